@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Compares the parse times of the pyparsing and the hand-written SPARQL parsers.
+
+Usage::
+
+    python devtools/benchmarks/sparql_parser.py --rounds 3
+
+The queries and updates are the ``.rq`` and ``.ru`` files of the W3C test
+suites under ``test/data/suites/w3c`` that both parsers accept, and a short
+query that is typical of what an application sends. Only parsing is timed,
+the parse trees are not translated to algebra.
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import rdflib.plugins.sparql
+from rdflib.plugins.sparql.parser import parseQuery, parseUpdate
+
+SUITES = Path(__file__).parent.parent.parent / "test" / "data" / "suites" / "w3c"
+
+PARSERS = ("pyparsing", "rdparser")
+
+SHORT_QUERY = """
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+SELECT ?name ?mbox WHERE {
+    ?x foaf:name ?name ; foaf:mbox ?mbox .
+    FILTER (regex(?name, "^A") && ?mbox != <mailto:nobody@example.org>)
+} ORDER BY ?name LIMIT 10
+"""
+
+
+def load() -> List[Tuple[Callable, str]]:
+    documents = []
+    for path in sorted(SUITES.glob("**/*.r[qu]")):
+        parse = parseUpdate if path.suffix == ".ru" else parseQuery
+        try:
+            text = path.read_text(encoding="utf-8")
+            for parser in PARSERS:
+                rdflib.plugins.sparql.SPARQL_PARSER = parser
+                parse(text)
+        except Exception:
+            continue
+        documents.append((parse, text))
+    return documents
+
+
+def measure(documents: List[Tuple[Callable, str]], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for parse, text in documents:
+            parse(text)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--short-rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    documents = load()
+    short = [(parseQuery, SHORT_QUERY)]
+    print(f"{len(documents)} queries and updates")
+    print(f"{'parser':<10} {'suites s':>9} {'short query ms':>15}")
+    for name in PARSERS:
+        rdflib.plugins.sparql.SPARQL_PARSER = name
+        elapsed = measure(documents, args.rounds) / args.rounds
+        short_elapsed = measure(short, args.short_rounds) / args.short_rounds
+        print(f"{name:<10} {elapsed:>9.2f} {short_elapsed * 1000:>15.3f}")
+    rdflib.plugins.sparql.SPARQL_PARSER = "pyparsing"
+
+
+if __name__ == "__main__":
+    main()
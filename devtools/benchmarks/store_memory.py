@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Measures the memory used per triple by in-memory stores.
+
+Usage::
+
+    python devtools/benchmarks/store_memory.py --triples 200000 Memory CompactMemory
+
+The triples are synthetic but shaped like typical instance data: a small
+vocabulary of predicates and classes, URIRef subjects and a mix of URIRef and
+Literal objects. Memory is measured with :mod:`tracemalloc` and only includes
+allocations made while the graph is being populated.
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+from typing import Iterator, List, Tuple
+
+from rdflib import RDF, Graph, Literal, Namespace, URIRef
+from rdflib.graph import _TripleType
+
+EX = Namespace("http://example.com/")
+
+
+def generate_triples(count: int, predicates: int = 20) -> Iterator[_TripleType]:
+    produced = 0
+    subject_index = 0
+    while True:
+        subject = EX[f"s{subject_index}"]
+        yield (subject, RDF.type, EX[f"Class{subject_index % 10}"])
+        produced += 1
+        for p in range(predicates):
+            if produced >= count:
+                return
+            predicate = EX[f"p{p}"]
+            if p % 2:
+                yield (subject, predicate, Literal(f"value {subject_index} {p}"))
+            else:
+                yield (subject, predicate, EX[f"s{(subject_index * 7 + p) % count}"])
+            produced += 1
+        subject_index += 1
+
+
+def measure(store: str, count: int) -> Tuple[int, float]:
+    triples = list(generate_triples(count))
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = Graph(store=store)
+    for triple in triples:
+        graph.add(triple)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(graph) == count
+    return size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--triples", type=int, default=100_000)
+    parser.add_argument("stores", nargs="*", default=["Memory", "CompactMemory"])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    rows: List[Tuple[str, int, float]] = []
+    for store in args.stores:
+        size, elapsed = measure(store, args.triples)
+        rows.append((store, size, elapsed))
+
+    print(f"{'store':<16} {'bytes/triple':>14} {'total MiB':>10} {'load s':>8}")
+    for store, size, elapsed in rows:
+        print(
+            f"{store:<16} {size / args.triples:>14.1f} "
+            f"{size / 2**20:>10.1f} {elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
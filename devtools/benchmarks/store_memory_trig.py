@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Measures the memory used per quad when a multi-graph TriG document is loaded.
+
+Usage::
+
+    python devtools/benchmarks/store_memory_trig.py --triples 200000 --graphs 100
+
+The document holds the synthetic triples of ``store_memory.py`` spread over a
+number of named graphs, each triple in one graph, except for a fraction that
+is repeated in a second graph. Memory is measured with :mod:`tracemalloc` and
+only includes allocations made while the document is being parsed.
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from store_memory import EX, generate_triples
+
+from rdflib import Dataset
+
+
+def generate_trig(count: int, graphs: int, shared: float) -> Tuple[str, int]:
+    dataset = Dataset()
+    every = int(1 / shared) if shared else 0
+    for index, triple in enumerate(generate_triples(count)):
+        dataset.graph(EX[f"g{index % graphs}"]).add(triple)
+        if every and index % every == 0:
+            dataset.graph(EX[f"g{(index + 1) % graphs}"]).add(triple)
+    quads = sum(1 for _ in dataset.quads())
+    return dataset.serialize(format="trig"), quads
+
+
+def measure(store: str, data: str) -> Tuple[int, float, int]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = Dataset(store=store)
+    dataset.parse(data=data, format="trig")
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, sum(1 for _ in dataset.quads())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--triples", type=int, default=100_000)
+    parser.add_argument("--graphs", type=int, default=100)
+    parser.add_argument(
+        "--shared",
+        type=float,
+        default=0.05,
+        help="fraction of the triples that are in two graphs",
+    )
+    parser.add_argument("stores", nargs="*", default=["Memory", "CompactMemory"])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    data, quads = generate_trig(args.triples, args.graphs, args.shared)
+    rows: List[Tuple[str, int, float]] = []
+    for store in args.stores:
+        size, elapsed, loaded = measure(store, data)
+        assert loaded == quads, (store, loaded, quads)
+        rows.append((store, size, elapsed))
+
+    print(f"{args.triples} triples, {quads} quads in {args.graphs} graphs")
+    print(f"{'store':<16} {'bytes/quad':>12} {'total MiB':>10} {'load s':>8}")
+    for store, size, elapsed in rows:
+        print(
+            f"{store:<16} {size / quads:>12.1f} {size / 2**20:>10.1f} {elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
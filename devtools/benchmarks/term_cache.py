@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Measures the effect of a shared TermCache when many graphs are parsed.
+
+Usage::
+
+    python devtools/benchmarks/term_cache.py --triples 10000 --graphs 20
+
+Each graph is the N-Triples document of the synthetic triples of
+``store_memory.py``, so all graphs use the same IRIs, and each is parsed into
+its own named graph of one Dataset, once without and once with a TermCache.
+Memory is measured with :mod:`tracemalloc` and only includes allocations made
+while the documents are being parsed. The comparison and hashing times are for
+pairs of equal terms taken from the first two graphs.
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from store_memory import EX, generate_triples
+
+from rdflib import Dataset, Graph
+from rdflib.term import Node, TermCache
+
+
+def measure(
+    data: str, graphs: int, term_cache: Optional[TermCache]
+) -> Tuple[Dataset, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = Dataset()
+    for index in range(graphs):
+        dataset.graph(EX[f"g{index}"]).parse(
+            data=data, format="nt", term_cache=term_cache
+        )
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dataset, size, elapsed
+
+
+def pairs(dataset: Dataset) -> List[Tuple[Node, Node]]:
+    first, second = (dataset.graph(EX[f"g{index}"]) for index in range(2))
+    return [
+        (a, b) for ta, tb in zip(sorted(first), sorted(second)) for a, b in zip(ta, tb)
+    ]
+
+
+def time_operations(terms: List[Tuple[Node, Node]], rounds: int) -> Tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for a, b in terms:
+            a == b
+    eq = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        table = {}
+        for a, b in terms:
+            table[a] = b
+            table[b]
+    hashing = time.perf_counter() - start
+    return eq, hashing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--triples", type=int, default=10_000)
+    parser.add_argument("--graphs", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    source = Graph()
+    for triple in generate_triples(args.triples):
+        source.add(triple)
+    data = source.serialize(format="nt")
+
+    rows = []
+    for name, term_cache in (("no cache", None), ("TermCache", TermCache())):
+        dataset, size, elapsed = measure(data, args.graphs, term_cache)
+        eq, hashing = time_operations(pairs(dataset), args.rounds)
+        rows.append((name, size, elapsed, eq, hashing))
+        del dataset
+
+    quads = args.triples * args.graphs
+    print(f"{args.triples} triples in each of {args.graphs} graphs")
+    print(
+        f"{'terms':<10} {'bytes/quad':>11} {'total MiB':>10} {'load s':>8}"
+        f" {'__eq__ s':>9} {'__hash__ s':>10}"
+    )
+    for name, size, elapsed, eq, hashing in rows:
+        print(
+            f"{name:<10} {size / quads:>11.1f} {size / 2**20:>10.1f}"
+            f" {elapsed:>8.2f} {eq:>9.3f} {hashing:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -85,3 +85,12 @@ class Dispatcher(object):
                 raise ValueError("unknown event type: %s" % type(event))
             for l_ in lst:
                 l_(event)
+
+    def has_subscribers(self, event_type):
+        """Return True if at least one handler is subscribed to the given
+        event_type.  Event sources can use this to avoid creating events
+        nobody will receive.
+        """
+        if self._dispatch_map is None:
+            return False
+        return bool(self._dispatch_map.get(event_type))
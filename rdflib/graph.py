@@ -673,6 +673,42 @@ class Graph(Node):
         # type error: Unexpected keyword argument "context" for "__len__" of "Store"
         return self.__store.__len__(context=self)  # type: ignore[call-arg]
 
+    def cardinality(self, triple: "_TripleSelectorType") -> Optional[int]:
+        """Number of triples matching the triple pattern, or None if the
+        store cannot tell without iterating over them
+
+        See :meth:`rdflib.store.Store.cardinality`.
+        """
+        s, p, o = triple
+        if isinstance(p, Path):
+            return None
+        return self.__store.cardinality((s, p, o), context=self)
+
+    def count(self, triple: "_TripleSelectorType") -> int:
+        """Number of triples matching the triple pattern, counted by the store
+        without building the matching triples where it can
+
+        See :meth:`rdflib.store.Store.count`.
+        """
+        s, p, o = triple
+        if isinstance(p, Path):
+            return sum(1 for _ in self.triples(triple))
+        return self.__store.count((s, p, o), context=self)
+
+    def distinct_cardinality(
+        self, position: int, triple: "_TripleSelectorType"
+    ) -> Optional[int]:
+        """Number of distinct subjects (position 0), predicates (1) or
+        objects (2) of the triples matching the triple pattern, or None if the
+        store cannot tell cheaply
+
+        See :meth:`rdflib.store.Store.distinct_cardinality`.
+        """
+        s, p, o = triple
+        if isinstance(p, Path):
+            return None
+        return self.__store.distinct_cardinality(position, (s, p, o), context=self)
+
     def __iter__(self) -> Generator["_TripleType", None, None]:
         """Iterates over all triples in the store"""
         return self.triples((None, None, None))
@@ -1502,6 +1538,7 @@ class Graph(Node):
         initNs: Optional[Mapping[str, Any]] = None,  # noqa: N803
         initBindings: Optional[Mapping[str, Identifier]] = None,
         use_store_provided: bool = True,
+        snapshot: bool = False,
         **kwargs: Any,
     ) -> query.Result:
         """
@@ -1514,10 +1551,26 @@ class Graph(Node):
         if none are given, the namespaces from the graph's namespace manager
         are used.
 
+        If snapshot is True the query is evaluated against a snapshot of the
+        store (see :meth:`rdflib.store.Store.snapshot`), so that it sees the
+        graph as it was when the query started, and the graph can be changed
+        while the result is being read.
+
         :returntype: :class:`~rdflib.query.Result`
 
         """
 
+        if snapshot:
+            return self._rebind(self.store.snapshot()).query(
+                query_object,
+                processor,
+                result,
+                initNs,
+                initBindings,
+                use_store_provided,
+                **kwargs,
+            )
+
         initBindings = initBindings or {}  # noqa: N806
         initNs = initNs or dict(self.namespaces())  # noqa: N806
 
@@ -1571,6 +1624,13 @@ class Graph(Node):
 
         return processor.update(update_object, initBindings, initNs, **kwargs)
 
+    def _rebind(self: _GraphT, store: Store) -> _GraphT:
+        """Return a copy of this graph that uses the given store"""
+        graph = object.__new__(type(self))
+        graph.__dict__.update(self.__dict__)
+        graph.__store = store
+        return graph
+
     def n3(self) -> str:
         """Return an n3 identifier for the Graph"""
         # type error: "IdentifiedNode" has no attribute "n3"
@@ -2100,6 +2160,64 @@ class ConjunctiveGraph(Graph):
         """Number of triples in the entire conjunctive graph"""
         return self.store.__len__()
 
+    def cardinality(
+        self,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        """Number of triples matching the triple pattern in the entire
+        conjunctive graph, or None if the store cannot tell without iterating
+        over them"""
+        s, p, o = triple
+        if isinstance(p, Path):
+            return None
+        return self.store.cardinality((s, p, o), context=self.__count_context(context))
+
+    def count(
+        self,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> int:
+        """Number of triples matching the triple pattern in the entire
+        conjunctive graph"""
+        s, p, o = triple
+        if isinstance(p, Path):
+            return sum(1 for _ in self.triples(triple, context))
+        return self.store.count((s, p, o), context=self.__count_context(context))
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        """Number of distinct subjects (position 0), predicates (1) or
+        objects (2) of the triples matching the triple pattern in the entire
+        conjunctive graph, or None if the store cannot tell cheaply"""
+        s, p, o = triple
+        if isinstance(p, Path):
+            return None
+        return self.store.distinct_cardinality(
+            position, (s, p, o), context=self.__count_context(context)
+        )
+
+    def _rebind(self: _ConjunctiveGraphT, store: Store) -> _ConjunctiveGraphT:
+        graph = super(ConjunctiveGraph, self)._rebind(store)
+        graph.default_context = self.default_context._rebind(store)
+        return graph
+
+    def __count_context(
+        self, context: Optional["_ContextType"]
+    ) -> Optional["_ContextType"]:
+        """the store context that `triples` reads for the given context"""
+        context = self._graph(context)
+        if self.default_union:
+            if context == self.default_context:
+                context = None
+        elif context is None:
+            context = self.default_context
+        return context
+
     def contexts(
         self, triple: Optional["_TripleType"] = None
     ) -> Generator["_ContextType", None, None]:
@@ -2684,6 +2802,28 @@ class ReadOnlyGraphAggregate(ConjunctiveGraph):
                 for s1, p1, o1 in graph.triples((s, p, o)):
                     yield s1, p1, o1
 
+    def cardinality(
+        self,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        return None
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        return None
+
+    def count(
+        self,
+        triple: "_TripleSelectorType",
+        context: Optional["_ContextType"] = None,
+    ) -> int:
+        return sum(1 for _ in self.triples(triple))
+
     def __contains__(self, triple_or_quad: _TripleOrQuadPatternType) -> bool:
         context = None
         if len(triple_or_quad) == 4:
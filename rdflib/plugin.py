@@ -207,6 +207,18 @@ register(
     "rdflib.plugins.stores.memory",
     "SimpleMemory",
 )
+register(
+    "CompactMemory",
+    Store,
+    "rdflib.plugins.stores.compactmemory",
+    "CompactMemory",
+)
+register(
+    "MMap",
+    Store,
+    "rdflib.plugins.stores.mmapstore",
+    "MMapStore",
+)
 register(
     "Auditable",
     Store,
@@ -35,13 +35,13 @@ Example usage::
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeVar, Union
 
 import rdflib.parser
 from rdflib.graph import ConjunctiveGraph, Graph
 from rdflib.namespace import RDF, XSD
 from rdflib.parser import InputSource, URLInputSource
-from rdflib.term import BNode, IdentifiedNode, Literal, Node, URIRef
+from rdflib.term import BNode, IdentifiedNode, Literal, Node, TermCache, URIRef
 
 from ..shared.jsonld.context import UNDEF, Context, Term
 from ..shared.jsonld.keys import (
@@ -74,6 +74,8 @@ TYPE_TERM = Term(str(RDF.type), TYPE, VOCAB)  # type: ignore[call-arg]
 
 ALLOW_LISTS_OF_LISTS = True  # NOTE: Not allowed in JSON-LD 1.0
 
+_NodeT = TypeVar("_NodeT", bound=Node)
+
 
 class JsonLDParser(rdflib.parser.Parser):
     def __init__(self):
@@ -104,6 +106,7 @@ class JsonLDParser(rdflib.parser.Parser):
             version = None
 
         generalized_rdf = kwargs.get("generalized_rdf", False)
+        term_cache = kwargs.get("term_cache", None)
 
         data = source_to_json(source)
 
@@ -116,7 +119,15 @@ class JsonLDParser(rdflib.parser.Parser):
         else:
             conj_sink = sink
 
-        to_rdf(data, conj_sink, base, context_data, version, generalized_rdf)
+        to_rdf(
+            data,
+            conj_sink,
+            base,
+            context_data,
+            version,
+            generalized_rdf,
+            term_cache=term_cache,
+        )
 
 
 def to_rdf(
@@ -127,22 +138,29 @@ def to_rdf(
     version: Optional[float] = None,
     generalized_rdf: bool = False,
     allow_lists_of_lists: Optional[bool] = None,
+    term_cache: Optional[TermCache] = None,
 ):
     # TODO: docstring w. args and return value
     context = Context(base=base, version=version)
     if context_data:
         context.load(context_data)
     parser = Parser(
-        generalized_rdf=generalized_rdf, allow_lists_of_lists=allow_lists_of_lists
+        generalized_rdf=generalized_rdf,
+        allow_lists_of_lists=allow_lists_of_lists,
+        term_cache=term_cache,
     )
     return parser.parse(data, context, dataset)
 
 
 class Parser(object):
     def __init__(
-        self, generalized_rdf: bool = False, allow_lists_of_lists: Optional[bool] = None
+        self,
+        generalized_rdf: bool = False,
+        allow_lists_of_lists: Optional[bool] = None,
+        term_cache: Optional[TermCache] = None,
     ):
         self.generalized_rdf = generalized_rdf
+        self.term_cache = term_cache
         self.allow_lists_of_lists = (
             allow_lists_of_lists
             if allow_lists_of_lists is not None
@@ -360,10 +378,16 @@ class Parser(object):
         else:
             pred = URIRef(pred_uri)
 
+        if self.term_cache is not None:
+            subj = self._cached(subj)
+            pred = self._cached(pred)
+
         for obj_node in obj_nodes:
             obj = self._to_object(dataset, graph, context, term, obj_node)
             if obj is None:
                 continue
+            if self.term_cache is not None:
+                obj = self._cached(obj)
             if reverse:
                 graph.add((obj, pred, subj))
             else:
@@ -541,6 +565,12 @@ class Parser(object):
                 return None
             return URIRef(uri)
 
+    def _cached(self, node: _NodeT) -> _NodeT:
+        if isinstance(node, (URIRef, Literal)):
+            # type error: Item "None" of "Optional[TermCache]" has no attribute "intern"
+            return self.term_cache.intern(node)  # type: ignore[union-attr, return-value]
+        return node
+
     def _get_bnodeid(self, ref: str) -> Optional[str]:
         if not ref.startswith("_:"):
             # type error: Return value expected
@@ -575,6 +605,8 @@ class Parser(object):
 
             if obj is None:
                 continue
+            if self.term_cache is not None:
+                obj = self._cached(obj)
 
             graph.add((subj, RDF.first, obj))
             rest = BNode()
@@ -65,6 +65,7 @@ from rdflib.term import (
     Identifier,
     Literal,
     Node,
+    TermCache,
     URIRef,
     Variable,
     _unique_id,
@@ -1816,11 +1817,12 @@ r_hibyte = re.compile(r"([\x80-\xff])")
 
 
 class RDFSink(object):
-    def __init__(self, graph: Graph):
+    def __init__(self, graph: Graph, term_cache: Optional[TermCache] = None):
         self.rootFormula: Optional[Formula] = None
         self.uuid = uuid4().hex
         self.counter = 0
         self.graph = graph
+        self.term_cache = term_cache
 
     def newFormula(self) -> Formula:
         fa = getattr(self.graph.store, "formula_aware", False)
@@ -1897,6 +1899,11 @@ class RDFSink(object):
         p = self.normalise(f, p)  # type: ignore[arg-type]
         o = self.normalise(f, o)  # type: ignore[arg-type]
 
+        if self.term_cache is not None:
+            s = self.cached(s)
+            p = self.cached(p)
+            o = self.cached(o)
+
         if f == self.rootFormula:
             # print s, p, o, '.'
             self.graph.add((s, p, o))
@@ -1949,6 +1956,13 @@ class RDFSink(object):
         # type error: Incompatible return value type (got "Union[int, _AnyT]", expected "Union[URIRef, Literal, BNode, _AnyT]")  [return-value]
         return n  # type: ignore[return-value]
 
+    def cached(self, node: _AnyT) -> _AnyT:
+        """the instance of the IRI or literal from the term cache"""
+        if isinstance(node, (URIRef, Literal)):
+            # type error: Value of type variable "_IdentifierT" of "intern" of "TermCache" cannot be "Union[URIRef, Literal]"
+            return self.term_cache.intern(node)  # type: ignore[union-attr, type-var, return-value]
+        return node
+
     def intern(self, something: _AnyT) -> _AnyT:
         return something
 
@@ -2004,13 +2018,14 @@ class TurtleParser(Parser):
         graph: Graph,
         encoding: Optional[str] = "utf-8",
         turtle: bool = True,
+        term_cache: Optional[TermCache] = None,
     ) -> None:
         if encoding not in [None, "utf-8"]:
             raise ParserError(
                 "N3/Turtle files are always utf-8 encoded, I was passed: %s" % encoding
             )
 
-        sink = RDFSink(graph)
+        sink = RDFSink(graph, term_cache=term_cache)
 
         baseURI = graph.absolutize(source.getPublicId() or source.getSystemId() or "")
         p = SinkParser(sink, baseURI=baseURI, turtle=turtle)
@@ -2038,7 +2053,11 @@ class N3Parser(TurtleParser):
 
     # type error: Signature of "parse" incompatible with supertype "TurtleParser"
     def parse(  # type: ignore[override]
-        self, source: InputSource, graph: Graph, encoding: Optional[str] = "utf-8"
+        self,
+        source: InputSource,
+        graph: Graph,
+        encoding: Optional[str] = "utf-8",
+        term_cache: Optional[TermCache] = None,
     ) -> None:
         # we're currently being handed a Graph, not a ConjunctiveGraph
         # context-aware is this implied by formula_aware
@@ -2055,4 +2074,6 @@ class N3Parser(TurtleParser):
         # TODO: update N3Processor so that it can use conj_graph as the sink
         conj_graph.namespace_manager = graph.namespace_manager
 
-        TurtleParser.parse(self, source, conj_graph, encoding, turtle=False)
+        TurtleParser.parse(
+            self, source, conj_graph, encoding, turtle=False, term_cache=term_cache
+        )
@@ -25,15 +25,19 @@ graphs that can be used and queried. The store that backs the graph
 from __future__ import annotations
 
 from codecs import getreader
-from typing import Any, MutableMapping, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, MutableMapping, Optional
 
 from rdflib.exceptions import ParserError as ParseError
-from rdflib.graph import ConjunctiveGraph
+from rdflib.graph import ConjunctiveGraph, Graph
 from rdflib.parser import InputSource
 
 # Build up from the NTriples parser:
 from rdflib.plugins.parsers.ntriples import W3CNTriplesParser, r_tail, r_wspace
-from rdflib.term import BNode
+from rdflib.term import BNode, TermCache
+
+if TYPE_CHECKING:
+    from rdflib.graph import _QuadType
+    from rdflib.term import Identifier
 
 __all__ = ["NQuadsParser"]
 
@@ -41,12 +45,17 @@ _BNodeContextType = MutableMapping[str, BNode]
 
 
 class NQuadsParser(W3CNTriplesParser):
+    #: number of quads that are collected before they are added to the sink
+    #: with `ConjunctiveGraph.addN <rdflib.graph.ConjunctiveGraph.addN>`
+    batch_size = 10000
+
     # type error: Signature of "parse" incompatible with supertype "W3CNTriplesParser"
     def parse(  # type: ignore[override]
         self,
         inputsource: InputSource,
         sink: ConjunctiveGraph,
         bnode_context: Optional[_BNodeContextType] = None,
+        term_cache: Optional[TermCache] = None,
         **kwargs: Any,
     ) -> ConjunctiveGraph:
         """
@@ -59,6 +68,9 @@ class NQuadsParser(W3CNTriplesParser):
         :type bnode_context: `dict`, optional
         :param bnode_context: a dict mapping blank node identifiers to `~rdflib.term.BNode` instances.
                               See `.W3CNTriplesParser.parse`
+        :type term_cache: `~rdflib.term.TermCache`, optional
+        :param term_cache: a cache that gives out the IRIs and literals that
+                           are read. See `.W3CNTriplesParser`
         """
         assert sink.store.context_aware, (
             "NQuadsParser must be given" " a context aware store."
@@ -76,19 +88,33 @@ class NQuadsParser(W3CNTriplesParser):
         if not hasattr(source, "read"):
             raise ParseError("Item to parse must be a file-like object.")
 
+        if term_cache is not None:
+            self._term_cache = term_cache
         self.file = source
         self.buffer = ""
-        while True:
-            self.line = __line = self.readline()
-            if self.line is None:
-                break
-            try:
-                self.parseline(bnode_context)
-            except ParseError as msg:
-                raise ParseError("Invalid line (%s):\n%r" % (msg, __line))
+        self._contexts: Dict[Identifier, Graph] = {}
+        self._pending: List[_QuadType] = []
+        try:
+            while True:
+                self.line = __line = self.readline()
+                if self.line is None:
+                    break
+                try:
+                    self.parseline(bnode_context)
+                except ParseError as msg:
+                    raise ParseError("Invalid line (%s):\n%r" % (msg, __line))
+        finally:
+            self.flush()
 
         return self.sink
 
+    def flush(self) -> None:
+        """Add all pending quads to the sink."""
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            self.sink.addN(pending)
+
     def parseline(self, bnode_context: Optional[_BNodeContextType] = None) -> None:
         self.eat(r_wspace)
         if (not self.line) or self.line.startswith(("#")):
@@ -110,4 +136,10 @@ class NQuadsParser(W3CNTriplesParser):
             raise ParseError("Trailing garbage")
         # Must have a context aware store - add on a normal Graph
         # discards anything where the ctx != graph.identifier
-        self.sink.get_context(context).add((subject, predicate, obj))
+        try:
+            graph = self._contexts[context]
+        except KeyError:
+            graph = self._contexts[context] = self.sink.get_context(context)
+        self._pending.append((subject, predicate, obj, graph))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
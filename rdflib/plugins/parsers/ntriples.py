@@ -14,6 +14,7 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
+    List,
     Match,
     MutableMapping,
     Optional,
@@ -26,14 +27,20 @@ from rdflib.compat import _string_escape_map, decodeUnicodeEscape
 from rdflib.exceptions import ParserError as ParseError
 from rdflib.parser import InputSource, Parser
 from rdflib.term import BNode as bNode
-from rdflib.term import Literal
+from rdflib.term import Literal, TermCache
 from rdflib.term import URIRef
 from rdflib.term import URIRef as URI
 
 if TYPE_CHECKING:
     import typing_extensions as te
 
-    from rdflib.graph import Graph, _ObjectType, _PredicateType, _SubjectType
+    from rdflib.graph import (
+        Graph,
+        _ObjectType,
+        _PredicateType,
+        _QuadType,
+        _SubjectType,
+    )
 
 __all__ = [
     "unquote",
@@ -138,19 +145,24 @@ class W3CNTriplesParser(object):
     across instances of NTriplesParser, pass the same dict as ``bnode_context`` to each
     instance. By default, a new blank node context is created for each instance of
     `W3CNTriplesParser`.
+
+    To share the IRIs and literals that are read with other parsers, pass the
+    same `~rdflib.term.TermCache` as ``term_cache`` to each of them.
     """
 
-    __slots__ = ("_bnode_ids", "sink", "buffer", "file", "line")
+    __slots__ = ("_bnode_ids", "_term_cache", "sink", "buffer", "file", "line")
 
     def __init__(
         self,
         sink: Optional[Union[DummySink, "NTGraphSink"]] = None,
         bnode_context: Optional[_BNodeContextType] = None,
+        term_cache: Optional[TermCache] = None,
     ):
         if bnode_context is not None:
             self._bnode_ids = bnode_context
         else:
             self._bnode_ids = {}
+        self._term_cache = term_cache
 
         self.sink: Union[DummySink, "NTGraphSink"]
         if sink is not None:
@@ -188,14 +200,20 @@ class W3CNTriplesParser(object):
 
         self.file = f  # type: ignore[assignment]
         self.buffer = ""
-        while True:
-            self.line = self.readline()
-            if self.line is None:
-                break
-            try:
-                self.parseline(bnode_context=bnode_context)
-            except ParseError:
-                raise ParseError("Invalid line: {}".format(self.line))
+        try:
+            while True:
+                self.line = self.readline()
+                if self.line is None:
+                    break
+                try:
+                    self.parseline(bnode_context=bnode_context)
+                except ParseError:
+                    raise ParseError("Invalid line: {}".format(self.line))
+        finally:
+            # sinks may batch triples, make sure all of them are delivered
+            flush = getattr(self.sink, "flush", None)
+            if flush is not None:
+                flush()
         return self.sink
 
     def parsestring(self, s: Union[bytes, bytearray, str], **kwargs) -> None:
@@ -291,6 +309,8 @@ class W3CNTriplesParser(object):
             uri = self.eat(r_uriref).group(1)
             uri = unquote(uri)
             uri = uriquote(uri)
+            if self._term_cache is not None:
+                return self._term_cache.intern(URI(uri))
             return URI(uri)
         return False
 
@@ -330,18 +350,47 @@ class W3CNTriplesParser(object):
             if lang and dtype:
                 raise ParseError("Can't have both a language and a datatype")
             lit = unquote(lit)
+            if self._term_cache is not None:
+                return self._term_cache.intern(Literal(lit, lang, dtype))
             return Literal(lit, lang, dtype)
         return False
 
 
 class NTGraphSink(object):
-    __slots__ = ("g",)
+    """Adds the triples it receives to a graph.
+
+    Triples are collected and added to the graph in batches of
+    ``batch_size`` with `Graph.addN <rdflib.graph.Graph.addN>`, so that
+    stores with a bulk loading path are used through it. Call `flush` to add
+    any triples that are still pending, `W3CNTriplesParser.parse` does this
+    when it is done.
+    """
+
+    __slots__ = ("g", "_pending", "_batch_size")
+
+    def __init__(self, graph: "Graph", batch_size: int = 10000):
+        from rdflib.graph import Graph
 
-    def __init__(self, graph: "Graph"):
         self.g = graph
+        # only graphs that use Graph.addN can be batched, ConjunctiveGraph and
+        # QuotedGraph give addN a different meaning than add.
+        self._batch_size = batch_size if type(graph).addN is Graph.addN else 0
+        self._pending: List["_QuadType"] = []
 
     def triple(self, s: "_SubjectType", p: "_PredicateType", o: "_ObjectType") -> None:
-        self.g.add((s, p, o))
+        if not self._batch_size:
+            self.g.add((s, p, o))
+            return
+        self._pending.append((s, p, o, self.g))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add all pending triples to the graph."""
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            self.g.addN(pending)
 
 
 class NTParser(Parser):
@@ -360,7 +409,9 @@ class NTParser(Parser):
         :param source: the source of NT-formatted data
         :type sink: `rdflib.graph.Graph`
         :param sink: where to send parsed triples
-        :param kwargs: Additional arguments to pass to `.W3CNTriplesParser.parse`
+        :param kwargs: Additional arguments to pass to `.W3CNTriplesParser.parse`,
+            and ``term_cache``, a `~rdflib.term.TermCache` for the terms that
+            are read
         """
         f: Union[TextIO, IO[bytes], codecs.StreamReader]
         f = source.getCharacterStream()
@@ -373,6 +424,8 @@ class NTParser(Parser):
             else:
                 # since N-Triples 1.1 files can and should be utf-8 encoded
                 f = codecs.getreader("utf-8")(b)
-        parser = W3CNTriplesParser(NTGraphSink(sink))
+        parser = W3CNTriplesParser(
+            NTGraphSink(sink), term_cache=kwargs.pop("term_cache", None)
+        )
         parser.parse(f, **kwargs)
         f.close()
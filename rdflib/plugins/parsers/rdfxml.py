@@ -14,7 +14,7 @@ from rdflib.graph import Graph
 from rdflib.namespace import RDF, is_ncname
 from rdflib.parser import InputSource, Parser
 from rdflib.plugins.parsers.RDFVOC import RDFVOC
-from rdflib.term import BNode, Identifier, Literal, URIRef
+from rdflib.term import BNode, Identifier, Literal, TermCache, URIRef
 
 if TYPE_CHECKING:
     # from xml.sax.expatreader import ExpatLocator
@@ -137,6 +137,7 @@ class RDFXMLHandler(handler.ContentHandler):
     def __init__(self, store: Graph):
         self.store = store
         self.preserve_bnode_ids = False
+        self.term_cache: Optional[TermCache] = None
         self.reset()
 
     def reset(self) -> None:
@@ -154,6 +155,16 @@ class RDFXMLHandler(handler.ContentHandler):
         ]  # contains uri -> prefix dicts
         self._current_context: Dict[str, Optional[str]] = self._ns_contexts[-1]
 
+    def add(self, triple: Tuple[Identifier, Identifier, Identifier]) -> None:
+        if self.term_cache is not None:
+            intern = self.term_cache.intern
+            triple = tuple(  # type: ignore[assignment]
+                intern(node) if isinstance(node, (URIRef, Literal)) else node
+                for node in triple
+            )
+        # type error: Argument 1 to "add" of "Graph" has incompatible type "Tuple[Identifier, Identifier, Identifier]"
+        self.store.add(triple)  # type: ignore[arg-type]
+
     # ContentHandler methods
 
     def setDocumentLocator(self, locator: Locator):
@@ -219,10 +230,10 @@ class RDFXMLHandler(handler.ContentHandler):
 
     def add_reified(self, sid: Identifier, spo: _TripleType):
         s, p, o = spo
-        self.store.add((sid, RDF.type, RDF.Statement))
-        self.store.add((sid, RDF.subject, s))
-        self.store.add((sid, RDF.predicate, p))
-        self.store.add((sid, RDF.object, o))
+        self.add((sid, RDF.type, RDF.Statement))
+        self.add((sid, RDF.subject, s))
+        self.add((sid, RDF.predicate, p))
+        self.add((sid, RDF.object, o))
 
     def error(self, message: str) -> NoReturn:
         locator = self.locator
@@ -353,7 +364,7 @@ class RDFXMLHandler(handler.ContentHandler):
 
         if name != RDFVOC.Description:  # S1
             # error: Argument 1 has incompatible type "Tuple[str, str]"; expected "str"
-            self.store.add((subject, RDF.type, absolutize(name)))  # type: ignore[arg-type]
+            self.add((subject, RDF.type, absolutize(name)))  # type: ignore[arg-type]
 
         object: _ObjectType
         language = current.language
@@ -381,7 +392,7 @@ class RDFXMLHandler(handler.ContentHandler):
                 except Error as e:
                     # type error: Argument 1 to "error" of "RDFXMLHandler" has incompatible type "Optional[str]"; expected "str"
                     self.error(e.msg)  # type: ignore[arg-type]
-            self.store.add((subject, predicate, object))
+            self.add((subject, predicate, object))
 
         current.subject = subject
 
@@ -514,7 +525,7 @@ class RDFXMLHandler(handler.ContentHandler):
 
                 if object is None:
                     object = BNode()
-                self.store.add((object, predicate, o))
+                self.add((object, predicate, o))
         if object is None:
             current.data = ""
             current.object = None
@@ -537,9 +548,9 @@ class RDFXMLHandler(handler.ContentHandler):
             current.data = None
         if self.next.end == self.list_node_element_end:
             if current.object != RDF.nil:
-                self.store.add((current.list, RDF.rest, RDF.nil))
+                self.add((current.list, RDF.rest, RDF.nil))
         if current.object is not None:
-            self.store.add((self.parent.subject, current.predicate, current.object))
+            self.add((self.parent.subject, current.predicate, current.object))
             if current.id is not None:
                 self.add_reified(
                     current.id, (self.parent.subject, current.predicate, current.object)
@@ -553,15 +564,15 @@ class RDFXMLHandler(handler.ContentHandler):
             # Removed between 20030123 and 20030905
             # self.store.add((list, RDF.type, LIST))
             self.parent.list = list
-            self.store.add((self.parent.list, RDF.first, current.subject))
+            self.add((self.parent.list, RDF.first, current.subject))
             self.parent.object = list
             self.parent.char = None
         else:
             list = BNode()
             # Removed between 20030123 and 20030905
             # self.store.add((list, RDF.type, LIST))
-            self.store.add((self.parent.list, RDF.rest, list))
-            self.store.add((list, RDF.first, current.subject))
+            self.add((self.parent.list, RDF.rest, list))
+            self.add((list, RDF.first, current.subject))
             self.parent.list = list
 
     def literal_element_start(
@@ -641,6 +652,7 @@ class RDFXMLParser(Parser):
         preserve_bnode_ids = args.get("preserve_bnode_ids", None)
         if preserve_bnode_ids is not None:
             content_handler.preserve_bnode_ids = preserve_bnode_ids
+        content_handler.term_cache = args.get("term_cache", None)
         # # We're only using it once now
         # content_handler.reset()
         # self._parser.reset()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, MutableSequence
+from typing import Any, MutableSequence, Optional
 
 from rdflib.graph import ConjunctiveGraph, Graph
 from rdflib.parser import InputSource, Parser
+from rdflib.term import TermCache
 
 from .notation3 import RDFSink, SinkParser
 
@@ -134,7 +135,13 @@ class TrigParser(Parser):
     def __init__(self):
         pass
 
-    def parse(self, source: InputSource, graph: Graph, encoding: str = "utf-8") -> None:
+    def parse(
+        self,
+        source: InputSource,
+        graph: Graph,
+        encoding: str = "utf-8",
+        term_cache: Optional[TermCache] = None,
+    ) -> None:
         if encoding not in [None, "utf-8"]:
             raise Exception(
                 # type error: Unsupported left operand type for % ("Tuple[str, str]")
@@ -151,7 +158,7 @@ class TrigParser(Parser):
         # TODO: update N3Processor so that it can use conj_graph as the sink
         conj_graph.namespace_manager = graph.namespace_manager
 
-        sink = RDFSink(conj_graph)
+        sink = RDFSink(conj_graph, term_cache=term_cache)
 
         baseURI = conj_graph.absolutize(
             source.getPublicId() or source.getSystemId() or ""
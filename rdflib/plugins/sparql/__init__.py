@@ -5,7 +5,7 @@ SPARQL implementation for RDFLib
 """
 
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 SPARQL_LOAD_GRAPHS = True
 """
@@ -21,6 +21,46 @@ named graphs (like RDFLib's ConjunctiveGraph)
 """
 
 
+SPARQL_PARSER = "pyparsing"
+"""
+The parser for SPARQL queries and updates, either "pyparsing" for the
+grammar in :mod:`rdflib.plugins.sparql.parser` or "rdparser" for the faster
+hand-written parser in :mod:`rdflib.plugins.sparql.rdparser`, which returns
+the same parse trees
+"""
+
+
+SPARQL_MEMORY_BUDGET: Optional[int] = None
+"""
+If set to a positive number, ORDER BY, DISTINCT and GROUP BY keep at most
+this many solutions, distinct solutions or groups in memory each, and write
+the others to temporary files, see :mod:`rdflib.plugins.sparql.spill`.
+If None, everything is kept in memory.
+"""
+
+SPARQL_THREADS: int = 0
+"""
+If set to a positive number, the branches of a UNION that do not share
+state, and the pattern of a GRAPH with an unbound variable for each named
+graph, are evaluated concurrently on a pool of this many threads, see
+:mod:`rdflib.plugins.sparql.parallel`. This helps when evaluation waits
+for I/O, as with SERVICE or a remote store. If 0, they are evaluated one
+after the other as their solutions are consumed.
+"""
+
+SPARQL_PROCESSES: int = 0
+"""
+If set to a positive number, the pattern of a GRAPH with an unbound
+variable is evaluated for the named graphs on a pool of this many
+processes, when the store can be opened in them, see
+:meth:`rdflib.store.Store.worker_configuration`. Each process opens the
+store once and evaluates the pattern for a share of the graphs. This helps
+with many named graphs when evaluation is bound by the CPU. If 0, or for
+other stores, the graphs are evaluated in this process, see
+:data:`SPARQL_THREADS`.
+"""
+
+
 CUSTOM_EVALS = {}
 """
 Custom evaluation functions
@@ -18,12 +18,25 @@ from typing import (
 )
 
 from rdflib.namespace import XSD
+from rdflib.plugins.sparql.compiler import compiled, compileValue
 from rdflib.plugins.sparql.datatypes import type_promotion
 from rdflib.plugins.sparql.evalutils import _eval, _val
 from rdflib.plugins.sparql.operators import numeric
-from rdflib.plugins.sparql.parserutils import CompValue
-from rdflib.plugins.sparql.sparql import FrozenBindings, NotBoundError, SPARQLTypeError
-from rdflib.term import BNode, Identifier, Literal, URIRef, Variable
+from rdflib.plugins.sparql.parserutils import CompValue, Expr
+from rdflib.plugins.sparql.sparql import (
+    FrozenBindings,
+    NotBoundError,
+    SPARQLTypeError,
+    VariableSchema,
+)
+from rdflib.term import (
+    _NUMERIC_LITERAL_TYPES,
+    BNode,
+    Identifier,
+    Literal,
+    URIRef,
+    Variable,
+)
 
 """
 Aggregation functions
@@ -304,3 +317,357 @@ class Aggregator(object):
         for acc in self.accumulators.values():
             acc.set_value(self.bindings)
         return self.bindings
+
+
+def _evaluator(expr: Any, schema: VariableSchema) -> Callable[[FrozenBindings], Any]:
+    """
+    A function that returns ``_eval(expr, row)`` for the solutions of
+    ``schema``, with the expression compiled
+    """
+    if isinstance(expr, Variable):
+        lookup = compileValue(expr, schema, variables=True)
+
+        def variable(row: FrozenBindings) -> Any:
+            value = lookup(row)
+            if value is expr:
+                raise NotBoundError("Variable %s is not bound" % expr)
+            return value
+
+        return variable
+    if isinstance(expr, Expr):
+        return compiled(expr, schema).eval
+    return lambda row: _eval(expr, row)
+
+
+class Column(object):
+    """
+    abstract base class for the state of an aggregation function in a
+    ColumnAggregator, kept in lists with one entry for each group
+    """
+
+    #: whether DISTINCT can change the value
+    distinct_values = True
+
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        self.var = aggregation.res
+        self.expr = aggregation.vars
+        self.evaluate = _evaluator(self.expr, schema)
+        self.distinct = bool(aggregation.distinct) and self.distinct_values
+        # the values seen for DISTINCT, as (column, group, value), shared by
+        # all columns of the aggregator
+        self.seen = seen
+
+    def add_group(self) -> None:
+        raise NotImplementedError()
+
+    def update(self, group: int, row: FrozenBindings) -> None:
+        if self.distinct:
+            # like Accumulator.use_row, an unbound variable is not skipped
+            value = self.evaluate(row)
+            if (self, group, value) in self.seen:
+                return
+        else:
+            try:
+                value = self.evaluate(row)
+            except NotBoundError:
+                # skip UNDEF
+                return
+        if self.add(group, value) and self.distinct:
+            self.seen.add((self, group, value))
+
+    def add(self, group: int, value: Any) -> bool:
+        """adds value to the group, returns whether it was used"""
+        raise NotImplementedError()
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        """sets the final value of the group in bindings"""
+        raise NotImplementedError()
+
+
+class CounterColumn(Column):
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        super(CounterColumn, self).__init__(aggregation, schema, seen)
+        self.counts: List[int] = []
+        if self.expr == "*":
+            # cannot eval "*" => always use the full row
+            self.evaluate = lambda row: row
+            if not self.distinct:
+                # type error: Cannot assign to a method
+                self.update = self.count  # type: ignore[assignment]
+
+    def add_group(self) -> None:
+        self.counts.append(0)
+
+    def count(self, group: int, row: FrozenBindings) -> None:
+        self.counts[group] += 1
+
+    def add(self, group: int, value: Any) -> bool:
+        self.counts[group] += 1
+        return True
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        bindings[self.var] = Literal(self.counts[group])
+
+
+_SUM_DATATYPES = frozenset((XSD.integer, XSD.decimal, XSD.float, XSD.double))
+"""the datatypes that type promotion leaves as they are"""
+
+
+class SumColumn(Column):
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        super(SumColumn, self).__init__(aggregation, schema, seen)
+        self.sums: List[Any] = []
+        self.datatypes: List[Optional[str]] = []
+
+    def add_group(self) -> None:
+        self.sums.append(0)
+        self.datatypes.append(None)
+
+    def add(self, group: int, value: Any) -> bool:
+        dt = self.datatypes[group]
+        if value.__class__ is Literal and dt in _SUM_DATATYPES and value.datatype == dt:
+            # the sum has the type of the value, so they add up directly
+            number = value.toPython()
+            total = self.sums[group]
+            if number.__class__ is total.__class__:
+                self.sums[group] = total + number
+                return True
+        if dt is None:
+            dt = value.datatype
+        else:
+            # type error: Argument 1 to "type_promotion" has incompatible type "str"; expected "URIRef"
+            dt = type_promotion(dt, value.datatype)  # type: ignore[arg-type]
+        self.datatypes[group] = dt
+        self.sums[group] = sum(type_safe_numbers(self.sums[group], numeric(value)))
+        return True
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        bindings[self.var] = Literal(self.sums[group], datatype=self.datatypes[group])
+
+
+class AverageColumn(Column):
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        super(AverageColumn, self).__init__(aggregation, schema, seen)
+        self.counts: List[int] = []
+        self.sums: List[Any] = []
+        self.datatypes: List[Optional[str]] = []
+
+    def add_group(self) -> None:
+        self.counts.append(0)
+        self.sums.append(0)
+        self.datatypes.append(None)
+
+    def add(self, group: int, value: Any) -> bool:
+        try:
+            self.sums[group] = sum(type_safe_numbers(self.sums[group], numeric(value)))
+            dt = self.datatypes[group]
+            if dt is None:
+                dt = value.datatype
+            else:
+                # type error: Argument 1 to "type_promotion" has incompatible type "str"; expected "URIRef"
+                dt = type_promotion(dt, value.datatype)  # type: ignore[arg-type]
+            self.datatypes[group] = dt
+            self.counts[group] += 1
+            return True
+        # skip BNode => SPARQLTypeError
+        except SPARQLTypeError:
+            return False
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        count = self.counts[group]
+        if count == 0:
+            bindings[self.var] = Literal(0)
+        elif self.datatypes[group] in (XSD.float, XSD.double):
+            bindings[self.var] = Literal(self.sums[group] / count)
+        else:
+            bindings[self.var] = Literal(Decimal(self.sums[group]) / Decimal(count))
+
+
+_ORDERED_NUMBERS = frozenset(_NUMERIC_LITERAL_TYPES)
+
+
+def _number(value: Any) -> Any:
+    """
+    The value of a numeric literal, which literals are ordered by, or None
+    if value is not one, or is NaN
+    """
+    if value.__class__ is Literal and value.datatype in _ORDERED_NUMBERS:
+        number = value.value
+        if (
+            number.__class__ is int
+            or (number.__class__ is float and number == number)
+            or (number.__class__ is Decimal and not number.is_nan())
+        ):
+            return number
+    return None
+
+
+class ExtremumColumn(Column):
+    """abstract base class for MinimumColumn and MaximumColumn"""
+
+    # DISTINCT would not change the value for MIN or MAX
+    distinct_values = False
+
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        self.compare: Callable[[Any, Any], Any]
+        self.before: Callable[[Any, Any], bool]
+        super(ExtremumColumn, self).__init__(aggregation, schema, seen)
+        self.values: List[Any] = []
+        # the numbers of the values, see _number
+        self.numbers: List[Any] = []
+
+    def add_group(self) -> None:
+        self.values.append(None)
+        self.numbers.append(None)
+
+    def add(self, group: int, value: Any) -> bool:
+        current = self.values[group]
+        if current is not None:
+            number = self.numbers[group]
+            if number is not None:
+                other = _number(value)
+                if other is not None:
+                    if self.before(other, number):
+                        self.values[group] = value
+                        self.numbers[group] = other
+                    return True
+            # self.compare is implemented by MinimumColumn/MaximumColumn
+            value = self.compare(current, value)
+        self.values[group] = value
+        self.numbers[group] = _number(value)
+        return True
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        value = self.values[group]
+        if value is not None:
+            # simply do not set if the value is still None
+            bindings[self.var] = Literal(value)
+
+
+class MinimumColumn(ExtremumColumn):
+    def compare(self, val1: _ValueT, val2: _ValueT) -> _ValueT:
+        return min(val1, val2, key=_val)
+
+    def before(self, number1: Any, number2: Any) -> bool:
+        return number1 < number2
+
+
+class MaximumColumn(ExtremumColumn):
+    def compare(self, val1: _ValueT, val2: _ValueT) -> _ValueT:
+        return max(val1, val2, key=_val)
+
+    def before(self, number1: Any, number2: Any) -> bool:
+        return number1 > number2
+
+
+class SampleColumn(Column):
+    """takes the first eligible value"""
+
+    # DISTINCT would not change the value
+    distinct_values = False
+
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        super(SampleColumn, self).__init__(aggregation, schema, seen)
+        self.values: List[Any] = []
+
+    def add_group(self) -> None:
+        self.values.append(None)
+
+    def update(self, group: int, row: FrozenBindings) -> None:
+        # skip the rows after the first eligible one
+        if self.values[group] is None:
+            super(SampleColumn, self).update(group, row)
+
+    def add(self, group: int, value: Any) -> bool:
+        self.values[group] = value
+        return True
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        # None if no value was set
+        bindings[self.var] = self.values[group]
+
+
+class GroupConcatColumn(Column):
+    def __init__(self, aggregation: CompValue, schema: VariableSchema, seen: Set[Any]):
+        super(GroupConcatColumn, self).__init__(aggregation, schema, seen)
+        self.values: List[List[Any]] = []
+        self.separator = aggregation.separator or " "
+
+    def add_group(self) -> None:
+        self.values.append([])
+
+    def add(self, group: int, value: Any) -> bool:
+        # skip UNDEF
+        if isinstance(value, NotBoundError):
+            return False
+        self.values[group].append(value)
+        return True
+
+    def set_value(
+        self, group: int, bindings: MutableMapping[Variable, Identifier]
+    ) -> None:
+        bindings[self.var] = Literal(
+            self.separator.join(str(v) for v in self.values[group])
+        )
+
+
+class ColumnAggregator(object):
+    """
+    Aggregates solutions in numbered groups, like an Aggregator for each
+    group. The state of each aggregation function is kept in a Column, with
+    one entry per group, instead of in an Accumulator object for each group
+    and aggregation, and DISTINCT uses one set for all of them, so that many
+    groups take little memory. The expressions are compiled for the
+    solutions of ``schema``.
+    """
+
+    column_classes = {
+        "Aggregate_Count": CounterColumn,
+        "Aggregate_Sample": SampleColumn,
+        "Aggregate_Sum": SumColumn,
+        "Aggregate_Avg": AverageColumn,
+        "Aggregate_Min": MinimumColumn,
+        "Aggregate_Max": MaximumColumn,
+        "Aggregate_GroupConcat": GroupConcatColumn,
+    }
+
+    def __init__(self, aggregations: List[CompValue], schema: VariableSchema):
+        self.groups = 0
+        seen: Set[Any] = set()
+        self.columns: List[Column] = []
+        for a in aggregations:
+            column_class = self.column_classes.get(a.name)
+            if column_class is None:
+                raise Exception("Unknown aggregate function " + a.name)
+            self.columns.append(column_class(a, schema, seen))
+
+    def add_group(self) -> int:
+        """adds a group, returns its number"""
+        for column in self.columns:
+            column.add_group()
+        self.groups += 1
+        return self.groups - 1
+
+    def update(self, group: int, row: FrozenBindings) -> None:
+        """update all columns for the group"""
+        for column in self.columns:
+            column.update(group, row)
+
+    def get_bindings(self, group: int) -> Mapping[Variable, Identifier]:
+        """calculate the values of the group"""
+        bindings: Dict[Variable, Identifier] = {}
+        for column in self.columns:
+            column.set_value(group, bindings)
+        return bindings
@@ -36,10 +36,10 @@ from rdflib.paths import (
     Path,
     SequencePath,
 )
-from rdflib.plugins.sparql.operators import TrueFilter, and_
+from rdflib.plugins.sparql.operators import EBV, TrueFilter, and_
 from rdflib.plugins.sparql.operators import simplify as simplifyFilters
 from rdflib.plugins.sparql.parserutils import CompValue, Expr
-from rdflib.plugins.sparql.sparql import Prologue, Query, Update
+from rdflib.plugins.sparql.sparql import Prologue, Query, SPARQLError, Update
 
 # ---------------------------
 # Some convenience methods
@@ -552,6 +552,60 @@ def _addVars(x, children: List[Set[Variable]]) -> Set[Variable]:
     return reduce(operator.or_, children, set())
 
 
+def _addDemand(part: Any, demand: Optional[int]) -> None:
+    """
+    Annotate the parts of the query with ``_demand``, the number of their
+    solutions that are needed when that is less than all of them, in any
+    order: one for ASK and for the patterns of EXISTS and NOT EXISTS, and
+    what follows from that through the parts that pass solutions on without
+    needing to see all of them.
+    """
+    if isinstance(part, (list, tuple, ParseResults)):
+        for x in part:
+            _addDemand(x, demand)
+        return
+    if not isinstance(part, CompValue):
+        return
+    if part.name in ("Builtin_EXISTS", "Builtin_NOTEXISTS"):
+        # the translated pattern is an attribute, the item is the parse tree
+        _addDemand(part.graph, 1)
+        return
+    if demand is not None:
+        part["_demand"] = demand
+    for key, child in part.items():
+        _addDemand(child, _childDemand(part, key, demand))
+
+
+def _childDemand(part: CompValue, key: str, demand: Optional[int]) -> Optional[int]:
+    """the demand on the ``key`` child of ``part``, see _addDemand"""
+    if part.name == "AskQuery" and key == "p":
+        return 1
+    if demand is None:
+        return None
+    if part.name == "Slice" and key == "p":
+        if part.length is None:
+            return part.start + demand
+        return part.start + min(part.length, demand)
+    if (part.name, key) in _PASS_DEMAND:
+        return demand
+    return None
+
+
+_PASS_DEMAND = {
+    ("Project", "p"),
+    ("ToMultiSet", "p"),
+    ("Extend", "p"),
+    # any solutions will do, so they need not be sorted
+    ("OrderBy", "p"),
+    ("Union", "p1"),
+    ("Union", "p2"),
+    ("LeftJoin", "p1"),
+    # each graph needs at most as many solutions as the whole pattern
+    ("Graph", "p"),
+}
+"""the parts that need at most as many solutions of a child as of themselves"""
+
+
 # type error: Missing return statement
 def _sample(e: typing.Union[CompValue, List[Expr], Expr, List[str], Variable], v: Optional[Variable] = None) -> Optional[CompValue]:  # type: ignore[return]
     """
@@ -814,6 +868,215 @@ def analyse(n: Any, children: Any) -> bool:
         return True
 
 
+_UNFOLDABLE = {
+    "Builtin_EXISTS",
+    "Builtin_NOTEXISTS",
+    "Builtin_IRI",
+    "Builtin_URI",
+    "Builtin_BNODE",
+    "Builtin_RAND",
+    "Builtin_NOW",
+    "Builtin_UUID",
+    "Builtin_STRUUID",
+    "Function",
+}
+"""Expressions that depend on the query context, the time or chance, or on
+custom functions that can be registered later, and are never folded"""
+
+
+def _isConstant(x: Any) -> bool:
+    if isinstance(x, (list, tuple)):
+        return all(_isConstant(y) for y in x)
+    return not isinstance(x, (Variable, BNode, CompValue))
+
+
+def _foldConstants(e: Any) -> Any:
+    """
+    Replace an expression whose arguments are all constants with its value,
+    so it is evaluated once instead of for each solution. Expressions that
+    evaluate to an error are kept, to raise it where they did before.
+    """
+    if (
+        isinstance(e, Expr)
+        and e.name not in _UNFOLDABLE
+        and all(_isConstant(x) for x in e.values())
+    ):
+        value = e.eval()
+        if isinstance(value, (Literal, URIRef)):
+            return value
+
+
+def _isTrue(expr: Any) -> bool:
+    try:
+        return isinstance(expr, Literal) and EBV(expr)
+    except SPARQLError:
+        return False
+
+
+def _conjuncts(expr: Any) -> List[Any]:
+    if isinstance(expr, Expr) and expr.name == "ConditionalAndExpression":
+        return _conjuncts(expr.expr) + [
+            c for other in expr.other for c in _conjuncts(other)
+        ]
+    return [expr]
+
+
+def _filterVars(expr: Any) -> Optional[Set[Variable]]:
+    """
+    The variables of a filter expression, or None if it uses EXISTS, which
+    sees all the bindings of a solution
+    """
+    res: Set[Variable] = set()
+
+    def _visit(n: Any) -> None:
+        if isinstance(n, Variable):
+            res.add(n)
+        elif isinstance(n, CompValue) and n.name in (
+            "Builtin_EXISTS",
+            "Builtin_NOTEXISTS",
+        ):
+            raise StopTraversal(None)
+
+    return traverse(expr, visitPre=_visit, complete=res)
+
+
+def _certainVars(part: CompValue) -> Set[Variable]:
+    """
+    The variables that are bound in every solution of an algebra expression
+    """
+    name = part.name
+    if name == "BGP":
+        return set(
+            term
+            for triple in part.triples
+            for term in triple
+            if isinstance(term, Variable)
+        )
+    elif name == "Join":
+        return _certainVars(part.p1) | _certainVars(part.p2)
+    elif name in ("LeftJoin", "Minus", "Filter", "Extend"):
+        return _certainVars(part.p1 if name in ("LeftJoin", "Minus") else part.p)
+    elif name == "Union":
+        return _certainVars(part.p1) & _certainVars(part.p2)
+    elif name == "Graph":
+        res = _certainVars(part.p)
+        if isinstance(part.term, Variable):
+            res.add(part.term)
+        return res
+    elif (
+        name == "ToMultiSet"
+        and isinstance(part.p, CompValue)
+        and part.p.name == "values"
+    ):
+        rows = [
+            set(var for var, value in row.items() if value != "UNDEF")
+            for row in part.p.res
+        ]
+        return set.intersection(*rows) if rows else set()
+    return set()
+
+
+def _equalsIRI(expr: Any) -> Optional[Tuple[Variable, URIRef]]:
+    """the variable and the IRI of a ``?x = <iri>`` expression"""
+    if (
+        isinstance(expr, Expr)
+        and expr.name == "RelationalExpression"
+        and expr.op == "="
+    ):
+        a, b = expr.expr, expr.other
+        if isinstance(b, Variable):
+            a, b = b, a
+        if isinstance(a, Variable) and isinstance(b, URIRef):
+            return a, b
+    return None
+
+
+def _pushFilter(part: CompValue, expr: Any, vars: Set[Variable]) -> CompValue:
+    """
+    Filter ``part`` with ``expr``, in the lowest subexpression of ``part``
+    that binds all of ``vars`` in every solution. Each solution that gets
+    there has the same values for them as it has in the solutions of
+    ``part``, so the filter removes the same solutions, only earlier.
+    """
+    name = part.name
+    if name == "Join":
+        for side in ("p1", "p2"):
+            if vars <= _certainVars(part[side]):
+                part[side] = _pushFilter(part[side], expr, vars)
+                return part
+    elif name in ("LeftJoin", "Minus"):
+        if vars <= _certainVars(part.p1):
+            part["p1"] = _pushFilter(part.p1, expr, vars)
+            return part
+    elif name == "Union":
+        if vars <= _certainVars(part.p1) and vars <= _certainVars(part.p2):
+            part["p1"] = _pushFilter(part.p1, expr, vars)
+            part["p2"] = _pushFilter(part.p2, expr, vars)
+            return part
+    elif name == "Filter" and not part.no_isolated_scope:
+        if vars <= _certainVars(part.p):
+            part["p"] = _pushFilter(part.p, expr, vars)
+            return part
+    elif name == "Extend":
+        if part.var not in vars and vars <= _certainVars(part.p):
+            part["p"] = _pushFilter(part.p, expr, vars)
+            return part
+    elif name == "Graph":
+        if part.term not in vars and vars <= _certainVars(part.p):
+            part["p"] = _pushFilter(part.p, expr, vars)
+            return part
+    elif name == "BGP":
+        equals = _equalsIRI(expr)
+        if equals is not None:
+            # ?x = <iri> is only true if ?x is that IRI, so join the
+            # single binding of ?x with the BGP, which matches the IRI in
+            # its place
+            var, iri = equals
+            return Join(ToMultiSet(Values([{var: iri}])), part)
+    return Filter(expr=expr, p=part)
+
+
+def optimizeFilters(part: Any) -> Any:
+    """
+    Optimize the filters of an algebra expression
+
+    Constant sub-expressions of filters and BINDs are replaced by their
+    values, and each conjunct of a filter is moved down to the lowest part
+    of the expression that binds all of its variables, so that it removes
+    solutions before they are joined with others. ``FILTER(?x = <iri>)``
+    on a BGP becomes a join with the single binding of ``?x``.
+
+    It is applied by :func:`translateQuery`, use ``optimize=False`` there
+    to see the expression without it in :func:`pprintAlgebra`.
+    """
+    if isinstance(part, list):
+        return [optimizeFilters(x) for x in part]
+    if not isinstance(part, CompValue) or isinstance(part, Expr):
+        return part
+    for k, val in part.items():
+        part[k] = optimizeFilters(val)
+
+    if part.name in ("Filter", "Extend"):
+        part["expr"] = traverse(part.expr, visitPost=_foldConstants)
+    if part.name != "Filter" or part.no_isolated_scope:
+        return part
+
+    rest = []
+    p = part.p
+    for expr in _conjuncts(part.expr):
+        if _isTrue(expr):
+            continue
+        vars = _filterVars(expr)
+        if vars and vars <= _certainVars(p):
+            p = _pushFilter(p, expr, vars)
+        else:
+            rest.append(expr)
+    if rest:
+        # type error: Argument 1 to "and_" has incompatible type "*List[Union[Expr, Literal, Variable]]"; expected "Expr"
+        return Filter(expr=and_(*rest), p=p)  # type: ignore[arg-type]
+    return p
+
+
 def translatePrologue(
     p: ParseResults,
     base: Optional[str],
@@ -909,7 +1172,9 @@ def translateUpdate(
 
         u = traverse(u, visitPost=translatePath)
 
-        res.append(translateUpdate1(u, prologue))
+        u = translateUpdate1(u, prologue)
+        _addDemand(u, None)
+        res.append(u)
 
     # type error: Argument 1 to "Update" has incompatible type "Optional[Any]"; expected "Prologue"
     return Update(prologue, res)  # type: ignore[arg-type]
@@ -919,11 +1184,15 @@ def translateQuery(
     q: ParseResults,
     base: Optional[str] = None,
     initNs: Optional[Mapping[str, Any]] = None,
+    optimize: bool = True,
 ) -> Query:
     """
     Translate a query-parsetree to a SPARQL Algebra Expression
 
     Return a rdflib.plugins.sparql.sparql.Query object
+
+    If optimize is true, the filters of the algebra expression are optimized
+    with :func:`optimizeFilters`.
     """
 
     # We get in: (prologue, query)
@@ -945,8 +1214,11 @@ def translateQuery(
         res = CompValue(q[1].name, p=P, datasetClause=datasetClause, PV=PV)
 
     res = traverse(res, visitPost=simplify)
+    if optimize:
+        res = optimizeFilters(res)
     _traverseAgg(res, visitor=analyse)
     _traverseAgg(res, _addVars)
+    _addDemand(res, None)
 
     return Query(prologue, res)
 
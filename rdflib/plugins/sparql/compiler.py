@@ -0,0 +1,201 @@
+"""
+Compiles SPARQL expressions into Python closures
+
+The expressions of ``FILTER``, ``BIND`` and ``ORDER BY`` are evaluated once
+per solution. Evaluating an :class:`~rdflib.plugins.sparql.parserutils.Expr`
+looks each argument up through the attributes of the expression node and
+:func:`~rdflib.plugins.sparql.parserutils.value`, and each variable through
+the mapping interface of the solution. A compiled expression resolves all of
+this once per query: variables become reads of their position in the tuple
+of values of a :class:`~rdflib.plugins.sparql.sparql.FrozenBindings` of the
+:class:`~rdflib.plugins.sparql.sparql.VariableSchema` of the query, and
+arguments become closures that are called as the evaluation function of the
+node reads them.
+
+The evaluation functions of :mod:`rdflib.plugins.sparql.operators` are still
+the ones that compute the results, and the arguments are computed lazily in
+the order the functions read them, so results and errors are the same as
+when the expression is evaluated directly. ``EXISTS``, ``NOT EXISTS`` and
+function calls, which may be custom functions that are given the expression
+itself, are evaluated directly.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, List, Optional, Set
+from weakref import WeakKeyDictionary
+
+from pyparsing import ParseResults
+
+from rdflib.plugins.sparql import operators
+from rdflib.plugins.sparql.parserutils import CompValue, Expr, value
+from rdflib.plugins.sparql.sparql import (
+    FrozenBindings,
+    NotBoundError,
+    SPARQLError,
+    VariableSchema,
+)
+from rdflib.term import BNode, Variable
+
+__all__ = ["CompiledExpr", "compileValue", "compiled"]
+
+_Closure = Callable[[Any], Any]
+
+_OPAQUE = {"Function", "Builtin_EXISTS", "Builtin_NOTEXISTS"}
+"""Expressions that are evaluated directly, and may see the whole solution"""
+
+
+class CompiledExpr:
+    """
+    An expression compiled for the solutions of a schema.
+
+    ``eval(solution)`` returns what ``expr.eval(solution)`` returns.
+    ``variables`` are the variables that the expression reads, or None if
+    it may read any binding of the solution.
+    """
+
+    __slots__ = ("schema", "eval", "variables")
+
+    def __init__(self, expr: Expr, schema: VariableSchema):
+        compiler = _Compiler(schema)
+        self.schema = schema
+        self.eval: _Closure = compiler.compile(expr)
+        self.variables: Optional[FrozenSet[Variable]] = (
+            None if compiler.opaque else frozenset(compiler.variables)
+        )
+
+
+def compiled(expr: Expr, schema: VariableSchema) -> CompiledExpr:
+    """
+    The expression compiled for the solutions of ``schema``. The
+    compilations are kept on the expression for as long as their schema is
+    in use, so an expression is compiled once per query execution, also when
+    threads evaluate the same expression for different executions.
+    """
+    compilations: "WeakKeyDictionary[VariableSchema, CompiledExpr]" = expr.__dict__.get(
+        "_compiled"
+    )
+    if compilations is None:
+        compilations = expr.__dict__.setdefault("_compiled", WeakKeyDictionary())
+    res = compilations.get(schema)
+    if res is None:
+        # threads that compile at the same time use the compilation kept first
+        res = compilations.setdefault(schema, CompiledExpr(expr, schema))
+    return res
+
+
+def compileValue(val: Any, schema: VariableSchema, variables: bool = False) -> _Closure:
+    """
+    A closure that returns ``value(solution, val, variables)`` for the
+    solutions of ``schema``.
+    """
+    return _Compiler(schema).compile(val, variables)
+
+
+class _Compiler:
+    def __init__(self, schema: VariableSchema):
+        self.schema = schema
+        self.variables: Set[Variable] = set()
+        self.opaque = False
+
+    def compile(self, val: Any, variables: bool = False) -> _Closure:
+        if isinstance(val, Expr):
+            return self.expr(val)
+        elif isinstance(val, CompValue):
+            self.opaque = True
+
+            def unknown(row: Any) -> Any:
+                return value(row, val, variables)
+
+            return unknown
+        elif isinstance(val, list):
+            items = [self.compile(x, variables) for x in val]
+
+            def items_(row: Any) -> List[Any]:
+                return [item(row) for item in items]
+
+            return items_
+        elif isinstance(val, (BNode, Variable)):
+            return self.variable(val, variables)
+        elif isinstance(val, ParseResults) and len(val) == 1:
+            return self.compile(val[0], variables)
+
+        def constant(row: Any) -> Any:
+            return val
+
+        return constant
+
+    def variable(self, var: Any, variables: bool) -> _Closure:
+        if isinstance(var, Variable):
+            self.variables.add(var)
+        schema = self.schema
+        position = schema.position(var)
+
+        def lookup(row: Any) -> Any:
+            if row.__class__ is FrozenBindings and row._schema is schema:
+                values = row._values
+                if position < len(values):
+                    r = values[position]
+                    if r is not None and not isinstance(r, SPARQLError):
+                        return r
+            r = row.get(var)
+            if isinstance(r, SPARQLError):
+                raise r
+            if r is not None:
+                return r
+            if variables:
+                return var
+            raise NotBoundError
+
+        return lookup
+
+    def expr(self, expr: Expr) -> _Closure:
+        evalfn = getattr(expr._evalfn, "__func__", None)
+        if (
+            expr.name in _OPAQUE
+            or evalfn is None
+            or evalfn.__module__ != operators.__name__
+        ):
+            self.opaque = True
+            return expr.eval
+
+        arguments = {key: self.compile(val) for key, val in expr.items()}
+        name = expr.name
+
+        def evaluate(row: Any) -> Any:
+            try:
+                return evalfn(_Arguments(expr, name, arguments, row), row)
+            except SPARQLError as e:
+                return e
+
+        return evaluate
+
+
+class _Arguments:
+    """
+    Stands in for an expression node in its evaluation function, computing
+    each argument with its closure when it is read
+    """
+
+    __slots__ = ("_node", "name", "_arguments", "_row")
+
+    def __init__(self, node: Expr, name: str, arguments: dict, row: Any):
+        self._node = node
+        self.name = name
+        self._arguments = arguments
+        self._row = row
+
+    def __getattr__(self, key: str) -> Any:
+        argument = self._arguments.get(key)
+        if argument is None:
+            return None
+        return argument(self._row)
+
+    def get(self, key: str, variables: bool = False, errors: bool = False) -> Any:
+        # like CompValue.get, which ignores errors
+        if not variables:
+            argument = self._arguments.get(key)
+            if argument is not None:
+                return argument(self._row)
+        return value(self._row, OrderedDict.get(self._node, key, key), variables)
@@ -17,19 +17,27 @@ also return a dict of list of dicts
 """
 
 import collections
+import functools
+import heapq
 import itertools
 import json as j
+import math
 import re
+import uuid
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    Container,
     Deque,
     Dict,
     Generator,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
+    Set,
     Tuple,
     Union,
 )
@@ -38,79 +46,235 @@ from urllib.request import Request, urlopen
 
 from pyparsing import ParseException
 
-from rdflib.graph import Graph
-from rdflib.plugins.sparql import CUSTOM_EVALS, parser
-from rdflib.plugins.sparql.aggregates import Aggregator
+import rdflib.plugins.sparql
+from rdflib.graph import ConjunctiveGraph, Graph
+from rdflib.paths import Path
+from rdflib.plugins.sparql import CUSTOM_EVALS, parallel, parser, spill
+from rdflib.plugins.sparql.aggregates import ColumnAggregator
+from rdflib.plugins.sparql.compiler import (
+    _OPAQUE,
+    CompiledExpr,
+    compiled,
+    compileValue,
+)
 from rdflib.plugins.sparql.evalutils import (
+    _candidates,
     _ebv,
     _eval,
     _fillTemplate,
+    _hash_join,
+    _hash_minus,
+    _hash_tables,
     _join,
     _minus,
-    _val,
+    _order_key,
+    _symmetric_hash_join,
 )
-from rdflib.plugins.sparql.parserutils import CompValue, value
+from rdflib.plugins.sparql.operators import _CUSTOM_FUNCTIONS, EBV
+from rdflib.plugins.sparql.parserutils import CompValue, Expr, value
 from rdflib.plugins.sparql.sparql import (
     AlreadyBound,
     FrozenBindings,
     FrozenDict,
+    Prologue,
     Query,
     QueryContext,
     SPARQLError,
+    VariableSchema,
 )
+from rdflib.store import VALID_STORE
 from rdflib.term import BNode, Identifier, Literal, URIRef, Variable
 
-if TYPE_CHECKING:
-    from rdflib.paths import Path
-
 _Triple = Tuple[Identifier, Identifier, Identifier]
 
 
+#: The number of partial solutions that :func:`evalBGP` extends at a time
+#: with the matches of each pattern. Partial solutions of the same batch that
+#: look up the same triples share a single call to the store.
+BGP_BATCH_SIZE = 1000
+
+_Row = Tuple[Identifier, ...]
+
+
 def evalBGP(
     ctx: QueryContext, bgp: List[_Triple]
 ) -> Generator[FrozenBindings, None, None]:
     """
     A basic graph pattern
+
+    The patterns are matched in the given order. Partial solutions are kept
+    as rows, tuples with one slot for each variable that is not bound in
+    ``ctx``, numbered in the order in which the patterns bind them, and each
+    pattern extends the rows of the patterns before it in batches of
+    :data:`BGP_BATCH_SIZE`. Only complete solutions become
+    :class:`~rdflib.plugins.sparql.sparql.FrozenBindings`.
     """
 
     if not bgp:
         yield ctx.solution()
         return
 
-    s, p, o = bgp[0]
-
-    _s = ctx[s]
-    _p = ctx[p]
-    _o = ctx[o]
+    slots: Dict[Identifier, int] = {}
+    rows: Iterable[_Row] = ((),)
+    for triple in bgp:
+        terms: List[Tuple[Any, Optional[int]]] = []
+        new: List[int] = []
+        checks: List[Tuple[int, int]] = []
+        first: Dict[Identifier, int] = {}
+        for position, term in enumerate(triple):
+            value = ctx[term]
+            if value is not None:
+                terms.append((value, None))
+            elif term in slots:
+                terms.append((None, slots[term]))
+            elif term in first:
+                # the same new variable twice in one pattern
+                terms.append((None, None))
+                checks.append((first[term], position))
+            else:
+                terms.append((None, None))
+                first[term] = position
+                new.append(position)
+        for term in first:
+            slots[term] = len(slots)
+        rows = _evalBGPPattern(ctx, terms, new, checks, rows)
+
+    base = list(ctx.solution().items())
+    variables = list(slots)
+    for row in rows:
+        yield FrozenBindings(ctx, itertools.chain(base, zip(variables, row)))
+
+
+def _evalBGPPattern(
+    ctx: QueryContext,
+    terms: List[Tuple[Any, Optional[int]]],
+    new: List[int],
+    checks: List[Tuple[int, int]],
+    rows: Iterable[_Row],
+) -> Generator[_Row, None, None]:
+    """
+    Extends ``rows`` with the matches of one pattern of :func:`evalBGP`.
 
+    ``terms`` has, for each position of the pattern, either its value or
+    the slot of the row that holds it, or neither if the pattern binds it.
+    The terms at the ``new`` positions are appended to the row, and the two
+    positions of each of the ``checks`` must match the same term.
+    """
     # type error: Item "None" of "Optional[Graph]" has no attribute "triples"
-    # type Argument 1 to "triples" of "Graph" has incompatible type "Tuple[Union[str, Path, None], Union[str, Path, None], Union[str, Path, None]]"; expected "Tuple[Optional[Node], Optional[Node], Optional[Node]]"
-    for ss, sp, so in ctx.graph.triples((_s, _p, _o)):  # type: ignore[union-attr, arg-type]
-        if None in (_s, _p, _o):
-            c = ctx.push()
-        else:
-            c = ctx
+    triples = ctx.graph.triples  # type: ignore[union-attr]
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, BGP_BATCH_SIZE))
+        if not batch:
+            return
+        matches: Dict[Tuple[Any, ...], List[Tuple[Identifier, ...]]] = {}
+        for row in batch:
+            pattern = tuple(
+                value if slot is None else row[slot] for value, slot in terms
+            )
+            if len(batch) == 1:
+                found: Iterable[Tuple[Identifier, ...]] = triples(pattern)
+            else:
+                found = matches.get(pattern)  # type: ignore[assignment]
+                if found is None:
+                    found = matches[pattern] = list(triples(pattern))
+            for match in found:
+                if checks and any(match[a] != match[b] for a, b in checks):
+                    continue
+                yield row + tuple(match[position] for position in new)
 
-        if _s is None:
-            # type error: Incompatible types in assignment (expression has type "Union[Node, Any]", target has type "Identifier")
-            c[s] = ss  # type: ignore[assignment]
 
-        try:
-            if _p is None:
-                # type error: Incompatible types in assignment (expression has type "Union[Node, Any]", target has type "Identifier")
-                c[p] = sp  # type: ignore[assignment]
-        except AlreadyBound:
-            continue
+def _triple_order(ctx: QueryContext, triple: _Triple) -> Tuple[int, float]:
+    """
+    Sort key for the patterns of a BGP: patterns with more bound nodes in the
+    current ctx come first, and among those the ones that the store knows to
+    match fewer triples. A pattern that matches nothing comes first of all, as
+    it ends the BGP straight away.
+    """
+    pattern = (ctx[triple[0]], ctx[triple[1]], ctx[triple[2]])
+    unbound = sum(1 for n in pattern if n is None)
+    # type error: Item "None" of "Optional[Graph]" has no attribute "cardinality"
+    # type error: Argument 1 to "cardinality" of "Graph" has incompatible type "Tuple[Union[str, Path, None], Union[str, Path, None], Union[str, Path, None]]"; expected "Union[Tuple[Optional[Node], Optional[Node], Optional[Node]], Tuple[Optional[Node], Path, Optional[Node]]]"
+    cardinality = ctx.graph.cardinality(pattern)  # type: ignore[union-attr, arg-type]
+    if cardinality is None:
+        return unbound, math.inf
+    if cardinality == 0:
+        return -1, 0
+    return unbound, cardinality
+
+
+def _plan_bgp(ctx: QueryContext, triples: List[_Triple]) -> List[_Triple]:
+    """
+    The order in which to match the patterns of a BGP, chosen greedily from
+    the store statistics: each step takes the pattern that is expected to
+    match the fewest triples for each solution of the patterns before it.
 
-        try:
-            if _o is None:
-                # type error: Incompatible types in assignment (expression has type "Union[Node, Any]", target has type "Identifier")
-                c[o] = so  # type: ignore[assignment]
-        except AlreadyBound:
-            continue
+    Patterns that the store has no statistics for come after the others. If
+    the store has no statistics for any of them, the patterns are sorted as
+    by :func:`_triple_order`.
+    """
+    patterns = [(ctx[t[0]], ctx[t[1]], ctx[t[2]]) for t in triples]
+    # type error: Item "None" of "Optional[Graph]" has no attribute "cardinality"
+    cardinalities = [ctx.graph.cardinality(p) for p in patterns]  # type: ignore[union-attr, arg-type]
+    if all(cardinality is None for cardinality in cardinalities):
+        return sorted(triples, key=lambda t: _triple_order(ctx, t))
+
+    remaining = list(range(len(triples)))
+    known: Set[Identifier] = set()
+    plan = []
+    while remaining:
+        best = min(
+            remaining,
+            key=lambda i: _pattern_cost(
+                ctx, triples[i], patterns[i], cardinalities[i], known
+            ),
+        )
+        remaining.remove(best)
+        plan.append(triples[best])
+        known.update(
+            term
+            for term, value in zip(triples[best], patterns[best])
+            if value is None and isinstance(term, (Variable, BNode))
+        )
+    return plan
 
-        for x in evalBGP(c, bgp[1:]):
-            yield x
+
+def _pattern_cost(
+    ctx: QueryContext,
+    triple: _Triple,
+    pattern: Tuple[Any, Any, Any],
+    cardinality: Optional[int],
+    known: Set[Identifier],
+) -> Tuple[float, int]:
+    """
+    Sort key for :func:`_plan_bgp`: the expected number of matches of the
+    pattern once the ``known`` variables are bound, and the number of its
+    terms that are still unbound.
+
+    The triples that match the pattern are assumed to be spread evenly over
+    the distinct terms at the position of a known variable. If the store
+    cannot count those, the square root of the matches is used.
+    """
+    joined = [
+        position
+        for position, (term, value) in enumerate(zip(triple, pattern))
+        if value is None and term in known
+    ]
+    unbound = sum(1 for value in pattern if value is None) - len(joined)
+    if cardinality is None:
+        return math.inf, unbound
+    estimate = float(cardinality)
+    for position in joined:
+        # type error: Item "None" of "Optional[Graph]" has no attribute "distinct_cardinality"
+        distinct = ctx.graph.distinct_cardinality(position, pattern)  # type: ignore[union-attr, arg-type]
+        if distinct:
+            estimate /= distinct
+        else:
+            estimate = math.sqrt(estimate)
+    if unbound == 0:
+        # a pattern with all terms bound matches one triple at most
+        estimate = min(estimate, 1.0)
+    return estimate, unbound
 
 
 def evalExtend(
@@ -118,9 +282,21 @@ def evalExtend(
 ) -> Generator[FrozenBindings, None, None]:
     # TODO: Deal with dict returned from evalPart from GROUP BY
 
+    expr = extend.expr
+    if isinstance(expr, Expr):
+        compiled_expr = compiled(expr, ctx.schema)
+        evaluate = compiled_expr.eval
+        isolated = not _sees(compiled_expr, extend._vars)
+    else:
+
+        def evaluate(row: FrozenBindings) -> Any:
+            return _eval(expr, row)
+
+        isolated = True
+
     for c in evalPart(ctx, extend.p):
         try:
-            e = _eval(extend.expr, c.forget(ctx, _except=extend._vars))
+            e = evaluate(c.forget(ctx, _except=extend._vars) if isolated else c)
             if isinstance(e, SPARQLError):
                 raise e
 
@@ -145,29 +321,245 @@ def evalLazyJoin(
             yield b.merge(a)  # merge, as some bindings may have been forgotten
 
 
+def evalValuesBGP(
+    ctx: QueryContext,
+    var: Variable,
+    counts: Dict[Identifier, int],
+    bgp: List[_Triple],
+) -> Generator[FrozenBindings, None, None]:
+    """
+    The join of a VALUES block that binds the single variable ``var`` with a
+    BGP. Instead of evaluating the BGP once for each value, the first
+    pattern of the BGP is matched against all values at once with
+    :meth:`~rdflib.graph.Graph.triples_choices`, ``counts`` holds the number
+    of times each value is in the VALUES block.
+    """
+    pattern, rest = bgp[0], bgp[1:]
+    terms: List[Any] = [ctx[n] for n in pattern]
+    terms[pattern.index(var)] = list(counts)
+    if len(rest) > 1:
+        rest = sorted(rest, key=lambda t: (var not in t, _triple_order(ctx, t)))
+
+    # type error: Item "None" of "Optional[Graph]" has no attribute "triples_choices"
+    for triple in ctx.graph.triples_choices(tuple(terms)):  # type: ignore[union-attr, arg-type]
+        c = ctx.push()
+        try:
+            for n, term in zip(pattern, triple):
+                if ctx[n] is None:
+                    c[n] = term
+        except AlreadyBound:
+            continue
+
+        # type error: Invalid index type "Optional[Any]" for "Dict[Identifier, int]"; expected type "Identifier"
+        count = counts[c[var]]  # type: ignore[index]
+        for x in evalBGP(c, rest):
+            for _ in range(count):
+                yield x
+
+
+def _values_bgp(
+    ctx: QueryContext, join: CompValue
+) -> Optional[Tuple[Variable, Dict[Identifier, int], List[_Triple]]]:
+    """
+    The variable, the values and the BGP of a join that
+    :func:`evalValuesBGP` can evaluate, with the pattern to match the values
+    against first, or None if it cannot.
+    """
+    values, bgp = join.p1, join.p2
+    if values.name != "ToMultiSet":
+        values, bgp = bgp, values
+    if values.name != "ToMultiSet" or values.p.name != "values" or bgp.name != "BGP":
+        return None
+
+    rows = values.p.res
+    if not rows or len(rows[0]) != 1:
+        return None
+    var = next(iter(rows[0]))
+    if ctx[var] is not None:
+        return None
+    counts: Dict[Identifier, int] = {}
+    for row in rows:
+        value = row.get(var)
+        if len(row) != 1 or value is None or value == "UNDEF":
+            return None
+        counts[value] = counts.get(value, 0) + 1
+
+    # the pattern with the most other bound terms that has the variable once
+    best: Optional[Tuple[int, _Triple]] = None
+    for triple in bgp.triples:
+        if sum(1 for n in triple if n == var) != 1 or isinstance(triple[1], Path):
+            continue
+        bound = sum(1 for n in triple if n != var and ctx[n] is not None)
+        if best is None or bound > best[0]:
+            best = bound, triple
+    if best is None:
+        return None
+    triples = list(bgp.triples)
+    triples.remove(best[1])
+    return var, counts, [best[1]] + triples
+
+
 def evalJoin(ctx: QueryContext, join: CompValue) -> Generator[FrozenDict, None, None]:
     # TODO: Deal with dict returned from evalPart from GROUP BY
     # only ever for join.p1
 
     if join.lazy:
+        values_bgp = _values_bgp(ctx, join)
+        if values_bgp is not None:
+            return evalValuesBGP(ctx, *values_bgp)
+        if join._demand is None:
+            limit = _lazy_join_limit(ctx, join)
+            if limit is not None:
+                return evalAdaptiveJoin(ctx, join, limit)
         return evalLazyJoin(ctx, join)
+    elif join._demand is not None:
+        # few solutions are needed, join them as both parts produce them
+        return _symmetric_hash_join(
+            evalPart(ctx, join.p1), evalPart(ctx, join.p2), _join_variables(join)
+        )
     else:
-        a = evalPart(ctx, join.p1)
+        a = _nonempty(evalPart(ctx, join.p1))
+        if a is None:
+            return _no_solutions()
         b = set(evalPart(ctx, join.p2))
-        return _join(a, b)
+        variables = _join_variables(join)
+        if not variables:
+            return _join(a, b)
+        return _hash_join(a, b, variables)
+
+
+def _nonempty(
+    solutions: Iterable[FrozenBindings],
+) -> Optional[Iterator[FrozenBindings]]:
+    """
+    The solutions, or None if there are none, found by evaluating the first
+    one, so that what they are joined with need not be evaluated
+    """
+    solutions = iter(solutions)
+    first = next(solutions, None)
+    if first is None:
+        return None
+    return itertools.chain([first], solutions)
+
+
+def _no_solutions() -> Generator[FrozenBindings, None, None]:
+    yield from ()
+
+
+def evalAdaptiveJoin(
+    ctx: QueryContext, join: CompValue, limit: int
+) -> Generator[FrozenBindings, None, None]:
+    """
+    A lazy join for up to ``limit`` solutions of the first part. If the
+    first part has more solutions than that, the second part is evaluated
+    once and joined with them in a hash join instead.
+    """
+    a = iter(evalPart(ctx, join.p1))
+    head = list(itertools.islice(a, limit + 1))
+    if len(head) <= limit:
+        for x in head:
+            c = ctx.thaw(x)
+            for y in evalPart(c, join.p2):
+                yield y.merge(x)
+        return
+    b = list(evalPart(ctx, join.p2))
+    yield from _hash_join(itertools.chain(head, a), b, _join_variables(join))
+
+
+def _join_variables(join: CompValue) -> List[Variable]:
+    """the variables that both parts of the join can bind"""
+    if join.p1._vars is None or join.p2._vars is None:
+        return []
+    return sorted(join.p1._vars & join.p2._vars)
+
+
+def _lazy_join_limit(ctx: QueryContext, join: CompValue) -> Optional[int]:
+    """
+    The number of solutions of the first part of a lazy join above which a
+    hash join is expected to be cheaper. A lazy join evaluates the second
+    part once for each of them, a hash join evaluates it once, so the limit
+    is the number of triples that the most selective pattern of the second
+    part matches. None if the second part is not a BGP or the store cannot
+    tell, then the join stays lazy.
+    """
+    if join.p2.name != "BGP":
+        # other patterns can depend on the bindings that are pushed into them
+        return None
+    limit: Optional[int] = None
+    for triple in join.p2.triples:
+        pattern = (ctx[triple[0]], ctx[triple[1]], ctx[triple[2]])
+        # type error: Item "None" of "Optional[Graph]" has no attribute "cardinality"
+        cardinality = ctx.graph.cardinality(pattern)  # type: ignore[union-attr, arg-type]
+        if cardinality is not None and (limit is None or cardinality < limit):
+            limit = cardinality
+    return limit
+
+
+def evalUnion(
+    ctx: QueryContext, union: CompValue
+) -> Generator[FrozenBindings, None, None]:
+    threads = rdflib.plugins.sparql.SPARQL_THREADS
+    if (
+        threads > 0
+        and not CUSTOM_EVALS
+        and not parallel.in_worker()
+        and _independent_branches(union)
+    ):
+        yield from parallel.chain(
+            [lambda: evalPart(ctx, union.p1), lambda: evalPart(ctx, union.p2)],
+            threads,
+        )
+        return
+    yield from evalPart(ctx, union.p1)
+    yield from evalPart(ctx, union.p2)
 
 
-def evalUnion(ctx: QueryContext, union: CompValue) -> Iterable[FrozenBindings]:
-    branch1_branch2 = []
-    for x in evalPart(ctx, union.p1):
-        branch1_branch2.append(x)
-    for x in evalPart(ctx, union.p2):
-        branch1_branch2.append(x)
-    return branch1_branch2
+def _independent_branches(union: CompValue) -> bool:
+    """whether the branches of the union are independent, see _independent"""
+    independent = union.__dict__.get("_independent")
+    if independent is None:
+        independent = union._independent = _independent(union.p1, union.p2)
+    return independent
+
+
+def _independent(*parts: CompValue) -> bool:
+    """
+    Whether parts can be evaluated concurrently: they do not share nodes,
+    except expressions that are only evaluated compiled, which leaves the
+    nodes unchanged, and they do not use BNODE, which shares the blank
+    nodes of its labels through the query context.
+    """
+    seen: Set[int] = set()
+    for part in parts:
+        nodes = list(_nodes(part))
+        for node in nodes:
+            if node.name == "Builtin_BNODE":
+                return False
+            if id(node) in seen and (
+                not isinstance(node, Expr) or node.name in _OPAQUE
+            ):
+                return False
+        seen.update(id(node) for node in nodes)
+    return True
+
+
+def _nodes(part: Any) -> Generator[CompValue, None, None]:
+    if isinstance(part, CompValue):
+        yield part
+        for value in part.values():
+            yield from _nodes(value)
+    elif isinstance(part, (list, tuple)):
+        for value in part:
+            yield from _nodes(value)
 
 
 def evalMinus(ctx: QueryContext, minus: CompValue) -> Generator[FrozenDict, None, None]:
-    a = evalPart(ctx, minus.p1)
+    a = _nonempty(evalPart(ctx, minus.p1))
+    if a is None:
+        return _no_solutions()
+    variables = _join_variables(minus)
+    if variables:
+        return _hash_minus(a, evalPart(ctx, minus.p2), variables)
     b = set(evalPart(ctx, minus.p2))
     return _minus(a, b)
 
@@ -175,10 +567,30 @@ def evalMinus(ctx: QueryContext, minus: CompValue) -> Generator[FrozenDict, None
 def evalLeftJoin(
     ctx: QueryContext, join: CompValue
 ) -> Generator[FrozenBindings, None, None]:
-    # import pdb; pdb.set_trace()
-    for a in evalPart(ctx, join.p1):
+    a = iter(evalPart(ctx, join.p1))
+    if join.p2.name == "BGP" and join._demand is None and _binds_nothing(ctx):
+        # the optional part only depends on the bindings of each solution of
+        # the first part, so it can be evaluated once and joined with them
+        limit = _lazy_join_limit(ctx, join)
+        head: List[FrozenBindings] = []
+        if limit is not None:
+            head = list(itertools.islice(a, limit + 1))
+            a = itertools.chain(head, a)
+        if limit is None or len(head) > limit:
+            return evalHashLeftJoin(ctx, join, a)
+    return evalLazyLeftJoin(ctx, join, a)
+
+
+def evalLazyLeftJoin(
+    ctx: QueryContext, join: CompValue, a: Iterable[FrozenBindings]
+) -> Generator[FrozenBindings, None, None]:
+    """
+    A left join that evaluates the optional part once for each solution of
+    the first part, with its bindings.
+    """
+    for x in a:
         ok = False
-        c = ctx.thaw(a)
+        c = ctx.thaw(x)
         for b in evalPart(c, join.p2):
             if _ebv(join.expr, b.forget(ctx)):
                 ok = True
@@ -192,23 +604,91 @@ def evalLeftJoin(
             p1_vars = join.p1._vars
             if p1_vars is None or not any(
                 _ebv(join.expr, b)
-                for b in evalPart(ctx.thaw(a.remember(p1_vars)), join.p2)
+                for b in evalPart(ctx.thaw(x.remember(p1_vars)), join.p2)
             ):
-                yield a
+                yield x
+
+
+def evalHashLeftJoin(
+    ctx: QueryContext, join: CompValue, a: Iterable[FrozenBindings]
+) -> Generator[FrozenBindings, None, None]:
+    """
+    A left join that evaluates the optional part once, and looks up the
+    solutions that match each solution of the first part by the values of
+    the variables that both parts can bind. This gives the same solutions
+    as :func:`evalLazyLeftJoin` if the context binds nothing but the
+    initial bindings, and the optional part is a BGP.
+    """
+    tables = _hash_tables(evalPart(ctx, join.p2), _join_variables(join))
+    test = _ebv_function(ctx, join.expr)
+    for x in a:
+        ok = False
+        for y in _candidates(x, tables):
+            if x.compatible(y):
+                b = x.merge(y)
+                if test(b):
+                    ok = True
+                    yield b
+        if not ok:
+            yield x
+
+
+def _binds_nothing(ctx: QueryContext) -> bool:
+    """whether the context binds no variables but the initial bindings"""
+    init = ctx.initBindings or {}
+    return all(key in init for key in ctx.bindings)
+
+
+def _ebv_function(
+    ctx: QueryContext, expr: Union[Literal, Variable, Expr]
+) -> Callable[[FrozenBindings], bool]:
+    """
+    A function that returns the effective boolean value of ``expr`` for a
+    solution, with the expression compiled for the schema of ``ctx``. An
+    error is false.
+    """
+    if not isinstance(expr, Expr):
+        return lambda row: _ebv(expr, row)
+    evaluate = compiled(expr, ctx.schema).eval
+
+    def test(row: FrozenBindings) -> bool:
+        try:
+            return EBV(evaluate(row))
+        except SPARQLError:
+            return False  # filter error == False
+
+    return test
 
 
 def evalFilter(
     ctx: QueryContext, part: CompValue
 ) -> Generator[FrozenBindings, None, None]:
     # TODO: Deal with dict returned from evalPart!
+    expr = part.expr
+    test = _ebv_function(ctx, expr)
+    isolated = not part.no_isolated_scope and not (
+        isinstance(expr, Expr) and _sees(compiled(expr, ctx.schema), part._vars)
+    )
     for c in evalPart(ctx, part.p):
-        if _ebv(
-            part.expr,
-            c.forget(ctx, _except=part._vars) if not part.no_isolated_scope else c,
-        ):
+        if test(c.forget(ctx, _except=part._vars) if isolated else c):
             yield c
 
 
+def _sees(
+    compiled_expr: CompiledExpr, variables: Optional[Container[Variable]]
+) -> bool:
+    """
+    Whether an expression only reads ``variables``, so that evaluating it
+    on a solution gives the same result as on the solution with the other
+    bindings forgotten
+    """
+    return (
+        compiled_expr.variables is not None
+        and variables is not None
+        and all(var in variables for var in compiled_expr.variables)
+    )
+
+
 def evalGraph(
     ctx: QueryContext, part: CompValue
 ) -> Generator[FrozenBindings, None, None]:
@@ -218,21 +698,31 @@ def evalGraph(
             + "graphs. Try a query without GRAPH."
         )
 
+    # the solutions are given this context, as the patterns that use them
+    # next are outside of the graph
     ctx = ctx.clone()
     graph: Union[str, Path, None, Graph] = ctx[part.term]
-    prev_graph = ctx.graph
     if graph is None:
-        for graph in ctx.dataset.contexts():
-            # in SPARQL the default graph is NOT a named graph
-            if graph == ctx.dataset.default_context:
-                continue
-
-            c = ctx.pushGraph(graph)
-            c = c.push()
-            graphSolution = [{part.term: graph.identifier}]
-            for x in _join(evalPart(c, part.p), graphSolution):
-                x.ctx.graph = prev_graph
-                yield x
+        # in SPARQL the default graph is NOT a named graph
+        graphs = (g for g in ctx.dataset.contexts() if g != ctx.dataset.default_context)
+        if not CUSTOM_EVALS and not parallel.in_worker():
+            processes = rdflib.plugins.sparql.SPARQL_PROCESSES
+            threads = rdflib.plugins.sparql.SPARQL_THREADS
+            if processes > 0 and _portable(part.p):
+                configuration = ctx.dataset.store.worker_configuration()
+                if configuration is not None:
+                    yield from _evalGraphsInProcesses(
+                        ctx, part, graphs, configuration, processes
+                    )
+                    return
+            if threads > 0 and _reentrant_graph(part):
+                yield from parallel.chain(
+                    (functools.partial(_evalNamedGraph, ctx, part, g) for g in graphs),
+                    threads,
+                )
+                return
+        for graph in graphs:
+            yield from _evalNamedGraph(ctx, part, graph)
 
     else:
         if TYPE_CHECKING:
@@ -240,8 +730,146 @@ def evalGraph(
         # type error: Argument 1 to "get_context" of "ConjunctiveGraph" has incompatible type "Union[str, Path]"; expected "Union[Node, str, None]"
         c = ctx.pushGraph(ctx.dataset.get_context(graph))  # type: ignore[arg-type]
         for x in evalPart(c, part.p):
-            x.ctx.graph = prev_graph
-            yield x
+            yield x._rebind(ctx)
+
+
+def _evalNamedGraph(
+    ctx: QueryContext, part: CompValue, graph: Graph
+) -> Generator[FrozenBindings, None, None]:
+    c = ctx.pushGraph(graph)
+    c = c.push()
+    graphSolution = [{part.term: graph.identifier}]
+    for x in _join(evalPart(c, part.p), graphSolution):
+        yield x._rebind(ctx)
+
+
+def _reentrant_graph(part: CompValue) -> bool:
+    """whether the pattern of GRAPH can be evaluated for several graphs at
+    once, see _reentrant"""
+    reentrant = part.__dict__.get("_reentrant")
+    if reentrant is None:
+        reentrant = part._reentrant = _reentrant(part.p)
+    return reentrant
+
+
+def _reentrant(part: CompValue) -> bool:
+    """
+    Whether part can be evaluated concurrently with itself: as for
+    _independent, evaluation only changes the expressions that are not
+    evaluated compiled, and BNODE shares blank nodes through the query
+    context.
+    """
+    return not any(
+        node.name == "Builtin_BNODE"
+        or (isinstance(node, Expr) and node.name in _OPAQUE)
+        for node in _nodes(part)
+    )
+
+
+def _portable(part: CompValue) -> bool:
+    """
+    Whether part can be evaluated in another process: it does not use BNODE,
+    and it only calls the functions of rdflib, as functions registered by
+    the application may not be registered there.
+    """
+    for node in _nodes(part):
+        if node.name == "Builtin_BNODE":
+            return False
+        if node.name == "Function":
+            function = _CUSTOM_FUNCTIONS.get(node.iri)
+            module = getattr(function and function[0], "__module__", None) or ""
+            if not module.startswith("rdflib."):
+                return False
+    return True
+
+
+def _evalGraphsInProcesses(
+    ctx: QueryContext,
+    part: CompValue,
+    graphs: Iterable[Graph],
+    configuration: str,
+    processes: int,
+) -> Generator[FrozenBindings, None, None]:
+    """
+    The solutions of GRAPH for each of graphs, evaluated on a pool of
+    processes that open the store of the dataset with configuration.
+    """
+    identifiers = [graph.identifier for graph in graphs]
+    if not identifiers:
+        return
+    prologue = ctx.prologue
+    query = (
+        uuid.uuid4().hex,
+        type(ctx.dataset.store),
+        configuration,
+        ctx.dataset.default_context.identifier,
+        ctx.dataset.default_union,
+        part,
+        dict(ctx.solution()),
+        ctx.initBindings,
+        ctx.now,
+        prologue and prologue.base,
+        list(prologue.namespace_manager.namespaces()) if prologue else [],
+    )
+    size = -(-len(identifiers) // (4 * processes))
+    tasks = (
+        (query, identifiers[start : start + size])
+        for start in range(0, len(identifiers), size)
+    )
+    for solutions in parallel.map(_evalNamedGraphsInWorker, tasks, processes):
+        for solution in solutions:
+            yield FrozenBindings(ctx, solution)
+
+
+# the dataset that a process of the pool has opened, for the evaluation
+# that it was opened for, so that later changes to the store are seen
+_worker_dataset: Optional[Tuple[str, ConjunctiveGraph]] = None
+
+
+def _evalNamedGraphsInWorker(
+    task: Tuple[Tuple[Any, ...], List[Identifier]]
+) -> List[Dict[Variable, Identifier]]:
+    """The solutions of GRAPH for a share of the graphs, in a process of the
+    pool, see _evalGraphsInProcesses"""
+    global _worker_dataset
+    query, identifiers = task
+    (
+        evaluation,
+        store_type,
+        configuration,
+        default_graph,
+        default_union,
+        part,
+        bindings,
+        initBindings,
+        now,
+        base,
+        namespaces,
+    ) = query
+    if _worker_dataset is None or _worker_dataset[0] != evaluation:
+        if _worker_dataset is not None:
+            _worker_dataset[1].close()
+            _worker_dataset = None
+        store = store_type()
+        if store.open(configuration, create=False) != VALID_STORE:
+            raise Exception("Could not open the store at %s" % configuration)
+        dataset = ConjunctiveGraph(store, identifier=default_graph)
+        dataset.default_union = default_union
+        _worker_dataset = (evaluation, dataset)
+    dataset = _worker_dataset[1]
+
+    ctx = QueryContext(dataset, bindings, initBindings=initBindings)
+    ctx.prologue = Prologue()
+    ctx.prologue.base = base
+    for prefix, namespace in namespaces:
+        ctx.prologue.bind(prefix, namespace)
+    ctx._now = now
+
+    solutions: List[Dict[Variable, Identifier]] = []
+    for identifier in identifiers:
+        graph = dataset.get_context(identifier)
+        solutions.extend(dict(x) for x in _evalNamedGraph(ctx, part, graph))
+    return solutions
 
 
 def evalValues(
@@ -277,9 +905,9 @@ def evalPart(ctx: QueryContext, part: CompValue) -> Any:
     if part.name == "BGP":
         # Reorder triples patterns by number of bound nodes in the current ctx
         # Do patterns with more bound nodes first
-        triples = sorted(
-            part.triples, key=lambda t: len([n for n in t if ctx[n] is None])
-        )
+        triples = part.triples
+        if len(triples) > 1:
+            triples = _plan_bgp(ctx, triples)
 
         return evalBGP(ctx, triples)
     elif part.name == "Filter":
@@ -451,58 +1079,156 @@ def evalGroup(ctx: QueryContext, group: CompValue):
 def evalAggregateJoin(
     ctx: QueryContext, agg: CompValue
 ) -> Generator[FrozenBindings, None, None]:
+    counts = _count_bgp(ctx, agg)
+    if counts is not None:
+        yield counts
+        return
+
     # import pdb ; pdb.set_trace()
     p = evalPart(ctx, agg.p)
     # p is always a Group, we always get a dict back
 
     group_expr = agg.p.expr
-    res: Dict[Any, Any] = collections.defaultdict(
-        lambda: Aggregator(aggregations=agg.A)
-    )
+    budget = rdflib.plugins.sparql.SPARQL_MEMORY_BUDGET
+    if group_expr is not None and budget is not None:
+        found = False
+        for solution in spill.aggregate(
+            ctx, p, _group_key(group_expr, ctx.schema), agg.A, budget
+        ):
+            found = True
+            yield solution
+        if not found:
+            yield FrozenBindings(ctx)
+        return
+
+    aggregator = ColumnAggregator(agg.A, ctx.schema)
 
     if group_expr is None:
         # no grouping, just COUNT in SELECT clause
-        # get 1 aggregator for counting
-        aggregator = res[True]
+        # get 1 group for counting
+        group = aggregator.add_group()
         for row in p:
-            aggregator.update(row)
+            aggregator.update(group, row)
     else:
+        key = _group_key(group_expr, ctx.schema)
+        groups: Dict[Any, int] = {}
         for row in p:
-            # determine right group aggregator for row
-            k = tuple(_eval(e, row, False) for e in group_expr)
-            res[k].update(row)
+            # determine right group for row
+            k = key(row)
+            number = groups.get(k)
+            if number is None:
+                number = groups[k] = aggregator.add_group()
+            aggregator.update(number, row)
 
     # all rows are done; yield aggregated values
-    for aggregator in res.values():
-        yield FrozenBindings(ctx, aggregator.get_bindings())
+    for group in range(aggregator.groups):
+        yield FrozenBindings(ctx, aggregator.get_bindings(group))
 
     # there were no matches
-    if len(res) == 0:
+    if aggregator.groups == 0:
         yield FrozenBindings(ctx)
 
 
+def _group_key(
+    group_expr: List[Any], schema: VariableSchema
+) -> Callable[[FrozenBindings], Tuple[Any, ...]]:
+    """
+    A function that returns the key of the group of a solution, the values
+    of the GROUP BY expressions, compiled for the solutions of ``schema``.
+    An unbound variable is a value of its own.
+    """
+    values = [
+        compileValue(e, schema, variables=True)
+        if isinstance(e, (Variable, Expr))
+        else functools.partial(_group_value, e)
+        for e in group_expr
+    ]
+    if len(values) == 1:
+        value = values[0]
+        return lambda row: (value(row),)
+    return lambda row: tuple(value(row) for value in values)
+
+
+def _group_value(expr: Any, row: FrozenBindings) -> Any:
+    return _eval(expr, row, False)
+
+
+def _count_bgp(ctx: QueryContext, agg: CompValue) -> Optional[FrozenBindings]:
+    """
+    The result of an aggregate join that only counts the solutions of a
+    single triple pattern, ``SELECT (COUNT(*) AS ?c) { ?s ?p ?o }``, from the
+    number of triples matching the pattern, so the store can count them
+    without building them. None if the aggregate join is not of this form.
+    """
+    group = agg.p
+    if group.expr is not None or group.p.name != "BGP" or len(group.p.triples) != 1:
+        return None
+    for aggregation in agg.A:
+        if (
+            aggregation.name != "Aggregate_Count"
+            or aggregation.vars != "*"
+            or aggregation.distinct
+        ):
+            return None
+    pattern = tuple(ctx[term] for term in group.p.triples[0])
+    if isinstance(pattern[1], Path):
+        return None
+    unbound = [
+        term for term, bound in zip(group.p.triples[0], pattern) if bound is None
+    ]
+    if len(set(unbound)) != len(unbound):
+        # a variable used twice only matches some of the triples
+        return None
+    # type error: Item "None" of "Optional[Graph]" has no attribute "count"
+    count = Literal(ctx.graph.count(pattern))  # type: ignore[union-attr, arg-type]
+    return FrozenBindings(ctx, {aggregation.res: count for aggregation in agg.A})
+
+
 def evalOrderBy(
     ctx: QueryContext, part: CompValue
 ) -> Generator[FrozenBindings, None, None]:
     res = evalPart(ctx, part.p)
+    if part._demand is not None:
+        # any solutions will do, see rdflib.plugins.sparql.algebra._addDemand
+        return res
 
-    for e in reversed(part.expr):
-        reverse = bool(e.order and e.order == "DESC")
-        res = sorted(
-            res, key=lambda x: _val(value(x, e.expr, variables=True)), reverse=reverse
-        )
+    budget = rdflib.plugins.sparql.SPARQL_MEMORY_BUDGET
+    if budget is not None:
+        return spill.sort(ctx, res, _order_key(part.expr, ctx.schema), budget)
 
-    return res
+    return sorted(res, key=_order_key(part.expr, ctx.schema))
+
+
+def evalTopK(ctx: QueryContext, part: CompValue, k: int) -> List[FrozenBindings]:
+    """
+    Returns the first ``k`` solutions of an OrderBy in order. The input is
+    scanned once and only the best ``k`` solutions are kept in a heap, ties
+    keep their input order as with a full sort.
+    """
+    return heapq.nsmallest(
+        k, evalPart(ctx, part.p), key=_order_key(part.expr, ctx.schema)
+    )
 
 
 def evalSlice(ctx: QueryContext, slice: CompValue):
-    res = evalPart(ctx, slice.p)
+    end = slice.start + slice.length if slice.length is not None else None
+    part = slice.p
 
-    return itertools.islice(
-        res,
-        slice.start,
-        slice.start + slice.length if slice.length is not None else None,
-    )
+    # LIMIT over ORDER BY, possibly with the projection in between, needs
+    # only the first offset + limit solutions of the ordering. Custom
+    # evaluation functions may handle OrderBy or Project themselves, so they
+    # still see the full parts.
+    if end is not None and not CUSTOM_EVALS and slice._demand is None:
+        if part.name == "OrderBy":
+            return iter(evalTopK(ctx, part, end)[slice.start :])
+        if part.name == "Project" and part.p.name == "OrderBy":
+            variables = set(part.PV)
+            res = evalTopK(ctx, part.p, end)[slice.start :]
+            return (row.project(variables) for row in res)
+
+    res = evalPart(ctx, part)
+
+    return itertools.islice(res, slice.start, end)
 
 
 def evalReduced(
@@ -550,6 +1276,11 @@ def evalDistinct(
 ) -> Generator[FrozenBindings, None, None]:
     res = evalPart(ctx, part.p)
 
+    budget = rdflib.plugins.sparql.SPARQL_MEMORY_BUDGET
+    if budget is not None:
+        yield from spill.distinct(ctx, res, budget)
+        return
+
     done = set()
     for x in res:
         if x not in done:
@@ -559,7 +1290,8 @@ def evalDistinct(
 
 def evalProject(ctx: QueryContext, project: CompValue):
     res = evalPart(ctx, project.p)
-    return (row.project(project.PV) for row in res)
+    variables = set(project.PV)
+    return (row.project(variables) for row in res)
 
 
 def evalSelectQuery(
@@ -647,10 +1379,12 @@ def evalQuery(
 ) -> Mapping[Any, Any]:
     initBindings = dict((Variable(k), v) for k, v in initBindings.items())
 
-    ctx = QueryContext(graph, initBindings=initBindings)
+    main = query.algebra
+    # the projected variables come first in each solution
+    schema = VariableSchema(main.get("PV") or ())
+    ctx = QueryContext(graph, initBindings=initBindings, schema=schema)
 
     ctx.prologue = query.prologue
-    main = query.algebra
 
     if main.datasetClause:
         if ctx.dataset is None:
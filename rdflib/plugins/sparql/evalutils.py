@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import collections
+import itertools
 from typing import (
     Any,
     DefaultDict,
+    Dict,
     Generator,
     Iterable,
+    Iterator,
+    List,
     Mapping,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -14,6 +19,7 @@ from typing import (
     overload,
 )
 
+from rdflib.plugins.sparql.compiler import compileValue
 from rdflib.plugins.sparql.operators import EBV
 from rdflib.plugins.sparql.parserutils import CompValue, Expr
 from rdflib.plugins.sparql.sparql import (
@@ -22,6 +28,7 @@ from rdflib.plugins.sparql.sparql import (
     NotBoundError,
     QueryContext,
     SPARQLError,
+    VariableSchema,
 )
 from rdflib.term import BNode, Identifier, Literal, URIRef, Variable
 
@@ -72,6 +79,118 @@ def _join(
                 yield x.merge(y)
 
 
+_HashTables = Dict[Tuple[Variable, ...], Dict[Tuple[Any, ...], List[Any]]]
+
+
+def _hash_tables(
+    solutions: Iterable[Mapping[Identifier, Identifier]], variables: Sequence[Variable]
+) -> _HashTables:
+    """
+    The solutions hashed by the values of the ``variables`` that they bind,
+    in one table for each set of bound variables, so a variable that is not
+    bound in every solution can still be looked up.
+    """
+    tables: _HashTables = {}
+    for y in solutions:
+        _hash_add(tables, y, variables)
+    return tables
+
+
+def _hash_add(
+    tables: _HashTables,
+    y: Mapping[Identifier, Identifier],
+    variables: Sequence[Variable],
+) -> None:
+    """adds solution y to hash tables, see _hash_tables"""
+    bound = tuple(v for v in variables if y.get(v) is not None)
+    key = tuple(y[v] for v in bound)
+    tables.setdefault(bound, {}).setdefault(key, []).append(y)
+
+
+def _candidates(
+    x: Mapping[Identifier, Identifier], tables: _HashTables
+) -> Iterator[Any]:
+    """
+    The solutions of ``tables`` that can be compatible with x: those with
+    the same values for the variables that both bind. If x leaves one of
+    the variables of a table unbound, all solutions of that table are
+    candidates.
+    """
+    for bound, table in tables.items():
+        try:
+            key = tuple(x[v] for v in bound)
+        except KeyError:
+            yield from itertools.chain.from_iterable(table.values())
+        else:
+            yield from table.get(key, ())
+
+
+def _hash_join(
+    a: Iterable[_FrozenDictT],
+    b: Iterable[Mapping[Identifier, Identifier]],
+    variables: Sequence[Variable],
+) -> Generator[_FrozenDictT, None, None]:
+    """
+    The join of a and b, found by looking up the solutions of b that have
+    the same values for the shared ``variables`` as each solution of a,
+    instead of comparing each pair of solutions.
+    """
+    tables = _hash_tables(b, variables)
+    for x in a:
+        for y in _candidates(x, tables):
+            if x.compatible(y):
+                yield x.merge(y)
+
+
+def _symmetric_hash_join(
+    a: Iterable[_FrozenDictT],
+    b: Iterable[_FrozenDictT],
+    variables: Sequence[Variable],
+) -> Generator[_FrozenDictT, None, None]:
+    """
+    Like :func:`_hash_join`, but reads a and b one solution at a time in
+    turn, hashing the solutions of both. Each solution is joined with the
+    solutions of the other side that were read before it, so the first
+    solutions of the join come without reading either side in full.
+    """
+    sides = [iter(a), iter(b)]
+    tables: List[_HashTables] = [{}, {}]
+    done = [False, False]
+    side = 0
+    while not (done[0] and done[1]):
+        if not done[side]:
+            y = next(sides[side], None)
+            if y is None:
+                done[side] = True
+                if not tables[side]:
+                    # nothing for the rest of the other side to join with
+                    return
+            else:
+                for x in _candidates(y, tables[1 - side]):
+                    if x.compatible(y):
+                        yield x.merge(y) if side else y.merge(x)
+                if not done[1 - side]:
+                    _hash_add(tables[side], y, variables)
+        side = 1 - side
+
+
+def _hash_minus(
+    a: Iterable[_FrozenDictT],
+    b: Iterable[Mapping[Identifier, Identifier]],
+    variables: Sequence[Variable],
+) -> Generator[_FrozenDictT, None, None]:
+    """
+    Like :func:`_minus`, but each solution of a is only compared with the
+    solutions of b that have the same values for the shared ``variables``.
+    """
+    tables = _hash_tables(b, variables)
+    for x in a:
+        if all(
+            not x.compatible(y) or x.disjointDomain(y) for y in _candidates(x, tables)
+        ):
+            yield x
+
+
 def _ebv(expr: Union[Literal, Variable, Expr], ctx: FrozenDict) -> bool:
     """
     Return true/false for the given expr
@@ -190,3 +309,50 @@ def _val(v: _ValueT) -> Tuple[int, _ValueT]:
         return (2, v)
     elif isinstance(v, Literal):
         return (3, v)
+
+
+class _SortKey:
+    """
+    Composite ORDER BY key of one solution. Keys compare component by
+    component, and descending components compare the other way round.
+    """
+
+    __slots__ = ("values", "descending")
+
+    def __init__(self, values: List[Any], descending: Sequence[bool]):
+        self.values = values
+        self.descending = descending
+
+    def __lt__(self, other: _SortKey) -> bool:
+        for a, b, descending in zip(self.values, other.values, self.descending):
+            if descending:
+                a, b = b, a
+            if a < b:
+                return True
+            if b < a:
+                return False
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        # heapq breaks ties between keys that are equal in this sense by the
+        # input position of the solutions
+        if not isinstance(other, _SortKey):
+            return NotImplemented
+        return not (self < other or other < self)
+
+
+def _order_key(conditions: List[CompValue], schema: VariableSchema):
+    """
+    Returns a sort key function for the OrderCondition list of an OrderBy,
+    so that the solutions are ordered with a single sort. The expressions
+    are compiled for the solutions of ``schema``.
+    """
+    expressions = [
+        compileValue(condition.expr, schema, variables=True) for condition in conditions
+    ]
+    descending = [condition.order == "DESC" for condition in conditions]
+
+    def key(solution: FrozenBindings) -> _SortKey:
+        return _SortKey([_val(expr(solution)) for expr in expressions], descending)
+
+    return key
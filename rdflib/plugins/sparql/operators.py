@@ -976,7 +976,11 @@ def and_(*args: Expr) -> Expr:
     )
 
 
-TrueFilter = Expr("TrueFilter", lambda _1, _2: Literal(True))
+def _true(expr: Expr, ctx: Any) -> Literal:
+    return Literal(True)
+
+
+TrueFilter = Expr("TrueFilter", _true)
 
 
 def simplify(expr: Any) -> Any:
@@ -1037,18 +1041,8 @@ def string(s: Literal) -> Literal:
     return s
 
 
-def numeric(expr: Literal) -> Any:
-    """
-    return a number from a literal
-    http://www.w3.org/TR/xpath20/#promotion
-
-    or TypeError
-    """
-
-    if not isinstance(expr, Literal):
-        raise SPARQLTypeError("%r is not a literal!" % expr)
-
-    if expr.datatype not in (
+_NUMERIC_DTs = frozenset(
+    (
         XSD.float,
         XSD.double,
         XSD.decimal,
@@ -1065,7 +1059,22 @@ def numeric(expr: Literal) -> Any:
         XSD.int,
         XSD.short,
         XSD.byte,
-    ):
+    )
+)
+
+
+def numeric(expr: Literal) -> Any:
+    """
+    return a number from a literal
+    http://www.w3.org/TR/xpath20/#promotion
+
+    or TypeError
+    """
+
+    if not isinstance(expr, Literal):
+        raise SPARQLTypeError("%r is not a literal!" % expr)
+
+    if expr.datatype not in _NUMERIC_DTs:
         raise SPARQLTypeError("%r does not have a numeric datatype!" % expr)
 
     return expr.toPython()
@@ -0,0 +1,192 @@
+"""
+Evaluation of independent parts of a query on a pool of threads or processes
+
+These are used by :mod:`rdflib.plugins.sparql.evaluate` when
+:data:`rdflib.plugins.sparql.SPARQL_THREADS` or
+:data:`rdflib.plugins.sparql.SPARQL_PROCESSES` is set.
+
+With :func:`chain`, the first part is evaluated by the thread that consumes
+the solutions, and as many of the next parts as there are threads are
+evaluated ahead on a shared pool of threads, each into a buffer of at most
+:data:`BUFFER_SIZE` solutions. With :func:`map`, calls are made on a shared
+pool of processes, with at most twice as many calls as there are processes
+made ahead of the consumer. Either way, the results come out in the same
+order as when the parts are evaluated one after the other.
+
+Parts are never evaluated concurrently from a thread or process of a pool,
+so a worker does not wait for another one. A part that no thread of the
+pool has started when its solutions are needed is evaluated by the
+consuming thread instead.
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Deque, Generator, Iterable, Optional, TypeVar
+
+__all__ = ["chain", "map", "in_worker"]
+
+BUFFER_SIZE = 1000
+"""The number of solutions that a part evaluated ahead keeps in its buffer"""
+
+_T = TypeVar("_T")
+_A = TypeVar("_A")
+
+_local = threading.local()
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_threads = 0
+_process_executor: Optional[ProcessPoolExecutor] = None
+_process_executor_processes = 0
+_process_worker = False
+
+_DONE = object()
+
+
+class _Error:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def in_worker() -> bool:
+    """Whether the current thread is one of a pool, or runs in a process of
+    one"""
+    return _process_worker or getattr(_local, "worker", False)
+
+
+def _pool(threads: int) -> ThreadPoolExecutor:
+    global _executor, _executor_threads
+    with _lock:
+        if _executor is None or _executor_threads != threads:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(threads, thread_name_prefix="rdflib-sparql")
+            _executor_threads = threads
+        return _executor
+
+
+def _start_process_worker() -> None:
+    global _process_worker
+    _process_worker = True
+
+
+def _process_pool(processes: int) -> ProcessPoolExecutor:
+    global _process_executor, _process_executor_processes
+    with _lock:
+        if _process_executor is None or _process_executor_processes != processes:
+            if _process_executor is not None:
+                _process_executor.shutdown(wait=False)
+            _process_executor = ProcessPoolExecutor(
+                processes, initializer=_start_process_worker
+            )
+            _process_executor_processes = processes
+        return _process_executor
+
+
+class _Prefetch:
+    """A part that is evaluated ahead on the pool into a buffer"""
+
+    def __init__(self, part: Callable[[], Iterable[_T]], pool: ThreadPoolExecutor):
+        self.part = part
+        self.buffer: queue.Queue = queue.Queue(BUFFER_SIZE)
+        self.cancelled = threading.Event()
+        self.future: Future = pool.submit(self._run)
+
+    def _put(self, item: object) -> bool:
+        while not self.cancelled.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        _local.worker = True
+        try:
+            for solution in self.part():
+                if not self._put(solution):
+                    return
+            self._put(_DONE)
+        except BaseException as e:
+            self._put(_Error(e))
+        finally:
+            _local.worker = False
+
+    def __iter__(self) -> Generator[_T, None, None]:
+        if self.future.cancel():
+            # not started yet, the pool is busy
+            yield from self.part()
+            return
+        while True:
+            item = self.buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Error):
+                raise item.error
+            yield item
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        self.future.cancel()
+
+
+def chain(
+    parts: Iterable[Callable[[], Iterable[_T]]], threads: int
+) -> Generator[_T, None, None]:
+    """
+    The solutions of each of ``parts`` one after the other, like
+    :func:`itertools.chain`, with up to ``threads`` of the parts after the
+    one being consumed evaluated ahead on a pool of ``threads`` threads.
+    """
+    pool = _pool(threads)
+    parts = iter(parts)
+    first = next(parts, None)
+    if first is None:
+        return
+    ahead: Deque[_Prefetch] = deque(
+        _Prefetch(part, pool) for part in itertools.islice(parts, threads)
+    )
+    try:
+        yield from first()
+        while ahead:
+            ahead.extend(_Prefetch(part, pool) for part in itertools.islice(parts, 1))
+            yield from ahead[0]
+            ahead.popleft()
+    finally:
+        for prefetch in ahead:
+            prefetch.cancel()
+
+
+def map(
+    function: Callable[[_A], _T], arguments: Iterable[_A], processes: int
+) -> Generator[_T, None, None]:
+    """
+    ``function`` called with each of ``arguments`` on a pool of
+    ``processes`` processes, like the builtin :func:`map`. ``function``,
+    the arguments and the results must be picklable.
+    """
+    pool = _process_pool(processes)
+    arguments = iter(arguments)
+    ahead: Deque[Future] = deque(
+        pool.submit(function, argument)
+        for argument in itertools.islice(arguments, 2 * processes)
+    )
+    try:
+        while ahead:
+            result = ahead[0].result()
+            ahead.popleft()
+            ahead.extend(
+                pool.submit(function, argument)
+                for argument in itertools.islice(arguments, 1)
+            )
+            yield result
+    finally:
+        for future in ahead:
+            future.cancel()
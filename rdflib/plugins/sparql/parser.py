@@ -1532,6 +1532,10 @@ def expandUnicodeEscapes(q: str) -> str:
     return expandUnicodeEscapes_re.sub(expand, q)
 
 
+# the hand-written parser uses the terminals and actions of this module
+from . import rdparser  # noqa: E402
+
+
 def parseQuery(q: Union[str, bytes, TextIO, BinaryIO]) -> ParseResults:
     if hasattr(q, "read"):
         q = q.read()
@@ -1539,6 +1543,8 @@ def parseQuery(q: Union[str, bytes, TextIO, BinaryIO]) -> ParseResults:
         q = q.decode("utf-8")
 
     q = expandUnicodeEscapes(q)
+    if rdflib.plugins.sparql.SPARQL_PARSER == "rdparser":
+        return rdparser.parseQuery(q)
     return Query.parseString(q, parseAll=True)
 
 
@@ -1550,4 +1556,6 @@ def parseUpdate(q: Union[str, bytes, TextIO, BinaryIO]) -> CompValue:
         q = q.decode("utf-8")
 
     q = expandUnicodeEscapes(q)
+    if rdflib.plugins.sparql.SPARQL_PARSER == "rdparser":
+        return rdparser.parseUpdate(q)
     return UpdateUnit.parseString(q, parseAll=True)[0]
@@ -6,8 +6,8 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Dict,
     List,
-    Mapping,
     Optional,
     Tuple,
     TypeVar,
@@ -167,6 +167,35 @@ class CompValue(OrderedDict):
     def clone(self) -> CompValue:
         return CompValue(self.name, **self)
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # compiled expressions are not kept, they are compiled again when
+        # needed, see rdflib.plugins.sparql.compiler, and methods bound to
+        # this value are bound again to the copy
+        state = {}
+        methods = {}
+        for k, v in self.__dict__.items():
+            if k == "_compiled":
+                continue
+            if isinstance(v, MethodType) and v.__self__ is self:
+                methods[k] = v.__func__
+            else:
+                state[k] = v
+        return (
+            CompValue.__new__,
+            (type(self),),
+            (state, methods),
+            None,
+            iter(self.items()),
+        )
+
+    def __setstate__(
+        self, state: Tuple[Dict[str, Any], Dict[str, Callable[..., Any]]]
+    ) -> None:
+        attributes, methods = state
+        self.__dict__.update(attributes)
+        for k, function in methods.items():
+            self.__dict__[k] = MethodType(function, self)
+
     def __str__(self) -> str:
         return self.name + "_" + OrderedDict.__str__(self)
 
@@ -224,13 +253,39 @@ class Expr(CompValue):
 
     def eval(self, ctx: Any = {}) -> Union[SPARQLError, Any]:
         try:
-            self.ctx: Optional[Union[Mapping, FrozenBindings]] = ctx
-            # type error: "None" not callable
-            return self._evalfn(ctx)  # type: ignore[misc]
+            # the evaluation function reads the arguments through a view of
+            # the expression for ctx, so that queries that share the
+            # expression can be evaluated at the same time
+            # type error: "None" has no attribute "__func__"
+            evalfn = self._evalfn.__func__  # type: ignore[union-attr]
+            return evalfn(_Evaluation(self, ctx), ctx)
         except SPARQLError as e:
             return e
-        finally:
-            self.ctx = None
+
+
+class _Evaluation(object):
+    """
+    An expression as its evaluation function sees it: the arguments are
+    evaluated for the solution ``ctx`` when they are read
+    """
+
+    __slots__ = ("_expr", "ctx")
+
+    def __init__(self, expr: Expr, ctx: Any):
+        self._expr = expr
+        self.ctx = ctx
+
+    def __getitem__(self, a: str) -> Any:
+        return value(self.ctx, OrderedDict.__getitem__(self._expr, a))
+
+    def get(self, a: str, variables: bool = False, errors: bool = False) -> Any:
+        return value(self.ctx, OrderedDict.get(self._expr, a, a), variables)
+
+    def __getattr__(self, a: str) -> Any:
+        expr = self._expr
+        if a not in expr.__dict__ and OrderedDict.__contains__(expr, a):
+            return value(self.ctx, OrderedDict.__getitem__(expr, a))
+        return getattr(expr, a)
 
 
 class Comp(TokenConverter):
@@ -6,7 +6,9 @@ These should be automatically registered with RDFLib
 """
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Union
+import collections
+import threading
+from typing import Any, Hashable, Mapping, Optional, Tuple, Union
 
 from rdflib.graph import Graph
 from rdflib.plugins.sparql.algebra import translateQuery, translateUpdate
@@ -29,6 +31,92 @@ def prepareQuery(
     return ret
 
 
+class QueryCache(object):
+    """
+    A least recently used cache of parsed and translated queries.
+
+    Queries are looked up by their text, ``initNs`` and ``base``, so the
+    same query with different initial bindings is only parsed once. When
+    the cache holds ``maxsize`` queries, the one that was used last the
+    longest time ago is dropped; a ``maxsize`` of 0 turns the cache off.
+
+    The translated queries are shared by all the evaluations that use them,
+    so they must not be modified. Unlike these, each query from
+    :func:`prepareQuery` is a new one.
+
+    >>> cache = QueryCache(maxsize=2)
+    >>> q = cache.get("SELECT * WHERE { ?s ?p ?o }")
+    >>> cache.get("SELECT * WHERE { ?s ?p ?o }") is q
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._queries: collections.OrderedDict[
+            Hashable, Query
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        queryString: str, initNs: Mapping[str, Any], base: Optional[str]
+    ) -> Tuple[str, Tuple[Tuple[str, str], ...], Optional[str]]:
+        return (
+            queryString,
+            tuple(sorted((prefix, str(ns)) for prefix, ns in initNs.items())),
+            base,
+        )
+
+    def get(
+        self,
+        queryString: str,
+        initNs: Mapping[str, Any] = {},
+        base: Optional[str] = None,
+    ) -> Query:
+        """
+        The translated query, which is parsed and added to the cache if it
+        is not in it yet
+        """
+        key = self._key(queryString, initNs, base)
+        with self._lock:
+            query = self._queries.get(key)
+            if query is not None:
+                self._queries.move_to_end(key)
+                self.hits += 1
+                return query
+            self.misses += 1
+
+        query = prepareQuery(queryString, initNs, base)
+        if self.maxsize > 0:
+            with self._lock:
+                self._queries[key] = query
+                while len(self._queries) > self.maxsize:
+                    self._queries.popitem(last=False)
+        return query
+
+    def clear(self) -> None:
+        """remove all queries from the cache and reset the counters"""
+        with self._lock:
+            self._queries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+
+query_cache = QueryCache()
+"""
+The cache of the queries that are given as strings to
+:meth:`SPARQLProcessor.query`. Set its ``maxsize`` to change how many
+queries it holds.
+"""
+
+
 def prepareUpdate(
     updateString: str, initNs: Mapping[str, Any] = {}, base: Optional[str] = None
 ) -> Update:
@@ -105,8 +193,7 @@ class SPARQLProcessor(Processor):
         """
 
         if not isinstance(strOrQuery, Query):
-            parsetree = parseQuery(strOrQuery)
-            query = translateQuery(parsetree, base, initNs)
+            query = query_cache.get(strOrQuery, initNs, base)
         else:
             query = strOrQuery
         return evalQuery(self.graph, query, initBindings, base)
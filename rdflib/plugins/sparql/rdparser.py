@@ -0,0 +1,1633 @@
+"""
+SPARQL 1.1 Parser
+
+A hand-written recursive descent parser for the grammar in
+:mod:`rdflib.plugins.sparql.parser`. It produces the same parse trees as the
+pyparsing grammar, but without the overhead of the pyparsing machinery, and
+is used instead of it when :data:`rdflib.plugins.sparql.SPARQL_PARSER` is set
+to ``"rdparser"``.
+
+Every method of :class:`Parser` implements the production with the same
+number in the SPARQL grammar and follows the pyparsing grammar closely:
+alternatives are tried in the same order, with backtracking, the same
+terminals skip whitespace and comments, and ``Comp``/``Param`` results are
+built as the same :class:`.CompValue` and :class:`.Expr` objects.
+"""
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NoReturn, Optional, Tuple
+
+from pyparsing import Keyword, ParseException, ParseResults, originalTextFor
+
+import rdflib
+from rdflib.compat import decodeUnicodeEscape
+from rdflib.term import BNode, Literal, URIRef, Variable
+
+from . import operators as op
+from . import parser
+from .parserutils import CompValue, Expr
+
+__all__ = ["Parser", "parseQuery", "parseUpdate"]
+
+# whitespace and comments, skipped before every token
+_SKIP = re.compile(r"(?:[ \t\n\r]+|#[^\n]*)*")
+
+# the terminals are shared with the pyparsing grammar
+_IRIREF = re.compile(
+    r'<([^<>"{}|^`\\%s]*)>' % "".join("\\x%02X" % i for i in range(33))
+)
+_PN_PREFIX = parser.PN_PREFIX.re
+_PN_LOCAL = parser.PN_LOCAL.re
+_BLANK_NODE_LABEL = parser.BLANK_NODE_LABEL.re
+_VARNAME = parser.VARNAME.re
+_LANGTAG = re.compile("[a-zA-Z]+(?:-[a-zA-Z0-9]+)*")
+_NUMBERS = (
+    (parser.DOUBLE.re, rdflib.XSD.double),
+    (parser.DECIMAL.re, rdflib.XSD.decimal),
+    (parser.INTEGER.re, rdflib.XSD.integer),
+)
+_INTEGER = parser.INTEGER.re
+_NUMBER_START = frozenset("0123456789+-.")
+_STRINGS = {
+    "'": ((parser.STRING_LITERAL_LONG1.re, 3), (parser.STRING_LITERAL1.re, 1)),
+    '"': ((parser.STRING_LITERAL_LONG2.re, 3), (parser.STRING_LITERAL2.re, 1)),
+}
+
+_KEYWORD_CHARS = frozenset(Keyword.DEFAULT_KEYWORD_CHARS.upper())
+
+# name, evaluation function and the parameters of built-in calls that take
+# a fixed number of expressions as arguments
+_BUILTINS: Dict[str, Tuple[str, Callable[..., Any], Tuple[str, ...]]] = {
+    "STR": ("Builtin_STR", op.Builtin_STR, ("arg",)),
+    "LANG": ("Builtin_LANG", op.Builtin_LANG, ("arg",)),
+    "LANGMATCHES": ("Builtin_LANGMATCHES", op.Builtin_LANGMATCHES, ("arg1", "arg2")),
+    "DATATYPE": ("Builtin_DATATYPE", op.Builtin_DATATYPE, ("arg",)),
+    "IRI": ("Builtin_IRI", op.Builtin_IRI, ("arg",)),
+    "URI": ("Builtin_URI", op.Builtin_IRI, ("arg",)),
+    "ABS": ("Builtin_ABS", op.Builtin_ABS, ("arg",)),
+    "CEIL": ("Builtin_CEIL", op.Builtin_CEIL, ("arg",)),
+    "FLOOR": ("Builtin_FLOOR", op.Builtin_FLOOR, ("arg",)),
+    "ROUND": ("Builtin_ROUND", op.Builtin_ROUND, ("arg",)),
+    "STRLEN": ("Builtin_STRLEN", op.Builtin_STRLEN, ("arg",)),
+    "UCASE": ("Builtin_UCASE", op.Builtin_UCASE, ("arg",)),
+    "LCASE": ("Builtin_LCASE", op.Builtin_LCASE, ("arg",)),
+    "ENCODE_FOR_URI": (
+        "Builtin_ENCODE_FOR_URI",
+        op.Builtin_ENCODE_FOR_URI,
+        ("arg",),
+    ),
+    "CONTAINS": ("Builtin_CONTAINS", op.Builtin_CONTAINS, ("arg1", "arg2")),
+    "STRSTARTS": ("Builtin_STRSTARTS", op.Builtin_STRSTARTS, ("arg1", "arg2")),
+    "STRENDS": ("Builtin_STRENDS", op.Builtin_STRENDS, ("arg1", "arg2")),
+    "STRBEFORE": ("Builtin_STRBEFORE", op.Builtin_STRBEFORE, ("arg1", "arg2")),
+    "STRAFTER": ("Builtin_STRAFTER", op.Builtin_STRAFTER, ("arg1", "arg2")),
+    "YEAR": ("Builtin_YEAR", op.Builtin_YEAR, ("arg",)),
+    "MONTH": ("Builtin_MONTH", op.Builtin_MONTH, ("arg",)),
+    "DAY": ("Builtin_DAY", op.Builtin_DAY, ("arg",)),
+    "HOURS": ("Builtin_HOURS", op.Builtin_HOURS, ("arg",)),
+    "MINUTES": ("Builtin_MINUTES", op.Builtin_MINUTES, ("arg",)),
+    "SECONDS": ("Builtin_SECONDS", op.Builtin_SECONDS, ("arg",)),
+    "TIMEZONE": ("Builtin_TIMEZONE", op.Builtin_TIMEZONE, ("arg",)),
+    "TZ": ("Builtin_TZ", op.Builtin_TZ, ("arg",)),
+    "MD5": ("Builtin_MD5", op.Builtin_MD5, ("arg",)),
+    "SHA1": ("Builtin_SHA1", op.Builtin_SHA1, ("arg",)),
+    "SHA256": ("Builtin_SHA256", op.Builtin_SHA256, ("arg",)),
+    "SHA384": ("Builtin_SHA384", op.Builtin_SHA384, ("arg",)),
+    "SHA512": ("Builtin_SHA512", op.Builtin_SHA512, ("arg",)),
+    "IF": ("Builtin_IF", op.Builtin_IF, ("arg1", "arg2", "arg3")),
+    "STRLANG": ("Builtin_STRLANG", op.Builtin_STRLANG, ("arg1", "arg2")),
+    "STRDT": ("Builtin_STRDT", op.Builtin_STRDT, ("arg1", "arg2")),
+    "SAMETERM": ("Builtin_sameTerm", op.Builtin_sameTerm, ("arg1", "arg2")),
+    "ISIRI": ("Builtin_isIRI", op.Builtin_isIRI, ("arg",)),
+    "ISURI": ("Builtin_isURI", op.Builtin_isIRI, ("arg",)),
+    "ISBLANK": ("Builtin_isBLANK", op.Builtin_isBLANK, ("arg",)),
+    "ISLITERAL": ("Builtin_isLITERAL", op.Builtin_isLITERAL, ("arg",)),
+    "ISNUMERIC": ("Builtin_isNUMERIC", op.Builtin_isNUMERIC, ("arg",)),
+}
+
+# built-in calls without arguments
+_NIL_BUILTINS = {
+    "RAND": ("Builtin_RAND", op.Builtin_RAND),
+    "NOW": ("Builtin_NOW", op.Builtin_NOW),
+    "UUID": ("Builtin_UUID", op.Builtin_UUID),
+    "STRUUID": ("Builtin_STRUUID", op.Builtin_STRUUID),
+}
+
+_AGGREGATES = {
+    "COUNT": "Aggregate_Count",
+    "SUM": "Aggregate_Sum",
+    "MIN": "Aggregate_Min",
+    "MAX": "Aggregate_Max",
+    "AVG": "Aggregate_Avg",
+    "SAMPLE": "Aggregate_Sample",
+    "GROUP_CONCAT": "Aggregate_GroupConcat",
+}
+
+_BUILTIN_KEYWORDS = (
+    list(_AGGREGATES)
+    + list(_BUILTINS)
+    + list(_NIL_BUILTINS)
+    + ["BOUND", "BNODE", "CONCAT", "COALESCE", "SUBSTR", "REPLACE", "REGEX"]
+    + ["EXISTS", "NOT"]
+)
+
+# keywords by their first letter, to find the one at a position
+_BUILTINS_BY_INITIAL: Dict[str, List[str]] = {}
+for _keyword in _BUILTIN_KEYWORDS:
+    _BUILTINS_BY_INITIAL.setdefault(_keyword[0], []).append(_keyword)
+del _keyword
+
+
+class _Backtrack(Exception):
+    """
+    Raised when a production does not match, the caller tries the next
+    alternative or fails in turn.
+    """
+
+
+def _add(comp: CompValue, name: str, value: Any) -> None:
+    # the equivalent of a ParamList
+    if name in comp:
+        OrderedDict.__getitem__(comp, name).append(value)
+    else:
+        comp[name] = [value]
+
+
+def _tokens(tokens: List[Any]) -> Any:
+    # the value of a Param for the given tokens
+    if len(tokens) == 1:
+        return tokens[0]
+    return ParseResults(tokens)
+
+
+class Parser:
+    """
+    Parses a SPARQL query or update string.
+
+    The parser works on the string after tabs were expanded, like pyparsing
+    does, and :attr:`pos` is the position in that string.
+    """
+
+    def __init__(self, text: str):
+        self.text = text.expandtabs()
+        self.pos = 0
+        # the furthest position where a token did not match and what was
+        # expected there, for the error message
+        self.error_pos = 0
+        self.expected = "end of text"
+
+    # ------ TOKENS --------------
+
+    def fail(self, pos: int, expected: str) -> _Backtrack:
+        if pos >= self.error_pos:
+            self.error_pos = pos
+            self.expected = expected
+        return _Backtrack()
+
+    def skip(self) -> int:
+        """
+        The position of the next token, after any whitespace and comments
+        """
+        return _SKIP.match(self.text, self.pos).end()
+
+    def at(self, token: str) -> bool:
+        """
+        If the next token is the given literal, without consuming it
+        """
+        return self.text.startswith(token, self.skip())
+
+    def accept(self, token: str) -> bool:
+        pos = self.skip()
+        if self.text.startswith(token, pos):
+            self.pos = pos + len(token)
+            return True
+        self.fail(pos, repr(token))
+        return False
+
+    def expect(self, token: str) -> str:
+        pos = self.skip()
+        if self.text.startswith(token, pos):
+            self.pos = pos + len(token)
+            return token
+        raise self.fail(pos, repr(token))
+
+    def keyword_at(self, pos: int, keyword: str) -> bool:
+        # the same test as a pyparsing CaselessKeyword
+        text = self.text
+        end = pos + len(keyword)
+        return (
+            text[pos:end].upper() == keyword
+            and (pos == 0 or text[pos - 1].upper() not in _KEYWORD_CHARS)
+            and (end >= len(text) or text[end].upper() not in _KEYWORD_CHARS)
+        )
+
+    def at_keyword(self, keyword: str) -> bool:
+        return self.keyword_at(self.skip(), keyword)
+
+    def accept_keyword(self, keyword: str) -> bool:
+        pos = self.skip()
+        if self.keyword_at(pos, keyword):
+            self.pos = pos + len(keyword)
+            return True
+        self.fail(pos, keyword)
+        return False
+
+    def expect_keyword(self, keyword: str) -> str:
+        if not self.accept_keyword(keyword):
+            raise _Backtrack()
+        return keyword
+
+    def attempt(self, production: Callable[..., Any], *args: Any) -> Any:
+        """
+        The result of the production, or None and the position unchanged if
+        it does not match
+        """
+        pos = self.pos
+        try:
+            return production(*args)
+        except _Backtrack:
+            self.pos = pos
+            return None
+
+    def repeat(
+        self, separator: str, production: Callable[[], Any], values: List[Any]
+    ) -> List[Any]:
+        """
+        Appends the values of ``( separator production )*`` to values
+        """
+        while True:
+            pos = self.pos
+            if not self.accept(separator):
+                return values
+            try:
+                values.append(production())
+            except _Backtrack:
+                self.pos = pos
+                return values
+
+    # ------ TERMINALS --------------
+
+    # [139] IRIREF
+    def IRIREF(self, skip: bool = True) -> URIRef:
+        pos = self.skip() if skip else self.pos
+        m = _IRIREF.match(self.text, pos)
+        if m is None:
+            raise self.fail(pos, "IRIREF")
+        self.pos = m.end()
+        return URIRef(m.group(1))
+
+    # [140] PNAME_NS, returns the prefix
+    def PNAME_NS(self, skip: bool = True) -> Optional[str]:
+        pos = self.skip() if skip else self.pos
+        m = _PN_PREFIX.match(self.text, pos)
+        prefix = None
+        if m is not None:
+            prefix = m.group()
+            pos = m.end()
+        if not self.text.startswith(":", pos):
+            raise self.fail(pos, "':'")
+        self.pos = pos + 1
+        return prefix
+
+    # [137] PrefixedName ::= PNAME_LN | PNAME_NS
+    def PrefixedName(self, skip: bool = True) -> CompValue:
+        prefix = self.PNAME_NS(skip)
+        res = CompValue("pname")
+        if prefix is not None:
+            res["prefix"] = prefix
+        m = _PN_LOCAL.match(self.text, self.pos)
+        if m is not None:
+            res["localname"] = m.group()
+            self.pos = m.end()
+        return res
+
+    # [136] iri ::= IRIREF | PrefixedName
+    def iri(self, skip: bool = True) -> Any:
+        pos = self.skip() if skip else self.pos
+        if self.text.startswith("<", pos):
+            return self.IRIREF(skip)
+        return self.PrefixedName(skip)
+
+    # [108] Var ::= VAR1 | VAR2
+    def Var(self) -> Variable:
+        pos = self.skip()
+        if self.text[pos : pos + 1] in ("?", "$"):
+            m = _VARNAME.match(self.text, pos + 1)
+            if m is not None:
+                self.pos = m.end()
+                return Variable(m.group())
+        raise self.fail(pos, "Var")
+
+    # [135] String
+    def String(self) -> Literal:
+        pos = self.skip()
+        for regex, quotes in _STRINGS.get(self.text[pos : pos + 1], ()):
+            m = regex.match(self.text, pos)
+            if m is not None:
+                self.pos = m.end()
+                return Literal(decodeUnicodeEscape(m.group()[quotes:-quotes]))
+        raise self.fail(pos, "String")
+
+    # [129] RDFLiteral ::= String ( LANGTAG | ( '^^' iri ) )?
+    def RDFLiteral(self) -> CompValue:
+        res = CompValue("literal", string=self.String())
+        text, pos = self.text, self.pos
+        if text.startswith("@", pos):
+            m = _LANGTAG.match(text, pos + 1)
+            if m is not None:
+                res["lang"] = m.group()
+                self.pos = m.end()
+        elif text.startswith("^^", pos):
+            self.pos = pos + 2
+            datatype = self.attempt(self.iri, False)
+            if datatype is None:
+                self.pos = pos
+            else:
+                res["datatype"] = datatype
+        return res
+
+    # [130] NumericLiteral
+    def NumericLiteral(self) -> Literal:
+        text = self.text
+        pos = self.skip()
+        sign = text[pos : pos + 1]
+        start = pos + 1 if sign in ("+", "-") else pos
+        for regex, datatype in _NUMBERS:
+            m = regex.match(text, start)
+            if m is not None:
+                self.pos = m.end()
+                literal = Literal(m.group(), datatype=datatype)
+                if sign == "-":
+                    return parser.neg(literal)
+                if sign == "+" and regex is _INTEGER:
+                    return Literal("+" + literal, datatype=datatype)
+                return literal
+        raise self.fail(start, "NumericLiteral")
+
+    # [134] BooleanLiteral ::= 'true' | 'false'
+    def BooleanLiteral(self) -> Literal:
+        if self.accept_keyword("TRUE"):
+            return Literal(True)
+        if self.accept_keyword("FALSE"):
+            return Literal(False)
+        raise _Backtrack()
+
+    # [138] BlankNode ::= BLANK_NODE_LABEL | ANON
+    def BlankNode(self) -> BNode:
+        pos = self.skip()
+        m = _BLANK_NODE_LABEL.match(self.text, pos)
+        if m is not None:
+            self.pos = m.end()
+            return BNode(m.group()[2:])
+        self.expect("[")
+        self.expect("]")
+        return BNode()
+
+    # [161] NIL ::= '(' WS* ')'
+    def NIL(self) -> URIRef:
+        self.expect("(")
+        self.expect(")")
+        return rdflib.RDF.nil
+
+    # [109] GraphTerm ::= iri | RDFLiteral | NumericLiteral | BooleanLiteral | BlankNode | NIL
+    def GraphTerm(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c == "<":
+            return self.IRIREF()
+        if c in ("'", '"'):
+            return self.RDFLiteral()
+        if c in ("[", "_"):
+            return self.BlankNode()
+        if c == "(":
+            return self.NIL()
+        if c in _NUMBER_START:
+            return self.NumericLiteral()
+        if c:
+            res = self.attempt(self.PrefixedName)
+            if res is not None:
+                return res
+            return self.BooleanLiteral()
+        raise self.fail(pos, "GraphTerm")
+
+    # [106] VarOrTerm ::= Var | GraphTerm
+    def VarOrTerm(self) -> Any:
+        pos = self.skip()
+        if self.text[pos : pos + 1] in ("?", "$"):
+            return self.Var()
+        return self.GraphTerm()
+
+    # [107] VarOrIri ::= Var | iri
+    def VarOrIri(self) -> Any:
+        pos = self.skip()
+        if self.text[pos : pos + 1] in ("?", "$"):
+            return self.Var()
+        return self.iri()
+
+    # ------ NON-TERMINALS --------------
+
+    # [4] Prologue ::= ( BaseDecl | PrefixDecl )*
+    def Prologue(self) -> ParseResults:
+        decls = []
+        while True:
+            pos = self.pos
+            try:
+                if self.accept_keyword("BASE"):
+                    # [5] BaseDecl ::= 'BASE' IRIREF
+                    decls.append(CompValue("Base", iri=self.IRIREF()))
+                elif self.accept_keyword("PREFIX"):
+                    # [6] PrefixDecl ::= 'PREFIX' PNAME_NS IRIREF
+                    decl = CompValue("PrefixDecl")
+                    prefix = self.PNAME_NS()
+                    if prefix is not None:
+                        decl["prefix"] = prefix
+                    decl["iri"] = self.IRIREF()
+                    decls.append(decl)
+                else:
+                    break
+            except _Backtrack:
+                self.pos = pos
+                break
+        return ParseResults(decls)
+
+    # [9] SelectClause ::= 'SELECT' ( 'DISTINCT' | 'REDUCED' )? ( ( Var | ( '(' Expression 'AS' Var ')' ) )+ | '*' )
+    def SelectClause(self, res: CompValue) -> None:
+        self.expect_keyword("SELECT")
+        if self.accept_keyword("DISTINCT"):
+            res["modifier"] = "DISTINCT"
+        elif self.accept_keyword("REDUCED"):
+            res["modifier"] = "REDUCED"
+        projection = []
+        while True:
+            pos = self.skip()
+            if self.text.startswith("(", pos):
+                var = self.attempt(self.ProjectionExpression)
+                if var is None:
+                    break
+                projection.append(var)
+            else:
+                var = self.attempt(self.Var)
+                if var is None:
+                    break
+                projection.append(CompValue("vars", var=var))
+        if projection:
+            res["projection"] = projection
+        else:
+            self.expect("*")
+
+    def ProjectionExpression(self) -> CompValue:
+        self.expect("(")
+        res = CompValue("vars", expr=self.Expression())
+        self.expect_keyword("AS")
+        res["evar"] = self.Var()
+        self.expect(")")
+        return res
+
+    # [17] WhereClause ::= 'WHERE'? GroupGraphPattern
+    def WhereClause(self, res: CompValue) -> None:
+        self.accept_keyword("WHERE")
+        res["where"] = self.GroupGraphPattern()
+
+    # [13] DatasetClause ::= 'FROM' ( DefaultGraphClause | NamedGraphClause )
+    def DatasetClause(self) -> CompValue:
+        self.expect_keyword("FROM")
+        default = self.attempt(self.iri)
+        if default is not None:
+            return CompValue("DatasetClause", default=default)
+        self.expect_keyword("NAMED")
+        return CompValue("DatasetClause", named=self.iri())
+
+    def DatasetClauses(self) -> List[CompValue]:
+        clauses = []
+        while self.at_keyword("FROM"):
+            clause = self.attempt(self.DatasetClause)
+            if clause is None:
+                break
+            clauses.append(clause)
+        return clauses
+
+    # [18] SolutionModifier ::= GroupClause? HavingClause? OrderClause? LimitOffsetClauses?
+    def SolutionModifier(self, res: CompValue) -> None:
+        for name, keyword, production in (
+            ("groupby", "GROUP", self.GroupClause),
+            ("having", "HAVING", self.HavingClause),
+            ("orderby", "ORDER", self.OrderClause),
+        ):
+            if self.at_keyword(keyword):
+                clause = self.attempt(production)
+                if clause is not None:
+                    res[name] = clause
+        limitoffset = self.attempt(self.LimitOffsetClauses)
+        if limitoffset is not None:
+            res["limitoffset"] = limitoffset
+
+    # [19] GroupClause ::= 'GROUP' 'BY' GroupCondition+
+    def GroupClause(self) -> CompValue:
+        self.expect_keyword("GROUP")
+        self.expect_keyword("BY")
+        conditions = [self.GroupCondition()]
+        while True:
+            condition = self.attempt(self.GroupCondition)
+            if condition is None:
+                return CompValue("GroupClause", condition=conditions)
+            conditions.append(condition)
+
+    # [20] GroupCondition ::= BuiltInCall | FunctionCall | '(' Expression ( 'AS' Var )? ')' | Var
+    def GroupCondition(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c == "(":
+            self.expect("(")
+            res = CompValue("GroupAs", expr=self.Expression())
+            if self.at_keyword("AS"):
+                pos = self.pos
+                try:
+                    self.expect_keyword("AS")
+                    res["var"] = self.Var()
+                except _Backtrack:
+                    self.pos = pos
+            self.expect(")")
+            return res
+        if c in ("?", "$"):
+            return self.Var()
+        res = self.attempt(self.BuiltInCall)
+        if res is not None:
+            return res
+        return self.FunctionCall()
+
+    # [21] HavingClause ::= 'HAVING' HavingCondition+
+    def HavingClause(self) -> CompValue:
+        self.expect_keyword("HAVING")
+        conditions = [self.Constraint()]
+        while True:
+            condition = self.attempt(self.Constraint)
+            if condition is None:
+                return CompValue("HavingClause", condition=conditions)
+            conditions.append(condition)
+
+    # [23] OrderClause ::= 'ORDER' 'BY' OneOrMore(OrderCondition)
+    def OrderClause(self) -> CompValue:
+        self.expect_keyword("ORDER")
+        self.expect_keyword("BY")
+        conditions = [self.OrderCondition()]
+        while True:
+            condition = self.attempt(self.OrderCondition)
+            if condition is None:
+                return CompValue("OrderClause", condition=conditions)
+            conditions.append(condition)
+
+    # [24] OrderCondition ::= ( ( 'ASC' | 'DESC' ) BrackettedExpression ) | ( Constraint | Var )
+    def OrderCondition(self) -> CompValue:
+        for order in ("ASC", "DESC"):
+            if self.at_keyword(order):
+                pos = self.pos
+                try:
+                    self.expect_keyword(order)
+                    return CompValue(
+                        "OrderCondition", order=order, expr=self.BrackettedExpression()
+                    )
+                except _Backtrack:
+                    self.pos = pos
+        pos = self.skip()
+        if self.text[pos : pos + 1] in ("?", "$"):
+            return CompValue("OrderCondition", expr=self.Var())
+        return CompValue("OrderCondition", expr=self.Constraint())
+
+    # [25] LimitOffsetClauses ::= LimitClause OffsetClause? | OffsetClause LimitClause?
+    def LimitOffsetClauses(self) -> CompValue:
+        res = CompValue("LimitOffsetClauses")
+        if self.at_keyword("LIMIT"):
+            first, second = "LIMIT", "OFFSET"
+        else:
+            first, second = "OFFSET", "LIMIT"
+        self.expect_keyword(first)
+        res[first.lower()] = self.INTEGER()
+        pos = self.pos
+        if self.accept_keyword(second):
+            try:
+                res[second.lower()] = self.INTEGER()
+            except _Backtrack:
+                self.pos = pos
+        return res
+
+    # [146] INTEGER
+    def INTEGER(self) -> Literal:
+        pos = self.skip()
+        m = _INTEGER.match(self.text, pos)
+        if m is None:
+            raise self.fail(pos, "INTEGER")
+        self.pos = m.end()
+        return Literal(m.group(), datatype=rdflib.XSD.integer)
+
+    # [28] ValuesClause ::= ( 'VALUES' DataBlock )?
+    def ValuesClause(self, res: CompValue) -> None:
+        if self.at_keyword("VALUES"):
+            values = self.attempt(self.InlineData, "ValuesClause")
+            if values is not None:
+                res["valuesClause"] = values
+
+    # [61] InlineData ::= 'VALUES' DataBlock
+    def InlineData(self, name: str = "InlineData") -> CompValue:
+        self.expect_keyword("VALUES")
+        res = CompValue(name)
+        # [62] DataBlock ::= InlineDataOneVar | InlineDataFull
+        block = self.attempt(self.InlineDataOneVar)
+        if block is None:
+            block = self.InlineDataFull()
+        variables, values = block
+        if variables:
+            res["var"] = variables
+        if values:
+            res["value"] = values
+        return res
+
+    # [63] InlineDataOneVar ::= Var '{' ZeroOrMore(DataBlockValue) '}'
+    def InlineDataOneVar(self) -> Tuple[List[Variable], List[Any]]:
+        variables = [self.Var()]
+        self.expect("{")
+        values = []
+        while True:
+            value = self.attempt(self.DataBlockValue)
+            if value is None:
+                break
+            values.append(value)
+        self.expect("}")
+        return variables, values
+
+    # [64] InlineDataFull ::= ( NIL | '(' ZeroOrMore(Var) ')' ) '{' ( '(' ZeroOrMore(DataBlockValue) ')' | NIL )* '}'
+    def InlineDataFull(self) -> Tuple[List[Variable], List[Any]]:
+        variables = []
+        self.expect("(")
+        while True:
+            var = self.attempt(self.Var)
+            if var is None:
+                break
+            variables.append(var)
+        self.expect(")")
+        self.expect("{")
+        values = []
+        while self.accept("("):
+            row = []
+            while True:
+                value = self.attempt(self.DataBlockValue)
+                if value is None:
+                    break
+                row.append(value)
+            self.expect(")")
+            values.append(ParseResults(row))
+        self.expect("}")
+        return variables, values
+
+    # [65] DataBlockValue ::= iri | RDFLiteral | NumericLiteral | BooleanLiteral | 'UNDEF'
+    def DataBlockValue(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c in ("'", '"'):
+            return self.RDFLiteral()
+        if c in _NUMBER_START:
+            return self.NumericLiteral()
+        res = self.attempt(self.iri)
+        if res is not None:
+            return res
+        res = self.attempt(self.BooleanLiteral)
+        if res is not None:
+            return res
+        return self.expect_keyword("UNDEF")
+
+    # [53] GroupGraphPattern ::= '{' ( SubSelect | GroupGraphPatternSub ) '}'
+    def GroupGraphPattern(self) -> CompValue:
+        self.expect("{")
+        res = None
+        if self.at_keyword("SELECT"):
+            res = self.attempt(self.SubSelect)
+        if res is None:
+            res = self.GroupGraphPatternSub()
+        self.expect("}")
+        return res
+
+    # [8] SubSelect ::= SelectClause WhereClause SolutionModifier ValuesClause
+    def SubSelect(self) -> CompValue:
+        res = CompValue("SubSelect")
+        self.SelectClause(res)
+        self.WhereClause(res)
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    # [54] GroupGraphPatternSub ::= Optional(TriplesBlock) ( GraphPatternNotTriples '.'? Optional(TriplesBlock) )*
+    def GroupGraphPatternSub(self) -> CompValue:
+        res = CompValue("GroupGraphPatternSub")
+        block = self.attempt(self.TriplesBlock)
+        if block is not None:
+            _add(res, "part", block)
+        while True:
+            part = self.attempt(self.GraphPatternNotTriples)
+            if part is None:
+                return res
+            _add(res, "part", part)
+            self.accept(".")
+            block = self.attempt(self.TriplesBlock)
+            if block is not None:
+                _add(res, "part", block)
+
+    # [55] TriplesBlock ::= TriplesSameSubjectPath ( '.' Optional(TriplesBlock) )?
+    def TriplesBlock(self) -> CompValue:
+        triples = [self.TriplesSameSubject(True)]
+        while self.accept("."):
+            pos = self.pos
+            try:
+                triples.append(self.TriplesSameSubject(True))
+            except _Backtrack:
+                self.pos = pos
+                break
+        return CompValue("TriplesBlock", triples=triples)
+
+    # [56] GraphPatternNotTriples ::= GroupOrUnionGraphPattern | OptionalGraphPattern | MinusGraphPattern | GraphGraphPattern | ServiceGraphPattern | Filter | Bind | InlineData
+    def GraphPatternNotTriples(self) -> CompValue:
+        pos = self.skip()
+        if self.text.startswith("{", pos):
+            # [67] GroupOrUnionGraphPattern ::= GroupGraphPattern ( 'UNION' GroupGraphPattern )*
+            graphs = [self.GroupGraphPattern()]
+            while self.at_keyword("UNION"):
+                pos = self.pos
+                try:
+                    self.expect_keyword("UNION")
+                    graphs.append(self.GroupGraphPattern())
+                except _Backtrack:
+                    self.pos = pos
+                    break
+            return CompValue("GroupOrUnionGraphPattern", graph=graphs)
+        if self.accept_keyword("OPTIONAL"):
+            # [57] OptionalGraphPattern ::= 'OPTIONAL' GroupGraphPattern
+            return CompValue("OptionalGraphPattern", graph=self.GroupGraphPattern())
+        if self.accept_keyword("MINUS"):
+            # [66] MinusGraphPattern ::= 'MINUS' GroupGraphPattern
+            return CompValue("MinusGraphPattern", graph=self.GroupGraphPattern())
+        if self.accept_keyword("GRAPH"):
+            # [58] GraphGraphPattern ::= 'GRAPH' VarOrIri GroupGraphPattern
+            res = CompValue("GraphGraphPattern", term=self.VarOrIri())
+            res["graph"] = self.GroupGraphPattern()
+            return res
+        if self.accept_keyword("SERVICE"):
+            return self.ServiceGraphPattern()
+        if self.accept_keyword("FILTER"):
+            # [68] Filter ::= 'FILTER' Constraint
+            return CompValue("Filter", expr=self.Constraint())
+        if self.accept_keyword("BIND"):
+            # [60] Bind ::= 'BIND' '(' Expression 'AS' Var ')'
+            self.expect("(")
+            res = CompValue("Bind", expr=self.Expression())
+            self.expect_keyword("AS")
+            res["var"] = self.Var()
+            self.expect(")")
+            return res
+        if self.at_keyword("VALUES"):
+            return self.InlineData()
+        raise self.fail(pos, "GraphPatternNotTriples")
+
+    # [59] ServiceGraphPattern ::= 'SERVICE' 'SILENT'? VarOrIri GroupGraphPattern
+    def ServiceGraphPattern(self) -> CompValue:
+        silent = self.accept_keyword("SILENT")
+        term = self.VarOrIri()
+        graph = self.GroupGraphPattern()
+        # the pyparsing grammar keeps the text of the first SERVICE pattern
+        # of the query, it is found in the same way here
+        service = originalTextFor(parser.ServiceGraphPattern.expr)
+        res = CompValue(
+            "ServiceGraphPattern", service_string=service.searchString(self.text)[0][0]
+        )
+        if silent:
+            res["silent"] = "SILENT"
+        res["term"] = term
+        res["graph"] = graph
+        return res
+
+    # [69] Constraint ::= BrackettedExpression | BuiltInCall | FunctionCall
+    def Constraint(self) -> Any:
+        if self.at("("):
+            return self.BrackettedExpression()
+        res = self.attempt(self.BuiltInCall)
+        if res is not None:
+            return res
+        return self.FunctionCall()
+
+    # [70] FunctionCall ::= iri ArgList
+    def FunctionCall(self) -> Expr:
+        res = Expr("Function", op.Function, iri=self.iri())
+        self.ArgList(res)
+        return res
+
+    # [71] ArgList ::= NIL | '(' 'DISTINCT'? Expression ( ',' Expression )* ')'
+    def ArgList(self, res: CompValue) -> None:
+        if self.attempt(self.NIL) is not None:
+            return
+        self.expect("(")
+        res["distinct"] = self.Distinct()
+        res["expr"] = self.repeat(",", self.Expression, [self.Expression()])
+        self.expect(")")
+
+    def Distinct(self) -> Any:
+        if self.accept_keyword("DISTINCT"):
+            return "DISTINCT"
+        return ParseResults([])
+
+    # [72] ExpressionList ::= NIL | '(' Expression ( ',' Expression )* ')'
+    def ExpressionList(self) -> Any:
+        res = self.attempt(self.NIL)
+        if res is not None:
+            return res
+        self.expect("(")
+        expressions = self.repeat(",", self.Expression, [self.Expression()])
+        self.expect(")")
+        return ParseResults(expressions)
+
+    # ------ TRIPLES --------------
+
+    # [75] TriplesSameSubject ::= VarOrTerm PropertyListNotEmpty | TriplesNode PropertyList
+    # [81] TriplesSameSubjectPath ::= VarOrTerm PropertyListPathNotEmpty | TriplesNodePath PropertyListPath
+    def TriplesSameSubject(self, path: bool) -> ParseResults:
+        pos = self.pos
+        tokens: List[Any]
+        try:
+            tokens = [self.VarOrTerm()]
+            self.PropertyListNotEmpty(path, tokens)
+        except _Backtrack:
+            self.pos = pos
+            tokens = [self.TriplesNode(path)]
+            pos = self.pos
+            try:
+                self.PropertyListNotEmpty(path, tokens)
+            except _Backtrack:
+                self.pos = pos
+                del tokens[1:]
+        return ParseResults(parser.expandTriples(tokens))
+
+    # [77] PropertyListNotEmpty ::= Verb ObjectList ( ';' ( Verb ObjectList )? )*
+    # [83] PropertyListPathNotEmpty ::= ( VerbPath | VerbSimple ) ObjectListPath ( ';' ( ( VerbPath | VerbSimple ) ObjectListPath )? )*
+    def PropertyListNotEmpty(self, path: bool, tokens: List[Any]) -> None:
+        tokens.append(self.Verb(path))
+        self.ObjectList(path, tokens)
+        while self.accept(";"):
+            tokens.append(";")
+            pos, count = self.pos, len(tokens)
+            try:
+                tokens.append(self.Verb(path))
+                self.ObjectList(path, tokens)
+            except _Backtrack:
+                self.pos = pos
+                del tokens[count:]
+
+    # [78] Verb ::= VarOrIri | A
+    # [84] VerbPath ::= Path, [85] VerbSimple ::= Var
+    def Verb(self, path: bool) -> Any:
+        if path:
+            res = self.attempt(self.Path)
+            if res is not None:
+                return res
+            return self.Var()
+        res = self.attempt(self.VarOrIri)
+        if res is not None:
+            return res
+        self.expect("a")
+        return rdflib.RDF.type
+
+    # [79] ObjectList ::= Object ( ',' Object )*
+    # [86] ObjectListPath ::= ObjectPath ( ',' ObjectPath )*
+    def ObjectList(self, path: bool, tokens: List[Any]) -> None:
+        tokens.append(self.GraphNode(path))
+        while True:
+            pos = self.pos
+            if not self.accept(","):
+                return
+            try:
+                node = self.GraphNode(path)
+            except _Backtrack:
+                self.pos = pos
+                return
+            tokens.append(",")
+            tokens.append(node)
+
+    # [104] GraphNode ::= VarOrTerm | TriplesNode
+    # [105] GraphNodePath ::= VarOrTerm | TriplesNodePath
+    def GraphNode(self, path: bool) -> Any:
+        res = self.attempt(self.VarOrTerm)
+        if res is not None:
+            return res
+        return self.TriplesNode(path)
+
+    # [98] TriplesNode ::= Collection | BlankNodePropertyList
+    # [100] TriplesNodePath ::= CollectionPath | BlankNodePropertyListPath
+    def TriplesNode(self, path: bool) -> List[Any]:
+        if self.accept("("):
+            # [102] Collection ::= '(' GraphNode+ ')'
+            nodes = [self.GraphNode(path)]
+            while True:
+                node = self.attempt(self.GraphNode, path)
+                if node is None:
+                    break
+                nodes.append(node)
+            self.expect(")")
+            return parser.expandCollection(nodes)[0]
+        # [99] BlankNodePropertyList ::= '[' PropertyListNotEmpty ']'
+        self.expect("[")
+        tokens: List[Any] = [BNode()]
+        self.PropertyListNotEmpty(path, tokens)
+        self.expect("]")
+        return parser.expandTriples(tokens)
+
+    # [52*] TriplesTemplate ::= TriplesSameSubject ( '.' TriplesSameSubject? )*
+    def TriplesTemplate(self, triples: List[Any]) -> List[Any]:
+        triples.append(self.TriplesSameSubject(False))
+        while self.accept("."):
+            same_subject = self.attempt(self.TriplesSameSubject, False)
+            if same_subject is not None:
+                triples.append(same_subject)
+        return triples
+
+    # [74] ConstructTriples ::= TriplesSameSubject ( '.' Optional(ConstructTriples) )?
+    def ConstructTriples(self) -> List[Any]:
+        triples = [self.TriplesSameSubject(False)]
+        while self.accept("."):
+            same_subject = self.attempt(self.TriplesSameSubject, False)
+            if same_subject is None:
+                break
+            triples.append(same_subject)
+        return triples
+
+    # ------ PATHS --------------
+
+    # [88] Path ::= PathAlternative
+    # [89] PathAlternative ::= PathSequence ( '|' PathSequence )*
+    def Path(self) -> CompValue:
+        parts = self.repeat("|", self.PathSequence, [self.PathSequence()])
+        return CompValue("PathAlternative", part=parts)
+
+    # [90] PathSequence ::= PathEltOrInverse ( '/' PathEltOrInverse )*
+    def PathSequence(self) -> CompValue:
+        parts = self.repeat("/", self.PathEltOrInverse, [self.PathEltOrInverse()])
+        return CompValue("PathSequence", part=parts)
+
+    # [92] PathEltOrInverse ::= PathElt | '^' PathElt
+    def PathEltOrInverse(self) -> CompValue:
+        if self.accept("^"):
+            return CompValue("PathEltOrInverse", part=self.PathElt())
+        return self.PathElt()
+
+    # [91] PathElt ::= PathPrimary PathMod?
+    def PathElt(self) -> CompValue:
+        res = CompValue("PathElt", part=self.PathPrimary())
+        # [93] PathMod ::= '?' | '*' | '+', without whitespace before it
+        mod = self.text[self.pos : self.pos + 1]
+        if mod in ("?", "*", "+"):
+            res["mod"] = mod
+            self.pos += 1
+        return res
+
+    # [94] PathPrimary ::= iri | A | '!' PathNegatedPropertySet | '(' Path ')' | 'DISTINCT' '(' Path ')'
+    def PathPrimary(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c == "!":
+            self.pos = pos + 1
+            return self.PathNegatedPropertySet()
+        if c == "(":
+            self.pos = pos + 1
+            res = self.Path()
+            self.expect(")")
+            return res
+        res = self.attempt(self.iri)
+        if res is not None:
+            return res
+        if c == "a":
+            self.pos = pos + 1
+            return rdflib.RDF.type
+        self.expect_keyword("DISTINCT")
+        self.expect("(")
+        res = CompValue("DistinctPath", part=self.Path())
+        self.expect(")")
+        return res
+
+    # [95] PathNegatedPropertySet ::= PathOneInPropertySet | '(' ( PathOneInPropertySet ( '|' PathOneInPropertySet )* )? ')'
+    def PathNegatedPropertySet(self) -> CompValue:
+        res = CompValue("PathNegatedPropertySet")
+        part = self.attempt(self.PathOneInPropertySet)
+        if part is not None:
+            res["part"] = [part]
+            return res
+        self.expect("(")
+        part = self.attempt(self.PathOneInPropertySet)
+        if part is not None:
+            res["part"] = self.repeat("|", self.PathOneInPropertySet, [part])
+        self.expect(")")
+        return res
+
+    # [96] PathOneInPropertySet ::= iri | A | '^' ( iri | A )
+    def PathOneInPropertySet(self) -> Any:
+        inverse = self.accept("^")
+        res = self.attempt(self.iri)
+        if res is None:
+            self.expect("a")
+            res = rdflib.RDF.type
+        if inverse:
+            # the pyparsing grammar does not keep the iri of an inverse path
+            return CompValue("InversePath")
+        return res
+
+    # ------ EXPRESSIONS --------------
+
+    # [110] Expression ::= ConditionalOrExpression
+    # [111] ConditionalOrExpression ::= ConditionalAndExpression ( '||' ConditionalAndExpression )*
+    def Expression(self) -> Expr:
+        res = Expr(
+            "ConditionalOrExpression",
+            op.ConditionalOrExpression,
+            expr=self.ConditionalAndExpression(),
+        )
+        other = self.repeat("||", self.ConditionalAndExpression, [])
+        if other:
+            res["other"] = other
+        return res
+
+    # [112] ConditionalAndExpression ::= ValueLogical ( '&&' ValueLogical )*
+    def ConditionalAndExpression(self) -> Expr:
+        res = Expr(
+            "ConditionalAndExpression",
+            op.ConditionalAndExpression,
+            expr=self.RelationalExpression(),
+        )
+        other = self.repeat("&&", self.RelationalExpression, [])
+        if other:
+            res["other"] = other
+        return res
+
+    # [114] RelationalExpression ::= NumericExpression ( '=' NumericExpression | '!=' NumericExpression | '<' NumericExpression | '>' NumericExpression | '<=' NumericExpression | '>=' NumericExpression | 'IN' ExpressionList | 'NOT' 'IN' ExpressionList )?
+    def RelationalExpression(self) -> Expr:
+        res = Expr(
+            "RelationalExpression",
+            op.RelationalExpression,
+            expr=self.AdditiveExpression(),
+        )
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c in ("=", "!", "<", ">"):
+            for operator in ("=", "!=", "<", ">", "<=", ">="):
+                if self.text.startswith(operator, pos):
+                    self.pos = pos + len(operator)
+                    other = self.attempt(self.AdditiveExpression)
+                    if other is not None:
+                        res["op"] = operator
+                        res["other"] = other
+                        return res
+                    self.pos = pos
+        elif c in ("I", "i", "N", "n"):
+            for operator in ("IN", "NOT IN"):
+                pos = self.pos
+                try:
+                    for keyword in operator.split():
+                        self.expect_keyword(keyword)
+                    other = self.ExpressionList()
+                except _Backtrack:
+                    self.pos = pos
+                else:
+                    res["op"] = operator
+                    res["other"] = other
+                    return res
+        return res
+
+    # [115] NumericExpression ::= AdditiveExpression
+    # [116] AdditiveExpression ::= MultiplicativeExpression ( '+' MultiplicativeExpression | '-' MultiplicativeExpression )*
+    def AdditiveExpression(self) -> Expr:
+        res = Expr(
+            "AdditiveExpression",
+            op.AdditiveExpression,
+            expr=self.MultiplicativeExpression(),
+        )
+        self.Operations(res, ("+", "-"), self.MultiplicativeExpression)
+        return res
+
+    # [117] MultiplicativeExpression ::= UnaryExpression ( '*' UnaryExpression | '/' UnaryExpression )*
+    def MultiplicativeExpression(self) -> Expr:
+        res = Expr(
+            "MultiplicativeExpression",
+            op.MultiplicativeExpression,
+            expr=self.UnaryExpression(),
+        )
+        self.Operations(res, ("*", "/"), self.UnaryExpression)
+        return res
+
+    def Operations(
+        self, res: Expr, operators: Tuple[str, str], operand: Callable[[], Expr]
+    ) -> None:
+        while True:
+            pos = self.skip()
+            operator = self.text[pos : pos + 1]
+            if operator not in operators:
+                return
+            self.pos = pos + 1
+            other = self.attempt(operand)
+            if other is None:
+                self.pos = pos
+                return
+            _add(res, "op", operator)
+            _add(res, "other", other)
+
+    # [118] UnaryExpression ::= '!' PrimaryExpression | '+' PrimaryExpression | '-' PrimaryExpression | PrimaryExpression
+    def UnaryExpression(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c in ("!", "+", "-"):
+            self.pos = pos + 1
+            expr = self.attempt(self.PrimaryExpression)
+            if expr is not None:
+                if c == "!":
+                    return Expr("UnaryNot", op.UnaryNot, expr=expr)
+                if c == "+":
+                    return Expr("UnaryPlus", op.UnaryPlus, expr=expr)
+                return Expr("UnaryMinus", op.UnaryMinus, expr=expr)
+            self.pos = pos
+        return self.PrimaryExpression()
+
+    # [119] PrimaryExpression ::= BrackettedExpression | BuiltInCall | iriOrFunction | RDFLiteral | NumericLiteral | BooleanLiteral | Var
+    def PrimaryExpression(self) -> Any:
+        pos = self.skip()
+        c = self.text[pos : pos + 1]
+        if c == "(":
+            return self.BrackettedExpression()
+        if c in ("?", "$"):
+            return self.Var()
+        if c in ("'", '"'):
+            return self.RDFLiteral()
+        if c in _NUMBER_START:
+            return self.NumericLiteral()
+        if c == "<":
+            return self.iriOrFunction()
+        res = self.attempt(self.BuiltInCall)
+        if res is not None:
+            return res
+        res = self.attempt(self.iriOrFunction)
+        if res is not None:
+            return res
+        return self.BooleanLiteral()
+
+    # [120] BrackettedExpression ::= '(' Expression ')'
+    def BrackettedExpression(self) -> Expr:
+        self.expect("(")
+        res = self.Expression()
+        self.expect(")")
+        return res
+
+    # [128] iriOrFunction ::= iri Optional(ArgList)
+    def iriOrFunction(self) -> Any:
+        iri = self.iri()
+        pos = self.pos
+        res = Expr("Function", op.Function, iri=iri)
+        try:
+            self.ArgList(res)
+        except _Backtrack:
+            self.pos = pos
+            return iri
+        return res
+
+    # [121] BuiltInCall ::= Aggregate | 'STR' '(' Expression ')' | ...
+    def BuiltInCall(self) -> CompValue:
+        pos = self.skip()
+        for keyword in _BUILTINS_BY_INITIAL.get(self.text[pos : pos + 1].upper(), ()):
+            if self.keyword_at(pos, keyword):
+                self.pos = pos + len(keyword)
+                break
+        else:
+            raise self.fail(pos, "BuiltInCall")
+
+        if keyword in _BUILTINS:
+            name, evalfn, args = _BUILTINS[keyword]
+            res = Expr(name, evalfn)
+            self.Arguments(res, args)
+            return res
+        if keyword in _NIL_BUILTINS:
+            name, evalfn = _NIL_BUILTINS[keyword]
+            self.NIL()
+            return Expr(name, evalfn)
+        if keyword in _AGGREGATES:
+            return self.Aggregate(_AGGREGATES[keyword])
+        if keyword == "BOUND":
+            self.expect("(")
+            res = Expr("Builtin_BOUND", op.Builtin_BOUND, arg=self.Var())
+            self.expect(")")
+            return res
+        if keyword == "BNODE":
+            res = Expr("Builtin_BNODE", op.Builtin_BNODE)
+            if self.attempt(self.Arguments, res, ("arg",)) is None:
+                self.NIL()
+            return res
+        if keyword == "CONCAT":
+            return Expr("Builtin_CONCAT", op.Builtin_CONCAT, arg=self.ExpressionList())
+        if keyword == "COALESCE":
+            return Expr(
+                "Builtin_COALESCE", op.Builtin_COALESCE, arg=self.ExpressionList()
+            )
+        if keyword == "SUBSTR":
+            # [123] SubstringExpression ::= 'SUBSTR' '(' Expression ',' Expression ( ',' Expression )? ')'
+            res = Expr("Builtin_SUBSTR", op.Builtin_SUBSTR)
+            self.Arguments(res, ("arg", "start"), "length")
+            return res
+        if keyword == "REPLACE":
+            # [124] StrReplaceExpression ::= 'REPLACE' '(' Expression ',' Expression ',' Expression ( ',' Expression )? ')'
+            res = Expr("Builtin_REPLACE", op.Builtin_REPLACE)
+            self.Arguments(res, ("arg", "pattern", "replacement"), "flags")
+            return res
+        if keyword == "REGEX":
+            # [122] RegexExpression ::= 'REGEX' '(' Expression ',' Expression ( ',' Expression )? ')'
+            res = Expr("Builtin_REGEX", op.Builtin_REGEX)
+            self.Arguments(res, ("text", "pattern"), "flags")
+            return res
+        if keyword == "EXISTS":
+            # [125] ExistsFunc ::= 'EXISTS' GroupGraphPattern
+            return Expr(
+                "Builtin_EXISTS", op.Builtin_EXISTS, graph=self.GroupGraphPattern()
+            )
+        # [126] NotExistsFunc ::= 'NOT' 'EXISTS' GroupGraphPattern
+        self.expect_keyword("EXISTS")
+        return Expr(
+            "Builtin_NOTEXISTS", op.Builtin_EXISTS, graph=self.GroupGraphPattern()
+        )
+
+    def Arguments(
+        self, res: CompValue, args: Tuple[str, ...], optional: Optional[str] = None
+    ) -> CompValue:
+        """
+        Parses ``'(' Expression ( ',' Expression )* ')'`` with an expression
+        for each of args and optionally one more
+        """
+        self.expect("(")
+        for index, arg in enumerate(args):
+            if index:
+                self.expect(",")
+            res[arg] = self.Expression()
+        if optional is not None and self.at(","):
+            pos = self.pos
+            try:
+                self.expect(",")
+                res[optional] = self.Expression()
+            except _Backtrack:
+                self.pos = pos
+        self.expect(")")
+        return res
+
+    # [127] Aggregate ::= 'COUNT' '(' 'DISTINCT'? ( '*' | Expression ) ')' | 'SUM' '(' 'DISTINCT'? Expression ')' | ...
+    def Aggregate(self, name: str) -> CompValue:
+        self.expect("(")
+        res = CompValue(name, distinct=self.Distinct())
+        if name == "Aggregate_Count" and self.accept("*"):
+            res["vars"] = "*"
+        else:
+            res["vars"] = self.Expression()
+        if name == "Aggregate_GroupConcat" and self.at(";"):
+            pos = self.pos
+            try:
+                self.expect(";")
+                self.expect_keyword("SEPARATOR")
+                self.expect("=")
+                res["separator"] = self.String()
+            except _Backtrack:
+                self.pos = pos
+        self.expect(")")
+        return res
+
+    # ------ QUERIES --------------
+
+    # [2] Query ::= Prologue ( SelectQuery | ConstructQuery | DescribeQuery | AskQuery )
+    def Query(self) -> ParseResults:
+        prologue = self.Prologue()
+        pos = self.skip()
+        if self.keyword_at(pos, "SELECT"):
+            query = self.SelectQuery()
+        elif self.keyword_at(pos, "CONSTRUCT"):
+            query = self.ConstructQuery()
+        elif self.keyword_at(pos, "DESCRIBE"):
+            query = self.DescribeQuery()
+        elif self.keyword_at(pos, "ASK"):
+            query = self.AskQuery()
+        else:
+            raise self.fail(pos, "SELECT, CONSTRUCT, DESCRIBE or ASK")
+        return ParseResults([prologue, query])
+
+    # [7] SelectQuery ::= SelectClause DatasetClause* WhereClause SolutionModifier
+    def SelectQuery(self) -> CompValue:
+        res = CompValue("SelectQuery")
+        self.SelectClause(res)
+        clauses = self.DatasetClauses()
+        if clauses:
+            res["datasetClause"] = clauses
+        self.WhereClause(res)
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    # [10] ConstructQuery ::= 'CONSTRUCT' ( ConstructTemplate DatasetClause* WhereClause SolutionModifier | DatasetClause* 'WHERE' '{' TriplesTemplate? '}' SolutionModifier )
+    def ConstructQuery(self) -> CompValue:
+        self.expect_keyword("CONSTRUCT")
+        res = self.attempt(self.ConstructTemplateQuery)
+        if res is not None:
+            return res
+        res = CompValue("ConstructQuery")
+        clauses = self.DatasetClauses()
+        if clauses:
+            res["datasetClause"] = clauses
+        self.expect_keyword("WHERE")
+        self.expect("{")
+        triples = self.attempt(self.TriplesTemplate, [])
+        if triples is not None:
+            block = CompValue("TriplesBlock", triples=triples)
+            res["where"] = CompValue("FakeGroupGraphPatten", part=[block])
+        self.expect("}")
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    def ConstructTemplateQuery(self) -> CompValue:
+        res = CompValue("ConstructQuery")
+        # [73] ConstructTemplate ::= '{' ConstructTriples? '}'
+        self.expect("{")
+        template = self.attempt(self.ConstructTriples)
+        if template is not None:
+            res["template"] = template
+        self.expect("}")
+        clauses = self.DatasetClauses()
+        if clauses:
+            res["datasetClause"] = clauses
+        self.WhereClause(res)
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    # [11] DescribeQuery ::= 'DESCRIBE' ( VarOrIri+ | '*' ) DatasetClause* WhereClause? SolutionModifier
+    def DescribeQuery(self) -> CompValue:
+        self.expect_keyword("DESCRIBE")
+        res = CompValue("DescribeQuery")
+        variables = []
+        while True:
+            var = self.attempt(self.VarOrIri)
+            if var is None:
+                break
+            variables.append(var)
+        if variables:
+            res["var"] = variables
+        else:
+            self.expect("*")
+        clauses = self.DatasetClauses()
+        if clauses:
+            res["datasetClause"] = clauses
+        self.attempt(self.WhereClause, res)
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    # [12] AskQuery ::= 'ASK' DatasetClause* WhereClause SolutionModifier
+    def AskQuery(self) -> CompValue:
+        self.expect_keyword("ASK")
+        res = CompValue("AskQuery", datasetClause=_tokens(self.DatasetClauses()))
+        self.WhereClause(res)
+        self.SolutionModifier(res)
+        self.ValuesClause(res)
+        return res
+
+    # ------ UPDATES --------------
+
+    # [3] UpdateUnit ::= Update
+    # [29] Update ::= Prologue ( Update1 ( ';' Update )? )?
+    def Update(self) -> CompValue:
+        res = CompValue("Update")
+        while True:
+            _add(res, "prologue", self.Prologue())
+            request = self.attempt(self.Update1)
+            if request is None:
+                return res
+            _add(res, "request", request)
+            if not self.accept(";"):
+                return res
+
+    # [30] Update1 ::= Load | Clear | Drop | Add | Move | Copy | Create | InsertData | DeleteData | DeleteWhere | Modify
+    def Update1(self) -> CompValue:
+        pos = self.skip()
+        for keyword in ("LOAD", "CLEAR", "DROP", "CREATE", "ADD", "MOVE", "COPY"):
+            if self.keyword_at(pos, keyword):
+                self.pos = pos + len(keyword)
+                return getattr(self, keyword.capitalize())()
+        for keyword in ("INSERT", "DELETE"):
+            if self.keyword_at(pos, keyword):
+                self.pos = pos + len(keyword)
+                res = self.attempt(self.QuadData, keyword)
+                if res is not None:
+                    return res
+                self.pos = pos
+        return self.Modify()
+
+    def Silent(self, res: CompValue) -> None:
+        if self.accept_keyword("SILENT"):
+            res["silent"] = "SILENT"
+
+    # [31] Load ::= 'LOAD' 'SILENT'? iri ( 'INTO' GraphRef )?
+    def Load(self) -> CompValue:
+        res = CompValue("Load")
+        self.Silent(res)
+        res["iri"] = self.iri()
+        if self.at_keyword("INTO"):
+            pos = self.pos
+            try:
+                self.expect_keyword("INTO")
+                graph = self.GraphRef()
+            except _Backtrack:
+                self.pos = pos
+            else:
+                res["graphiri"] = graph
+        return res
+
+    # [32] Clear ::= 'CLEAR' 'SILENT'? GraphRefAll
+    def Clear(self, name: str = "Clear") -> CompValue:
+        res = CompValue(name)
+        self.Silent(res)
+        # [47] GraphRefAll ::= GraphRef | 'DEFAULT' | 'NAMED' | 'ALL'
+        graph = self.attempt(self.GraphRef)
+        if graph is None:
+            for keyword in ("DEFAULT", "NAMED", "ALL"):
+                if self.accept_keyword(keyword):
+                    graph = keyword
+                    break
+            else:
+                raise _Backtrack()
+        res["graphiri"] = graph
+        return res
+
+    # [33] Drop ::= 'DROP' 'SILENT'? GraphRefAll
+    def Drop(self) -> CompValue:
+        return self.Clear("Drop")
+
+    # [34] Create ::= 'CREATE' 'SILENT'? GraphRef
+    def Create(self) -> CompValue:
+        res = CompValue("Create")
+        self.Silent(res)
+        res["graphiri"] = self.GraphRef()
+        return res
+
+    # [46] GraphRef ::= 'GRAPH' iri
+    def GraphRef(self) -> Any:
+        self.expect_keyword("GRAPH")
+        return self.iri()
+
+    # [35] Add ::= 'ADD' 'SILENT'? GraphOrDefault 'TO' GraphOrDefault
+    def Add(self, name: str = "Add") -> CompValue:
+        res = CompValue(name)
+        self.Silent(res)
+        graphs = [self.GraphOrDefault()]
+        self.expect_keyword("TO")
+        graphs.append(self.GraphOrDefault())
+        res["graph"] = graphs
+        return res
+
+    # [36] Move ::= 'MOVE' 'SILENT'? GraphOrDefault 'TO' GraphOrDefault
+    def Move(self) -> CompValue:
+        return self.Add("Move")
+
+    # [37] Copy ::= 'COPY' 'SILENT'? GraphOrDefault 'TO' GraphOrDefault
+    def Copy(self) -> CompValue:
+        return self.Add("Copy")
+
+    # [45] GraphOrDefault ::= 'DEFAULT' | 'GRAPH'? iri
+    def GraphOrDefault(self) -> Any:
+        if self.accept_keyword("DEFAULT"):
+            return "DEFAULT"
+        self.accept_keyword("GRAPH")
+        return self.iri()
+
+    # [38] InsertData ::= 'INSERT DATA' QuadData
+    # [39] DeleteData ::= 'DELETE DATA' QuadData
+    # [40] DeleteWhere ::= 'DELETE WHERE' QuadPattern
+    def QuadData(self, keyword: str) -> CompValue:
+        if self.accept_keyword("DATA"):
+            name = "InsertData" if keyword == "INSERT" else "DeleteData"
+        elif keyword == "DELETE" and self.accept_keyword("WHERE"):
+            name = "DeleteWhere"
+        else:
+            raise _Backtrack()
+        return CompValue(name, quads=self.QuadPattern())
+
+    # [48] QuadPattern ::= '{' Quads '}'
+    # [49] QuadData ::= '{' Quads '}'
+    def QuadPattern(self) -> CompValue:
+        self.expect("{")
+        res = self.Quads()
+        self.expect("}")
+        return res
+
+    # [50] Quads ::= TriplesTemplate? ( QuadsNotTriples '.'? TriplesTemplate? )*
+    def Quads(self) -> CompValue:
+        res = CompValue("Quads")
+        triples: List[Any] = []
+        self.attempt(self.TriplesTemplate, triples)
+        if triples:
+            res["triples"] = triples
+        while self.at_keyword("GRAPH"):
+            quads = self.attempt(self.QuadsNotTriples)
+            if quads is None:
+                break
+            _add(res, "quadsNotTriples", quads)
+            self.accept(".")
+            self.attempt(self.TriplesTemplate, triples)
+            if triples and "triples" not in res:
+                res["triples"] = triples
+        return res
+
+    # [51] QuadsNotTriples ::= 'GRAPH' VarOrIri '{' TriplesTemplate? '}'
+    def QuadsNotTriples(self) -> CompValue:
+        self.expect_keyword("GRAPH")
+        res = CompValue("QuadsNotTriples", term=self.VarOrIri())
+        self.expect("{")
+        triples = self.attempt(self.TriplesTemplate, [])
+        if triples is not None:
+            res["triples"] = triples
+        self.expect("}")
+        return res
+
+    # [41] Modify ::= ( 'WITH' iri )? ( DeleteClause InsertClause? | InsertClause ) UsingClause* 'WHERE' GroupGraphPattern
+    def Modify(self) -> CompValue:
+        res = CompValue("Modify")
+        if self.at_keyword("WITH"):
+            pos = self.pos
+            try:
+                self.expect_keyword("WITH")
+                res["withClause"] = self.iri()
+            except _Backtrack:
+                self.pos = pos
+        # [42] DeleteClause ::= 'DELETE' QuadPattern
+        # [43] InsertClause ::= 'INSERT' QuadPattern
+        delete = self.attempt(self.QuadClause, "DELETE")
+        if delete is not None:
+            res["delete"] = delete
+            insert = self.attempt(self.QuadClause, "INSERT")
+        else:
+            insert = self.QuadClause("INSERT")
+        if insert is not None:
+            res["insert"] = insert
+        while self.at_keyword("USING"):
+            using = self.attempt(self.UsingClause)
+            if using is None:
+                break
+            _add(res, "using", using)
+        self.expect_keyword("WHERE")
+        res["where"] = self.GroupGraphPattern()
+        return res
+
+    def QuadClause(self, keyword: str) -> CompValue:
+        self.expect_keyword(keyword)
+        name = "DeleteClause" if keyword == "DELETE" else "InsertClause"
+        return CompValue(name, quads=self.QuadPattern())
+
+    # [44] UsingClause ::= 'USING' ( iri | 'NAMED' iri )
+    def UsingClause(self) -> CompValue:
+        self.expect_keyword("USING")
+        default = self.attempt(self.iri)
+        if default is not None:
+            return CompValue("UsingClause", default=default)
+        self.expect_keyword("NAMED")
+        return CompValue("UsingClause", named=self.iri())
+
+    # ------ ENTRY POINTS --------------
+
+    def parse(self, production: Callable[[], Any]) -> Any:
+        """
+        Parses the whole string with the given production, raises a
+        :class:`pyparsing.ParseException` if it does not match
+        """
+        try:
+            res = production()
+            self.pos = self.skip()
+            if self.pos < len(self.text):
+                raise self.fail(self.pos, "end of text")
+        except _Backtrack:
+            self._raise()
+        return res
+
+    def _raise(self) -> NoReturn:
+        raise ParseException(
+            self.text, self.error_pos, "Expected %s" % self.expected
+        ) from None
+
+
+def parseQuery(q: str) -> ParseResults:
+    """
+    Parses a SPARQL query, after its unicode escapes were expanded, into the
+    same tree as :func:`rdflib.plugins.sparql.parser.parseQuery`
+    """
+    p = Parser(q)
+    return p.parse(p.Query)
+
+
+def parseUpdate(q: str) -> CompValue:
+    """
+    Parses a SPARQL update, after its unicode escapes were expanded, into the
+    same tree as :func:`rdflib.plugins.sparql.parser.parseUpdate`
+    """
+    p = Parser(q)
+    return p.parse(p.Update)
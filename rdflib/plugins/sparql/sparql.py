@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import collections
 import datetime
-import itertools
+import threading
 import typing as t
 from typing import (
     TYPE_CHECKING,
@@ -114,26 +114,123 @@ class Bindings(MutableMapping):
         return str(self)
 
 
+class VariableSchema:
+    """
+    The positions of the variables of the solutions of a query
+
+    Solutions made from the same schema keep their values in tuples indexed
+    by these positions, instead of in a dict each. Variables that only
+    become known while the query is evaluated, like the blank nodes of a
+    pattern, are added when they are first bound, and a position never
+    changes once it is given out.
+    """
+
+    __slots__ = ("index", "variables", "_lock", "__weakref__")
+
+    def __init__(self, variables: Iterable[Identifier] = ()):
+        self.index: Dict[Identifier, int] = {}
+        self.variables: List[Identifier] = []
+        self._lock = threading.Lock()
+        for variable in variables:
+            self.position(variable)
+
+    def position(self, variable: Identifier) -> int:
+        try:
+            return self.index[variable]
+        except KeyError:
+            pass
+        with self._lock:
+            if variable not in self.index:
+                self.variables.append(variable)
+                self.index[variable] = len(self.variables) - 1
+            return self.index[variable]
+
+    def freeze(
+        self,
+        items: Iterable[Tuple[Identifier, Any]],
+        values: Tuple[Any, ...] = (),
+    ) -> Tuple[Any, ...]:
+        """
+        The tuple of ``values`` with the variables of ``items`` set, later
+        items replacing earlier ones as in a dict.
+        """
+        row = list(values)
+        for key, value in items:
+            position = self.position(key)
+            if position >= len(row):
+                row.extend([None] * (position + 1 - len(row)))
+            row[position] = value
+        return _trim(row)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def __repr__(self) -> str:
+        return "VariableSchema(%r)" % self.variables
+
+
+def _trim(row: List[Any]) -> Tuple[Any, ...]:
+    while row and row[-1] is None:
+        row.pop()
+    return tuple(row)
+
+
 class FrozenDict(Mapping):
     """
     An immutable hashable dict
 
     Taken from http://stackoverflow.com/a/2704866/81121
 
+    The values are kept in a tuple indexed by the positions of a
+    :class:`VariableSchema`, with None for the variables that are not bound.
+    Merging, projecting or comparing two solutions of the same schema works
+    on these tuples directly.
     """
 
+    __slots__ = ("_schema", "_values", "_hash")
+
     def __init__(self, *args: Any, **kwargs: Any):
-        self._d: Dict[Identifier, Identifier] = dict(*args, **kwargs)
+        d: Dict[Identifier, Identifier] = dict(*args, **kwargs)
+        self._schema = VariableSchema(d)
+        self._values: Tuple[Any, ...] = _trim(list(d.values()))
         self._hash: Optional[int] = None
 
+    def _new(self, values: Tuple[Any, ...]) -> "FrozenDict":
+        res = FrozenDict.__new__(FrozenDict)
+        res._schema = self._schema
+        res._values = values
+        res._hash = None
+        return res
+
+    def _same_schema(self, other: Any) -> bool:
+        return isinstance(other, FrozenDict) and other._schema is self._schema
+
     def __iter__(self):
-        return iter(self._d)
+        for key, value in zip(self._schema.variables, self._values):
+            if value is not None:
+                yield key
 
     def __len__(self) -> int:
-        return len(self._d)
+        return len(self._values) - self._values.count(None)
 
     def __getitem__(self, key: Identifier) -> Identifier:
-        return self._d[key]
+        position = self._schema.index.get(key)
+        if position is None or position >= len(self._values):
+            raise KeyError(key)
+        value = self._values[position]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _items(self) -> Generator[Tuple[Identifier, Identifier], None, None]:
+        for key, value in zip(self._schema.variables, self._values):
+            if value is not None:
+                yield key, value
+
+    def __eq__(self, other: Any) -> bool:
+        if self._same_schema(other):
+            return self._values == other._values
+        return Mapping.__eq__(self, other)
 
     def __hash__(self) -> int:
         # It would have been simpler and maybe more obvious to
@@ -143,18 +240,37 @@ class FrozenDict(Mapping):
         # urge to optimize when it will gain improved algorithmic performance.
         if self._hash is None:
             self._hash = 0
-            for key, value in self.items():
+            for key, value in self._items():
                 self._hash ^= hash(key)
                 self._hash ^= hash(value)
         return self._hash
 
     def project(self, vars: Container[Variable]) -> "FrozenDict":
-        return FrozenDict((x for x in self.items() if x[0] in vars))
+        return self._new(
+            _trim(
+                [
+                    value if key in vars else None
+                    for key, value in zip(self._schema.variables, self._values)
+                ]
+            )
+        )
 
     def disjointDomain(self, other: t.Mapping[Identifier, Identifier]) -> bool:
+        if self._same_schema(other):
+            return all(
+                a is None or b is None
+                # type error: "Mapping[Identifier, Identifier]" has no attribute "_values"
+                for a, b in zip(self._values, other._values)  # type: ignore[attr-defined]
+            )
         return not bool(set(self).intersection(other))
 
     def compatible(self, other: t.Mapping[Identifier, Identifier]) -> bool:
+        if self._same_schema(other):
+            return all(
+                a is None or b is None or a == b
+                # type error: "Mapping[Identifier, Identifier]" has no attribute "_values"
+                for a, b in zip(self._values, other._values)  # type: ignore[attr-defined]
+            )
         for k in self:
             try:
                 if self[k] != other[k]:
@@ -165,22 +281,54 @@ class FrozenDict(Mapping):
         return True
 
     def merge(self, other: t.Mapping[Identifier, Identifier]) -> "FrozenDict":
-        res = FrozenDict(itertools.chain(self.items(), other.items()))
-
-        return res
+        if self._same_schema(other):
+            # type error: "Mapping[Identifier, Identifier]" has no attribute "_values"
+            values = other._values  # type: ignore[attr-defined]
+            if len(values) > len(self._values):
+                values, rest = values[: len(self._values)], values[len(self._values) :]
+            else:
+                rest = self._values[len(values) :]
+            return self._new(
+                tuple(a if b is None else b for a, b in zip(self._values, values))
+                + rest
+            )
+        return self._new(self._schema.freeze(other.items(), self._values))
 
     def __str__(self) -> str:
-        return str(self._d)
+        return str(dict(self._items()))
 
     def __repr__(self) -> str:
-        return repr(self._d)
+        return repr(dict(self._items()))
 
 
 class FrozenBindings(FrozenDict):
+    """
+    A solution of a query, made from the :class:`VariableSchema` of its
+    context.
+    """
+
+    __slots__ = ("ctx",)
+
     def __init__(self, ctx: "QueryContext", *args, **kwargs):
-        FrozenDict.__init__(self, *args, **kwargs)
+        self._schema = ctx.schema
+        self._values = self._schema.freeze(dict(*args, **kwargs).items())
+        self._hash = None
         self.ctx = ctx
 
+    def _new(self, values: Tuple[Any, ...]) -> "FrozenBindings":
+        res = FrozenBindings.__new__(FrozenBindings)
+        res._schema = self._schema
+        res._values = values
+        res._hash = None
+        res.ctx = self.ctx
+        return res
+
+    def _rebind(self, ctx: "QueryContext") -> "FrozenBindings":
+        """the same solution in ctx, which has the same schema"""
+        res = self._new(self._values)
+        res.ctx = ctx
+        return res
+
     def __getitem__(self, key: Union[Identifier, str]) -> Identifier:
         if not isinstance(key, Node):
             key = Variable(key)
@@ -188,19 +336,24 @@ class FrozenBindings(FrozenDict):
         if not isinstance(key, (BNode, Variable)):
             return key
 
-        if key not in self._d:
+        position = self._schema.index.get(key)
+        if position is None or position >= len(self._values):
+            value = None
+        else:
+            value = self._values[position]
+        if value is None:
             # type error: Value of type "Optional[Dict[Variable, Identifier]]" is not indexable
             # type error: Invalid index type "Union[BNode, Variable]" for "Optional[Dict[Variable, Identifier]]"; expected type "Variable"
             return self.ctx.initBindings[key]  # type: ignore[index]
-        else:
-            return self._d[key]
+        return value
 
     def project(self, vars: Container[Variable]) -> "FrozenBindings":
-        return FrozenBindings(self.ctx, (x for x in self.items() if x[0] in vars))
+        # type error: Incompatible return value type (got "FrozenDict", expected "FrozenBindings")
+        return FrozenDict.project(self, vars)  # type: ignore[return-value]
 
     def merge(self, other: t.Mapping[Identifier, Identifier]) -> "FrozenBindings":
-        res = FrozenBindings(self.ctx, itertools.chain(self.items(), other.items()))
-        return res
+        # type error: Incompatible return value type (got "FrozenDict", expected "FrozenBindings")
+        return FrozenDict.merge(self, other)  # type: ignore[return-value]
 
     @property
     def now(self) -> datetime.datetime:
@@ -225,25 +378,28 @@ class FrozenBindings(FrozenDict):
             _except = []
 
         # bindings from initBindings are newer forgotten
-        return FrozenBindings(
-            self.ctx,
-            (
-                x
-                for x in self.items()
-                if (
-                    x[0] in _except
-                    # type error: Unsupported right operand type for in ("Optional[Dict[Variable, Identifier]]")
-                    or x[0] in self.ctx.initBindings  # type: ignore[operator]
-                    or before[x[0]] is None
-                )
-            ),
+        return self._new(
+            _trim(
+                [
+                    value
+                    if value is not None
+                    and (
+                        key in _except
+                        # type error: Unsupported right operand type for in ("Optional[Dict[Variable, Identifier]]")
+                        or key in self.ctx.initBindings  # type: ignore[operator]
+                        or before[key] is None
+                    )
+                    else None
+                    for key, value in zip(self._schema.variables, self._values)
+                ]
+            )
         )
 
     def remember(self, these) -> FrozenBindings:
         """
         return a frozen dict only of bindings in these
         """
-        return FrozenBindings(self.ctx, (x for x in self.items() if x[0] in these))
+        return self.project(these)
 
 
 class QueryContext(object):
@@ -256,6 +412,7 @@ class QueryContext(object):
         graph: Optional[Graph] = None,
         bindings: Optional[Union[Bindings, FrozenBindings, List[Any]]] = None,
         initBindings: Optional[Mapping[str, Identifier]] = None,
+        schema: Optional[VariableSchema] = None,
     ):
         self.initBindings = initBindings
         self.bindings = Bindings(d=bindings or [])
@@ -280,6 +437,7 @@ class QueryContext(object):
         self.bnodes: t.MutableMapping[Identifier, BNode] = collections.defaultdict(
             BNode
         )
+        self.schema = schema if schema is not None else VariableSchema()
 
     @property
     def now(self) -> datetime.datetime:
@@ -294,6 +452,7 @@ class QueryContext(object):
             self._dataset if self._dataset is not None else self.graph,
             bindings or self.bindings,
             initBindings=self.initBindings,
+            schema=self.schema,
         )
         r.prologue = self.prologue
         r.graph = self.graph
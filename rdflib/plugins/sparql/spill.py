@@ -0,0 +1,255 @@
+"""
+ORDER BY, DISTINCT and GROUP BY over more solutions than fit in memory
+
+These are used by :mod:`rdflib.plugins.sparql.evaluate` when
+:data:`rdflib.plugins.sparql.SPARQL_MEMORY_BUDGET` is set. Each operator keeps
+at most that many solutions, distinct solutions or groups in memory, and
+writes the others to temporary files that it reads back later: sorted runs
+that are merged for ORDER BY, and partitions by hash for DISTINCT and
+GROUP BY. The solutions come out in the same order as when everything is
+kept in memory.
+
+Solutions are written as the tuples of values of their
+:class:`~rdflib.plugins.sparql.sparql.VariableSchema` and read back as
+solutions of the context of the operator.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import pickle
+import tempfile
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+)
+
+from rdflib.plugins.sparql.aggregates import ColumnAggregator
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import FrozenBindings, QueryContext
+
+__all__ = ["sort", "distinct", "aggregate"]
+
+FANOUT = 16
+"""The number of partitions that DISTINCT and GROUP BY spill to"""
+
+MERGE_WIDTH = 64
+"""The number of sorted runs that ORDER BY keeps open at a time"""
+
+_Record = Tuple[Any, FrozenBindings]
+
+
+class SpillFile:
+    """
+    A temporary file of ``(item, solution)`` records, written once and then
+    read back once, after which it is removed.
+    """
+
+    def __init__(self, ctx: QueryContext):
+        self.ctx = ctx
+        self.file = tempfile.TemporaryFile()
+
+    def write(self, item: Any, solution: FrozenBindings) -> None:
+        pickle.dump((item, solution._values), self.file, pickle.HIGHEST_PROTOCOL)
+
+    def read(self) -> Generator[_Record, None, None]:
+        ctx = self.ctx
+        file = self.file
+        file.seek(0)
+        try:
+            while True:
+                try:
+                    item, values = pickle.load(file)
+                except EOFError:
+                    return
+                solution = FrozenBindings.__new__(FrozenBindings)
+                solution._schema = ctx.schema
+                solution._values = values
+                solution._hash = None
+                solution.ctx = ctx
+                yield item, solution
+        finally:
+            file.close()
+
+
+def _spill(ctx: QueryContext, records: Iterable[_Record]) -> SpillFile:
+    spill = SpillFile(ctx)
+    for item, solution in records:
+        spill.write(item, solution)
+    return spill
+
+
+def sort(
+    ctx: QueryContext,
+    solutions: Iterable[FrozenBindings],
+    key: Callable[[FrozenBindings], Any],
+    budget: int,
+) -> Iterator[FrozenBindings]:
+    """
+    The solutions sorted by ``key``, stable like :func:`sorted`. Runs of
+    ``budget`` sorted solutions are written to temporary files with their
+    keys and merged, so the keys are computed once per solution. Every
+    :data:`MERGE_WIDTH` runs are merged into a longer one.
+    """
+    solutions = iter(solutions)
+    # the runs in input order with their levels, a run of level n is the
+    # merge of MERGE_WIDTH runs of level n - 1
+    runs: List[Tuple[int, SpillFile]] = []
+    while True:
+        run = sorted(
+            (
+                (key(solution), solution)
+                for solution in itertools.islice(solutions, budget)
+            ),
+            key=itemgetter(0),
+        )
+        if len(run) < budget:
+            break
+        level = 0
+        runs.append((level, _spill(ctx, run)))
+        while len(runs) >= MERGE_WIDTH and all(
+            merged == level for merged, _ in runs[-MERGE_WIDTH:]
+        ):
+            merged_run = _spill(ctx, _merge_runs(runs[-MERGE_WIDTH:]))
+            level += 1
+            runs[-MERGE_WIDTH:] = [(level, merged_run)]
+    if not runs:
+        return (solution for _, solution in run)
+    return (solution for _, solution in _merge_runs(runs, run))
+
+
+def _merge_runs(
+    runs: List[Tuple[int, SpillFile]], *rest: Iterable[_Record]
+) -> Iterator[_Record]:
+    # heapq.merge prefers the earlier of equal records, which keeps the sort
+    # stable as the runs are in input order
+    return heapq.merge(*(spill.read() for _, spill in runs), *rest, key=itemgetter(0))
+
+
+def distinct(
+    ctx: QueryContext, solutions: Iterable[FrozenBindings], budget: int
+) -> Iterator[FrozenBindings]:
+    """
+    The solutions without duplicates, in the order they are first seen.
+    """
+    return (solution for _, solution in _distinct(ctx, enumerate(solutions), budget))
+
+
+def _distinct(
+    ctx: QueryContext,
+    records: Iterable[Tuple[int, FrozenBindings]],
+    budget: int,
+    depth: int = 0,
+) -> Generator[Tuple[int, FrozenBindings], None, None]:
+    # The first budget distinct solutions are yielded as they are seen, and
+    # the solutions that are not among them go to partitions by hash. The
+    # partitions only hold solutions that are seen after the ones yielded
+    # so far, and each is made distinct on its own.
+    done: Set[FrozenBindings] = set()
+    partitions: Dict[int, SpillFile] = {}
+    for seq, solution in records:
+        if solution in done:
+            continue
+        if len(done) < budget:
+            done.add(solution)
+            yield seq, solution
+            continue
+        _partition(ctx, partitions, hash((depth, solution._values))).write(
+            seq, solution
+        )
+    if not partitions:
+        return
+    done.clear()
+    yield from _merge(
+        ctx,
+        (
+            _distinct(ctx, spill.read(), budget, depth + 1)
+            for spill in partitions.values()
+        ),
+    )
+
+
+def aggregate(
+    ctx: QueryContext,
+    solutions: Iterable[FrozenBindings],
+    key: Callable[[FrozenBindings], Any],
+    aggregations: List[CompValue],
+    budget: int,
+) -> Iterator[FrozenBindings]:
+    """
+    The aggregated solution of each group of solutions with the same
+    ``key``, in the order the groups are first seen.
+    """
+    return (
+        solution
+        for _, solution in _aggregate(
+            ctx, enumerate(solutions), key, aggregations, budget
+        )
+    )
+
+
+def _aggregate(
+    ctx: QueryContext,
+    records: Iterable[Tuple[int, FrozenBindings]],
+    key: Callable[[FrozenBindings], Any],
+    aggregations: List[CompValue],
+    budget: int,
+    depth: int = 0,
+) -> Generator[Tuple[int, FrozenBindings], None, None]:
+    # As for _distinct, the groups that do not fit are first seen after all
+    # the groups that are kept in memory.
+    aggregator = ColumnAggregator(aggregations, ctx.schema)
+    groups: Dict[Any, Tuple[int, int]] = {}
+    partitions: Dict[int, SpillFile] = {}
+    for seq, solution in records:
+        k = key(solution)
+        group = groups.get(k)
+        if group is None:
+            if len(groups) >= budget:
+                _partition(ctx, partitions, hash((depth, k))).write(seq, solution)
+                continue
+            group = groups[k] = (seq, aggregator.add_group())
+        aggregator.update(group[1], solution)
+    for seq, number in groups.values():
+        yield seq, FrozenBindings(ctx, aggregator.get_bindings(number))
+    if not partitions:
+        return
+    groups.clear()
+    del aggregator
+    yield from _merge(
+        ctx,
+        (
+            _aggregate(ctx, spill.read(), key, aggregations, budget, depth + 1)
+            for spill in partitions.values()
+        ),
+    )
+
+
+def _partition(
+    ctx: QueryContext, partitions: Dict[int, SpillFile], key_hash: int
+) -> SpillFile:
+    index = key_hash % FANOUT
+    spill = partitions.get(index)
+    if spill is None:
+        spill = partitions[index] = SpillFile(ctx)
+    return spill
+
+
+def _merge(
+    ctx: QueryContext, parts: Iterable[Iterable[Tuple[int, FrozenBindings]]]
+) -> Iterator[Tuple[int, FrozenBindings]]:
+    """
+    Merges the results of the partitions by the position at which each
+    result was first seen. The partitions are evaluated one after the other
+    into temporary files, so only one of them is in memory at a time.
+    """
+    return heapq.merge(*(_spill(ctx, part).read() for part in parts), key=itemgetter(0))
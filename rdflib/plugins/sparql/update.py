@@ -138,6 +138,23 @@ def evalDeleteWhere(ctx: QueryContext, u: CompValue) -> None:
 
 
 def evalModify(ctx: QueryContext, u: CompValue) -> None:
+    # type error: Item "None" of "Optional[Graph]" has no attribute "store"
+    store = ctx.graph.store  # type: ignore[union-attr]
+    # apply all the deletes and inserts, or none of them, in stores that
+    # start transactions, unless the update is part of a transaction already
+    if store.in_transaction or not store.begin():
+        _evalModify(ctx, u)
+        return
+
+    try:
+        _evalModify(ctx, u)
+    except BaseException:
+        store.rollback()
+        raise
+    store.commit()
+
+
+def _evalModify(ctx: QueryContext, u: CompValue) -> None:
     originalctx = ctx
 
     # Using replaces the dataset for evaluating the where-clause
@@ -2,14 +2,35 @@ import logging
 from os import mkdir
 from os.path import abspath, exists
 from threading import Thread
-from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.request import pathname2url
 
-from rdflib.store import NO_STORE, VALID_STORE, Store
+from rdflib.namespace import RDF
+from rdflib.store import NO_STORE, VALID_STORE, Store, TripleAddedEvent
 from rdflib.term import Identifier, Node, URIRef
 
 if TYPE_CHECKING:
-    from rdflib.graph import Graph, _ContextType, _TriplePatternType, _TripleType
+    from rdflib.graph import (
+        Graph,
+        _ContextType,
+        _ObjectType,
+        _PredicateType,
+        _QuadType,
+        _SubjectType,
+        _TriplePatternType,
+        _TripleType,
+    )
 
 
 def bb(u: str) -> bytes:
@@ -36,6 +57,9 @@ if has_bsddb:
     # passed to db.DB.Open()
     DBOPENFLAGS = db.DB_THREAD
 
+# number of quads that BerkeleyDB.addN encodes and sorts at a time
+ADDN_BATCH_SIZE = 10000
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
@@ -94,6 +118,7 @@ class BerkeleyDB(Store):
         if not has_bsddb:
             raise ImportError("Unable to import berkeleydb, store is unusable.")
         self.__open = False
+        self.__home: Optional[str] = None
         self.__identifier = identifier
         super(BerkeleyDB, self).__init__(configuration)
         self._loads = self.node_pickler.loads
@@ -138,6 +163,7 @@ class BerkeleyDB(Store):
             return NO_STORE
         self.db_env = db_env
         self.__open = True
+        self.__home = abspath(homeDir)
 
         dbname = None
         dbtype = db.DB_BTREE
@@ -243,6 +269,21 @@ class BerkeleyDB(Store):
         self.__i2k.set_flags(dbsetflags)
         self.__i2k.open("i2k", dbname, db.DB_RECNO, dbopenflags, dbmode)
 
+        # created even when opening an existing store, which may predate it
+        self.__statistics = db.DB(db_env)
+        self.__statistics.set_flags(dbsetflags)
+        self.__statistics.open(
+            "statistics", dbname, dbtype, dbopenflags | db.DB_CREATE, dbmode
+        )
+        self.__statistics_kept = self.__statistics.get(b"version") is not None
+        if not self.__statistics_kept and not self.__prefix_exists(
+            self.__indicies[0], b""
+        ):
+            # statistics can only be started on an empty store
+            self.__statistics.put(b"version", b"1")
+            self.__statistics_kept = True
+        self.__type_id = bb(self._to_string(RDF.type))
+
         self.__needs_sync = False
         t = Thread(target=self.__sync_run)
         t.setDaemon(True)
@@ -283,6 +324,12 @@ class BerkeleyDB(Store):
             self.__prefix.sync()
             self.__i2k.sync()
             self.__k2i.sync()
+            self.__statistics.sync()
+
+    def worker_configuration(self) -> Optional[str]:
+        # other processes join the same environment, which lets them read
+        # what this one has written, see ENVFLAGS
+        return self.__home if self.__open else None
 
     def close(self, commit_pending_transaction: bool = False) -> None:
         self.__open = False
@@ -294,6 +341,7 @@ class BerkeleyDB(Store):
         self.__prefix.close()
         self.__i2k.close()
         self.__k2i.close()
+        self.__statistics.close()
         self.db_env.close()
 
     def add(
@@ -318,15 +366,81 @@ class BerkeleyDB(Store):
         o = _to_string(object, txn=txn)
         c = _to_string(context, txn=txn)
 
+        self.__add(s, p, o, c, quoted, txn=txn)
+
+    def addN(  # noqa: N802
+        self, quads: Iterable["_QuadType"], txn: Optional[Any] = None
+    ) -> None:
+        """\
+        Add a sequence of quads to the store of triples.
+
+        Unless a handler is subscribed to `TripleAddedEvent` no events are
+        dispatched. The quads are processed in batches: every term is only
+        encoded once per batch, and each batch is written in key order, which
+        groups the writes by context, subject and predicate.
+        """
+        assert self.__open, "The Store must be open."
+        if self.dispatcher.has_subscribers(TripleAddedEvent):
+            for subject, predicate, object, context in quads:
+                self.add((subject, predicate, object), context, txn=txn)
+            return
+
+        _to_string = self._to_string
+        encoded: Dict[Node, str] = {}
+
+        def to_string(term: Node) -> str:
+            try:
+                return encoded[term]
+            except KeyError:
+                i = encoded[term] = _to_string(term, txn=txn)
+                return i
+
+        batch: List[Tuple[str, str, str, str]] = []
+        for subject, predicate, object, context in quads:
+            assert context is not None, "Context associated with %s %s %s is None!" % (
+                subject,
+                predicate,
+                object,
+            )
+            assert context != self, "Can not add triple directly to store"
+            batch.append(
+                (
+                    to_string(context),
+                    to_string(subject),
+                    to_string(predicate),
+                    to_string(object),
+                )
+            )
+            if len(batch) >= ADDN_BATCH_SIZE:
+                self.__add_batch(batch, txn=txn)
+                batch = []
+                encoded.clear()
+        self.__add_batch(batch, txn=txn)
+
+    def __add_batch(
+        self, batch: List[Tuple[str, str, str, str]], txn: Optional[Any] = None
+    ) -> None:
+        batch.sort()
+        for c, s, p, o in batch:
+            self.__add(s, p, o, c, txn=txn)
+
+    def __add(
+        self,
+        s: str,
+        p: str,
+        o: str,
+        c: str,
+        quoted: bool = False,
+        txn: Optional[Any] = None,
+    ) -> None:
         cspo, cpos, cosp = self.__indicies
 
         value = cspo.get(bb("%s^%s^%s^%s^" % (c, s, p, o)), txn=txn)
         if value is None:
             self.__contexts.put(bb(c), b"", txn=txn)
 
-            contexts_value = cspo.get(
-                bb("%s^%s^%s^%s^" % ("", s, p, o)), txn=txn
-            ) or "".encode("latin-1")
+            asserted_value = cspo.get(bb("%s^%s^%s^%s^" % ("", s, p, o)), txn=txn)
+            contexts_value = asserted_value or "".encode("latin-1")
             contexts = set(contexts_value.split("^".encode("latin-1")))
             contexts.add(bb(c))
             contexts_value = "^".encode("latin-1").join(contexts)
@@ -336,6 +450,8 @@ class BerkeleyDB(Store):
             cpos.put(bb("%s^%s^%s^%s^" % (c, p, o, s)), b"", txn=txn)
             cosp.put(bb("%s^%s^%s^%s^" % (c, o, s, p)), b"", txn=txn)
             if not quoted:
+                if asserted_value is None:
+                    self.__update_statistics(bb(s), bb(p), bb(o), 1, txn=txn)
                 cspo.put(bb("%s^%s^%s^%s^" % ("", s, p, o)), contexts_value, txn=txn)
                 cpos.put(bb("%s^%s^%s^%s^" % ("", p, o, s)), contexts_value, txn=txn)
                 cosp.put(bb("%s^%s^%s^%s^" % ("", o, s, p)), contexts_value, txn=txn)
@@ -351,12 +467,13 @@ class BerkeleyDB(Store):
     ) -> None:
         s, p, o = spo
         cspo, cpos, cosp = self.__indicies
-        contexts_value = cspo.get(
+        asserted_value = cspo.get(
             "^".encode("latin-1").join(
                 ["".encode("latin-1"), s, p, o, "".encode("latin-1")]
             ),
             txn=txn,
-        ) or "".encode("latin-1")
+        )
+        contexts_value = asserted_value or "".encode("latin-1")
         contexts = set(contexts_value.split("^".encode("latin-1")))
         contexts.discard(c)
         contexts_value = "^".encode("latin-1").join(contexts)
@@ -376,6 +493,8 @@ class BerkeleyDB(Store):
                         i.delete(_to_key((s, p, o), "".encode("latin-1")), txn=txn)
                     except db.DBNotFoundError:
                         pass  # TODO: is it okay to ignore these?
+                if asserted_value is not None:
+                    self.__update_statistics(s, p, o, -1, txn=txn)
 
     # type error: Signature of "remove" incompatible with supertype "Store"
     def remove(  # type: ignore[override]
@@ -449,6 +568,8 @@ class BerkeleyDB(Store):
                                 # type error: Argument 1 has incompatible type "Tuple[str, str, str]"; expected "Tuple[bytes, bytes, bytes]"
                                 # type error: Argument 2 has incompatible type "str"; expected "bytes"
                                 i.delete(_to_key((s, p, o), c), txn=txn)  # type: ignore[arg-type]
+                        # type error: Argument 1 to "__update_statistics" of "BerkeleyDB" has incompatible type "str"; expected "bytes"
+                        self.__update_statistics(s, p, o, -1, txn=txn)  # type: ignore[arg-type]
                     else:
                         # type error: Argument 1 to "__remove" of "BerkeleyDB" has incompatible type "Tuple[str, str, str]"; expected "Tuple[bytes, bytes, bytes]"
                         # type error: Argument 2 to "__remove" of "BerkeleyDB" has incompatible type "str"; expected "bytes"
@@ -493,6 +614,70 @@ class BerkeleyDB(Store):
             (subject, predicate, object), context, txn=txn
         )
 
+        for key, contexts_value in self.__scan(index, prefix, txn=txn):
+            # type error: Incompatible types in "yield" (actual type "Tuple[Tuple[Node, Node, Node], Generator[Node, None, None]]", expected type "Tuple[Tuple[IdentifiedNode, URIRef, Identifier], Iterator[Optional[Graph]]]")
+            # NOTE on type ignore: this is needed because some context is
+            # lost in the process of extracting triples from the database.
+            yield results_from_key(key, subject, predicate, object, contexts_value)  # type: ignore[misc]
+
+    def triples_choices(
+        self,
+        triple: Union[
+            Tuple[List["_SubjectType"], "_PredicateType", "_ObjectType"],
+            Tuple["_SubjectType", List["_PredicateType"], "_ObjectType"],
+            Tuple["_SubjectType", "_PredicateType", List["_ObjectType"]],
+        ],
+        context: Optional["_ContextType"] = None,
+        txn: Optional[Any] = None,
+    ) -> Generator[
+        Tuple["_TripleType", Generator[Optional["_ContextType"], None, None]],
+        None,
+        None,
+    ]:
+        """
+        A variant of triples that takes a list of terms in one slot. The
+        keys of all the terms are looked up first and then visited in key
+        order, so the index is walked once from start to end.
+        """
+        assert self.__open, "The Store must be open."
+
+        lists = [isinstance(term, list) for term in triple]
+        if lists.count(True) != 1:
+            # left to the default implementation
+            yield from super(BerkeleyDB, self).triples_choices(triple, context)
+            return
+        position = lists.index(True)
+        choices: List[Node] = triple[position]  # type: ignore[assignment]
+        if not choices:
+            pattern = list(triple)
+            pattern[position] = None
+            yield from self.triples(tuple(pattern), context, txn=txn)  # type: ignore[arg-type]
+            return
+
+        if context is not None:
+            if context == self:
+                context = None
+
+        lookups = []
+        for choice in dict.fromkeys(choices):
+            pattern = list(triple)
+            pattern[position] = choice
+            index, prefix, _, results_from_key = self.__lookup(
+                tuple(pattern), context, txn=txn  # type: ignore[arg-type]
+            )
+            lookups.append((prefix, pattern))
+        lookups.sort(key=lambda lookup: lookup[0])
+
+        # every pattern binds the same slots, so they share index and key format
+        for prefix, (subject, predicate, object) in lookups:
+            for key, contexts_value in self.__scan(index, prefix, txn=txn):
+                # type error: Incompatible types in "yield" (actual type "Tuple[Tuple[Node, Node, Node], Generator[Node, None, None]]", expected type "Tuple[Tuple[IdentifiedNode, URIRef, Identifier], Iterator[Optional[Graph]]]")
+                yield results_from_key(key, subject, predicate, object, contexts_value)  # type: ignore[misc]
+
+    def __scan(
+        self, index: "db.DB", prefix: bytes, txn: Optional[Any] = None
+    ) -> Generator[Tuple[bytes, bytes], None, None]:
+        """The keys of ``index`` that start with ``prefix``, with their values"""
         cursor = index.cursor(txn=txn)
         try:
             current = cursor.set_range(prefix)
@@ -510,11 +695,7 @@ class BerkeleyDB(Store):
                 current = None
             cursor.close()
             if key and key.startswith(prefix):
-                contexts_value = index.get(key, txn=txn)
-                # type error: Incompatible types in "yield" (actual type "Tuple[Tuple[Node, Node, Node], Generator[Node, None, None]]", expected type "Tuple[Tuple[IdentifiedNode, URIRef, Identifier], Iterator[Optional[Graph]]]")
-                # NOTE on type ignore: this is needed because some context is
-                # lost in the process of extracting triples from the database.
-                yield results_from_key(key, subject, predicate, object, contexts_value)  # type: ignore[misc]
+                yield key, index.get(key, txn=txn)
             else:
                 break
 
@@ -544,6 +725,86 @@ class BerkeleyDB(Store):
         cursor.close()
         return count
 
+    def count(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+        txn: Optional[Any] = None,
+    ) -> int:
+        """\
+        Counts the keys in the range of the index that holds the pattern,
+        with one cursor and without reading the values or building triples.
+        """
+        assert self.__open, "The Store must be open."
+        cardinality = self.cardinality(triple_pattern, context, txn=txn)
+        if cardinality is not None:
+            return cardinality
+        if context is not None:
+            if context == self:
+                context = None
+        index, prefix, _, _ = self.__lookup(triple_pattern, context, txn=txn)
+        cursor = index.cursor(txn=txn)
+        try:
+            current = cursor.set_range(prefix)
+        except db.DBNotFoundError:
+            current = None
+        count = 0
+        while current:
+            key, value = current
+            if key.startswith(prefix):
+                count += 1
+                # Hack to stop 2to3 converting this to next(cursor)
+                current = getattr(cursor, "next")()
+            else:
+                break
+        cursor.close()
+        return count
+
+    def cardinality(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+        txn: Optional[Any] = None,
+    ) -> Optional[int]:
+        """\
+        Answers the patterns ``(None, None, None)``, ``(None, predicate,
+        None)`` and ``(None, RDF.type, class)`` from the statistics, which
+        cover the triples of all contexts, so they are only used for a context
+        that is the only one in the store.
+        """
+        assert self.__open, "The Store must be open."
+        if not self.__statistics_apply(context, txn=txn):
+            return None
+        subject, predicate, object = triple_pattern
+        if subject is not None:
+            return None
+        if object is None:
+            if predicate is None:
+                return self.__statistic(b"t", txn=txn)
+            return self.__statistic(b"pt^", predicate, txn=txn)
+        if predicate == RDF.type:
+            return self.__statistic(b"c^", object, txn=txn)
+        return None
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+        txn: Optional[Any] = None,
+    ) -> Optional[int]:
+        assert self.__open, "The Store must be open."
+        if not self.__statistics_apply(context, txn=txn):
+            return None
+        subject, predicate, object = triple_pattern
+        if subject is not None or object is not None:
+            return None
+        if predicate is None:
+            return self.__statistic((b"s", b"p", b"o")[position], txn=txn)
+        if position == 1:
+            return min(self.__statistic(b"pt^", predicate, txn=txn), 1)
+        return self.__statistic((b"ps^", None, b"po^")[position], predicate, txn=txn)
+
     def bind(self, prefix: str, namespace: "URIRef", override: bool = True) -> None:
         # NOTE on type error: this is because the variables are reused with
         # another type.
@@ -667,6 +928,88 @@ class BerkeleyDB(Store):
             i = i.decode()
         return i
 
+    def __prefix_exists(
+        self, index: "db.DB", prefix: bytes, txn: Optional[Any] = None
+    ) -> bool:
+        cursor = index.cursor(txn=txn)
+        try:
+            current = cursor.set_range(prefix)
+        except db.DBNotFoundError:
+            current = None
+        cursor.close()
+        return current is not None and current[0].startswith(prefix)
+
+    def __count(self, key: bytes, delta: int, txn: Optional[Any] = None) -> int:
+        """add delta to the statistics counter, returning its new value"""
+        value = int(self.__statistics.get(key, txn=txn) or 0) + delta
+        if value:
+            self.__statistics.put(key, b"%d" % value, txn=txn)
+        else:
+            self.__statistics.delete(key, txn=txn)
+        return value
+
+    def __update_statistics(
+        self, s: bytes, p: bytes, o: bytes, delta: int, txn: Optional[Any] = None
+    ) -> None:
+        """update the statistics for a triple that is about to be added to
+        (delta 1) or that was just removed from (delta -1) the conjunctive
+        index"""
+        if not self.__statistics_kept:
+            return
+        cspo, cpos, cosp = self.__indicies
+        exists = self.__prefix_exists
+        count = self.__count
+        count(b"t", delta, txn=txn)
+        if not exists(cspo, b"^%s^" % s, txn=txn):
+            count(b"s", delta, txn=txn)
+        if not exists(cosp, b"^%s^" % o, txn=txn):
+            count(b"o", delta, txn=txn)
+        if count(b"pt^" + p, delta, txn=txn) == (1 if delta > 0 else 0):
+            count(b"p", delta, txn=txn)
+        if not exists(cspo, b"^%s^%s^" % (s, p), txn=txn):
+            count(b"ps^" + p, delta, txn=txn)
+        if not exists(cpos, b"^%s^%s^" % (p, o), txn=txn):
+            count(b"po^" + p, delta, txn=txn)
+        if p == self.__type_id:
+            count(b"c^" + o, delta, txn=txn)
+
+    def __statistic(
+        self, key: bytes, term: Optional[Node] = None, txn: Optional[Any] = None
+    ) -> int:
+        if term is not None:
+            term_id = self.__k2i.get(self._dumps(term), txn=txn)
+            if term_id is None:
+                return 0
+            key += term_id
+        return int(self.__statistics.get(key, txn=txn) or 0)
+
+    def __statistics_apply(
+        self, context: Optional["_ContextType"], txn: Optional[Any] = None
+    ) -> bool:
+        """return True if the statistics, which are kept for the conjunctive
+        index, also hold for the given context"""
+        if not self.__statistics_kept:
+            return False
+        if context is None or context == self:
+            return True
+        c = self.__k2i.get(self._dumps(context), txn=txn)
+        if c is None:
+            return self.__statistic(b"t", txn=txn) == 0
+        # the context has to be the only one in the store
+        cursor = self.__contexts.cursor(txn=txn)
+        try:
+            first = cursor.first()
+            second = getattr(cursor, "next")() if first is not None else None
+        except db.DBNotFoundError:
+            first = second = None
+        cursor.close()
+        if first is None or first[0] != c or second is not None:
+            return False
+        # and not only hold quoted triples
+        return self.__statistic(b"t", txn=txn) > 0 or not self.__prefix_exists(
+            self.__indicies[0], c + b"^", txn=txn
+        )
+
     def __lookup(
         self,
         spo: "_TriplePatternType",
@@ -0,0 +1,698 @@
+"""
+A dictionary-encoded in-memory store.
+
+Every term is interned into an integer id and the indexes only ever hold those
+ids, which makes the store considerably smaller than
+:class:`~rdflib.plugins.stores.memory.Memory` for large graphs at the cost of a
+dictionary lookup per term on the way in and out.
+"""
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from rdflib.store import Store, TripleAddedEvent
+from rdflib.util import _coalesce
+
+if TYPE_CHECKING:
+    from rdflib.graph import (
+        Graph,
+        _ContextType,
+        _QuadType,
+        _TriplePatternType,
+        _TripleType,
+    )
+    from rdflib.plugins.sparql.sparql import Query, Update
+    from rdflib.query import Result
+    from rdflib.term import Identifier, Node, URIRef
+
+__all__ = ["CompactMemory"]
+
+#: A set of term ids, stored as a bare ``int`` while it has a single member and
+#: promoted to a ``set`` once it has more.
+_IdSet = Union[int, Set[int]]
+
+#: The contexts of a triple, encoded as ``context_id << 1 | quoted``. Like
+#: ``_IdSet`` this is a bare ``int`` for triples that are in a single context.
+_ContextCodes = Union[int, Set[int]]
+
+#: Context id used for triples that were added without a context.
+_NO_CONTEXT = 0
+
+
+def _idset_add(index: Dict[int, Dict[int, _IdSet]], k1: int, k2: int, v: int) -> None:
+    try:
+        inner = index[k1]
+    except KeyError:
+        index[k1] = {k2: v}
+        return
+    try:
+        members = inner[k2]
+    except KeyError:
+        inner[k2] = v
+        return
+    if members.__class__ is int:
+        if members != v:
+            inner[k2] = {members, v}  # type: ignore[arg-type]
+    else:
+        members.add(v)  # type: ignore[union-attr]
+
+
+def _idset_remove(
+    index: Dict[int, Dict[int, _IdSet]], k1: int, k2: int, v: int
+) -> None:
+    inner = index[k1]
+    members = inner[k2]
+    if members.__class__ is int:
+        del inner[k2]
+        if not inner:
+            del index[k1]
+    else:
+        members.discard(v)  # type: ignore[union-attr]
+        if len(members) == 1:  # type: ignore[arg-type]
+            # demote back to the compact single member form
+            inner[k2] = members.pop()  # type: ignore[union-attr]
+
+
+def _members(value: Union[int, Set[int]]) -> Iterable[int]:
+    if value.__class__ is int:
+        return (value,)  # type: ignore[return-value]
+    # copy, so that callers may modify the store while iterating
+    return tuple(value)  # type: ignore[arg-type]
+
+
+def _size(value: _IdSet) -> int:
+    if value.__class__ is int:
+        return 1
+    return len(value)  # type: ignore[arg-type]
+
+
+def _is_asserted(codes: _ContextCodes) -> bool:
+    if codes.__class__ is int:
+        return not codes & 1  # type: ignore[operator]
+    return any(not code & 1 for code in codes)  # type: ignore[union-attr]
+
+
+class CompactMemory(Store):
+    """\
+    A dictionary-encoded in memory implementation of a triple store.
+
+    Behaves like :class:`~rdflib.plugins.stores.memory.Memory` (it is
+    Context-aware, Graph-aware, and Formula-aware) but stores every term only
+    once, in a term dictionary that maps it to an integer id. The ``spo``,
+    ``pos`` and ``osp`` indexes are nested dictionaries of those ids, and the
+    last level of ``pos`` and ``osp`` as well as the set of contexts of a
+    triple are kept as a bare ``int`` until they have more than one member.
+
+    Contexts are not tracked per triple in a separate mapping: the contexts of
+    a triple are the values of the ``spo`` index, and each context only keeps a
+    count of triples per subject so that it can be enumerated without a scan
+    of the whole store.
+
+    Terms that are no longer used by any triple are dropped from the term
+    dictionary and their ids are reused.
+    """
+
+    context_aware = True
+    formula_aware = True
+    graph_aware = True
+
+    def __init__(
+        self,
+        configuration: Optional[str] = None,
+        identifier: Optional["Identifier"] = None,
+    ):
+        super(CompactMemory, self).__init__(configuration)
+        self.identifier = identifier
+
+        # term dictionary
+        self.__term_ids: Dict["Node", int] = {}
+        self.__terms: List[Optional["Node"]] = []
+        # number of triples positions (s, p or o) that refer to each term id
+        self.__term_refs = array("L")
+        self.__free_ids: List[int] = []
+
+        # indexed by [subject][predicate][object] = context codes
+        self.__spo: Dict[int, Dict[int, Dict[int, _ContextCodes]]] = {}
+        # indexed by [predicate][object] = subjects
+        self.__pos: Dict[int, Dict[int, _IdSet]] = {}
+        # indexed by [object][subject] = predicates
+        self.__osp: Dict[int, Dict[int, _IdSet]] = {}
+
+        # context dictionary, id 0 is reserved for triples without a context
+        self.__context_ids: Dict[Any, int] = {}
+        self.__context_objs: List[Optional["_ContextType"]] = [None]
+        # number of triples per context and per [context][subject]
+        self.__context_sizes: Dict[int, int] = {}
+        self.__context_subjects: Dict[int, Dict[int, int]] = {}
+        # number of asserted (non-quoted) triples
+        self.__asserted = 0
+        # number of triples in the indexes, and per predicate the number of
+        # triples and of distinct subjects
+        self.__triple_count = 0
+        self.__predicate_stats: Dict[int, List[int]] = {}
+        # all contexts used in store (unencoded)
+        self.__all_contexts: Set["Graph"] = set()
+
+        self.__namespace: Dict[str, "URIRef"] = {}
+        self.__prefix: Dict["URIRef", str] = {}
+
+    def add(
+        self,
+        triple: "_TripleType",
+        context: "_ContextType",
+        quoted: bool = False,
+    ) -> None:
+        """\
+        Add a triple to the store of triples.
+        """
+        Store.add(self, triple, context, quoted=quoted)
+        if context is not None:
+            self.__all_contexts.add(context)
+        # type error: Argument 2 to "__add" of "CompactMemory" has incompatible type "Optional[int]"; expected "int"
+        self.__add(triple, self.__context_id(context, create=True), quoted)  # type: ignore[arg-type]
+
+    def addN(self, quads: Iterable["_QuadType"]) -> None:  # noqa: N802
+        """\
+        Add a sequence of quads to the store of triples.
+
+        Unless a handler is subscribed to `TripleAddedEvent` no events are
+        dispatched, and the context of consecutive quads is only resolved
+        once.
+        """
+        if self.dispatcher.has_subscribers(TripleAddedEvent):
+            Store.addN(self, quads)
+            return
+
+        add = self.__add
+        last_context: Optional["_ContextType"] = None
+        ctx_id = _NO_CONTEXT
+        for s, p, o, context in quads:
+            assert context is not None, "Context associated with %s %s %s is None!" % (
+                s,
+                p,
+                o,
+            )
+            if context is not last_context:
+                self.__all_contexts.add(context)
+                # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+                ctx_id = self.__context_id(context, create=True)  # type: ignore[assignment]
+                last_context = context
+            add((s, p, o), ctx_id, False)
+
+    def __add(self, triple: "_TripleType", ctx_id: int, quoted: bool) -> None:
+        """add the triple to the context with the given id"""
+        subject, predicate, object_ = triple
+        code = ctx_id << 1 | bool(quoted)
+
+        s = self.__intern(subject)
+        p = self.__intern(predicate)
+        o = self.__intern(object_)
+
+        spo = self.__spo
+        try:
+            po = spo[s]
+        except KeyError:
+            po = spo[s] = {}
+        try:
+            objects = po[p]
+        except KeyError:
+            objects = po[p] = {}
+
+        try:
+            codes = objects[o]
+        except KeyError:
+            # the triple didn't exist before in the store
+            objects[o] = code
+            _idset_add(self.__pos, p, o, s)
+            _idset_add(self.__osp, o, s, p)
+            refs = self.__term_refs
+            refs[s] += 1
+            refs[p] += 1
+            refs[o] += 1
+            if not quoted:
+                self.__asserted += 1
+            self.__triple_count += 1
+            try:
+                stats = self.__predicate_stats[p]
+            except KeyError:
+                stats = self.__predicate_stats[p] = [0, 0]
+            stats[0] += 1
+            if len(objects) == 1:
+                # first object of this subject and predicate
+                stats[1] += 1
+            self.__context_gained(ctx_id, s)
+            return
+
+        was_asserted = _is_asserted(codes)
+        flipped = code ^ 1
+        if codes.__class__ is int:
+            if codes == code:
+                return
+            if codes == flipped:
+                # same context, only the quoted flag changed
+                objects[o] = code
+            else:
+                objects[o] = {codes, code}  # type: ignore[arg-type]
+                self.__context_gained(ctx_id, s)
+        else:
+            if code in codes:  # type: ignore[operator]
+                return
+            if flipped in codes:  # type: ignore[operator]
+                codes.discard(flipped)  # type: ignore[union-attr]
+            else:
+                self.__context_gained(ctx_id, s)
+            codes.add(code)  # type: ignore[union-attr]
+        self.__asserted += _is_asserted(objects[o]) - was_asserted
+
+    def remove(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> None:
+        ctx_id = None if context is None else self.__context_id(context)
+        if context is None or ctx_id is not None:
+            spo = self.__spo
+            term_ids = self.__term_ids
+            for (subject, predicate, object_), _ in list(
+                self.triples(triple_pattern, context=context)
+            ):
+                s = term_ids[subject]
+                p = term_ids[predicate]
+                o = term_ids[object_]
+                objects = spo[s][p]
+                codes = objects[o]
+                was_asserted = _is_asserted(codes)
+                if ctx_id is None:
+                    # remove the triple from all contexts
+                    remaining: Set[int] = set()
+                else:
+                    remaining = set(_members(codes))
+                    remaining.difference_update((ctx_id << 1, ctx_id << 1 | 1))
+                for code in _members(codes):
+                    if code not in remaining:
+                        self.__context_lost(code >> 1, s)
+                if remaining:
+                    objects[o] = remaining.pop() if len(remaining) == 1 else remaining
+                    self.__asserted += _is_asserted(objects[o]) - was_asserted
+                else:
+                    self.__asserted -= was_asserted
+                    self.__remove_triple(s, p, o)
+
+        if (
+            triple_pattern == (None, None, None)
+            and context in self.__all_contexts
+            and not self.graph_aware
+        ):
+            # remove the whole context
+            self.__all_contexts.remove(context)
+
+    def triples(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Generator[
+        Tuple["_TripleType", Generator[Optional["_ContextType"], None, None]],
+        None,
+        None,
+    ]:
+        """A generator over all the triples matching"""
+        if context is None:
+            matches: Callable[[_ContextCodes], bool] = _is_asserted
+        else:
+            ctx_id = self.__context_id(context)
+            if ctx_id is None:
+                return
+            matches = self.__context_matcher(ctx_id)
+
+        subject, predicate, object_ = triple_pattern
+        term_ids = self.__term_ids
+        try:
+            s = None if subject is None else term_ids[subject]
+            p = None if predicate is None else term_ids[predicate]
+            o = None if object_ is None else term_ids[object_]
+        except (KeyError, TypeError):
+            # one of the given terms is not in the store
+            return
+
+        terms = self.__terms
+        spo = self.__spo
+        contexts = self.__contexts
+
+        if s is not None:  # subject is given
+            if s not in spo:
+                return
+            po = spo[s]
+            if p is not None:
+                predicates: Iterable[int] = (p,) if p in po else ()
+            else:
+                predicates = list(po.keys())
+            for p_ in predicates:
+                objects = po.get(p_)
+                if objects is None:
+                    continue
+                if o is not None:  # object is given
+                    codes = objects.get(o)
+                    if codes is not None and matches(codes):
+                        yield (subject, terms[p_], object_), contexts(codes)  # type: ignore[misc]
+                else:  # object unbound
+                    for o_, codes in list(objects.items()):
+                        if matches(codes):
+                            yield (subject, terms[p_], terms[o_]), contexts(codes)  # type: ignore[misc]
+        elif p is not None:  # predicate is given, subject unbound
+            if p not in self.__pos:
+                return
+            os = self.__pos[p]
+            if o is not None:  # predicate+object is given, subject unbound
+                objects_ = (o,) if o in os else ()
+            else:  # predicate is given, object+subject unbound
+                objects_ = list(os.keys())
+            for o_ in objects_:
+                subjects = os.get(o_)
+                if subjects is None:
+                    continue
+                for s_ in _members(subjects):
+                    codes = spo[s_][p][o_]
+                    if matches(codes):
+                        yield (terms[s_], predicate, terms[o_]), contexts(codes)  # type: ignore[misc]
+        elif o is not None:  # object is given, subject+predicate unbound
+            if o not in self.__osp:
+                return
+            sp = self.__osp[o]
+            for s_, predicates_ in list(sp.items()):
+                for p_ in _members(predicates_):
+                    codes = spo[s_][p_][o]
+                    if matches(codes):
+                        yield (terms[s_], terms[p_], object_), contexts(codes)  # type: ignore[misc]
+        else:  # subject+predicate+object unbound
+            if context is None:
+                subjects_: Iterable[int] = list(spo.keys())
+            else:
+                # only visit the subjects this context knows about
+                # type error: Argument 1 to "get" of "dict" has incompatible type "Optional[int]"; expected "int"
+                subjects_ = list(self.__context_subjects.get(ctx_id, ()))  # type: ignore[arg-type]
+            for s_ in subjects_:
+                po = spo.get(s_)
+                if po is None:
+                    continue
+                for p_, objects in list(po.items()):
+                    for o_, codes in list(objects.items()):
+                        if matches(codes):
+                            yield (terms[s_], terms[p_], terms[o_]), contexts(codes)  # type: ignore[misc]
+
+    def bind(self, prefix: str, namespace: "URIRef", override: bool = True) -> None:
+        # should be identical to `Memory.bind`
+        bound_namespace = self.__namespace.get(prefix)
+        bound_prefix = _coalesce(
+            self.__prefix.get(namespace),
+            # type error: error: Argument 1 to "get" of "Mapping" has incompatible type "Optional[URIRef]"; expected "URIRef"
+            self.__prefix.get(bound_namespace),  # type: ignore[arg-type]
+        )
+        if override:
+            if bound_prefix is not None:
+                del self.__namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self.__prefix[bound_namespace]
+            self.__prefix[namespace] = prefix
+            self.__namespace[prefix] = namespace
+        else:
+            # type error: Invalid index type "Optional[URIRef]" for "Dict[URIRef, str]"; expected type "URIRef"
+            self.__prefix[_coalesce(bound_namespace, namespace)] = _coalesce(  # type: ignore[index]
+                bound_prefix, default=prefix
+            )
+            # type error: Invalid index type "Optional[str]" for "Dict[str, URIRef]"; expected type "str"
+            # type error: Incompatible types in assignment (expression has type "Optional[URIRef]", target has type "URIRef")
+            self.__namespace[_coalesce(bound_prefix, prefix)] = _coalesce(  # type: ignore[index]
+                bound_namespace, default=namespace
+            )
+
+    def namespace(self, prefix: str) -> Optional["URIRef"]:
+        return self.__namespace.get(prefix, None)
+
+    def prefix(self, namespace: "URIRef") -> Optional[str]:
+        return self.__prefix.get(namespace, None)
+
+    def namespaces(self) -> Generator[Tuple[str, "URIRef"], None, None]:
+        for prefix, namespace in self.__namespace.items():
+            yield prefix, namespace
+
+    def contexts(
+        self, triple: Optional["_TripleType"] = None
+    ) -> Generator["_ContextType", None, None]:
+        if triple is None or triple == (None, None, None):
+            return (context for context in self.__all_contexts)
+
+        term_ids = self.__term_ids
+        subj, pred, obj = triple
+        try:
+            codes = self.__spo[term_ids[subj]][term_ids[pred]][term_ids[obj]]
+        except KeyError:
+            return (_ for _ in [])
+        return self.__contexts(codes)
+
+    def __len__(self, context: Optional["_ContextType"] = None) -> int:
+        if context is None:
+            return self.__asserted
+        ctx_id = self.__context_id(context)
+        if ctx_id is None:
+            return 0
+        return self.__context_sizes.get(ctx_id, 0)
+
+    def cardinality(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if not self.__statistics_apply(context):
+            return None
+        term_ids = self.__term_ids
+        subject, predicate, object_ = triple_pattern
+        try:
+            s = None if subject is None else term_ids[subject]
+            p = None if predicate is None else term_ids[predicate]
+            o = None if object_ is None else term_ids[object_]
+            if s is not None:
+                po = self.__spo[s]
+                if p is not None:
+                    if o is not None:
+                        return 1 if o in po[p] else 0
+                    return len(po[p])
+                if o is not None:
+                    return _size(self.__osp[o][s])
+                return sum(len(objects) for objects in po.values())
+            if p is not None:
+                if o is not None:
+                    return _size(self.__pos[p][o])
+                return self.__predicate_stats[p][0]
+            if o is not None:
+                return sum(_size(predicates) for predicates in self.__osp[o].values())
+        except KeyError:
+            return 0
+        return self.__triple_count
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if not self.__statistics_apply(context):
+            return None
+        subject, predicate, object_ = triple_pattern
+        if subject is not None or object_ is not None:
+            return None
+        if predicate is None:
+            return len((self.__spo, self.__pos, self.__osp)[position])
+        p = self.__term_ids.get(predicate)
+        if p is None or p not in self.__predicate_stats:
+            return 0
+        if position == 0:
+            return self.__predicate_stats[p][1]
+        if position == 2:
+            return len(self.__pos[p])
+        return 1
+
+    def add_graph(self, graph: "Graph") -> None:
+        if not self.graph_aware:
+            Store.add_graph(self, graph)
+        else:
+            self.__all_contexts.add(graph)
+
+    def remove_graph(self, graph: "Graph") -> None:
+        if not self.graph_aware:
+            Store.remove_graph(self, graph)
+        else:
+            self.remove((None, None, None), graph)
+            try:
+                self.__all_contexts.remove(graph)
+            except KeyError:
+                pass  # we didn't know this graph, no problem
+
+    # internal utility methods below
+    def __intern(self, term: "Node") -> int:
+        """return the id of the term, allocating one if needed"""
+        try:
+            return self.__term_ids[term]
+        except KeyError:
+            pass
+        if self.__free_ids:
+            term_id = self.__free_ids.pop()
+            self.__terms[term_id] = term
+        else:
+            term_id = len(self.__terms)
+            self.__terms.append(term)
+            self.__term_refs.append(0)
+        self.__term_ids[term] = term_id
+        return term_id
+
+    def __release(self, term_id: int) -> None:
+        """drop a reference to the term id, freeing it if it is unused"""
+        refs = self.__term_refs
+        refs[term_id] -= 1
+        if refs[term_id] == 0:
+            # type error: Argument 1 to "__delitem__" of "dict" has incompatible type "Optional[Node]"; expected "Node"
+            del self.__term_ids[self.__terms[term_id]]  # type: ignore[arg-type]
+            self.__terms[term_id] = None
+            self.__free_ids.append(term_id)
+
+    def __remove_triple(self, s: int, p: int, o: int) -> None:
+        """remove the triple from all indexes"""
+        stats = self.__predicate_stats[p]
+        stats[0] -= 1
+        if stats[0] == 0:
+            del self.__predicate_stats[p]
+        self.__triple_count -= 1
+        po = self.__spo[s]
+        objects = po[p]
+        del objects[o]
+        if not objects:
+            stats[1] -= 1
+            del po[p]
+            if not po:
+                del self.__spo[s]
+        _idset_remove(self.__pos, p, o, s)
+        _idset_remove(self.__osp, o, s, p)
+        self.__release(s)
+        self.__release(p)
+        self.__release(o)
+
+    def __statistics_apply(self, context: Optional["_ContextType"]) -> bool:
+        """return True if the indexes, and so the statistics kept with them,
+        hold exactly the triples of the given context"""
+        if context is None:
+            return self.__asserted == self.__triple_count
+        ctx_id = self.__context_id(context)
+        size = 0 if ctx_id is None else self.__context_sizes.get(ctx_id, 0)
+        return size == self.__triple_count
+
+    def __context_gained(self, ctx_id: int, s: int) -> None:
+        """record that a triple with subject s was added to the context"""
+        if ctx_id == _NO_CONTEXT:
+            return
+        sizes = self.__context_sizes
+        sizes[ctx_id] = sizes.get(ctx_id, 0) + 1
+        try:
+            subjects = self.__context_subjects[ctx_id]
+        except KeyError:
+            subjects = self.__context_subjects[ctx_id] = {}
+        subjects[s] = subjects.get(s, 0) + 1
+
+    def __context_lost(self, ctx_id: int, s: int) -> None:
+        """record that a triple with subject s was removed from the context"""
+        if ctx_id == _NO_CONTEXT:
+            return
+        sizes = self.__context_sizes
+        sizes[ctx_id] -= 1
+        if sizes[ctx_id] == 0:
+            # all triples are removed out of this context
+            del sizes[ctx_id]
+            del self.__context_subjects[ctx_id]
+            return
+        subjects = self.__context_subjects[ctx_id]
+        subjects[s] -= 1
+        if subjects[s] == 0:
+            del subjects[s]
+
+    def __context_id(
+        self, ctx: Optional["_ContextType"], create: bool = False
+    ) -> Optional[int]:
+        """return the id of the context, or None if it is not known and
+        create is False"""
+        if ctx is None:
+            return _NO_CONTEXT
+        try:
+            # ctx could be a graph. In that case, use its identifier
+            key = ctx.identifier
+        except AttributeError:
+            # otherwise, ctx should be a URIRef or BNode or str
+            if not isinstance(ctx, str):  # type: ignore[unreachable]
+                raise RuntimeError("Cannot use that type of object as a Graph context")
+            key = ctx  # type: ignore[unreachable]
+        ctx_id = self.__context_ids.get(key)
+        if ctx_id is None:
+            if not create:
+                return None
+            ctx_id = self.__context_ids[key] = len(self.__context_objs)
+            self.__context_objs.append(ctx)
+        else:
+            self.__context_objs[ctx_id] = ctx
+        return ctx_id
+
+    @staticmethod
+    def __context_matcher(ctx_id: int) -> Callable[[_ContextCodes], bool]:
+        asserted = ctx_id << 1
+        quoted = asserted | 1
+
+        def matches(codes: _ContextCodes) -> bool:
+            if codes.__class__ is int:
+                return codes >> 1 == ctx_id  # type: ignore[operator]
+            return asserted in codes or quoted in codes  # type: ignore[operator]
+
+        return matches
+
+    def __contexts(self, codes: _ContextCodes) -> Generator["_ContextType", None, None]:
+        """return a generator for all the non-quoted contexts
+        (dereferenced) in the given context codes"""
+        objs = self.__context_objs
+        # type error: Incompatible types in "yield" (actual type "Optional[Graph]", expected type "Graph")
+        return (
+            objs[code >> 1]  # type: ignore[misc]
+            for code in _members(codes)
+            if not code & 1 and code >> 1 != _NO_CONTEXT
+        )
+
+    # type error: Missing return statement
+    def query(  # type: ignore[return]
+        self,
+        query: Union["Query", str],
+        initNs: Mapping[str, Any],  # noqa: N803
+        initBindings: Mapping["str", "Identifier"],  # noqa: N803
+        queryGraph: "str",  # noqa: N803
+        **kwargs: Any,
+    ) -> "Result":
+        super(CompactMemory, self).query(
+            query, initNs, initBindings, queryGraph, **kwargs
+        )
+
+    def update(
+        self,
+        update: Union["Update", Any],
+        initNs: Mapping[str, Any],  # noqa: N803
+        initBindings: Mapping["str", "Identifier"],  # noqa: N803
+        queryGraph: "str",  # noqa: N803
+        **kwargs: Any,
+    ) -> None:
+        super(CompactMemory, self).update(
+            update, initNs, initBindings, queryGraph, **kwargs
+        )
@@ -1,21 +1,25 @@
 #
 #
+import threading
+import weakref
 from typing import (
     TYPE_CHECKING,
     Any,
-    Collection,
+    Callable,
     Dict,
     Generator,
+    Iterable,
     Iterator,
+    List,
     Mapping,
     Optional,
     Set,
     Tuple,
+    TypeVar,
     Union,
-    overload,
 )
 
-from rdflib.store import Store
+from rdflib.store import Store, TripleAddedEvent
 from rdflib.util import _coalesce
 
 if TYPE_CHECKING:
@@ -24,6 +28,7 @@ if TYPE_CHECKING:
         _ContextType,
         _ObjectType,
         _PredicateType,
+        _QuadType,
         _SubjectType,
         _TriplePatternType,
         _TripleType,
@@ -32,10 +37,66 @@ if TYPE_CHECKING:
     from rdflib.query import Result
     from rdflib.term import Identifier, URIRef
 
-__all__ = ["SimpleMemory", "Memory"]
+__all__ = ["SimpleMemory", "Memory", "MemorySnapshot"]
 
 ANY = None
 
+_ChildType = TypeVar("_ChildType", dict, set, list)
+
+# a change made in a transaction: "add" or "remove" with a triple, its context
+# and whether it is quoted, "quote" with a triple whose contexts only changed
+# in whether it is quoted, and its contexts before, or "add_graph" or
+# "remove_graph" with a graph
+_JournalEntry = Tuple[
+    str,
+    Optional["_TripleType"],
+    Optional["_ContextType"],
+    Union[None, bool, "_ContextsType"],
+]
+
+
+# The contexts of a triple in the Memory store, as the value of the triple in
+# the spo index: the id of a graph if the triple is in that graph and the
+# default context only, which is by far the most common case, and otherwise a
+# dict from the ids of the contexts, 0 for the default context, to whether the
+# triple is quoted in them. These values are never changed, but replaced.
+_ContextsType = Union[int, Dict[int, bool]]
+
+
+def _new_predicate_stats() -> List[int]:
+    return [0, 0]
+
+
+def _in_context(contexts: _ContextsType, context_id: int) -> bool:
+    if contexts.__class__ is int:
+        return context_id == contexts or context_id == 0
+    # type error: Unsupported right operand type for in ("Union[int, Dict[int, bool]]")
+    return context_id in contexts  # type: ignore[operator]
+
+
+def _quoted_in(contexts: _ContextsType, context_id: int) -> bool:
+    """whether the triple is quoted in the context, which it is in"""
+    if contexts.__class__ is int:
+        return False
+    # type error: Value of type "Union[int, Dict[int, bool]]" is not indexable
+    return contexts[context_id]  # type: ignore[index]
+
+
+def _context_dict(contexts: _ContextsType) -> Dict[int, bool]:
+    if contexts.__class__ is int:
+        # type error: Dict entry 0 has incompatible type "Union[int, Dict[int, bool]]": "bool"; expected "int": "bool"
+        return {contexts: False, 0: False}  # type: ignore[dict-item]
+    # type error: No overload variant of "dict" matches argument type "Union[int, Dict[int, bool]]"
+    return dict(contexts)  # type: ignore[call-overload]
+
+
+def _compact_contexts(contexts: Dict[int, bool]) -> _ContextsType:
+    if len(contexts) == 2 and contexts.get(0) is False:
+        for context_id, quoted in contexts.items():
+            if context_id and not quoted:
+                return context_id
+    return contexts
+
 
 class SimpleMemory(Store):
     """\
@@ -120,6 +181,65 @@ class SimpleMemory(Store):
             p = sp[subject] = {}
         p[predicate] = 1
 
+    def addN(self, quads: Iterable["_QuadType"]) -> None:  # noqa: N802
+        """\
+        Add a sequence of quads to the store of triples.
+
+        The index entries of the previous subject and predicate are reused
+        when the next quad has the same subject and predicate objects, so input
+        that is grouped by subject and predicate, as most parsers produce it,
+        mostly skips the outer index lookups.
+        """
+        spo = self.__spo
+        pos = self.__pos
+        osp = self.__osp
+        last_subject: Optional["_SubjectType"] = None
+        last_predicate: Optional["_PredicateType"] = None
+        po: Dict["_PredicateType", Dict["_ObjectType", int]] = {}
+        o: Dict["_ObjectType", int] = {}
+        for subject, predicate, object, c in quads:
+            assert c is not None, "Context associated with %s %s %s is None!" % (
+                subject,
+                predicate,
+                object,
+            )
+            if subject is not last_subject:
+                try:
+                    po = spo[subject]
+                except KeyError:
+                    po = spo[subject] = {}
+                last_subject = subject
+                last_predicate = None
+            if predicate is not last_predicate:
+                try:
+                    o = po[predicate]
+                except KeyError:
+                    o = po[predicate] = {}
+                last_predicate = predicate
+            if object in o:
+                continue
+            o[object] = 1
+
+            try:
+                os = pos[predicate]
+            except KeyError:
+                os = pos[predicate] = {}
+            try:
+                s = os[object]
+            except KeyError:
+                s = os[object] = {}
+            s[subject] = 1
+
+            try:
+                sp = osp[object]
+            except KeyError:
+                sp = osp[object] = {}
+            try:
+                p = sp[subject]
+            except KeyError:
+                p = sp[subject] = {}
+            p[predicate] = 1
+
     def remove(
         self,
         triple_pattern: "_TriplePatternType",
@@ -278,6 +398,7 @@ class Memory(Store):
     context_aware = True
     formula_aware = True
     graph_aware = True
+    transaction_aware = True
 
     def __init__(
         self,
@@ -287,9 +408,10 @@ class Memory(Store):
         super(Memory, self).__init__(configuration)
         self.identifier = identifier
 
-        # indexed by [subject][predicate][object]
+        # indexed by [subject][predicate][object], holding the contexts of
+        # each triple
         self.__spo: Dict[
-            "_SubjectType", Dict["_PredicateType", Dict["_ObjectType", int]]
+            "_SubjectType", Dict["_PredicateType", Dict["_ObjectType", _ContextsType]]
         ] = {}
 
         # indexed by [predicate][object][subject]
@@ -302,15 +424,121 @@ class Memory(Store):
             "_ObjectType", Dict["_SubjectType", Dict["_PredicateType", int]]
         ] = {}
 
+        # number of triples in the indexes, and per predicate the number of
+        # triples and of distinct subjects
+        self.__triple_count = 0
+        self.__predicate_stats: Dict["_PredicateType", List[int]] = {}
+
         self.__namespace: Dict[str, "URIRef"] = {}
         self.__prefix: Dict["URIRef", str] = {}
-        self.__context_obj_map: Dict[str, "Graph"] = {}
-        self.__tripleContexts: Dict["_TripleType", Dict[Optional[str], bool]] = {}
-        self.__contextTriples: Dict[Optional[str], Set["_TripleType"]] = {None: set()}
+        # ids of the contexts by identifier, starting at 1 as 0 is used for
+        # the default context, and the last context object used for each
+        self.__context_ids: Dict[Any, int] = {}
+        self.__context_objs: Dict[int, "Graph"] = {}
+        # triples by context id, and the number of triples in the default
+        # context
+        self.__contextTriples: Dict[int, Set["_TripleType"]] = {}
+        self.__default_count = 0
         # all contexts used in store (unencoded)
         self.__all_contexts: Set["Graph"] = set()
-        # default context information for triples
-        self.__defaultContexts: Optional[Dict[Optional[str], bool]] = None
+        # the changes made in the current transaction, in order, and the
+        # thread that began it, or None outside of transactions
+        self.__journal: Optional[List[_JournalEntry]] = None
+        self.__transaction_thread: Optional[int] = None
+        self.__init_snapshots()
+
+    def __init_snapshots(self) -> None:
+        # Snapshots share the containers of the store.  While there are any,
+        # each container is copied before it is changed the first time, so
+        # the snapshots keep seeing the containers as they were.  __top_owned
+        # tells if the top level containers were copied since the last
+        # snapshot was taken, __owned holds the ids of the nested containers
+        # that were, and is None when there are no snapshots.
+        self.__lock = threading.RLock()
+        # held by the thread of the current transaction, so that changes from
+        # other threads wait until it ends
+        self.__transaction = threading.RLock()
+        self.__snapshots = 0
+        self.__top_owned = True
+        self.__owned: Optional[Set[int]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_Memory__lock"]
+        del state["_Memory__transaction"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__init_snapshots()
+
+    def snapshot(self) -> "MemorySnapshot":
+        """\
+        Return a read-only view of the store as it is now.
+
+        The snapshot shares its indexes with the store, and the store copies
+        the parts it changes afterwards, so taking a snapshot is cheap and
+        writes to the store do not block, nor are seen by, readers of the
+        snapshot. The copying stops once all snapshots are garbage collected.
+        """
+        with self.__lock:
+            snapshot = MemorySnapshot.__new__(MemorySnapshot)
+            snapshot.__dict__.update(self.__dict__)
+            snapshot.__namespace = self.__namespace.copy()
+            snapshot.__prefix = self.__prefix.copy()
+            # the snapshot records the graphs bound to it in its own map
+            snapshot.__context_objs = self.__context_objs.copy()
+            snapshot.__journal = None
+            snapshot.__transaction_thread = None
+            snapshot.__init_snapshots()
+            self.__snapshots += 1
+            self.__top_owned = False
+            self.__owned = set()
+        weakref.finalize(snapshot, Memory.__snapshot_released, weakref.ref(self))
+        return snapshot
+
+    @staticmethod
+    def __snapshot_released(store_ref: "weakref.ReferenceType[Memory]") -> None:
+        store = store_ref()
+        if store is None:
+            return
+        with store.__lock:
+            store.__snapshots -= 1
+            if store.__snapshots == 0:
+                store.__owned = None
+                store.__top_owned = True
+
+    def __unshare(self) -> None:
+        """copy the top level containers, which the store shares with its
+        snapshots"""
+        self.__spo = self.__spo.copy()
+        self.__pos = self.__pos.copy()
+        self.__osp = self.__osp.copy()
+        self.__predicate_stats = self.__predicate_stats.copy()
+        self.__context_ids = self.__context_ids.copy()
+        self.__contextTriples = self.__contextTriples.copy()
+        self.__all_contexts = self.__all_contexts.copy()
+        self.__top_owned = True
+
+    def __child(
+        self,
+        parent: Dict[Any, _ChildType],
+        key: Any,
+        factory: Callable[[], _ChildType] = dict,  # type: ignore[assignment]
+    ) -> _ChildType:
+        """return the container stored under key in parent, creating it if it
+        is missing and copying it if it is shared with a snapshot"""
+        try:
+            child = parent[key]
+        except KeyError:
+            child = parent[key] = factory()
+            if self.__owned is not None:
+                self.__owned.add(id(child))
+            return child
+        if self.__owned is not None and id(child) not in self.__owned:
+            child = parent[key] = child.copy()
+            self.__owned.add(id(child))
+        return child
 
     def add(
         self,
@@ -321,88 +549,220 @@ class Memory(Store):
         """\
         Add a triple to the store of triples.
         """
+        Store.add(self, triple, context, quoted=quoted)
+        with self.__transaction, self.__lock:
+            if not self.__top_owned:
+                self.__unshare()
+            self.__add(triple, context, quoted)
+
+    def __add(
+        self,
+        triple: "_TripleType",
+        context: Optional["_ContextType"],
+        quoted: bool,
+    ) -> None:
         # add dictionary entries for spo[s][p][p] = 1 and pos[p][o][s]
         # = 1, creating the nested dictionaries where they do not yet
         # exits.
-        Store.add(self, triple, context, quoted=quoted)
+        journal = self.__journal
         if context is not None:
+            if journal is not None and context not in self.__all_contexts:
+                journal.append(("add_graph", None, context, None))
             self.__all_contexts.add(context)
         subject, predicate, object_ = triple
-
-        spo = self.__spo
-        try:
-            po = spo[subject]
-        except LookupError:
-            po = spo[subject] = {}
-        try:
-            o = po[predicate]
-        except LookupError:
-            o = po[predicate] = {}
-
-        try:
-            _ = o[object_]
-            # This cannot be reached if (s, p, o) was not inserted before.
-            triple_exists = True
-        except KeyError:
-            o[object_] = 1
-            triple_exists = False
-        self.__add_triple_context(triple, triple_exists, context, quoted)
-
-        if triple_exists:
+        child = self.__child
+
+        o = child(child(self.__spo, subject), predicate)
+        contexts = o.get(object_)
+        context_id = self.__context_id(context, create=True)
+        if journal is not None:
+            if contexts is None or not _in_context(contexts, context_id):
+                journal.append(("add", triple, context, quoted))
+            elif _quoted_in(contexts, context_id) != bool(quoted):
+                journal.append(("quote", triple, context, contexts))
+        # type error: Argument 3 to "__add_triple_context" of "Memory" has incompatible type "Optional[int]"; expected "int"
+        self.__add_triple_context(o, triple, contexts, context_id, quoted)  # type: ignore[arg-type]
+
+        if contexts is not None:
             # No need to insert twice this triple.
             return
 
-        pos = self.__pos
-        try:
-            os = pos[predicate]
-        except LookupError:
-            os = pos[predicate] = {}
-        try:
-            s = os[object_]
-        except LookupError:
-            s = os[object_] = {}
-        s[subject] = 1
+        self.__triple_count += 1
+        stats = child(self.__predicate_stats, predicate, _new_predicate_stats)
+        stats[0] += 1
+        if len(o) == 1:
+            # first object of this subject and predicate
+            stats[1] += 1
 
+        child(child(self.__pos, predicate), object_)[subject] = 1
+        child(child(self.__osp, object_), subject)[predicate] = 1
+
+    def addN(self, quads: Iterable["_QuadType"]) -> None:  # noqa: N802
+        """\
+        Add a sequence of quads to the store of triples.
+
+        Unless a handler is subscribed to `TripleAddedEvent` no events are
+        dispatched. The context of consecutive quads is only encoded once, and
+        the index entries of the previous subject and predicate are reused when
+        the next quad has the same subject and predicate objects, so input that
+        is grouped by subject and predicate, as most parsers produce it, mostly
+        skips the outer index lookups.
+        """
+        if not self.dispatcher.has_subscribers(TripleAddedEvent):
+            with self.__transaction, self.__lock:
+                if self.__owned is None and self.__journal is None:
+                    self.__add_quads(quads)
+                    return
+        # while there are snapshots each container has to be checked before
+        # it is changed, and in transactions each change is recorded, which
+        # `add` does
+        Store.addN(self, quads)
+
+    def __add_quads(self, quads: Iterable["_QuadType"]) -> None:
+        """add the quads without dispatching events, only while there are
+        no snapshots"""
+        spo = self.__spo
+        pos = self.__pos
         osp = self.__osp
-        try:
-            sp = osp[object_]
-        except LookupError:
-            sp = osp[object_] = {}
-        try:
-            p = sp[subject]
-        except LookupError:
-            p = sp[subject] = {}
-        p[predicate] = 1
+        predicate_stats = self.__predicate_stats
+        all_contexts = self.__all_contexts
+        add_triple_context = self.__add_triple_context
+        last_context: Optional["_ContextType"] = None
+        context_id = 0
+        context_triples: Set["_TripleType"] = set()
+        last_subject: Optional["_SubjectType"] = None
+        last_predicate: Optional["_PredicateType"] = None
+        po: Dict["_PredicateType", Dict["_ObjectType", _ContextsType]] = {}
+        o: Dict["_ObjectType", _ContextsType] = {}
+        for subject, predicate, object_, context in quads:
+            assert context is not None, "Context associated with %s %s %s is None!" % (
+                subject,
+                predicate,
+                object_,
+            )
+            if context is not last_context:
+                all_contexts.add(context)
+                # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+                context_id = self.__context_id(context, create=True)  # type: ignore[assignment]
+                try:
+                    context_triples = self.__contextTriples[context_id]
+                except KeyError:
+                    context_triples = self.__contextTriples[context_id] = set()
+                last_context = context
+            if subject is not last_subject:
+                try:
+                    po = spo[subject]
+                except KeyError:
+                    po = spo[subject] = {}
+                last_subject = subject
+                last_predicate = None
+            if predicate is not last_predicate:
+                try:
+                    o = po[predicate]
+                except KeyError:
+                    o = po[predicate] = {}
+                last_predicate = predicate
+
+            triple = (subject, predicate, object_)
+            contexts = o.get(object_)
+            if contexts is not None:
+                add_triple_context(o, triple, contexts, context_id, False)
+                # No need to insert twice this triple.
+                continue
+            o[object_] = context_id
+            context_triples.add(triple)
+            self.__default_count += 1
+
+            self.__triple_count += 1
+            try:
+                stats = predicate_stats[predicate]
+            except KeyError:
+                stats = predicate_stats[predicate] = [0, 0]
+            stats[0] += 1
+            if len(o) == 1:
+                stats[1] += 1
+
+            try:
+                os = pos[predicate]
+            except KeyError:
+                os = pos[predicate] = {}
+            try:
+                s = os[object_]
+            except KeyError:
+                s = os[object_] = {}
+            s[subject] = 1
+
+            try:
+                sp = osp[object_]
+            except KeyError:
+                sp = osp[object_] = {}
+            try:
+                p = sp[subject]
+            except KeyError:
+                p = sp[subject] = {}
+            p[predicate] = 1
 
     def remove(
         self,
         triple_pattern: "_TriplePatternType",
         context: Optional["_ContextType"] = None,
     ) -> None:
-        req_ctx = self.__ctx_to_str(context)
+        with self.__transaction, self.__lock:
+            if not self.__top_owned:
+                self.__unshare()
+            self.__remove(triple_pattern, context)
+
+    def __remove(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> None:
+        if context is None:
+            req_id = 0
+        else:
+            # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+            req_id = self.__context_id(context)  # type: ignore[assignment]
+            if req_id is None:
+                return
+        journal = self.__journal
+        context_objs = self.__context_objs
+        child = self.__child
         for triple, c in self.triples(triple_pattern, context=context):
             subject, predicate, object_ = triple
-            for ctx in self.__get_context_for_triple(triple):
-                if context is not None and req_ctx != ctx:
-                    continue
-                self.__remove_triple_context(triple, ctx)
-            ctxs = self.__get_context_for_triple(triple, skipQuoted=True)
-            if None in ctxs and (context is None or len(ctxs) == 1):
-                # remove from default graph too
-                self.__remove_triple_context(triple, None)
-            if len(self.__get_context_for_triple(triple)) == 0:
-                del self.__spo[subject][predicate][object_]
-                del self.__pos[predicate][object_][subject]
-                del self.__osp[object_][subject][predicate]
-                del self.__tripleContexts[triple]
-        if (
-            req_ctx is not None
-            and req_ctx in self.__contextTriples
-            and len(self.__contextTriples[req_ctx]) == 0
-        ):
+            o = child(child(self.__spo, subject), predicate)
+            contexts = _context_dict(o[object_])
+            if context is None:
+                removed = list(contexts.items())
+                contexts.clear()
+            else:
+                removed = [(req_id, contexts.pop(req_id))]
+                if contexts.get(0) is False and not any(
+                    context_id and not quoted for context_id, quoted in contexts.items()
+                ):
+                    # remove from default graph too
+                    removed.append((0, contexts.pop(0)))
+            for context_id, quoted in removed:
+                if journal is not None:
+                    journal.append(
+                        (
+                            "remove",
+                            triple,
+                            context_objs[context_id] if context_id else None,
+                            quoted,
+                        )
+                    )
+                if context_id:
+                    child(self.__contextTriples, context_id, set).remove(triple)
+                else:
+                    self.__default_count -= 1
+            if contexts:
+                o[object_] = _compact_contexts(contexts)
+            else:
+                self.__remove_triple(triple)
+        if req_id and not self.__contextTriples.get(req_id, True):
             # all triples are removed out of this context
             # and it's not the default context so delete it
-            del self.__contextTriples[req_ctx]
+            del self.__contextTriples[req_id]
 
         if (
             triple_pattern == (None, None, None)
@@ -422,29 +782,50 @@ class Memory(Store):
         None,
     ]:
         """A generator over all the triples matching"""
-        req_ctx = self.__ctx_to_str(context)
+        if context is None:
+            req_id = 0
+        else:
+            # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+            req_id = self.__context_id(context)  # type: ignore[assignment]
+            if req_id is None:
+                return
+        contexts_of = self.__contexts
         subject, predicate, object_ = triple_pattern
 
-        # all triples case (no triple parts given as pattern)
-        if subject is None and predicate is None and object_ is None:
+        # all triples case (no triple parts given as pattern), for a named
+        # graph with less than half of the triples in the store, larger ones
+        # are scanned in the spo index below
+        if (
+            subject is None
+            and predicate is None
+            and object_ is None
+            and req_id
+            and len(self.__contextTriples.get(req_id, ())) * 2 < self.__triple_count
+        ):
             # Just dump all known triples from the given graph
-            if req_ctx not in self.__contextTriples:
+            if req_id not in self.__contextTriples:
                 return
-            for triple in self.__contextTriples[req_ctx].copy():
-                yield triple, self.__contexts(triple)
+            spo = self.__spo
+            for triple in self.__contextTriples[req_id].copy():
+                s, p, o = triple
+                try:
+                    contexts = spo[s][p][o]
+                except KeyError:
+                    # removed while iterating
+                    continue
+                yield triple, contexts_of(contexts)
 
         # optimize "triple in graph" case (all parts given)
         elif subject is not None and predicate is not None and object_ is not None:
-            # type error: Incompatible types in assignment (expression has type "Tuple[Optional[IdentifiedNode], Optional[IdentifiedNode], Optional[Identifier]]", variable has type "Tuple[IdentifiedNode, IdentifiedNode, Identifier]")
-            # NOTE on type error: at this point, all elements of triple_pattern
-            # is not None, so it has the same type as triple
-            triple = triple_pattern  # type: ignore[assignment]
             try:
-                _ = self.__spo[subject][predicate][object_]
-                if self.__triple_has_context(triple, req_ctx):
-                    yield triple, self.__contexts(triple)
+                contexts = self.__spo[subject][predicate][object_]
             except KeyError:
                 return
+            if _in_context(contexts, req_id):
+                # type error: Incompatible types in "yield" (actual type "Tuple[Tuple[Optional[Node], Optional[Node], Optional[Node]], Generator[Graph, None, None]]", expected type "Tuple[Tuple[Node, Node, Node], Generator[Optional[Graph], None, None]]")
+                # NOTE on type error: at this point, all elements of triple_pattern
+                # is not None, so it has the same type as triple
+                yield triple_pattern, contexts_of(contexts)  # type: ignore[misc]
 
         elif subject is not None:  # subject is given
             spo = self.__spo
@@ -452,75 +833,222 @@ class Memory(Store):
                 subjectDictionary = spo[subject]  # noqa: N806
                 if predicate is not None:  # subject+predicate is given
                     if predicate in subjectDictionary:
+                        objects = subjectDictionary[predicate]
                         if object_ is not None:  # subject+predicate+object is given
-                            if object_ in subjectDictionary[predicate]:
-                                triple = (subject, predicate, object_)
-                                if self.__triple_has_context(triple, req_ctx):
-                                    yield triple, self.__contexts(triple)
+                            if object_ in objects:
+                                contexts = objects[object_]
+                                if _in_context(contexts, req_id):
+                                    triple = (subject, predicate, object_)
+                                    yield triple, contexts_of(contexts)
                             else:  # given object not found
                                 pass
                         else:  # subject+predicate is given, object unbound
-                            for o in list(subjectDictionary[predicate].keys()):
-                                triple = (subject, predicate, o)
-                                if self.__triple_has_context(triple, req_ctx):
-                                    yield triple, self.__contexts(triple)
+                            for o, contexts in list(objects.items()):
+                                if _in_context(contexts, req_id):
+                                    triple = (subject, predicate, o)
+                                    yield triple, contexts_of(contexts)
                     else:  # given predicate not found
                         pass
                 else:  # subject given, predicate unbound
-                    for p in list(subjectDictionary.keys()):
+                    for p, objects in list(subjectDictionary.items()):
                         if object_ is not None:  # object is given
-                            if object_ in subjectDictionary[p]:
-                                triple = (subject, p, object_)
-                                if self.__triple_has_context(triple, req_ctx):
-                                    yield triple, self.__contexts(triple)
+                            if object_ in objects:
+                                contexts = objects[object_]
+                                if _in_context(contexts, req_id):
+                                    triple = (subject, p, object_)
+                                    yield triple, contexts_of(contexts)
                             else:  # given object not found
                                 pass
                         else:  # object unbound
-                            for o in list(subjectDictionary[p].keys()):
-                                triple = (subject, p, o)
-                                if self.__triple_has_context(triple, req_ctx):
-                                    yield triple, self.__contexts(triple)
+                            for o, contexts in list(objects.items()):
+                                if _in_context(contexts, req_id):
+                                    triple = (subject, p, o)
+                                    yield triple, contexts_of(contexts)
             else:  # given subject not found
                 pass
         elif predicate is not None:  # predicate is given, subject unbound
             pos = self.__pos
+            spo = self.__spo
             if predicate in pos:
                 predicateDictionary = pos[predicate]  # noqa: N806
                 if object_ is not None:  # predicate+object is given, subject unbound
                     if object_ in predicateDictionary:
                         for s in list(predicateDictionary[object_].keys()):
-                            triple = (s, predicate, object_)
-                            if self.__triple_has_context(triple, req_ctx):
-                                yield triple, self.__contexts(triple)
+                            try:
+                                contexts = spo[s][predicate][object_]
+                            except KeyError:
+                                continue
+                            if _in_context(contexts, req_id):
+                                triple = (s, predicate, object_)
+                                yield triple, contexts_of(contexts)
                     else:  # given object not found
                         pass
                 else:  # predicate is given, object+subject unbound
                     for o in list(predicateDictionary.keys()):
                         for s in list(predicateDictionary[o].keys()):
-                            triple = (s, predicate, o)
-                            if self.__triple_has_context(triple, req_ctx):
-                                yield triple, self.__contexts(triple)
+                            try:
+                                contexts = spo[s][predicate][o]
+                            except KeyError:
+                                continue
+                            if _in_context(contexts, req_id):
+                                triple = (s, predicate, o)
+                                yield triple, contexts_of(contexts)
         elif object_ is not None:  # object is given, subject+predicate unbound
             osp = self.__osp
+            spo = self.__spo
             if object_ in osp:
                 objectDictionary = osp[object_]  # noqa: N806
                 for s in list(objectDictionary.keys()):
                     for p in list(objectDictionary[s].keys()):
-                        triple = (s, p, object_)
-                        if self.__triple_has_context(triple, req_ctx):
-                            yield triple, self.__contexts(triple)
+                        try:
+                            contexts = spo[s][p][object_]
+                        except KeyError:
+                            continue
+                        if _in_context(contexts, req_id):
+                            triple = (s, p, object_)
+                            yield triple, contexts_of(contexts)
         else:  # subject+predicate+object unbound
-            # Shouldn't get here if all other cases above worked correctly.
             spo = self.__spo
-            for s in list(spo.keys()):
-                subjectDictionary = spo[s]  # noqa: N806
-                for p in list(subjectDictionary.keys()):
-                    for o in list(subjectDictionary[p].keys()):
-                        triple = (s, p, o)
-                        if self.__triple_has_context(triple, req_ctx):
-                            yield triple, self.__contexts(triple)
+            for s, subjectDictionary in list(spo.items()):  # noqa: N806
+                for p, objects in list(subjectDictionary.items()):
+                    for o, contexts in list(objects.items()):
+                        if _in_context(contexts, req_id):
+                            triple = (s, p, o)
+                            yield triple, contexts_of(contexts)
+
+    def triples_choices(
+        self,
+        triple: Union[
+            Tuple[List["_SubjectType"], "_PredicateType", "_ObjectType"],
+            Tuple["_SubjectType", List["_PredicateType"], "_ObjectType"],
+            Tuple["_SubjectType", "_PredicateType", List["_ObjectType"]],
+        ],
+        context: Optional["_ContextType"] = None,
+    ) -> Generator[
+        Tuple["_TripleType", Generator[Optional["_ContextType"], None, None]],
+        None,
+        None,
+    ]:
+        """
+        A variant of triples that takes a list of terms in one slot. The
+        context is resolved once and the index entries of the terms that are
+        given are looked up once, and then probed for each of the choices.
+        """
+        subject, predicate, object_ = triple
+        lists = [isinstance(term, list) for term in triple]
+        if lists.count(True) != 1:
+            # left to the default implementation
+            yield from super(Memory, self).triples_choices(triple, context)
+            return
+        position = lists.index(True)
+        if not triple[position]:
+            pattern = list(triple)
+            pattern[position] = None
+            # type error: Argument 1 to "triples" of "Memory" has incompatible type "Tuple[Any, ...]"; expected "Tuple[Optional[Node], Optional[Node], Optional[Node]]"
+            yield from self.triples(tuple(pattern), context)  # type: ignore[arg-type]
+            return
+        if context is None:
+            req_id = 0
+        else:
+            # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+            req_id = self.__context_id(context)  # type: ignore[assignment]
+            if req_id is None:
+                return
+        contexts_of = self.__contexts
+        # type error: No overload variant of "fromkeys" of "dict" matches argument type "Union[List[Node], Node]"
+        choices = list(dict.fromkeys(triple[position]))  # type: ignore[call-overload]
+        spo = self.__spo
+
+        if position == 0:  # subjects given, each is looked up in spo
+            for s in choices:
+                subjectDictionary = spo.get(s)  # noqa: N806
+                if subjectDictionary is None:
+                    continue
+                if predicate is not None:
+                    objects = subjectDictionary.get(predicate)
+                    items = [] if objects is None else [(predicate, objects)]
+                else:
+                    items = list(subjectDictionary.items())
+                for p, objects in items:
+                    if object_ is not None:
+                        contexts = objects.get(object_)
+                        if contexts is not None and _in_context(contexts, req_id):
+                            yield (s, p, object_), contexts_of(contexts)
+                    else:
+                        for o, contexts in list(objects.items()):
+                            if _in_context(contexts, req_id):
+                                yield (s, p, o), contexts_of(contexts)
+
+        elif subject is not None:  # predicates or objects of a given subject
+            subjectDictionary = spo.get(subject)  # noqa: N806
+            if subjectDictionary is None:
+                return
+            if position == 1:
+                predicates = choices
+            elif predicate is not None:
+                predicates = [predicate]
+            else:
+                predicates = list(subjectDictionary.keys())
+            for p in predicates:
+                objects = subjectDictionary.get(p)
+                if objects is None:
+                    continue
+                if position == 2:
+                    candidates = choices
+                elif object_ is not None:
+                    candidates = [object_]
+                else:
+                    candidates = list(objects.keys())
+                for o in candidates:
+                    contexts = objects.get(o)
+                    if contexts is not None and _in_context(contexts, req_id):
+                        yield (subject, p, o), contexts_of(contexts)
+
+        elif position == 1 or predicate is not None:
+            # predicates given, or objects of a given predicate, from pos
+            pos = self.__pos
+            for p in choices if position == 1 else [predicate]:
+                predicateDictionary = pos.get(p)  # noqa: N806
+                if predicateDictionary is None:
+                    continue
+                if position == 2:
+                    candidates = choices
+                elif object_ is not None:
+                    candidates = [object_]
+                else:
+                    candidates = list(predicateDictionary.keys())
+                for o in candidates:
+                    subjects = predicateDictionary.get(o)
+                    if subjects is None:
+                        continue
+                    for s in list(subjects.keys()):
+                        try:
+                            contexts = spo[s][p][o]
+                        except KeyError:
+                            continue
+                        if _in_context(contexts, req_id):
+                            yield (s, p, o), contexts_of(contexts)
+
+        else:  # objects given, subject+predicate unbound, from osp
+            osp = self.__osp
+            for o in choices:
+                objectDictionary = osp.get(o)  # noqa: N806
+                if objectDictionary is None:
+                    continue
+                for s in list(objectDictionary.keys()):
+                    for p in list(objectDictionary[s].keys()):
+                        try:
+                            contexts = spo[s][p][o]
+                        except KeyError:
+                            continue
+                        if _in_context(contexts, req_id):
+                            yield (s, p, o), contexts_of(contexts)
 
     def bind(self, prefix: str, namespace: "URIRef", override: bool = True) -> None:
+        with self.__lock:
+            self.__bind(prefix, namespace, override)
+
+    def __bind(self, prefix: str, namespace: "URIRef", override: bool) -> None:
         # should be identical to `SimpleMemory.bind`
         bound_namespace = self.__namespace.get(prefix)
         bound_prefix = _coalesce(
@@ -564,158 +1092,346 @@ class Memory(Store):
 
         subj, pred, obj = triple
         try:
-            _ = self.__spo[subj][pred][obj]
-            return self.__contexts(triple)
+            return self.__contexts(self.__spo[subj][pred][obj])
         except KeyError:
             return (_ for _ in [])
 
     def __len__(self, context: Optional["_ContextType"] = None) -> int:
-        ctx = self.__ctx_to_str(context)
-        if ctx not in self.__contextTriples:
+        if context is None:
+            return self.__default_count
+        context_id = self.__context_id(context)
+        if context_id is None or context_id not in self.__contextTriples:
             return 0
-        return len(self.__contextTriples[ctx])
+        return len(self.__contextTriples[context_id])
+
+    def count(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> int:
+        cardinality = self.cardinality(triple_pattern, context)
+        if cardinality is not None:
+            return cardinality
+        subject, predicate, object_ = triple_pattern
+        if subject is None and predicate is None and object_ is None:
+            return self.__len__(context)
+        # the indexes hold the triples of all contexts, so the contexts of
+        # each match are checked, but no triples are built
+        # type error: Incompatible types in assignment (expression has type "Optional[int]", variable has type "int")
+        req_id: int = 0 if context is None else self.__context_id(context)  # type: ignore[assignment]
+        if req_id is None:
+            return 0
+        spo = self.__spo
+        count = 0
+        try:
+            if subject is not None:
+                subjectDictionary = spo[subject]  # noqa: N806
+                if predicate is not None:
+                    objects = subjectDictionary[predicate]
+                    if object_ is not None:
+                        return 1 if _in_context(objects[object_], req_id) else 0
+                    for contexts in list(objects.values()):
+                        count += _in_context(contexts, req_id)
+                    return count
+                for objects in list(subjectDictionary.values()):
+                    if object_ is not None:
+                        if object_ in objects:
+                            count += _in_context(objects[object_], req_id)
+                    else:
+                        for contexts in list(objects.values()):
+                            count += _in_context(contexts, req_id)
+                return count
+            if predicate is not None:
+                predicateDictionary = self.__pos[predicate]  # noqa: N806
+                if object_ is not None:
+                    items = [(object_, predicateDictionary[object_])]
+                else:
+                    items = list(predicateDictionary.items())
+                for o, subjects in items:
+                    for s in list(subjects):
+                        count += _in_context(spo[s][predicate][o], req_id)
+                return count
+            for s, predicates in list(self.__osp[object_].items()):
+                for p in list(predicates):
+                    count += _in_context(spo[s][p][object_], req_id)
+        except KeyError:
+            # not found, or removed while counting
+            pass
+        return count
+
+    def cardinality(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if not self.__statistics_apply(context):
+            return None
+        subject, predicate, object_ = triple_pattern
+        try:
+            if subject is not None:
+                po = self.__spo[subject]
+                if predicate is not None:
+                    if object_ is not None:
+                        return 1 if object_ in po[predicate] else 0
+                    return len(po[predicate])
+                if object_ is not None:
+                    return len(self.__osp[object_][subject])
+                return sum(len(o) for o in po.values())
+            if predicate is not None:
+                if object_ is not None:
+                    return len(self.__pos[predicate][object_])
+                return self.__predicate_stats[predicate][0]
+            if object_ is not None:
+                return sum(len(p) for p in self.__osp[object_].values())
+        except KeyError:
+            return 0
+        return self.__triple_count
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if not self.__statistics_apply(context):
+            return None
+        subject, predicate, object_ = triple_pattern
+        if subject is not None or object_ is not None:
+            return None
+        if predicate is None:
+            return len((self.__spo, self.__pos, self.__osp)[position])
+        if predicate not in self.__predicate_stats:
+            return 0
+        if position == 0:
+            return self.__predicate_stats[predicate][1]
+        if position == 2:
+            return len(self.__pos[predicate])
+        return 1
 
     def add_graph(self, graph: "Graph") -> None:
         if not self.graph_aware:
             Store.add_graph(self, graph)
         else:
-            self.__all_contexts.add(graph)
+            with self.__transaction, self.__lock:
+                if graph in self.__all_contexts:
+                    return
+                if not self.__top_owned:
+                    self.__unshare()
+                if self.__journal is not None:
+                    self.__journal.append(("add_graph", None, graph, None))
+                self.__all_contexts.add(graph)
 
     def remove_graph(self, graph: "Graph") -> None:
         if not self.graph_aware:
             Store.remove_graph(self, graph)
         else:
-            self.remove((None, None, None), graph)
-            try:
-                self.__all_contexts.remove(graph)
-            except KeyError:
-                pass  # we didn't know this graph, no problem
+            with self.__transaction, self.__lock:
+                if not self.__top_owned:
+                    self.__unshare()
+                self.__remove((None, None, None), graph)
+                try:
+                    self.__all_contexts.remove(graph)
+                except KeyError:
+                    pass  # we didn't know this graph, no problem
+                else:
+                    if self.__journal is not None:
+                        self.__journal.append(("remove_graph", None, graph, None))
+
+    # Transactions
+
+    @property
+    def in_transaction(self) -> bool:
+        """True in the thread that called :meth:`begin`, until the
+        :meth:`commit` or :meth:`rollback` of that thread"""
+        return self.__transaction_thread == threading.get_ident()
+
+    def begin(self) -> bool:
+        """\
+        Start a transaction, and return True.
+
+        The changes to the statements and graphs of the store made until the
+        next :meth:`commit` are undone by :meth:`rollback`. They are applied
+        to the store directly, and recorded, so reads in the transaction, and
+        from other threads, see them, and committing does no work. Namespace
+        bindings are not part of transactions. Transactions can not be nested.
+
+        A transaction belongs to the thread that began it, and only its
+        commit or rollback ends it. Until then, changes from other threads,
+        and transactions that they begin, wait, so a rollback only undoes the
+        changes of the transaction.
+        """
+        self.__transaction.acquire()
+        with self.__lock:
+            if self.__journal is not None:
+                self.__transaction.release()
+                raise ValueError("A transaction is already in progress")
+            self.__journal = []
+            self.__transaction_thread = threading.get_ident()
+        return True
+
+    def commit(self) -> None:
+        """Keep the changes of the transaction of this thread, if there is
+        one, and end it"""
+        with self.__lock:
+            if not self.in_transaction:
+                return
+            self.__journal = None
+            self.__transaction_thread = None
+        self.__transaction.release()
+
+    def rollback(self) -> None:
+        """Undo the changes of the transaction of this thread, if there is
+        one, and end it. No events are dispatched for the undone changes."""
+        with self.__lock:
+            if not self.in_transaction:
+                return
+            journal = self.__journal
+            self.__journal = None
+            self.__transaction_thread = None
+            self.__transaction.release()
+            if not self.__top_owned:
+                self.__unshare()
+            for operation, triple, context, quoted in reversed(journal):
+                if operation == "add":
+                    # type error: Argument 1 to "__remove" of "Memory" has incompatible type "Optional[Tuple[Node, Node, Node]]"; expected "Tuple[Optional[Node], Optional[Node], Optional[Node]]"
+                    self.__remove(triple, context)  # type: ignore[arg-type]
+                elif operation == "remove":
+                    # type error: Argument 1 to "__add" of "Memory" has incompatible type "Optional[Tuple[Node, Node, Node]]"; expected "Tuple[Node, Node, Node]"
+                    self.__add(triple, context, bool(quoted))  # type: ignore[arg-type]
+                elif operation == "quote":
+                    # type error: Argument 1 to "__restore_contexts" of "Memory" has incompatible type "Optional[Tuple[Node, Node, Node]]"; expected "Tuple[Node, Node, Node]"
+                    self.__restore_contexts(triple, quoted)  # type: ignore[arg-type]
+                elif operation == "add_graph":
+                    self.__all_contexts.discard(context)
+                else:
+                    # type error: Argument 1 to "add" of "set" has incompatible type "Optional[Graph]"; expected "Graph"
+                    self.__all_contexts.add(context)  # type: ignore[arg-type]
 
     # internal utility methods below
+    def __remove_triple(self, triple: "_TripleType") -> None:
+        """remove the triple from the indexes, dropping the entries it
+        leaves empty"""
+        subject, predicate, object_ = triple
+        child = self.__child
+        stats = child(self.__predicate_stats, predicate)
+        stats[0] -= 1
+        if stats[0] == 0:
+            del self.__predicate_stats[predicate]
+        self.__triple_count -= 1
+
+        po = child(self.__spo, subject)
+        o = child(po, predicate)
+        del o[object_]
+        if not o:
+            stats[1] -= 1
+            del po[predicate]
+            if not po:
+                del self.__spo[subject]
+
+        os = child(self.__pos, predicate)
+        s = child(os, object_)
+        del s[subject]
+        if not s:
+            del os[object_]
+            if not os:
+                del self.__pos[predicate]
+
+        sp = child(self.__osp, object_)
+        p = child(sp, subject)
+        del p[predicate]
+        if not p:
+            del sp[subject]
+            if not sp:
+                del self.__osp[object_]
+
+    def __restore_contexts(
+        self, triple: "_TripleType", contexts: _ContextsType
+    ) -> None:
+        """set the contexts of the triple back to contexts, which only differ
+        from its contexts in whether it is quoted in them"""
+        subject, predicate, object_ = triple
+        o = self.__child(self.__child(self.__spo, subject), predicate)
+        self.__default_count += _in_context(contexts, 0) - _in_context(o[object_], 0)
+        o[object_] = contexts
+
+    def __statistics_apply(self, context: Optional["_ContextType"]) -> bool:
+        """return True if the indexes, and so the statistics kept with them,
+        hold exactly the triples of the given context"""
+        return self.__len__(context) == self.__triple_count
+
     def __add_triple_context(
         self,
+        o: Dict["_ObjectType", _ContextsType],
         triple: "_TripleType",
-        triple_exists: bool,
-        context: Optional["_ContextType"],
+        contexts: Optional[_ContextsType],
+        context_id: int,
         quoted: bool,
     ) -> None:
-        """add the given context to the set of contexts for the triple"""
-        ctx = self.__ctx_to_str(context)
+        """add the context to the contexts of the triple, which are stored in
+        o, the entry of its subject and predicate in the spo index"""
         quoted = bool(quoted)
-        if triple_exists:
-            # we know the triple exists somewhere in the store
-            try:
-                triple_context = self.__tripleContexts[triple]
-            except KeyError:
-                # triple exists with default ctx info
-                # start with a copy of the default ctx info
-                # type error: Item "None" of "Optional[Dict[Optional[str], bool]]" has no attribute "copy"
-                triple_context = self.__tripleContexts[
-                    triple
-                ] = self.__defaultContexts.copy()  # type: ignore[union-attr]
-
-            triple_context[ctx] = quoted
-
+        if contexts is None and context_id and not quoted:
+            # the triple didn't exist before in the store, and is in this
+            # context and the default context
+            o[triple[2]] = context_id
+            self.__default_count += 1
+        elif contexts != context_id or quoted:
+            new_contexts = {} if contexts is None else _context_dict(contexts)
+            in_default = 0 in new_contexts
+            new_contexts[context_id] = quoted
+            # if the triple is not quoted add it to the default context
             if not quoted:
-                triple_context[None] = quoted
-
-        else:
-            # the triple didn't exist before in the store
-            if quoted:  # this context only
-                triple_context = self.__tripleContexts[triple] = {ctx: quoted}
-            else:  # default context as well
-                triple_context = self.__tripleContexts[triple] = {
-                    ctx: quoted,
-                    None: quoted,
-                }
-
-        # if the triple is not quoted add it to the default context
-        if not quoted:
-            self.__contextTriples[None].add(triple)
-
-        # always add the triple to given context, making sure it's initialized
-        if ctx not in self.__contextTriples:
-            self.__contextTriples[ctx] = set()
-        self.__contextTriples[ctx].add(triple)
-
-        # if this is the first ever triple in the store, set default ctx info
-        if self.__defaultContexts is None:
-            self.__defaultContexts = triple_context
-        # if the context info is the same as default, no need to store it
-        if triple_context == self.__defaultContexts:
-            del self.__tripleContexts[triple]
-
-    def __get_context_for_triple(
-        self, triple: "_TripleType", skipQuoted: bool = False  # noqa: N803
-    ) -> Collection[Optional[str]]:
-        """return a list of contexts (str) for the triple, skipping
-        quoted contexts if skipQuoted==True"""
-
-        ctxs = self.__tripleContexts.get(triple, self.__defaultContexts)
-
-        if not skipQuoted:
-            # type error: Item "None" of "Optional[Dict[Optional[str], bool]]" has no attribute "keys"
-            return ctxs.keys()  # type: ignore[union-attr]
-
-        # type error: Item "None" of "Optional[Dict[Optional[str], bool]]" has no attribute "items"
-        return [ctx for ctx, quoted in ctxs.items() if not quoted]  # type: ignore[union-attr]
-
-    def __triple_has_context(self, triple: "_TripleType", ctx: Optional[str]) -> bool:
-        """return True if the triple exists in the given context"""
-        # type error: Unsupported right operand type for in ("Optional[Dict[Optional[str], bool]]")
-        return ctx in self.__tripleContexts.get(triple, self.__defaultContexts)  # type: ignore[operator]
-
-    def __remove_triple_context(self, triple: "_TripleType", ctx):
-        """remove the context from the triple"""
-        # type error: Item "None" of "Optional[Dict[Optional[str], bool]]" has no attribute "copy"
-        ctxs = self.__tripleContexts.get(triple, self.__defaultContexts).copy()  # type: ignore[union-attr]
-        del ctxs[ctx]
-        if ctxs == self.__defaultContexts:
-            del self.__tripleContexts[triple]
-        else:
-            self.__tripleContexts[triple] = ctxs
-        self.__contextTriples[ctx].remove(triple)
-
-    @overload
-    def __ctx_to_str(self, ctx: "_ContextType") -> str:
-        ...
-
-    @overload
-    def __ctx_to_str(self, ctx: None) -> None:
-        ...
-
-    def __ctx_to_str(self, ctx: Optional["_ContextType"]) -> Optional[str]:
+                new_contexts[0] = False
+            if not in_default and 0 in new_contexts:
+                self.__default_count += 1
+            o[triple[2]] = _compact_contexts(new_contexts)
+
+        if context_id:
+            self.__child(self.__contextTriples, context_id, set).add(triple)
+
+    def __context_id(
+        self, ctx: Optional["_ContextType"], create: bool = False
+    ) -> Optional[int]:
+        """return the id of the context, 0 for the default context, or None if
+        the context is not known and create is False"""
         if ctx is None:
-            return None
+            return 0
         try:
             # ctx could be a graph. In that case, use its identifier
-            ctx_str = "{}:{}".format(ctx.identifier.__class__.__name__, ctx.identifier)
-            self.__context_obj_map[ctx_str] = ctx
-            return ctx_str
+            key = ctx.identifier
         except AttributeError:
             # otherwise, ctx should be a URIRef or BNode or str
             # NOTE on type errors: This is actually never called with ctx value as str in all unit tests, so this seems like it should just not be here.
             # type error: Subclass of "Graph" and "str" cannot exist: would have incompatible method signatures
             if isinstance(ctx, str):  # type: ignore[unreachable]
                 # type error: Statement is unreachable
-                ctx_str = "{}:{}".format(ctx.__class__.__name__, ctx)  # type: ignore[unreachable]
-                if ctx_str in self.__context_obj_map:
-                    return ctx_str
-                self.__context_obj_map[ctx_str] = ctx
-                return ctx_str
-            raise RuntimeError("Cannot use that type of object as a Graph context")
+                key = ctx  # type: ignore[unreachable]
+            else:
+                raise RuntimeError("Cannot use that type of object as a Graph context")
+        context_id = self.__context_ids.get(key)
+        if context_id is None:
+            if not create:
+                return None
+            context_id = self.__context_ids[key] = len(self.__context_ids) + 1
+        self.__context_objs[context_id] = ctx
+        return context_id
 
     def __contexts(
-        self, triple: "_TripleType"
+        self, contexts: _ContextsType
     ) -> Generator["_ContextType", None, None]:
         """return a generator for all the non-quoted contexts
-        (dereferenced) the encoded triple appears in"""
-        # type error: Argument 2 to "get" of "Mapping" has incompatible type "str"; expected "Optional[Graph]"
-        return (
-            self.__context_obj_map.get(ctx_str, ctx_str)  # type: ignore[arg-type]
-            for ctx_str in self.__get_context_for_triple(triple, skipQuoted=True)
-            if ctx_str is not None
-        )
+        (dereferenced) of a triple"""
+        if contexts.__class__ is int:
+            context_ids: Iterable[int] = (contexts,)  # type: ignore[assignment]
+        else:
+            context_ids = [
+                context_id
+                # type error: Item "int" of "Union[int, Dict[int, bool]]" has no attribute "items"
+                for context_id, quoted in contexts.items()  # type: ignore[union-attr]
+                if context_id and not quoted
+            ]
+        context_objs = self.__context_objs
+        return (context_objs[context_id] for context_id in context_ids)
 
     # type error: Missing return statement
     def query(  # type: ignore[return]
@@ -737,3 +1453,62 @@ class Memory(Store):
         **kwargs,
     ) -> None:
         super(Memory, self).update(update, initNs, initBindings, queryGraph, **kwargs)
+
+
+class MemorySnapshot(Memory):
+    """\
+    A read-only view of a :class:`Memory` store at the time it was taken,
+    returned by :meth:`Memory.snapshot`.
+
+    Namespace bindings are copied from the store and can be changed without
+    affecting it.
+    """
+
+    def add(
+        self,
+        triple: "_TripleType",
+        context: "_ContextType",
+        quoted: bool = False,
+    ) -> None:
+        raise TypeError("The memory store snapshot is read only")
+
+    def addN(self, quads: Iterable["_QuadType"]) -> None:  # noqa: N802
+        raise TypeError("The memory store snapshot is read only")
+
+    def remove(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> None:
+        raise TypeError("The memory store snapshot is read only")
+
+    def add_graph(self, graph: "Graph") -> None:
+        from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+
+        # Dataset adds each graph it returns, including its default graph,
+        # which is fine as long as the snapshot does not change
+        if (
+            graph.identifier != DATASET_DEFAULT_GRAPH_ID
+            # type error: "MemorySnapshot" has no attribute "_Memory__all_contexts"
+            and graph not in self._Memory__all_contexts  # type: ignore[attr-defined]
+        ):
+            raise TypeError("The memory store snapshot is read only")
+
+    def remove_graph(self, graph: "Graph") -> None:
+        raise TypeError("The memory store snapshot is read only")
+
+    def begin(self) -> bool:
+        raise TypeError("The memory store snapshot is read only")
+
+    def snapshot(self) -> "MemorySnapshot":
+        return self
+
+    def contexts(
+        self, triple: Optional["_TripleType"] = None
+    ) -> Generator["_ContextType", None, None]:
+        # the graphs are bound to the live store, rebind them so that they
+        # are read from the snapshot too
+        return (
+            context._rebind(self) if context.store is not self else context
+            for context in super(MemorySnapshot, self).contexts(triple)
+        )
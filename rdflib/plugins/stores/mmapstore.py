@@ -0,0 +1,702 @@
+"""
+A read-only store backed by a single memory-mapped file.
+
+The file holds a term dictionary and four sorted indexes of term ids (SPOG,
+POSG, OSPG and GSPO). It is opened with :mod:`mmap` so the operating system
+only pages in what queries touch, and so that forked or separate worker
+processes that open the same file share those pages instead of each holding
+their own copy of the graph. Triple patterns are answered with binary searches
+over the indexes and terms are only decoded for the statements that match.
+
+Files are built with :func:`write_mmap_store` from any
+:class:`~rdflib.graph.Graph`, :class:`~rdflib.graph.ConjunctiveGraph` or
+:class:`~rdflib.graph.Dataset`:
+
+.. code-block:: python
+
+    from rdflib import Dataset
+    from rdflib.plugins.stores.mmapstore import write_mmap_store
+
+    write_mmap_store(source, "data.rdfmm")
+    dataset = Dataset(store="MMap")
+    dataset.open("data.rdfmm")
+
+Statements from a plain :class:`~rdflib.graph.Graph` are written to a graph
+named by its identifier.
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from rdflib.store import CORRUPTED_STORE, NO_STORE, VALID_STORE, Store
+from rdflib.term import BNode, Literal, Node, URIRef
+from rdflib.util import _coalesce
+
+if TYPE_CHECKING:
+    from rdflib.graph import (
+        Graph,
+        _ContextType,
+        _QuadType,
+        _TriplePatternType,
+        _TripleType,
+    )
+
+__all__ = ["MMapStore", "write_mmap_store"]
+
+MAGIC = b"RDFLIBMM"
+VERSION = 1
+
+#: Number of index rows that are copied out of the mapping at a time.
+BLOCK_SIZE = 4096
+
+#: Number of decoded terms that each open store keeps around.
+TERM_CACHE_SIZE = 65536
+
+# magic, version, byte order, then the counts and the section offsets below
+_HEADER = struct.Struct("<8sHH4x17Q")
+_HEADER_FIELDS = (
+    "terms",
+    "quads",
+    "triples",
+    "contexts",
+    "subjects",
+    "predicates",
+    "objects",
+    "term_offsets",
+    "term_data",
+    "term_data_length",
+    "spog",
+    "posg",
+    "ospg",
+    "gspo",
+    "context_ids",
+    "namespaces",
+    "namespaces_length",
+)
+_LITTLE_ENDIAN = 1
+_BIG_ENDIAN = 2
+_BYTE_ORDER = _LITTLE_ENDIAN if sys.byteorder == "little" else _BIG_ENDIAN
+_LENGTH = struct.Struct("<I")
+
+# Each index row is four term ids, these give the columns of s, p, o and g.
+_SPOG = (0, 1, 2, 3)
+_POSG = (2, 0, 1, 3)
+_OSPG = (1, 2, 0, 3)
+_GSPO = (1, 2, 3, 0)
+
+
+def _encode_term(term: Node) -> bytes:
+    if isinstance(term, URIRef):
+        return b"U" + term.encode("utf-8")
+    if isinstance(term, BNode):
+        return b"B" + term.encode("utf-8")
+    if isinstance(term, Literal):
+        lexical = str(term).encode("utf-8")
+        if term.language is not None:
+            suffix = term.language.encode("utf-8")
+            kind = b"T"
+        elif term.datatype is not None:
+            suffix = term.datatype.encode("utf-8")
+            kind = b"D"
+        else:
+            return b"L" + lexical
+        return kind + _LENGTH.pack(len(lexical)) + lexical + suffix
+    raise ValueError(f"Term {term!r} of type {type(term)} cannot be stored")
+
+
+def _decode_term(data: bytes) -> Node:
+    kind = data[:1]
+    if kind == b"U":
+        return URIRef(data[1:].decode("utf-8"))
+    if kind == b"B":
+        return BNode(data[1:].decode("utf-8"))
+    if kind == b"L":
+        return Literal(data[1:].decode("utf-8"))
+    (length,) = _LENGTH.unpack_from(data, 1)
+    lexical = data[5 : 5 + length].decode("utf-8")
+    suffix = data[5 + length :].decode("utf-8")
+    if kind == b"T":
+        return Literal(lexical, lang=suffix)
+    if kind == b"D":
+        return Literal(lexical, datatype=URIRef(suffix))
+    raise ValueError(f"Unknown term kind {kind!r}")
+
+
+def _pad(position: int) -> int:
+    return -position % 8
+
+
+def write_mmap_store(source: "Graph", path: str) -> None:
+    """
+    Write the statements and namespace bindings of ``source`` to a file that
+    can be opened with :class:`MMapStore`.
+
+    The quads of a :class:`~rdflib.graph.ConjunctiveGraph` or
+    :class:`~rdflib.graph.Dataset` are written with their graphs, statements
+    in the default graph of a dataset are written to
+    :data:`~rdflib.graph.DATASET_DEFAULT_GRAPH_ID`. The file is written next
+    to ``path`` and then renamed over it, so processes that still have an
+    older version of the file open keep seeing that version.
+
+    :param source: the graph to write
+    :param path: the file to write to
+    """
+    from rdflib.graph import DATASET_DEFAULT_GRAPH_ID, ConjunctiveGraph, Graph
+
+    quads: Iterable[Tuple[Node, Node, Node, Any]]
+    if isinstance(source, ConjunctiveGraph):
+        quads = source.quads((None, None, None, None))
+    else:
+        quads = (
+            (s, p, o, source.identifier)
+            for s, p, o in source.triples((None, None, None))
+        )
+
+    ids: Dict[Node, int] = {}
+    encoded: List[bytes] = []
+    rows: Set[Tuple[int, int, int, int]] = set()
+
+    def term_id(term: Node) -> int:
+        try:
+            return ids[term]
+        except KeyError:
+            ids[term] = index = len(encoded)
+            encoded.append(_encode_term(term))
+            return index
+
+    for s, p, o, c in quads:
+        if isinstance(c, Graph):
+            c = c.identifier
+        rows.add(
+            (
+                term_id(s),
+                term_id(p),
+                term_id(o),
+                term_id(_coalesce(c, default=DATASET_DEFAULT_GRAPH_ID)),
+            )
+        )
+
+    # term ids follow the order of the encoded terms, which lets readers find
+    # the id of a term with a binary search
+    order = sorted(range(len(encoded)), key=encoded.__getitem__)
+    remap = array("I", bytes(4 * len(order)))
+    for new, old in enumerate(order):
+        remap[old] = new
+    spog = sorted((remap[s], remap[p], remap[o], remap[g]) for s, p, o, g in rows)
+    del rows
+
+    offsets = array("Q", [0])
+    for old in order:
+        offsets.append(offsets[-1] + len(encoded[old]))
+    term_data = b"".join(encoded[old] for old in order)
+
+    namespaces = "".join(
+        f"{prefix} {namespace}\n" for prefix, namespace in source.namespaces()
+    ).encode("utf-8")
+
+    sections: List[Tuple[str, bytes]] = [
+        ("term_offsets", offsets.tobytes()),
+        ("term_data", term_data),
+    ]
+    for name, columns in (
+        ("spog", _SPOG),
+        ("posg", _POSG),
+        ("ospg", _OSPG),
+        ("gspo", _GSPO),
+    ):
+        ordered = spog if columns is _SPOG else sorted(_permute(spog, columns))
+        sections.append((name, _rows_to_array(ordered).tobytes()))
+    context_ids = array("I", sorted({row[3] for row in spog}))
+    sections.append(("context_ids", context_ids.tobytes()))
+    sections.append(("namespaces", namespaces))
+
+    header: Dict[str, int] = {
+        "terms": len(order),
+        "quads": len(spog),
+        "triples": len({row[:3] for row in spog}),
+        "contexts": len(context_ids),
+        "subjects": len({row[0] for row in spog}),
+        "predicates": len({row[1] for row in spog}),
+        "objects": len({row[2] for row in spog}),
+        "term_data_length": len(term_data),
+        "namespaces_length": len(namespaces),
+    }
+    position = _HEADER.size + _pad(_HEADER.size)
+    for name, data in sections:
+        header[name] = position
+        position += len(data) + _pad(len(data))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".rdfmm-")
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    _BYTE_ORDER,
+                    *(header[name] for name in _HEADER_FIELDS),
+                )
+            )
+            stream.write(bytes(_pad(_HEADER.size)))
+            for _, data in sections:
+                stream.write(data)
+                stream.write(bytes(_pad(len(data))))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _permute(
+    rows: Iterable[Tuple[int, int, int, int]], columns: Tuple[int, int, int, int]
+) -> Generator[Tuple[int, int, int, int], None, None]:
+    s, p, o, g = columns
+    for row in rows:
+        permuted = [0, 0, 0, 0]
+        permuted[s], permuted[p], permuted[o], permuted[g] = row
+        yield permuted[0], permuted[1], permuted[2], permuted[3]
+
+
+def _rows_to_array(rows: Iterable[Tuple[int, int, int, int]]) -> array:
+    values = array("I")
+    for row in rows:
+        values.extend(row)
+    return values
+
+
+class _Rows(Sequence[Tuple[int, ...]]):
+    """The rows of a mapped index, as tuples that can be bisected."""
+
+    def __init__(self, values: memoryview) -> None:
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values) // 4
+
+    def __getitem__(self, index: int) -> Tuple[int, ...]:  # type: ignore[override]
+        return tuple(self.values[4 * index : 4 * index + 4].tolist())
+
+    def range(self, prefix: Tuple[int, ...]) -> Tuple[int, int]:
+        """The rows that start with ``prefix``."""
+        if not prefix:
+            return 0, len(self)
+        return (
+            bisect_left(self, prefix),
+            bisect_left(self, prefix[:-1] + (prefix[-1] + 1,)),
+        )
+
+    def blocks(self, start: int, stop: int) -> Generator[List[int], None, None]:
+        """The values of the rows from ``start`` to ``stop``, a block at a time."""
+        for block in range(start, stop, BLOCK_SIZE):
+            yield self.values[4 * block : 4 * min(block + BLOCK_SIZE, stop)].tolist()
+
+
+class _Terms(Sequence[bytes]):
+    """The encoded terms of a mapped term dictionary, in id order."""
+
+    def __init__(self, offsets: memoryview, data: memoryview) -> None:
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:  # type: ignore[override]
+        return bytes(self.data[self.offsets[index] : self.offsets[index + 1]])
+
+
+class MMapStore(Store):
+    """
+    A read-only, context-aware store over a file written by
+    :func:`write_mmap_store`.
+
+    The file is mapped by :meth:`open` and unmapped by :meth:`close`.
+    Namespace bindings are read from the file, changes to them are kept in
+    memory and are not written back.
+    """
+
+    context_aware = True
+    formula_aware = False
+    graph_aware = True
+
+    def __init__(
+        self,
+        configuration: Optional[str] = None,
+        identifier: Optional[URIRef] = None,
+    ):
+        self.__mmap: Optional[mmap.mmap] = None
+        self.__views: List[memoryview] = []
+        self.__namespace: Dict[str, URIRef] = {}
+        self.__prefix: Dict[URIRef, str] = {}
+        self.__graphs: Dict[int, "Graph"] = {}
+        self.__counts: Dict[str, int] = {}
+        self.__configuration: Optional[str] = None
+        self.__identifier = identifier
+        super(MMapStore, self).__init__(configuration)
+
+    @property
+    def identifier(self) -> Optional[URIRef]:
+        return self.__identifier
+
+    def open(self, configuration: str, create: bool = False) -> int:
+        if create:
+            raise TypeError(
+                "The MMap store is read only, use write_mmap_store to create one"
+            )
+        if not os.path.exists(configuration):
+            return NO_STORE
+        self.close()
+        with open(configuration, "rb") as stream:
+            mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < _HEADER.size:
+            mapping.close()
+            return CORRUPTED_STORE
+        magic, version, byte_order, *values = _HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            mapping.close()
+            return CORRUPTED_STORE
+        if byte_order != _BYTE_ORDER:
+            mapping.close()
+            raise ValueError(
+                f"{configuration} was written on a machine with a different byte order"
+            )
+        counts = self.__counts = dict(zip(_HEADER_FIELDS, values))
+
+        self.__mmap = mapping
+        view = memoryview(mapping)
+        self.__views = [view]
+
+        def section(name: str, length: int, format: str = "B") -> memoryview:
+            start = counts[name]
+            data = view[start : start + length]
+            self.__views.append(data)
+            if format != "B":
+                data = data.cast(format)
+                self.__views.append(data)
+            return data
+
+        self.__terms = _Terms(
+            section("term_offsets", 8 * (counts["terms"] + 1), "Q"),
+            section("term_data", counts["term_data_length"]),
+        )
+        self.__spog, self.__posg, self.__ospg, self.__gspo = (
+            _Rows(section(name, 16 * counts["quads"], "I"))
+            for name in ("spog", "posg", "ospg", "gspo")
+        )
+        self.__context_ids = section("context_ids", 4 * counts["contexts"], "I")
+        self.__term: Callable[[int], Node] = lru_cache(maxsize=TERM_CACHE_SIZE)(
+            lambda term_id: _decode_term(self.__terms[term_id])
+        )
+        self.__id: Callable[[Node], Optional[int]] = lru_cache(maxsize=TERM_CACHE_SIZE)(
+            self.__lookup
+        )
+
+        self.__namespace = {}
+        self.__prefix = {}
+        namespaces = bytes(section("namespaces", counts["namespaces_length"])).decode(
+            "utf-8"
+        )
+        for line in namespaces.splitlines():
+            prefix, namespace = line.split(" ", 1)
+            self.__namespace[prefix] = URIRef(namespace)
+            self.__prefix[URIRef(namespace)] = prefix
+        self.__graphs = {}
+        self.__configuration = os.path.abspath(configuration)
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self.__mmap is None:
+            return
+        for view in reversed(self.__views):
+            view.release()
+        self.__views = []
+        self.__mmap.close()
+        self.__mmap = None
+        self.__graphs = {}
+        self.__configuration = None
+
+    def __lookup(self, term: Node) -> Optional[int]:
+        try:
+            encoded = _encode_term(term)
+        except ValueError:
+            return None
+        index = bisect_left(self.__terms, encoded)
+        if index < len(self.__terms) and self.__terms[index] == encoded:
+            return index
+        return None
+
+    def __graph(self, context_id: int) -> "Graph":
+        try:
+            return self.__graphs[context_id]
+        except KeyError:
+            from rdflib.graph import Graph
+
+            # type error: Argument "identifier" to "Graph" has incompatible type "Node"; expected "Union[IdentifiedNode, str, None]"
+            graph = self.__graphs[context_id] = Graph(
+                store=self, identifier=self.__term(context_id)  # type: ignore[arg-type]
+            )
+            return graph
+
+    def __context_id(self, context: Optional["_ContextType"]) -> Optional[int]:
+        """The id of the graph of ``context``, or -1 for unknown graphs."""
+        if context is None:
+            return None
+        if self.__mmap is None:
+            return -1
+        context_id = self.__id(context.identifier)
+        if context_id is None:
+            return -1
+        index = bisect_left(self.__context_ids, context_id)
+        if index < len(self.__context_ids) and self.__context_ids[index] == context_id:
+            return context_id
+        return -1
+
+    def __pattern(
+        self, triple_pattern: "_TriplePatternType"
+    ) -> Optional[Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """The ids of the bound terms, or None if any of them is not stored."""
+        ids = []
+        for term in triple_pattern:
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.__id(term)
+            if term_id is None:
+                return None
+            ids.append(term_id)
+        return ids[0], ids[1], ids[2]
+
+    def __index(
+        self,
+        pattern: Tuple[Optional[int], Optional[int], Optional[int]],
+        context_id: Optional[int],
+    ) -> Tuple[_Rows, Tuple[int, int, int, int], Tuple[int, ...], bool]:
+        """
+        The index to answer ``pattern`` with, its column layout, the prefix to
+        search for and whether the rows still need filtering on the graph.
+        """
+        s, p, o = pattern
+        bound = tuple(term for term in pattern if term is not None)
+        if context_id is not None and pattern[: len(bound)] == bound:
+            # the bound terms are a prefix of the graph's rows
+            prefix: Tuple[int, ...] = (context_id,) + bound
+            return self.__gspo, _GSPO, prefix, False
+        filter_context = context_id is not None
+        if s is not None:
+            if p is not None:
+                prefix = (s, p) if o is None else (s, p, o)
+                return self.__spog, _SPOG, prefix, filter_context
+            if o is not None:
+                return self.__ospg, _OSPG, (o, s), filter_context
+            return self.__spog, _SPOG, (s,), filter_context
+        if p is not None:
+            prefix = (p,) if o is None else (p, o)
+            return self.__posg, _POSG, prefix, filter_context
+        if o is not None:
+            return self.__ospg, _OSPG, (o,), filter_context
+        return self.__spog, _SPOG, (), filter_context
+
+    def triples(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Iterator[Tuple["_TripleType", Iterator[Optional["_ContextType"]]]]:
+        context_id = self.__context_id(context)
+        if context_id == -1 or self.__mmap is None:
+            return
+        pattern = self.__pattern(triple_pattern)
+        if pattern is None:
+            return
+        rows, (s, p, o, g), prefix, filter_context = self.__index(pattern, context_id)
+        start, stop = rows.range(prefix)
+        term = self.__term
+        graph = self.__graph
+
+        if context is not None:
+            for values in rows.blocks(start, stop):
+                for index in range(0, len(values), 4):
+                    if filter_context and values[index + g] != context_id:
+                        continue
+                    yield (
+                        term(values[index + s]),
+                        term(values[index + p]),
+                        term(values[index + o]),
+                    ), iter((context,))
+            return
+
+        # the graph is the last column of the union indexes, so the rows of a
+        # triple that is in several graphs are next to each other
+        current: Optional[Tuple[int, int, int]] = None
+        graphs: List[int] = []
+        for values in rows.blocks(start, stop):
+            for index in range(0, len(values), 4):
+                triple = values[index + s], values[index + p], values[index + o]
+                if triple != current:
+                    if current is not None:
+                        yield (
+                            term(current[0]),
+                            term(current[1]),
+                            term(current[2]),
+                        ), iter([graph(graph_id) for graph_id in graphs])
+                    current = triple
+                    graphs = []
+                graphs.append(values[index + g])
+        if current is not None:
+            yield (
+                term(current[0]),
+                term(current[1]),
+                term(current[2]),
+            ), iter([graph(graph_id) for graph_id in graphs])
+
+    def __len__(self, context: Optional["_ContextType"] = None) -> int:
+        if self.__mmap is None:
+            return 0
+        context_id = self.__context_id(context)
+        if context_id is None:
+            return self.__counts["triples"]
+        if context_id == -1:
+            return 0
+        start, stop = self.__gspo.range((context_id,))
+        return stop - start
+
+    def contexts(
+        self, triple: Optional["_TripleType"] = None
+    ) -> Generator["_ContextType", None, None]:
+        if self.__mmap is None:
+            return
+        if triple is None:
+            for context_id in self.__context_ids.tolist():
+                yield self.__graph(context_id)
+            return
+        pattern = self.__pattern(triple)
+        if pattern is None or None in pattern:
+            return
+        start, stop = self.__spog.range(pattern)  # type: ignore[arg-type]
+        for values in self.__spog.blocks(start, stop):
+            for index in range(3, len(values), 4):
+                yield self.__graph(values[index])
+
+    def cardinality(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if self.__mmap is None:
+            return 0
+        context_id = self.__context_id(context)
+        if context_id == -1:
+            return 0
+        pattern = self.__pattern(triple_pattern)
+        if pattern is None:
+            return 0
+        if context_id is None and self.__counts["quads"] != self.__counts["triples"]:
+            # the index rows are quads, which count triples that are in more
+            # than one graph more than once
+            return None
+        rows, _, prefix, filter_context = self.__index(pattern, context_id)
+        if filter_context:
+            return None
+        start, stop = rows.range(prefix)
+        return stop - start
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        if context is not None or triple_pattern != (None, None, None):
+            return None
+        if self.__mmap is None:
+            return 0
+        return self.__counts[("subjects", "predicates", "objects")[position]]
+
+    def snapshot(self) -> "MMapStore":
+        return self
+
+    def worker_configuration(self) -> Optional[str]:
+        return self.__configuration
+
+    def add(
+        self,
+        triple: "_TripleType",
+        context: "_ContextType",
+        quoted: bool = False,
+    ) -> None:
+        raise TypeError("The MMap store is read only")
+
+    def addN(self, quads: Iterable["_QuadType"]) -> None:  # noqa: N802
+        raise TypeError("The MMap store is read only")
+
+    def remove(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> None:
+        raise TypeError("The MMap store is read only")
+
+    def add_graph(self, graph: "Graph") -> None:
+        from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+
+        if graph.identifier != DATASET_DEFAULT_GRAPH_ID and (
+            self.__context_id(graph) == -1
+        ):
+            raise TypeError("The MMap store is read only")
+
+    def remove_graph(self, graph: "Graph") -> None:
+        raise TypeError("The MMap store is read only")
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        # should be identical to `Memory.bind`
+        bound_namespace = self.__namespace.get(prefix)
+        bound_prefix = _coalesce(
+            self.__prefix.get(namespace),
+            # type error: error: Argument 1 to "get" of "Mapping" has incompatible type "Optional[URIRef]"; expected "URIRef"
+            self.__prefix.get(bound_namespace),  # type: ignore[arg-type]
+        )
+        if override:
+            if bound_prefix is not None:
+                del self.__namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self.__prefix[bound_namespace]
+            self.__prefix[namespace] = prefix
+            self.__namespace[prefix] = namespace
+        else:
+            # type error: Invalid index type "Optional[URIRef]" for "Dict[URIRef, str]"; expected type "URIRef"
+            self.__prefix[_coalesce(bound_namespace, namespace)] = _coalesce(  # type: ignore[index]
+                bound_prefix, default=prefix
+            )
+            # type error: Invalid index type "Optional[str]" for "Dict[str, URIRef]"; expected type "str"
+            self.__namespace[_coalesce(bound_prefix, prefix)] = _coalesce(  # type: ignore[index]
+                bound_namespace, default=namespace
+            )
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self.__namespace.get(prefix, None)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self.__prefix.get(namespace, None)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        for prefix, namespace in self.__namespace.items():
+            yield prefix, namespace
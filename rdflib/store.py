@@ -262,6 +262,11 @@ class Store(object):
         quoted argument is interpreted by formula-aware stores to indicate this
         statement is quoted/hypothetical. Note that the default implementation
         is a redirect to add
+
+        Stores can override this with a batched implementation for bulk
+        loading. Such implementations should still dispatch a
+        `TripleAddedEvent` for every statement when there are subscribers for
+        it, which `Dispatcher.has_subscribers` can be used to check.
         """
         for s, p, o, c in quads:
             assert c is not None, "Context associated with %s %s %s is None!" % (
@@ -374,6 +379,28 @@ class Store(object):
         :param context: a graph instance to query or None
         """
 
+    def count(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> int:
+        """
+        Number of statements matching the triple pattern, in the same terms as
+        :meth:`__len__`. The default implementation uses :meth:`cardinality`
+        and :meth:`__len__` when they can answer and otherwise counts the
+        results of :meth:`triples`. Stores can implement this to count
+        matches in their indexes without building the matching triples.
+
+        :param triple_pattern: a triple pattern, ``None`` matches any term
+        :param context: a graph instance to count in or None
+        """
+        cardinality = self.cardinality(triple_pattern, context)
+        if cardinality is not None:
+            return cardinality
+        if triple_pattern == (None, None, None):
+            return self.__len__(context)
+        return sum(1 for _ in self.triples(triple_pattern, context))
+
     # type error: Missing return statement
     def contexts(  # type: ignore[empty-body]
         self, triple: Optional["_TripleType"] = None
@@ -456,8 +483,90 @@ class Store(object):
         if False:
             yield None  # type: ignore[unreachable]
 
+    # Optional statistics methods
+
+    def cardinality(
+        self,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        """
+        Number of statements matching the triple pattern, in the same terms as
+        :meth:`__len__`, or None if the store cannot tell without iterating
+        over them.
+
+        This is used for planning queries and by
+        :func:`rdflib.void.generateVoID`, so stores should only answer when it
+        is cheap to do so, and only with exact counts. Stores that keep
+        statistics should at least answer ``(None, predicate, None)``
+        (statements per predicate) and ``(None, RDF.type, class)`` (instances
+        per class).
+
+        :param triple_pattern: a triple pattern, ``None`` matches any term
+        :param context: a graph instance to count in or None
+        """
+        return None
+
+    def distinct_cardinality(
+        self,
+        position: int,
+        triple_pattern: "_TriplePatternType",
+        context: Optional["_ContextType"] = None,
+    ) -> Optional[int]:
+        """
+        Number of distinct terms at ``position`` of the statements matching
+        the triple pattern, or None if the store cannot tell cheaply. As for
+        :meth:`cardinality`, only exact counts should be returned.
+
+        Stores that keep statistics should at least answer the pattern
+        ``(None, None, None)`` (distinct subjects, predicates and objects)
+        and ``(None, predicate, None)`` for subjects and objects.
+
+        :param position: 0 for subjects, 1 for predicates and 2 for objects
+        :param triple_pattern: a triple pattern, ``None`` matches any term
+        :param context: a graph instance to count in or None
+        """
+        return None
+
+    # Optional snapshot methods
+
+    def snapshot(self) -> "Store":
+        """
+        Return a read-only store holding the statements of this store as
+        they are now, which later changes to this store do not affect.
+        Stores that support it should make this cheap, so that queries can
+        be evaluated against a snapshot while the store is being changed.
+        """
+        raise NotImplementedError
+
+    def worker_configuration(self) -> Optional[str]:
+        """
+        A configuration with which a new instance of this store, opened with
+        :meth:`open` in another process while this one is open, holds the
+        same statements, or None if there is none. This is used to evaluate
+        SPARQL queries on a pool of processes, see
+        :data:`rdflib.plugins.sparql.SPARQL_PROCESSES`.
+        """
+        return None
+
     # Optional Transactional methods
 
+    @property
+    def in_transaction(self) -> bool:
+        """True in the thread that started a transaction with :meth:`begin`,
+        until it ends"""
+        return False
+
+    def begin(self) -> bool:
+        """
+        Start a transaction, which the next :meth:`commit` or
+        :meth:`rollback` in the same thread ends, and return True, or return
+        False if the store does not start transactions. The commit and
+        rollback of other stores that are :attr:`transaction_aware` apply to
+        the changes made since the last commit or rollback instead.
+        """
+        return False
+
     def commit(self) -> None:
         """ """
 
@@ -33,6 +33,7 @@ __all__ = [
     "BNode",
     "Literal",
     "Variable",
+    "TermCache",
 ]
 
 import logging
@@ -171,6 +172,8 @@ class Identifier(Node, str):  # allow Identifiers to be Nodes in the Graph
         False
         """
 
+        if self is other:
+            return True
         if type(self) == type(other):
             return str(self) == str(other)
         else:
@@ -2195,6 +2198,76 @@ class Variable(Identifier):
         return (Variable, (str(self),))
 
 
+_IdentifierT = TypeVar("_IdentifierT", bound=Identifier)
+
+
+class TermCache(object):
+    """
+    A table of terms that gives out one shared instance for each distinct
+    term.
+
+    Parsers that are passed a term cache return the cached instance of each
+    term they read, so graphs that are loaded with the same cache share the
+    terms of their common vocabulary, instead of each holding its own equal
+    copy of them. The datatypes of cached literals are cached too.
+
+    >>> cache = TermCache()
+    >>> a = cache.intern(URIRef("urn:example:a"))
+    >>> cache.intern(URIRef("urn:example:a")) is a
+    True
+    >>> one = cache.intern(Literal("1", datatype=URIRef("urn:example:a")))
+    >>> one.datatype is a
+    True
+    >>> len(cache)
+    2
+
+    The cache holds strong references to its terms. It is emptied with
+    :meth:`clear`, and if ``maxsize`` is given the terms that were cached
+    first are dropped once it holds ``maxsize`` terms.
+    """
+
+    __slots__ = ("_terms", "maxsize")
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._terms: Dict[Any, Identifier] = {}
+        self.maxsize = maxsize
+
+    def intern(self, term: _IdentifierT) -> _IdentifierT:
+        """the cached instance of the term, which is added to the cache if it
+        is not in it yet"""
+        if isinstance(term, Literal):
+            # literals with language tags that only differ in case are
+            # equal, but are not the same term
+            key: Any = (term._language, term)
+        else:
+            key = term
+        try:
+            # type error: Incompatible return value type (got "Identifier", expected "_IdentifierT")
+            return self._terms[key]  # type: ignore[return-value]
+        except KeyError:
+            pass
+        if self.maxsize is not None and len(self._terms) >= self.maxsize:
+            if self.maxsize <= 0:
+                return term
+            del self._terms[next(iter(self._terms))]
+        if isinstance(term, Literal) and term._datatype is not None:
+            term._datatype = self.intern(term._datatype)
+        self._terms[key] = term
+        return term
+
+    def clear(self) -> None:
+        """remove all terms from the cache"""
+        self._terms.clear()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: Any) -> bool:
+        if isinstance(term, Literal):
+            return (term._language, term) in self._terms
+        return term in self._terms
+
+
 # Nodes are ordered like this
 # See http://www.w3.org/TR/sparql11-query/#modOrderBy
 # we leave "space" for more subclasses of Node elsewhere
@@ -24,6 +24,12 @@ def generateVoID(  # noqa: N802
     distinctSubjects/objects are tracked for each class/propertyPartition
     this requires more memory again
 
+    If distinctForPartitions is False and the store keeps statistics (see
+    :meth:`rdflib.store.Store.cardinality`), the counts are taken from those
+    instead: only the rdf:type triples are read, plus one pass over the
+    predicates to find the property partitions, and no sets of subjects or
+    objects are built up.
+
     """
 
     typeMap = collections.defaultdict(set)  # noqa: N806
@@ -32,37 +38,23 @@ def generateVoID(  # noqa: N802
         classes[c].add(e)
         typeMap[e].add(c)
 
-    triples = 0
-    subjects = set()
-    objects = set()
-    properties = set()
-    classCount = collections.defaultdict(int)  # noqa: N806
-    propCount = collections.defaultdict(int)  # noqa: N806
-
-    classProps = collections.defaultdict(set)  # noqa: N806
-    classObjects = collections.defaultdict(set)  # noqa: N806
-    propSubjects = collections.defaultdict(set)  # noqa: N806
-    propObjects = collections.defaultdict(set)  # noqa: N806
-
-    for s, p, o in g:
-        triples += 1
-        subjects.add(s)
-        properties.add(p)
-        objects.add(o)
-
-        # class partitions
-        if s in typeMap:
-            for c in typeMap[s]:
-                classCount[c] += 1
-                if distinctForPartitions:
-                    classObjects[c].add(o)
-                    classProps[c].add(p)
-
-        # property partitions
-        propCount[p] += 1
-        if distinctForPartitions:
-            propObjects[p].add(o)
-            propSubjects[p].add(s)
+    statistics = None if distinctForPartitions else _statistics(g, classes)
+    if statistics is not None:
+        triples, distinct_subjects, distinct_objects, classCount, propCount = statistics
+        properties = propCount.keys()
+    else:
+        (
+            triples,
+            distinct_subjects,
+            distinct_objects,
+            classCount,
+            propCount,
+            properties,
+            classProps,
+            classObjects,
+            propSubjects,
+            propObjects,
+        ) = _scan(g, typeMap, distinctForPartitions)
 
     if not dataset:
         dataset = URIRef("http://example.org/Dataset")
@@ -76,8 +68,8 @@ def generateVoID(  # noqa: N802
     res.add((dataset, VOID.triples, Literal(triples)))
     res.add((dataset, VOID.classes, Literal(len(classes))))
 
-    res.add((dataset, VOID.distinctObjects, Literal(len(objects))))
-    res.add((dataset, VOID.distinctSubjects, Literal(len(subjects))))
+    res.add((dataset, VOID.distinctObjects, Literal(distinct_objects)))
+    res.add((dataset, VOID.distinctSubjects, Literal(distinct_subjects)))
     res.add((dataset, VOID.properties, Literal(len(properties))))
 
     for i, c in enumerate(classes):
@@ -123,3 +115,83 @@ def generateVoID(  # noqa: N802
             res.add((part, VOID.distinctObjects, Literal(len(propObjects[p]))))
 
     return res, dataset
+
+
+def _statistics(g, classes):
+    """
+    Counts from the statistics kept by the store: triples, distinct subjects,
+    distinct objects, triples per class and triples per property, or None if
+    the store does not keep them.
+    """
+    triples = g.cardinality((None, None, None))
+    distinct_subjects = g.distinct_cardinality(0, (None, None, None))
+    distinct_objects = g.distinct_cardinality(2, (None, None, None))
+    if None in (triples, distinct_subjects, distinct_objects):
+        return None
+
+    classCount = collections.defaultdict(int)  # noqa: N806
+    for c, entities in classes.items():
+        for e in entities:
+            count = g.cardinality((e, None, None))
+            if count is None:
+                return None
+            classCount[c] += count
+
+    propCount = {}  # noqa: N806
+    for p in g.predicates(unique=True):
+        count = g.cardinality((None, p, None))
+        if count is None:
+            return None
+        propCount[p] = count
+
+    return triples, distinct_subjects, distinct_objects, classCount, propCount
+
+
+def _scan(g, typeMap, distinctForPartitions):  # noqa: N803
+    """
+    Counts and partition sets from a pass over all triples of the graph.
+    """
+    triples = 0
+    subjects = set()
+    objects = set()
+    properties = set()
+    classCount = collections.defaultdict(int)  # noqa: N806
+    propCount = collections.defaultdict(int)  # noqa: N806
+
+    classProps = collections.defaultdict(set)  # noqa: N806
+    classObjects = collections.defaultdict(set)  # noqa: N806
+    propSubjects = collections.defaultdict(set)  # noqa: N806
+    propObjects = collections.defaultdict(set)  # noqa: N806
+
+    for s, p, o in g:
+        triples += 1
+        subjects.add(s)
+        properties.add(p)
+        objects.add(o)
+
+        # class partitions
+        if s in typeMap:
+            for c in typeMap[s]:
+                classCount[c] += 1
+                if distinctForPartitions:
+                    classObjects[c].add(o)
+                    classProps[c].add(p)
+
+        # property partitions
+        propCount[p] += 1
+        if distinctForPartitions:
+            propObjects[p].add(o)
+            propSubjects[p].add(s)
+
+    return (
+        triples,
+        len(subjects),
+        len(objects),
+        classCount,
+        propCount,
+        properties,
+        classProps,
+        classObjects,
+        propSubjects,
+        propObjects,
+    )
@@ -27,7 +27,7 @@ DB = "/db/"
 pluginstores = []
 
 for s in plugin.plugins(None, plugin.Store):
-    if s.name in ("Memory", "Auditable", "Concurrent", "SPARQLStore"):
+    if s.name in ("Memory", "Auditable", "Concurrent", "MMap", "SPARQLStore"):
         continue  # these are tested by default
 
     if not s.getClass().graph_aware:
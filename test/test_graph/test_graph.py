@@ -69,6 +69,7 @@ def get_store_names() -> Set[Optional[str]]:
             "Memory",
             "Auditable",
             "Concurrent",
+            "MMap",
             "SPARQLStore",
             "SPARQLUpdateStore",
             "SimpleMemory",
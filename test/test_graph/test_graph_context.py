@@ -373,6 +373,7 @@ for s in plugin.plugins(pluginname, plugin.Store):
         "Memory",
         "Auditable",
         "Concurrent",
+        "MMap",
         "SPARQLStore",
         "SPARQLUpdateStore",
     ):
@@ -0,0 +1,122 @@
+from typing import Dict, Optional
+
+import pytest
+
+from rdflib import XSD, BNode, Dataset, Graph, Literal, URIRef
+from rdflib.term import Genid, TermCache
+
+EX = "http://example.org/"
+
+DATA: Dict[str, str] = {
+    "nt": f"""
+        <{EX}a> <{EX}p> "1"^^<{XSD.integer}> .
+        <{EX}a> <{EX}q> "chat"@fr .
+        _:b <{EX}p> <{EX}a> .
+    """,
+    "nquads": f"""
+        <{EX}a> <{EX}p> "1"^^<{XSD.integer}> <{EX}g> .
+        <{EX}a> <{EX}q> "chat"@fr .
+        _:b <{EX}p> <{EX}a> <{EX}g> .
+    """,
+    "turtle": f"""
+        @prefix ex: <{EX}> .
+        ex:a ex:p 1 ; ex:q "chat"@fr .
+        [] ex:p ex:a .
+    """,
+    "trig": f"""
+        @prefix ex: <{EX}> .
+        ex:g {{ ex:a ex:p 1 ; ex:q "chat"@fr . [] ex:p ex:a . }}
+    """,
+    "n3": f"""
+        @prefix ex: <{EX}> .
+        ex:a ex:p 1 ; ex:q "chat"@fr .
+        [] ex:p ex:a .
+    """,
+    "xml": f"""<?xml version="1.0"?>
+        <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+                 xmlns:ex="{EX}">
+          <rdf:Description rdf:about="{EX}a">
+            <ex:p rdf:datatype="{XSD.integer}">1</ex:p>
+            <ex:q xml:lang="fr">chat</ex:q>
+          </rdf:Description>
+          <rdf:Description><ex:p rdf:resource="{EX}a"/></rdf:Description>
+        </rdf:RDF>
+    """,
+    "json-ld": f"""{{
+        "@context": {{"ex": "{EX}"}},
+        "@graph": [
+            {{"@id": "ex:a",
+              "ex:p": {{"@value": "1", "@type": "{XSD.integer}"}},
+              "ex:q": {{"@value": "chat", "@language": "fr"}}}},
+            {{"ex:p": {{"@id": "ex:a"}}}}
+        ]
+    }}""",
+}
+
+
+def test_intern() -> None:
+    cache = TermCache()
+    a = URIRef(EX + "a")
+    assert cache.intern(a) is a
+    assert cache.intern(URIRef(EX + "a")) is a
+    assert cache.intern(Genid(EX + "a")) is not a
+    assert cache.intern(Literal(EX + "a")) is not a
+    assert Literal(EX + "a") in cache
+    assert BNode("a") not in cache
+    assert len(cache) == 3
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.intern(URIRef(EX + "a")) is not a
+
+
+def test_intern_literals() -> None:
+    cache = TermCache()
+    one = cache.intern(Literal("1", datatype=URIRef(str(XSD.integer))))
+    assert cache.intern(Literal(1)) is one
+    assert one.datatype is cache.intern(URIRef(str(XSD.integer)))
+    en = cache.intern(Literal("cat", lang="en"))
+    assert cache.intern(Literal("cat", lang="en")) is en
+    # equal, but a different lexical form of the language tag
+    upper = cache.intern(Literal("cat", lang="EN"))
+    assert upper is not en and upper.language == "EN"
+    assert cache.intern(Literal("cat")) is not en
+
+
+@pytest.mark.parametrize("maxsize", [0, 2])
+def test_maxsize(maxsize: int) -> None:
+    cache = TermCache(maxsize=maxsize)
+    terms = [cache.intern(URIRef(f"{EX}{i}")) for i in range(4)]
+    assert len(cache) == maxsize
+    assert [term in cache for term in terms] == [False] * (4 - maxsize) + [
+        True
+    ] * maxsize
+
+
+def parse(format: str, term_cache: Optional[TermCache]) -> Graph:
+    dataset = Dataset()
+    dataset.parse(data=DATA[format], format=format, term_cache=term_cache)
+    graph = Graph()
+    for s, p, o, _ in dataset.quads():
+        graph.add((s, p, o))
+    return graph
+
+
+@pytest.mark.parametrize("format", sorted(DATA))
+def test_parsers_share_terms(format: str) -> None:
+    cache = TermCache()
+    graphs = [parse(format, cache) for _ in range(2)]
+    expected = parse(format, None)
+    assert len(graphs[0]) == 3
+    assert set(graphs[0].triples((URIRef(EX + "a"), None, None))) == set(
+        expected.triples((URIRef(EX + "a"), None, None))
+    )
+    first = {term: term for triple in graphs[0] for term in triple}
+    for triple in graphs[1]:
+        for term in triple:
+            if isinstance(term, BNode):
+                assert term not in cache
+            else:
+                assert first[term] is term
+                assert cache.intern(term) is term
+    one = first[Literal(1)]
+    assert one.datatype is cache.intern(URIRef(str(XSD.integer)))
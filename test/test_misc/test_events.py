@@ -62,3 +62,11 @@ class TestEvent:
         del c3["bob"]
         assert ("bob" in c1) == False
         assert ("bob" in c2) == False
+
+
+def test_has_subscribers():
+    dispatcher = events.Dispatcher()
+    assert not dispatcher.has_subscribers(AddedEvent)
+    dispatcher.subscribe(AddedEvent, lambda event: None)
+    assert dispatcher.has_subscribers(AddedEvent)
+    assert not dispatcher.has_subscribers(RemovedEvent)
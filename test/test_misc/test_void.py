@@ -0,0 +1,68 @@
+from test.data import bob, cheese, hates, likes, michel, pizza
+from typing import Dict, Tuple
+
+import pytest
+
+from rdflib import RDF, Graph, Literal, URIRef
+from rdflib.namespace import FOAF, VOID
+from rdflib.void import generateVoID
+
+
+def make_graph(store: str) -> Graph:
+    graph = Graph(store=store)
+    graph.add((michel, RDF.type, FOAF.Person))
+    graph.add((bob, RDF.type, FOAF.Person))
+    graph.add((pizza, RDF.type, FOAF.Document))
+    graph.add((michel, likes, pizza))
+    graph.add((michel, likes, cheese))
+    graph.add((bob, likes, cheese))
+    graph.add((bob, hates, pizza))
+    graph.add((michel, hates, Literal("broccoli")))
+    return graph
+
+
+def summary(void: Graph, dataset: URIRef) -> Dict[Tuple, int]:
+    """
+    The counts in the VoID description, keyed by the class or property of
+    their partition, as partition names depend on iteration order.
+    """
+    counts = {}
+    for p, o in void.predicate_objects(dataset):
+        if isinstance(o, Literal):
+            counts[(None, p)] = o.toPython()
+    for partition_property, key in [
+        (VOID.classPartition, VOID["class"]),
+        (VOID.propertyPartition, VOID.property),
+    ]:
+        for part in void.objects(dataset, partition_property):
+            term = void.value(part, key)
+            for p, o in void.predicate_objects(part):
+                if isinstance(o, Literal):
+                    counts[(term, p)] = o.toPython()
+    return counts
+
+
+@pytest.mark.parametrize("distinct", [True, False])
+def test_counts(distinct: bool) -> None:
+    void, dataset = generateVoID(
+        make_graph("SimpleMemory"), distinctForPartitions=distinct
+    )
+    counts = summary(void, dataset)
+    assert counts[(None, VOID.triples)] == 8
+    assert counts[(None, VOID.classes)] == 2
+    assert counts[(None, VOID.properties)] == 3
+    assert counts[(None, VOID.distinctSubjects)] == 3
+    assert counts[(None, VOID.distinctObjects)] == 5
+    assert counts[(FOAF.Person, VOID.triples)] == 7
+    assert counts[(FOAF.Person, VOID.entities)] == 2
+    assert counts[(likes, VOID.triples)] == 3
+
+
+@pytest.mark.parametrize("store", ["Memory", "CompactMemory"])
+def test_statistics_give_the_same_counts(store: str) -> None:
+    expected = summary(
+        *generateVoID(make_graph("SimpleMemory"), distinctForPartitions=False)
+    )
+    graph = make_graph(store)
+    assert graph.cardinality((None, None, None)) is not None
+    assert summary(*generateVoID(graph, distinctForPartitions=False)) == expected
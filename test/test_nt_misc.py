@@ -168,6 +168,25 @@ class TestNT:
         # p.line = '"baz"@fr^^<http://example.org/datatype1>'
         # self.assertRaises(ntriples.ParseError, p.literal)
 
+    def test_graph_sink_batches(self):
+        fname = nt_file("lists-02.nt")
+        sink = ntriples.NTGraphSink(Graph(), batch_size=5)
+        p = ntriples.W3CNTriplesParser(sink)
+        with open(fname, "r") as f:
+            p.parse(f)
+        assert 14 == len(sink.g)
+
+    def test_graph_sink_flushes_on_error(self):
+        data = (
+            "<http://example.org/a> <http://example.org/b> <http://example.org/c> .\n"
+            "<http://example.org/resource32> 3 <http://example.org/datatype1> .\n"
+        )
+        sink = ntriples.NTGraphSink(Graph())
+        p = ntriples.W3CNTriplesParser(sink)
+        with pytest.raises(ntriples.ParseError):
+            p.parsestring(data)
+        assert 1 == len(sink.g)
+
 
 class TestBNodeContext:
     def test_bnode_shared_across_instances(self):
@@ -0,0 +1,111 @@
+from decimal import Decimal
+from typing import Any, List
+
+import pytest
+
+from rdflib import XSD, Graph, Literal, URIRef, Variable
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.aggregates import Aggregator, ColumnAggregator
+from rdflib.plugins.sparql.sparql import FrozenBindings, QueryContext
+
+VALUES = [
+    Literal(1),
+    Literal("01", datatype=XSD.integer),
+    Literal(Decimal("1.0")),
+    Literal(1.0),
+    Literal(2),
+    Literal(-3),
+    Literal(Decimal("2.5")),
+    Literal("NaN", datatype=XSD.double),
+    Literal("7", datatype=XSD.int),
+    Literal("a"),
+    Literal("b", lang="en"),
+    URIRef("http://example.org/a"),
+    None,
+]
+
+AGGREGATES = [
+    "COUNT(*)",
+    "COUNT(DISTINCT *)",
+    "COUNT(?y)",
+    "COUNT(DISTINCT ?y)",
+    "SUM(?y)",
+    "SUM(DISTINCT ?y)",
+    "AVG(?y)",
+    "MIN(?y)",
+    "MAX(?y)",
+    "MIN(?y + 1)",
+    "SAMPLE(?y)",
+    "GROUP_CONCAT(DISTINCT ?y; SEPARATOR = '|')",
+]
+
+
+def aggregations(aggregate: str) -> List[Any]:
+    query = prepareQuery(f"SELECT ?x ({aggregate} AS ?a) {{ }} GROUP BY ?x")
+    part = query.algebra
+    while part.name != "AggregateJoin":
+        part = part.p
+    return part.A
+
+
+def outcome(function: Any) -> Any:
+    try:
+        return function()
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("aggregate", AGGREGATES)
+@pytest.mark.parametrize("values", [VALUES[:7], VALUES[:9], VALUES])
+def test_same_as_aggregator(aggregate: str, values: List[Any]) -> None:
+    ctx = QueryContext(Graph(), initBindings={})
+    x, y = Variable("x"), Variable("y")
+    rows = [
+        FrozenBindings(ctx, {x: Literal(i % 3), y: value} if value else {x: 1})
+        for i, value in enumerate(values * 2)
+    ]
+    A = aggregations(aggregate)
+
+    def aggregators() -> List[Any]:
+        groups = {}
+        for row in rows:
+            groups.setdefault(row[x], Aggregator(aggregations=A)).update(row)
+        return [dict(group.get_bindings()) for group in groups.values()]
+
+    def columns() -> List[Any]:
+        aggregator = ColumnAggregator(A, ctx.schema)
+        groups = {}
+        for row in rows:
+            group = groups.get(row[x])
+            if group is None:
+                group = groups[row[x]] = aggregator.add_group()
+            aggregator.update(group, row)
+        return [dict(aggregator.get_bindings(group)) for group in groups.values()]
+
+    expected = outcome(aggregators)
+    assert outcome(columns) == expected
+
+
+def test_numbers() -> None:
+    graph = Graph()
+    query = """
+        SELECT ?x (SUM(?y) AS ?sum) (MIN(?y) AS ?min) (MAX(?y) AS ?max)
+            (COUNT(DISTINCT ?y) AS ?distinct) (COUNT(*) AS ?count) {
+            VALUES (?x ?y) {
+                (1 1) (1 3) (1 01) (1 2) (1 3)
+                (2 1.5) (2 0.5) (2 1.50)
+                (3 1e0) (3 2) (3 0.5)
+            }
+        } GROUP BY ?x ORDER BY ?x
+    """
+    assert [tuple(row)[1:] for row in graph.query(query)] == [
+        (Literal(10), Literal(1), Literal(3), Literal(3), Literal(5)),
+        (
+            Literal(Decimal("3.50")),
+            Literal(Decimal("0.5")),
+            Literal(Decimal("1.5")),
+            Literal(3),
+            Literal(3),
+        ),
+        (Literal(3.5), Literal(Decimal("0.5")), Literal(2), Literal(3), Literal(3)),
+    ]
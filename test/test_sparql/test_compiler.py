@@ -0,0 +1,167 @@
+import threading
+from typing import Any
+
+import pytest
+
+from rdflib import Graph, Literal, Namespace, Variable
+from rdflib.plugins.sparql.algebra import translateQuery
+from rdflib.plugins.sparql.compiler import compiled, compileValue
+from rdflib.plugins.sparql.operators import register_custom_function
+from rdflib.plugins.sparql.parser import parseQuery
+from rdflib.plugins.sparql.parserutils import CompValue, value
+from rdflib.plugins.sparql.sparql import (
+    FrozenBindings,
+    QueryContext,
+    SPARQLError,
+    VariableSchema,
+)
+
+EX = Namespace("http://example.org/")
+
+EXPRESSIONS = [
+    "?x = 1",
+    "?x < ?y",
+    "?x != ?z",
+    "?u < 1",
+    "?x IN (1, ?z, 2)",
+    "?x NOT IN (?z)",
+    "?x + ?y * 2",
+    "?x - ?y / 0",
+    "-?x",
+    "!?b",
+    "?b && ?z",
+    "?z || ?b",
+    "?z || !?b",
+    "BOUND(?z) || BOUND(?x)",
+    "COALESCE(?z, ?x + 1)",
+    "IF(?b, ?x, ?z)",
+    "STRLEN(?s) > 2",
+    "REGEX(?s, 'A', 'i')",
+    "REGEX(?x, ?z)",
+    "CONTAINS(UCASE(?s), 'B')",
+    "LANGMATCHES(LANG(?s), 'en')",
+    "DATATYPE(?x)",
+    "STR(?u)",
+    "sameTerm(?x, ?y)",
+    "isIRI(?u) && isLITERAL(?x)",
+    "<http://www.w3.org/2001/XMLSchema#integer>(?y) = 2",
+    "<http://example.org/twice>(?x)",
+]
+
+ROWS = [
+    {
+        "x": Literal(1),
+        "y": Literal(2),
+        "b": Literal(True),
+        "s": Literal("abc", lang="en"),
+        "u": EX.u,
+    },
+    {"x": Literal("a"), "y": Literal(2.5), "b": Literal(""), "s": Literal("ABC")},
+    {},
+]
+
+
+def filter_expr(expression: str) -> Any:
+    query = translateQuery(parseQuery(f"SELECT * {{ FILTER ({expression}) }}"))
+    part = query.algebra
+    while part.name != "Filter":
+        part = part.p
+    return part.expr
+
+
+def same(a: Any, b: Any) -> bool:
+    if isinstance(a, SPARQLError):
+        return type(a) is type(b) and a.args == b.args
+    return (
+        type(a) is type(b)
+        and a == b
+        and getattr(a, "datatype", None) == getattr(b, "datatype", None)
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def twice():
+    register_custom_function(
+        EX.twice, lambda x: Literal(x.toPython() * 2), override=True
+    )
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+@pytest.mark.parametrize("bindings", ROWS)
+def test_same_as_interpreted(expression: str, bindings: dict) -> None:
+    expr = filter_expr(expression)
+    ctx = QueryContext(Graph(), initBindings={})
+    row = FrozenBindings(ctx, {Variable(k): v for k, v in bindings.items()})
+    evaluate = compiled(expr, ctx.schema).eval
+    assert same(evaluate(row), expr.eval(row))
+    # solutions of another schema are looked up like mappings
+    other = FrozenBindings(QueryContext(Graph(), initBindings={}), row)
+    assert same(evaluate(other), expr.eval(other))
+
+
+def test_compiled_once_per_schema() -> None:
+    expr = filter_expr("?x + ?y > 1 && BOUND(?z)")
+    schema = VariableSchema()
+    first = compiled(expr, schema)
+    assert compiled(expr, schema) is first
+    assert compiled(expr, VariableSchema()) is not first
+    assert first.variables == {Variable("x"), Variable("y"), Variable("z")}
+    assert compiled(filter_expr("EXISTS { ?x ?p ?o }"), schema).variables is None
+
+    # executions with other schemas, also in other threads, keep their own
+    other = VariableSchema([Variable("z"), Variable("y"), Variable("x")])
+    second = compiled(expr, other)
+    assert compiled(expr, schema) is first and compiled(expr, other) is second
+    results = []
+
+    def evaluate(schema: VariableSchema) -> None:
+        ctx = QueryContext(Graph(), initBindings={}, schema=schema)
+        row = FrozenBindings(ctx, {Variable(v): Literal(1) for v in "xyz"})
+        for _ in range(100):
+            results.append(compiled(expr, schema).eval(row))
+
+    threads = [
+        threading.Thread(target=evaluate, args=(s,)) for s in [schema, other] * 2
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert compiled(expr, schema) is first and compiled(expr, other) is second
+    assert results == [Literal(True)] * 400
+
+
+def test_values() -> None:
+    ctx = QueryContext(Graph(), initBindings={})
+    row = FrozenBindings(ctx, {Variable("x"): Literal(1)})
+    for val in [Variable("x"), Variable("z"), Literal(2), [Variable("x")]]:
+        assert compileValue(val, ctx.schema, variables=True)(row) == value(
+            row, val, variables=True
+        )
+    with pytest.raises(SPARQLError):
+        compileValue(Variable("z"), ctx.schema)(row)
+    with pytest.raises(Exception, match="What do I do"):
+        compileValue(CompValue("Unknown"), ctx.schema)(row)
+
+
+def test_queries() -> None:
+    graph = Graph()
+    for i in range(10):
+        graph.add((EX[f"s{i}"], EX.p, Literal(i)))
+        if i % 2:
+            graph.add((EX[f"s{i}"], EX.q, Literal(i * 10)))
+    query = """
+        PREFIX : <http://example.org/>
+        SELECT ?s ?d {
+            ?s :p ?o
+            OPTIONAL { ?s :q ?q }
+            BIND (?o * 2 AS ?d)
+            FILTER (?o > ?limit && (!BOUND(?q) || ?q > 30))
+            FILTER EXISTS { ?s :p ?d2 FILTER (?d2 < ?o + 1) }
+        } ORDER BY DESC(?d) ?s
+    """
+    result = [
+        (s.toPython(), d.toPython())
+        for s, d in graph.query(query, initBindings={"limit": Literal(3)})
+    ]
+    assert result == [(str(EX[f"s{i}"]), i * 2) for i in (9, 8, 7, 6, 5, 4)]
@@ -0,0 +1,142 @@
+import itertools
+from typing import Any, List
+
+import pytest
+
+from rdflib import Graph, Literal, Namespace, Variable
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.evalutils import _hash_join, _symmetric_hash_join
+from rdflib.plugins.sparql.operators import (
+    register_custom_function,
+    unregister_custom_function,
+)
+from rdflib.plugins.sparql.sparql import FrozenBindings, QueryContext
+
+EX = Namespace("http://example.org/")
+
+PREFIX = "PREFIX : <http://example.org/> "
+
+PATTERNS = [
+    "?s :p ?o",
+    "?s :p ?o . ?t :q ?o",
+    "?s :p ?o . ?s :q ?q FILTER (?q > 10)",
+    "?s :p ?o OPTIONAL { ?s :q ?q }",
+    "?s :p ?o MINUS { ?s :q ?q }",
+    "{ ?s :p ?o } UNION { ?s :q 100 }",
+    "?s :p ?o . { SELECT ?s { ?s :q ?q } ORDER BY ?q LIMIT 2 OFFSET 3 }",
+    "{ SELECT ?s { ?s :p ?o } ORDER BY ?o OFFSET 5 } ?s :q ?q",
+    "?s :p ?o FILTER (?o > 3)",
+    "?s :p ?o . ?s :q 100",
+    "?s :p ?o . ?t :r ?o",
+]
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    graph = Graph()
+    for i in range(30):
+        s = EX[f"s{i}"]
+        graph.add((s, EX.p, Literal(i % 7)))
+        if i % 2:
+            graph.add((s, EX.q, Literal(i)))
+    return graph
+
+
+@pytest.fixture
+def calls():
+    """registers :f, which records the solutions it is called with"""
+    calls: List[Any] = []
+
+    def f(x):
+        calls.append(x)
+        return Literal(True)
+
+    register_custom_function(EX.f, f)
+    yield calls
+    unregister_custom_function(EX.f)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_same_answers(graph: Graph, pattern: str) -> None:
+    select = list(graph.query(PREFIX + f"SELECT * {{ {pattern} }}"))
+    assert graph.query(PREFIX + f"ASK {{ {pattern} }}").askAnswer == bool(select)
+    exists = list(
+        graph.query(
+            PREFIX + f"SELECT ?x {{ VALUES ?x {{ 1 }} FILTER EXISTS {{ {pattern} }} }}"
+        )
+    )
+    assert len(exists) == int(bool(select))
+
+
+def test_annotated() -> None:
+    query = prepareQuery(
+        PREFIX
+        + "ASK { { SELECT ?s { ?s :p ?o } ORDER BY ?o LIMIT 5 OFFSET 2 } "
+        + "FILTER NOT EXISTS { ?s :q ?q . ?s :r ?r } }"
+    )
+    part = query.algebra.p
+    assert part._demand == 1
+    assert part.p.name == "Filter" and part.p._demand == 1
+    assert part.p.p._demand is None  # the filter may need all solutions
+    exists = part.p.expr.graph
+    assert exists.name == "Join" and exists._demand == 1
+    assert exists.p1._demand is None
+
+    query = prepareQuery(
+        PREFIX + "ASK { SELECT ?s { ?s :p ?o } ORDER BY ?o LIMIT 5 OFFSET 2 }"
+    )
+    part = query.algebra.p
+    while part.name != "Slice":
+        part = part.p
+    assert part._demand == 1
+    assert part.p._demand == 3
+    assert part.p.name == "Project" and part.p.p.name == "OrderBy"
+    assert part.p.p._demand == 3
+
+    query = prepareQuery(PREFIX + "SELECT * { ?s :p ?o . ?s :q ?q }")
+    assert all(
+        "_demand" not in part
+        for part in (query.algebra, query.algebra.p, query.algebra.p.p)
+    )
+
+
+def test_stops_early(graph: Graph, calls: List[Any]) -> None:
+    query = "ASK { ?s :p ?o FILTER (:f(?o)) . ?t :q ?q FILTER (:f(?q)) }"
+    assert graph.query(PREFIX + query).askAnswer
+    # a hash join reads both sides in full before the first solution
+    assert len(calls) < 10
+
+    calls.clear()
+    query = "ASK { ?s :p ?o FILTER (:f(?o)) } ORDER BY ?o"
+    assert graph.query(PREFIX + query).askAnswer
+    assert len(calls) == 1
+
+
+def test_empty_side_not_evaluated(graph: Graph, calls: List[Any]) -> None:
+    query = "SELECT * { ?s :r ?o . ?t :q ?q FILTER (:f(?q)) }"
+    assert list(graph.query(PREFIX + query)) == []
+    query = "SELECT * { ?s :r ?o MINUS { ?t :q ?q FILTER (:f(?q)) } }"
+    assert list(graph.query(PREFIX + query)) == []
+    assert calls == []
+
+
+def test_symmetric_hash_join() -> None:
+    ctx = QueryContext(initBindings={})
+    x, y, z = Variable("x"), Variable("y"), Variable("z")
+    values = [None, Literal(1), Literal(2)]
+    solutions = [
+        FrozenBindings(
+            ctx, {v: value for v, value in zip((x, y, z), row) if value is not None}
+        )
+        for row in itertools.product(values, repeat=3)
+    ]
+    for a, b in [
+        (solutions, solutions[::4]),
+        (solutions[5:9], solutions),
+        (solutions, []),
+        ([], solutions),
+    ]:
+        for variables in ([], [x, y], [x, y, z], [z]):
+            assert sorted(map(repr, _symmetric_hash_join(a, b, variables))) == sorted(
+                map(repr, _hash_join(a, b, variables))
+            )
@@ -0,0 +1,256 @@
+from typing import List
+
+import pytest
+
+from rdflib import RDF, BNode, Dataset, Graph, Literal, Namespace
+from rdflib.plugins.sparql import evaluate
+from rdflib.plugins.sparql.evaluate import _plan_bgp, _triple_order, evalBGP
+from rdflib.plugins.sparql.sparql import AlreadyBound, QueryContext
+from rdflib.term import Variable
+
+EX = Namespace("http://example.org/")
+
+
+def make_graph(store: str) -> Graph:
+    graph = Graph(store=store)
+    for i in range(20):
+        graph.add((EX[f"book{i}"], RDF.type, EX.Book))
+        graph.add((EX[f"book{i}"], EX.isbn, EX[f"isbn{i}"]))
+    return graph
+
+
+def order(graph: Graph) -> List:
+    s = Variable("s")
+    triples = [(s, RDF.type, EX.Book), (s, EX.isbn, EX.isbn3)]
+    ctx = QueryContext(graph)
+    return sorted(triples, key=lambda t: _triple_order(ctx, t))
+
+
+def test_selective_pattern_first() -> None:
+    assert order(make_graph("Memory"))[0][1] == EX.isbn
+
+
+def test_without_statistics_order_is_kept() -> None:
+    assert order(make_graph("SimpleMemory"))[0][1] == RDF.type
+
+
+def library(store: str) -> Graph:
+    graph = make_graph(store)
+    for i in range(20):
+        graph.add((EX[f"book{i}"], EX.author, EX[f"author{i % 10}"]))
+        graph.add((EX[f"author{i % 10}"], RDF.type, EX.Person))
+        graph.add((EX[f"author{i % 10}"], EX.name, Literal(f"name{i % 10}")))
+    return graph
+
+
+def test_plan_follows_joins() -> None:
+    s, a, c = Variable("s"), Variable("a"), Variable("c")
+    triples = [
+        (s, RDF.type, c),
+        (s, EX.author, a),
+        (a, RDF.type, EX.Person),
+        (a, EX.name, Literal("name3")),
+    ]
+    ctx = QueryContext(library("Memory"))
+    # the name matches one triple, then the books of that author, and the
+    # types of those books
+    assert _plan_bgp(ctx, triples) == [triples[3], triples[2], triples[1], triples[0]]
+    ctx = QueryContext(library("SimpleMemory"))
+    assert _plan_bgp(ctx, triples) == sorted(
+        triples, key=lambda t: _triple_order(ctx, t)
+    )
+
+
+def test_query_results_unchanged() -> None:
+    query = """
+        SELECT ?s WHERE { ?s a <http://example.org/Book> ;
+            <http://example.org/isbn> <http://example.org/isbn3> . }
+    """
+    for store in ["Memory", "SimpleMemory"]:
+        assert [row.s for row in make_graph(store).query(query)] == [EX.book3]
+
+
+VALUES_QUERIES = [
+    # values first and last, duplicates, values that are not in the graph
+    """SELECT ?s ?i WHERE {
+        VALUES ?s { ex:book1 ex:book2 ex:book1 ex:missing }
+        ?s ex:isbn ?i }""",
+    "SELECT ?s ?i WHERE { ?s ex:isbn ?i } VALUES ?s { ex:book1 ex:book2 }",
+    # values for an object, and a pattern where the variable is not first
+    "SELECT ?s WHERE { VALUES ?i { ex:isbn4 ex:isbn5 } ?s a ex:Book ; ex:isbn ?i }",
+    "SELECT ?p WHERE { VALUES ?p { ex:isbn rdf:type ex:title } ex:book7 ?p ?o }",
+    # more than one variable, or UNDEF, is joined row by row
+    "SELECT * WHERE { VALUES (?s ?i) { (ex:book1 ex:isbn1) } ?s ex:isbn ?i }",
+    "SELECT * WHERE { VALUES ?s { ex:book1 UNDEF } ?s ex:isbn ex:isbn1 }",
+]
+
+
+def test_values_join_uses_triples_choices(monkeypatch) -> None:
+    graph = make_graph("Memory")
+    calls = []
+    triples_choices = Graph.triples_choices
+
+    def record(self, triple, context=None):
+        calls.append(triple)
+        return triples_choices(self, triple, context)
+
+    monkeypatch.setattr(Graph, "triples_choices", record)
+    result = graph.query(VALUES_QUERIES[0], initNs={"ex": EX})
+    assert sorted(row.s for row in result) == [EX.book1, EX.book1, EX.book2]
+    assert calls == [([EX.book1, EX.book2, EX.missing], EX.isbn, None)]
+
+
+def test_values_join_results_unchanged() -> None:
+    expected = Graph(store="SimpleMemory")
+    for triple in make_graph("Memory"):
+        expected.add(triple)
+    for query in VALUES_QUERIES:
+        graph = make_graph("Memory")
+        for initBindings in ({}, {"s": EX.book1}):
+            results = [
+                sorted(
+                    tuple(row)
+                    for row in g.query(
+                        query, initNs={"ex": EX}, initBindings=initBindings
+                    )
+                )
+                for g in (graph, expected)
+            ]
+            assert results[0] == results[1], query
+
+
+COUNT_QUERIES = [
+    ("SELECT (COUNT(*) AS ?c) WHERE { ?s ?p ?o }", 40),
+    ("SELECT (COUNT(*) AS ?c) (COUNT(*) AS ?d) WHERE { ?s a ex:Book }", 20),
+    ("SELECT (COUNT(*) AS ?c) WHERE { ex:book1 ?p ?o }", 2),
+    ("SELECT (COUNT(*) AS ?c) WHERE { ?s a ex:Missing }", 0),
+    # not answered by counting triples
+    ("SELECT (COUNT(*) AS ?c) WHERE { ?s ?p ?s }", 0),
+    ("SELECT (COUNT(DISTINCT *) AS ?c) WHERE { ?s a ?o }", 20),
+    ("SELECT (COUNT(?s) AS ?c) WHERE { ?s ex:isbn ?i }", 20),
+    ("SELECT (COUNT(*) AS ?c) WHERE { ?s ex:isbn/^ex:isbn ?o }", 20),
+]
+
+
+def test_count_uses_graph_count(monkeypatch) -> None:
+    graph = make_graph("Memory")
+    calls = []
+    count = Graph.count
+
+    def record(self, triple):
+        calls.append(triple)
+        return count(self, triple)
+
+    monkeypatch.setattr(Graph, "count", record)
+    result = graph.query(COUNT_QUERIES[1][0], initNs={"ex": EX})
+    assert [tuple(row) for row in result] == [(Literal(20), Literal(20))]
+    assert calls == [(None, RDF.type, EX.Book)]
+    calls.clear()
+    graph.query(COUNT_QUERIES[4][0]).bindings
+    assert calls == []
+
+
+def test_count_results() -> None:
+    for store in ["Memory", "SimpleMemory"]:
+        graph = make_graph(store)
+        for query, expected in COUNT_QUERIES:
+            result = graph.query(query, initNs={"ex": EX})
+            assert [row.c for row in result] == [Literal(expected)], query
+        result = graph.query(
+            COUNT_QUERIES[2][0], initNs={"ex": EX}, initBindings={"p": RDF.type}
+        )
+        assert [row.c for row in result] == [Literal(1)]
+
+
+def recursive_bgp(ctx: QueryContext, bgp: List):
+    """The per-match recursion that evalBGP used to be"""
+    if not bgp:
+        yield ctx.solution()
+        return
+    pattern = [ctx[term] for term in bgp[0]]
+    for triple in ctx.graph.triples(tuple(pattern)):
+        c = ctx.push()
+        try:
+            for term, value, match in zip(bgp[0], pattern, triple):
+                if value is None:
+                    c[term] = match
+        except AlreadyBound:
+            continue
+        yield from recursive_bgp(c, bgp[1:])
+
+
+s, a, o = Variable("s"), Variable("a"), Variable("o")
+BGPS = [
+    [],
+    [(s, RDF.type, EX.Book)],
+    [(s, EX.author, a), (a, EX.name, o), (s, RDF.type, EX.Book)],
+    # the same variable twice in one pattern, and a blank node
+    [(s, EX.author, a), (a, RDF.type, a)],
+    [(a, EX.loves, a)],
+    [(BNode("b"), EX.author, a), (a, EX.name, o)],
+    [(s, EX.author / EX.name, o)],
+    [(s, EX.author, a), (s, EX.author, a)],
+]
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 1000])
+@pytest.mark.parametrize("bgp", BGPS)
+def test_bgp_results_unchanged(monkeypatch, batch_size: int, bgp: List) -> None:
+    monkeypatch.setattr(evaluate, "BGP_BATCH_SIZE", batch_size)
+    graph = library("Memory")
+    graph.add((EX.author1, EX.loves, EX.author1))
+    graph.add((EX.author2, EX.loves, EX.author1))
+    for initBindings in ({}, {a: EX.author1}, {s: EX.book3, a: EX.author1}):
+        ctx = QueryContext(graph, initBindings=initBindings)
+        results = list(evalBGP(ctx, bgp))
+        assert results == list(recursive_bgp(ctx, bgp))
+        assert all(
+            result[term] == value
+            for result in results
+            for term, value in initBindings.items()
+        )
+
+
+def test_bgp_batch_shares_lookups(monkeypatch) -> None:
+    graph = library("Memory")
+    calls = []
+    triples = Graph.triples
+
+    def record(self, triple):
+        calls.append(triple)
+        return triples(self, triple)
+
+    monkeypatch.setattr(Graph, "triples", record)
+    ctx = QueryContext(graph)
+    bgp = [(s, EX.author, a), (a, EX.name, o)]
+    assert len(list(evalBGP(ctx, bgp))) == 20
+    # one lookup for the books and one for each of the 10 authors
+    assert len(calls) == 11
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("?s :p ?o FILTER EXISTS { ?s :q ?z }", 9),
+        ("?s :p ?o FILTER NOT EXISTS { ?s :q ?z }", 0),
+        ("?s :p ?o OPTIONAL { ?s :q ?z }", 9),
+        ("?s :p ?o OPTIONAL { ?s :r ?z }", 9),
+    ],
+)
+@pytest.mark.parametrize("values", ["", "VALUES ?g { :g0 :g1 :g2 }"])
+def test_solutions_of_named_graphs(pattern: str, expected: int, values: str) -> None:
+    # the solutions of a basic graph pattern share its context, which must
+    # keep the named graph while the rest of the pattern uses them
+    dataset = Dataset()
+    for g in range(3):
+        graph = dataset.graph(EX[f"g{g}"])
+        for i in range(3):
+            graph.add((EX[f"s{g}{i}"], EX.p, Literal(i)))
+            graph.add((EX[f"s{g}{i}"], EX.q, EX.z))
+            dataset.add((EX[f"s{g}{i}"], EX.r, EX.z))
+    query = f"SELECT * {{ {values} GRAPH ?g {{ {pattern} }} }}"
+    rows = list(dataset.query("PREFIX : <http://example.org/> " + query))
+    assert len(rows) == expected
+    if "OPTIONAL" in pattern:
+        bound = EX.z if ":q" in pattern else None
+        assert [row.z for row in rows] == [bound] * expected
@@ -0,0 +1,155 @@
+import pickle
+import threading
+from typing import List
+
+import pytest
+
+import rdflib.plugins.sparql
+from rdflib import ConjunctiveGraph, Dataset, Literal, Namespace
+from rdflib.plugins.sparql import evaluate, parallel, prepareQuery
+from rdflib.plugins.sparql.operators import (
+    register_custom_function,
+    unregister_custom_function,
+)
+from rdflib.plugins.stores.mmapstore import write_mmap_store
+
+EX = Namespace("http://example.org/")
+
+PREFIX = "PREFIX : <http://example.org/> "
+
+QUERIES = [
+    "SELECT * { GRAPH ?g { ?s :p ?o } }",
+    "SELECT ?g (COUNT(*) AS ?c) { GRAPH ?g { ?s :p ?o . ?s :q ?t FILTER (?o > 2) } } "
+    + "GROUP BY ?g ORDER BY ?g",
+    "SELECT * { VALUES ?s { :s1 :s4 } GRAPH ?g { ?s :p ?o } }",
+    "SELECT * { GRAPH ?g { ?s :p ?o FILTER NOT EXISTS { ?s :q :s0 } } }",
+    "SELECT * { GRAPH ?g { ?s :p ?o BIND (IRI(STR(?o)) AS ?i) } }",
+    "SELECT * { GRAPH ?g { ?s :p ?o } GRAPH ?h { ?s :q ?t } }",
+    "SELECT * { ?s :p ?o GRAPH ?g { ?s :p ?o } }",
+    "SELECT * { GRAPH ?g { ?s :p ?o } } LIMIT 5",
+]
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory) -> Dataset:
+    source = Dataset()
+    for g in range(6):
+        graph = source.graph(EX[f"g{g}"])
+        for i in range(g + 3):
+            graph.add((EX[f"s{i}"], EX.p, Literal(i * g % 5)))
+            graph.add((EX[f"s{i}"], EX.q, EX[f"s{(i + g) % 4}"]))
+    source.add((EX.s1, EX.p, Literal(1)))
+    path = str(tmp_path_factory.mktemp("mmap") / "data.rdfmm")
+    write_mmap_store(source, path)
+    dataset = Dataset(store="MMap")
+    dataset.open(path)
+    yield dataset
+    dataset.close()
+
+
+@pytest.fixture
+def calls():
+    """registers :f, which records the values it is called with"""
+    calls: List[Literal] = []
+
+    def f(x):
+        calls.append(x)
+        return Literal(True)
+
+    register_custom_function(EX.f, f)
+    yield calls
+    unregister_custom_function(EX.f)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("setting", ["SPARQL_THREADS", "SPARQL_PROCESSES"])
+def test_same(dataset: Dataset, query: str, setting: str, monkeypatch) -> None:
+    expected = list(dataset.query(PREFIX + query, initBindings={"t": EX.s1}))
+    monkeypatch.setattr(rdflib.plugins.sparql, setting, 2)
+    assert list(dataset.query(PREFIX + query, initBindings={"t": EX.s1})) == expected
+
+
+def test_same_conjunctive(dataset: Dataset, monkeypatch) -> None:
+    # the default graph of a conjunctive graph is the union of all graphs
+    graph = ConjunctiveGraph(dataset.store)
+    expected = list(graph.query(PREFIX + QUERIES[3]))
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_PROCESSES", 2)
+    assert list(graph.query(PREFIX + QUERIES[3])) == expected
+
+
+def test_processes(dataset: Dataset, calls: List[Literal], monkeypatch) -> None:
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_PROCESSES", 2)
+    evaluated = []
+    monkeypatch.setattr(
+        evaluate, "_evalNamedGraph", lambda *args: evaluated.append(args) or []
+    )
+    # the graphs are evaluated in other processes, which are not patched
+    assert len(list(dataset.query(PREFIX + "SELECT * { GRAPH ?g { ?s :p ?o } }")))
+    assert evaluated == []
+
+    # functions registered here are called here
+    query = "SELECT * { GRAPH ?g { ?s :p ?o FILTER (:f(?o)) } }"
+    assert list(dataset.query(PREFIX + query)) == []
+    assert len(evaluated) == 6
+
+
+def test_concurrent(dataset: Dataset, calls: List[Literal], monkeypatch) -> None:
+    # only passes if the graphs are evaluated at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    original = evaluate._evalNamedGraph
+
+    def evaluated(ctx, part, graph):
+        if graph.identifier in (EX.g0, EX.g1, EX.g2):
+            barrier.wait()
+        return original(ctx, part, graph)
+
+    monkeypatch.setattr(evaluate, "_evalNamedGraph", evaluated)
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_THREADS", 2)
+    query = "SELECT * { GRAPH ?g { ?s :p ?o } }"
+    assert len(list(dataset.query(PREFIX + query))) == 33
+
+
+def test_reentrant() -> None:
+    def graph(query: str):
+        part = prepareQuery(PREFIX + query).algebra
+        while part.name != "Graph":
+            part = part.p
+        return part
+
+    assert evaluate._reentrant_graph(
+        graph("SELECT * { GRAPH ?g { ?s :p ?o FILTER (?o > 1) } }")
+    )
+    assert not evaluate._reentrant_graph(
+        graph("SELECT * { GRAPH ?g { ?s :p ?o FILTER EXISTS { ?s :q ?o } } }")
+    )
+    assert not evaluate._reentrant_graph(
+        graph("SELECT * { GRAPH ?g { ?s :p ?o BIND (BNODE('a') AS ?b) } }")
+    )
+    assert evaluate._portable(
+        graph("SELECT * { GRAPH ?g { ?s :p ?o FILTER EXISTS { ?s :q ?o } } }").p
+    )
+
+
+def test_pickled_algebra(dataset: Dataset) -> None:
+    query = prepareQuery(PREFIX + QUERIES[3])
+    expected = list(dataset.query(query))
+    # evaluation keeps compiled expressions on the algebra
+    query.algebra = pickle.loads(pickle.dumps(query.algebra))
+    assert list(dataset.query(query)) == expected
+
+
+def test_chain_ahead() -> None:
+    started: List[int] = []
+
+    def part(i: int):
+        def solutions():
+            started.append(i)
+            yield i
+
+        return solutions
+
+    solutions = parallel.chain((part(i) for i in range(100)), 2)
+    assert next(solutions) == 0
+    assert next(solutions) == 1
+    assert len(started) <= 4
+    assert list(solutions) == list(range(2, 100))
@@ -0,0 +1,120 @@
+from typing import Any, List, Set, Tuple
+
+import pytest
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.plugins.sparql import evaluate
+from rdflib.plugins.sparql.evalutils import _hash_join, _join
+from rdflib.plugins.sparql.sparql import FrozenDict
+from rdflib.term import Variable
+
+EX = Namespace("http://example.org/")
+x, y, z = Variable("x"), Variable("y"), Variable("z")
+
+A = [
+    FrozenDict({x: EX.a, y: Literal(1)}),
+    FrozenDict({x: EX.b, y: Literal(2)}),
+    FrozenDict({x: EX.b, y: Literal("two", lang="en")}),
+    FrozenDict({x: EX.c}),
+    FrozenDict({y: Literal(1)}),
+]
+B = [
+    FrozenDict({x: EX.b, z: EX.z1}),
+    FrozenDict({x: EX.a, y: Literal(1), z: EX.z2}),
+    FrozenDict({x: EX.b, y: Literal("two", lang="EN"), z: EX.z3}),
+    FrozenDict({z: EX.z4}),
+    FrozenDict({x: EX.d, z: EX.z5}),
+]
+
+
+def bag(solutions) -> List[Tuple[Any, ...]]:
+    return sorted(tuple(sorted(solution.items())) for solution in solutions)
+
+
+def query(graph: Graph, query: str) -> List[Tuple[Any, ...]]:
+    return bag(row.asdict() for row in graph.query(query, initNs={"ex": EX}))
+
+
+@pytest.mark.parametrize("variables", [[x], [x, y], [y]])
+def test_join_matches_nested_loop(variables) -> None:
+    assert bag(_hash_join(A, B, variables)) == bag(_join(A, B))
+    assert bag(_hash_join(B, A, variables)) == bag(_join(B, A))
+
+
+def make_graph() -> Graph:
+    graph = Graph()
+    for i in range(50):
+        graph.add((EX[f"s{i}"], EX.p, Literal(i)))
+        if i % 2:
+            graph.add((EX[f"s{i}"], EX.q, EX[f"o{i % 5}"]))
+        graph.add((EX[f"o{i % 5}"], EX.r, Literal(i % 3)))
+    return graph
+
+
+JOIN_QUERIES = [
+    # subqueries are joined with a hash join
+    """SELECT * WHERE {
+        { SELECT ?s ?v WHERE { ?s ex:p ?v } LIMIT 30 }
+        { SELECT DISTINCT ?s ?o WHERE { ?s ex:q ?o } } }""",
+    # both sides are ordered by the join variable
+    """SELECT * WHERE {
+        { SELECT ?s ?v WHERE { ?s ex:p ?v } ORDER BY ?s LIMIT 40 }
+        { SELECT DISTINCT ?s ?o WHERE { ?s ex:q ?o } ORDER BY ?s } }""",
+    # no shared variables
+    """SELECT * WHERE {
+        { SELECT ?o WHERE { ?o ex:r 0 } LIMIT 3 }
+        { SELECT DISTINCT ?v WHERE { ?s ex:p ?v } LIMIT 4 } }""",
+    # a variable that is not always bound
+    """SELECT * WHERE {
+        { SELECT ?s ?o WHERE { ?s ex:p ?v OPTIONAL { ?s ex:q ?o } } LIMIT 20 }
+        { SELECT DISTINCT ?o ?w WHERE { ?o ex:r ?w } } }""",
+    # lazy joins with a BGP
+    "SELECT * WHERE { ?s ex:q ?o { ?o ex:r ?w } }",
+    "SELECT * WHERE { ?s ex:p ?v OPTIONAL { ?s ex:q ?o } { ?o ex:r ?w } }",
+    "SELECT * WHERE { ?s ex:q ?o { ?o ex:r ?w FILTER (?w > 0) } }",
+]
+
+
+def nested_loop_join(ctx, join):
+    a = evaluate.evalPart(ctx, join.p1)
+    b = set(evaluate.evalPart(ctx, join.p2))
+    return _join(a, b)
+
+
+@pytest.mark.parametrize("text", JOIN_QUERIES)
+def test_join_results_unchanged(monkeypatch, text: str) -> None:
+    graph = make_graph()
+    results = query(graph, text)
+    assert results
+    monkeypatch.setattr(evaluate, "_lazy_join_limit", lambda ctx, join: None)
+    assert query(graph, text) == results
+    monkeypatch.setattr(evaluate, "evalJoin", nested_loop_join)
+    assert query(graph, text) == results
+
+
+def test_join_choice(monkeypatch) -> None:
+    graph = make_graph()
+    calls: Set[str] = set()
+    for name in ("_hash_join", "_join", "evalLazyJoin"):
+        function = getattr(evaluate, name)
+
+        def record(*args, name=name, function=function):
+            calls.add(name)
+            return function(*args)
+
+        monkeypatch.setattr(evaluate, name, record)
+
+    def choice(text: str) -> Set[str]:
+        calls.clear()
+        query(graph, text)
+        return set(calls)
+
+    assert choice(JOIN_QUERIES[0]) == {"_hash_join"}
+    assert choice(JOIN_QUERIES[1]) == {"_hash_join"}
+    assert choice(JOIN_QUERIES[2]) == {"_join"}
+    # 25 solutions of the first part, but only 15 triples match ?o ex:r ?w
+    assert choice(JOIN_QUERIES[4]) == {"_hash_join"}
+    assert choice("SELECT * WHERE { ex:s1 ex:q ?o { ?o ex:r ?w } }") == set()
+    assert choice(JOIN_QUERIES[5]) == {"_hash_join"}
+    # the second part is not a BGP
+    assert choice(JOIN_QUERIES[6]) == {"evalLazyJoin"}
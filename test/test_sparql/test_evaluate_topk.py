@@ -0,0 +1,63 @@
+import pytest
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.plugins.sparql import evaluate
+from rdflib.plugins.sparql.processor import query_cache
+
+EX = Namespace("http://example.org/")
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    graph = Graph()
+    for i in range(50):
+        graph.add((EX[f"s{i}"], EX.a, Literal(i % 7)))
+        graph.add((EX[f"s{i}"], EX.b, Literal(f"v{i % 3}")))
+        if i % 5:
+            graph.add((EX[f"s{i}"], EX.c, Literal(i)))
+    return graph
+
+
+@pytest.mark.parametrize(
+    ["order", "offset", "limit"],
+    [
+        ("?a", 0, 5),
+        ("DESC(?a) ?b", 3, 10),
+        ("?b DESC(?c) ?s", 7, 12),
+        ("DESC(?c)", 0, 60),
+        ("(?a * -1)", 48, 4),
+        ("?a", 0, 0),
+    ],
+)
+def test_top_k_matches_full_sort(
+    graph: Graph, order: str, offset: int, limit: int, monkeypatch
+) -> None:
+    query = (
+        "PREFIX : <http://example.org/> "
+        "SELECT ?s ?a { ?s :a ?a ; :b ?b OPTIONAL { ?s :c ?c } } ORDER BY " + order
+    )
+    query_cache.clear()
+    expected = list(graph.query(query))[offset : offset + limit]
+    calls = []
+    top_k = evaluate.evalTopK
+
+    def evalTopK(ctx, part, k):
+        calls.append(k)
+        return top_k(ctx, part, k)
+
+    monkeypatch.setattr(evaluate, "evalTopK", evalTopK)
+    query_cache.clear()
+    result = list(graph.query(f"{query} LIMIT {limit} OFFSET {offset}"))
+    assert calls == [offset + limit]
+    assert result == expected
+
+
+def test_order_by_is_stable_over_keys(graph: Graph) -> None:
+    result = list(
+        graph.query(
+            "PREFIX : <http://example.org/> "
+            "SELECT ?a ?b { ?s :a ?a ; :b ?b } ORDER BY DESC(?a) ?b"
+        )
+    )
+    keys = [(-row.a.toPython(), str(row.b)) for row in result]
+    assert len(result) == 50 and keys == sorted(keys)
@@ -0,0 +1,74 @@
+import pytest
+
+from rdflib import BNode, Literal, Namespace
+from rdflib.plugins.sparql.sparql import (
+    FrozenBindings,
+    FrozenDict,
+    QueryContext,
+    VariableSchema,
+)
+from rdflib.term import Variable
+
+EX = Namespace("http://example.org/")
+x, y, z = Variable("x"), Variable("y"), Variable("z")
+
+
+def test_schema_positions() -> None:
+    schema = VariableSchema([x, y])
+    assert schema.position(y) == 1
+    assert schema.position(BNode("b")) == 2
+    assert schema.position(x) == 0
+    assert schema.variables == [x, y, BNode("b")]
+    assert schema.freeze([(y, EX.a), (y, EX.b)]) == (None, EX.b)
+    assert schema.freeze([(x, EX.a)], (EX.c, EX.b)) == (EX.a, EX.b)
+
+
+def solutions():
+    ctx = QueryContext(initBindings={z: EX.z})
+    ctx.schema.position(z)
+    a = FrozenBindings(ctx, {x: EX.a, y: Literal(1)})
+    b = FrozenBindings(ctx, {y: Literal(1)})
+    c = FrozenBindings(ctx, {x: EX.b})
+    return ctx, a, b, c
+
+
+def test_bindings_are_rows_of_the_schema() -> None:
+    ctx, a, b, c = solutions()
+    assert a._schema is ctx.schema and ctx.push().schema is ctx.schema
+    assert a._values == (None, EX.a, Literal(1))
+    assert dict(a) == {x: EX.a, y: Literal(1)}
+    assert len(a) == 2 and len(c) == 1
+    assert a[z] == EX.z and a["x"] == EX.a and a[EX.c] == EX.c
+    with pytest.raises(KeyError):
+        c[y]
+    assert a.get(Variable("missing")) is None
+
+
+def test_operations_match_dicts() -> None:
+    ctx, a, b, c = solutions()
+    plain = [FrozenDict(dict(solution)) for solution in (a, b, c)]
+    for first, second in [(a, b), (a, c), (b, c), (b, a)]:
+        other = FrozenDict(dict(second))
+        assert first.compatible(second) == first.compatible(other)
+        assert first.disjointDomain(second) == first.disjointDomain(other)
+        merged = first.merge(second)
+        assert isinstance(merged, FrozenBindings)
+        assert (
+            merged
+            == first.merge(other)
+            == FrozenDict(list(first.items()) + list(second.items()))
+        )
+        assert hash(merged) == hash(first.merge(other))
+    assert not a.compatible(c) and a.compatible(b) and b.disjointDomain(c)
+    assert a.project([y]) == plain[1] and hash(a.project([y])) == hash(plain[1])
+    assert a.project([y])._values == (None, None, Literal(1))
+    assert b.merge(a)[y] == Literal(1) and a.merge(b)[y] == b[y]
+
+
+def test_forget() -> None:
+    ctx, a, b, c = solutions()
+    before = ctx.push()
+    before[x] = EX.a
+    assert dict(a.forget(before)) == {y: Literal(1)}
+    assert dict(a.forget(before, _except=[x])) == dict(a)
+    assert a.remember([x, z]) == FrozenDict({x: EX.a})
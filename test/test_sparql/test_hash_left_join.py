@@ -0,0 +1,103 @@
+import itertools
+from collections import Counter
+from typing import Any, List
+
+import pytest
+
+from rdflib import Graph, Literal, Namespace, Variable
+from rdflib.plugins.sparql import evaluate
+from rdflib.plugins.sparql.evalutils import _hash_minus, _minus
+from rdflib.plugins.sparql.sparql import FrozenBindings, QueryContext
+
+EX = Namespace("http://example.org/")
+
+PREFIX = "PREFIX : <http://example.org/> "
+
+QUERIES = [
+    "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?q } }",
+    "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?q } OPTIONAL { ?s :r ?r ; :p ?r2 } }",
+    "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?q FILTER (?q > ?o) } }",
+    "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?o } }",
+    "SELECT * { { ?s :p ?o } UNION { ?s :r ?r } OPTIONAL { ?s :q ?q ; :r ?r } }",
+    "SELECT * { ?s :p ?o OPTIONAL { ?t :q ?o } }",
+    "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?q OPTIONAL { ?q :r ?r } } }",
+    "SELECT * { { ?s :p ?o } UNION { ?s :r ?r } ?s :q ?q }",
+    "SELECT * { ?s :p ?o MINUS { ?s :q ?q } }",
+    "SELECT * { ?s :p ?o MINUS { ?s :q ?q FILTER (?q > 20) } }",
+    "SELECT * { ?s :p ?o MINUS { ?t :q ?q } }",
+    "SELECT * { { ?s :p ?o } UNION { ?s :r ?r } MINUS { ?s :r ?r } }",
+]
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    graph = Graph()
+    for i in range(30):
+        s = EX[f"s{i}"]
+        graph.add((s, EX.p, Literal(i % 7)))
+        if i % 2:
+            graph.add((s, EX.q, Literal(i)))
+            graph.add((s, EX.q, Literal(i % 7)))
+        if i % 3:
+            graph.add((s, EX.r, EX[f"s{(i * 5) % 30}"]))
+    return graph
+
+
+def results(graph: Graph, query: str, **kwargs: Any) -> Counter:
+    return Counter(
+        tuple(sorted(row.asdict().items()))
+        for row in graph.query(PREFIX + query, **kwargs)
+    )
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_same_as_lazy(graph: Graph, query: str, monkeypatch) -> None:
+    # switch to the hash joins after the first solution
+    monkeypatch.setattr(evaluate, "_lazy_join_limit", lambda ctx, join: 0)
+    hashed = results(graph, query)
+    monkeypatch.setattr(evaluate, "_lazy_join_limit", lambda ctx, join: None)
+    monkeypatch.setattr(evaluate, "_binds_nothing", lambda ctx: False)
+    monkeypatch.setattr(evaluate, "_join_variables", lambda join: [])
+    assert results(graph, query) == hashed
+
+
+def test_chosen(graph: Graph, monkeypatch) -> None:
+    calls: List[Any] = []
+    evalHashLeftJoin = evaluate.evalHashLeftJoin
+
+    def spy(*args: Any) -> Any:
+        calls.append(args)
+        return evalHashLeftJoin(*args)
+
+    monkeypatch.setattr(evaluate, "evalHashLeftJoin", spy)
+    query = "SELECT * { ?s :p ?o OPTIONAL { ?s :q ?q } }"
+    assert sum(results(graph, query).values()) == 42
+    assert len(calls) == 1
+    # fewer solutions of the first part than triples of the optional part
+    assert sum(results(graph, query, initBindings={"o": Literal(1)}).values()) == 7
+    assert len(calls) == 1
+    # in a lazy join the optional part is evaluated with the bindings of each
+    # solution of the first part of the join
+    calls.clear()
+    nested = "SELECT * { ?s :r ?t . { ?t :p ?o OPTIONAL { ?t :q ?q } } }"
+    assert sum(results(graph, nested).values()) == 25
+    assert calls == []
+
+
+def test_hash_minus() -> None:
+    ctx = QueryContext(initBindings={})
+    x, y, z = Variable("x"), Variable("y"), Variable("z")
+    values = [None, Literal(1), Literal(2)]
+    solutions = [
+        FrozenBindings(
+            ctx, {v: value for v, value in zip((x, y, z), row) if value is not None}
+        )
+        for row in itertools.product(values, repeat=3)
+    ]
+    for a, b in [
+        (solutions, solutions[::4]),
+        (solutions, solutions[5:9]),
+        (solutions[:3], solutions),
+    ]:
+        for variables in ([x, y], [x, y, z], [z]):
+            assert list(_hash_minus(a, b, variables)) == list(_minus(a, set(b)))
@@ -0,0 +1,99 @@
+from typing import Any, List
+
+import pytest
+
+from rdflib import ConjunctiveGraph, Literal, Namespace, Variable
+from rdflib.plugins.sparql.algebra import translateQuery
+from rdflib.plugins.sparql.parser import parseQuery
+from rdflib.plugins.sparql.parserutils import CompValue
+
+EX = Namespace("http://example.org/")
+
+PREFIX = "PREFIX : <http://example.org/> "
+
+
+def translate(query: str, optimize: bool = True):
+    return translateQuery(parseQuery(PREFIX + query), optimize=optimize)
+
+
+def parts(part: Any, name: str) -> List[CompValue]:
+    """the parts of an algebra expression with the given name"""
+    found = []
+    if isinstance(part, list):
+        for x in part:
+            found += parts(x, name)
+    elif isinstance(part, CompValue):
+        if part.name == name:
+            found.append(part)
+        for x in part.values():
+            found += parts(x, name)
+    return found
+
+
+@pytest.fixture(scope="module")
+def graph() -> ConjunctiveGraph:
+    graph = ConjunctiveGraph()
+    for i in range(12):
+        s = EX[f"s{i}"]
+        graph.add((s, EX.p, Literal(i)))
+        graph.add((s, EX.q, EX[f"s{(i * 5) % 12}"]))
+        if i % 3:
+            graph.add((s, EX.r, Literal(f"r{i}")))
+        graph.get_context(EX[f"g{i % 2}"]).add((s, EX.t, Literal(i % 4)))
+    return graph
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * { ?s :p ?v ; :q ?o . ?o :p ?w FILTER (?v > 3 && ?w < 2 * 4) }",
+        "SELECT * { ?s :p ?v OPTIONAL { ?s :r ?r } FILTER (?v != 2 && !BOUND(?r)) }",
+        "SELECT * { ?s :p ?v OPTIONAL { ?s :r ?r } FILTER (?r = 'r4') }",
+        "SELECT * { { ?s :p ?v } UNION { ?s :r ?v } FILTER (?s != :s3) }",
+        "SELECT * { ?s :q ?o MINUS { ?o :r ?r } FILTER (?s IN (:s1, :s2, :s5)) }",
+        "SELECT * { ?s :p ?v BIND (?v + 1 AS ?w) FILTER (?w > 4 && ?v < 9) }",
+        "SELECT * { GRAPH ?g { ?s :t ?t } ?s :p ?v FILTER (?g = :g1 && ?t = 2) }",
+        "SELECT * { ?s :q ?o FILTER (?o = :s5) }",
+        "SELECT * { ?s :q ?o . ?o :q ?x FILTER (?o = :s5 || ?x = :s1) }",
+        "SELECT * { ?s :q ?o { SELECT ?s { ?s :p ?v } } FILTER (?s = :s2) }",
+        "SELECT * { ?s :q ?o FILTER EXISTS { ?o :r ?r } FILTER (?s != :s0) }",
+        "SELECT * { ?s :q ?o OPTIONAL { ?o :q ?x FILTER (?x = :s0) } }",
+        "SELECT * { ?s :q ?o FILTER (1 > 2) }",
+        "SELECT * { ?s :q ?o FILTER (?o = :s5) } VALUES ?o { :s0 :s5 }",
+        "ASK { ?s :p ?v FILTER (?v = 11 && true) }",
+    ],
+)
+def test_same_results(graph: ConjunctiveGraph, query: str) -> None:
+    expected = graph.query(translate(query, optimize=False))
+    result = graph.query(translate(query))
+    if expected.type == "ASK":
+        assert result.askAnswer == expected.askAnswer
+    else:
+        assert sorted(result, key=str) == sorted(expected, key=str)
+
+
+def test_push_down() -> None:
+    query = translate(
+        "SELECT * { ?s :p ?v ; :q ?o . ?o :p ?w OPTIONAL { ?s :r ?r } "
+        "{ ?s :q ?a } UNION { ?a :q ?s } FILTER (?v > 3 && ?a != :s0 && !BOUND(?r)) }"
+    )
+    filters = parts(query.algebra, "Filter")
+    assert [f.p.name for f in filters] == ["Join", "BGP", "BGP", "BGP"]
+    assert [str(f.expr.name) for f in filters][1:] == ["RelationalExpression"] * 3
+
+
+def test_folding() -> None:
+    query = translate("SELECT * { ?s :p ?v FILTER (?v > 1 + 2 * 3 && 1 < 2) }")
+    (only,) = parts(query.algebra, "Filter")
+    assert isinstance(only.expr.other, Literal) and only.expr.other.toPython() == 7
+    query = translate("SELECT * { ?s :p ?v FILTER (?v > RAND() + 1) }")
+    assert parts(query.algebra, "Builtin_RAND")
+
+
+def test_substitute_iri() -> None:
+    query = translate("SELECT ?s { ?s :q ?o FILTER (:s5 = ?o) }")
+    assert not parts(query.algebra, "Filter")
+    (values,) = parts(query.algebra, "values")
+    assert values.res == [{Variable("o"): EX.s5}]
+    unoptimized = translate("SELECT ?s { ?s :q ?o FILTER (:s5 = ?o) }", optimize=False)
+    assert parts(unoptimized.algebra, "Filter")
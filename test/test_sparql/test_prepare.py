@@ -1,8 +1,10 @@
 import os
+import threading
 
-from rdflib import Graph, URIRef
+from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import FOAF
-from rdflib.plugins.sparql import prepareQuery, prepareUpdate
+from rdflib.plugins.sparql import prepareQuery, prepareUpdate, processor
+from rdflib.plugins.sparql.processor import QueryCache
 
 
 def test_prepare_update():
@@ -39,3 +41,64 @@ def test_prepare_query():
     tim = URIRef("http://www.w3.org/People/Berners-Lee/card#i")
 
     assert len(list(g.query(q, initBindings={"person": tim}))) == 50
+
+
+def test_query_cache(monkeypatch):
+    cache = QueryCache(maxsize=2)
+    monkeypatch.setattr(processor, "query_cache", cache)
+    text = "SELECT ?o WHERE { ?s foaf:name ?o }"
+    g = Graph()
+    g.add((URIRef("urn:a"), FOAF.name, Literal("a")))
+    g.add((URIRef("urn:b"), FOAF.name, Literal("b")))
+
+    for s in ("urn:a", "urn:b"):
+        result = g.query(text, initNs={"foaf": FOAF}, initBindings={"s": URIRef(s)})
+        assert [row.o for row in result] == [Literal(s[-1])]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    # the same text with the same namespaces is found in the cache
+    g.query(text, initNs={"foaf": str(FOAF)})
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # the namespaces and base are part of the key
+    assert list(g.query(text, initNs={"foaf": "urn:other#"})) == []
+    g.query(text, initNs={"foaf": FOAF}, base="urn:")
+    assert len(cache) == 2 and cache.misses == 3
+    # which dropped the query that was used longest ago
+    g.query(text, initNs={"foaf": FOAF})
+    assert cache.misses == 4
+
+    # prepared queries can be changed, so they are not shared
+    q = prepareQuery(text, initNs={"foaf": FOAF})
+    assert q is not prepareQuery(text, initNs={"foaf": FOAF})
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+    cache.maxsize = 0
+    g.query(text, initNs={"foaf": FOAF})
+    g.query(text, initNs={"foaf": FOAF})
+    assert len(cache) == 0 and cache.misses == 2
+
+
+def test_query_cache_threads():
+    # the cached algebra is evaluated by all threads at the same time
+    text = (
+        "SELECT (COUNT(*) AS ?c) WHERE { ?s foaf:age ?o FILTER (xsd:integer(?o) >= 0) }"
+    )
+    g = Graph()
+    for i in range(3000):
+        g.add((URIRef(f"urn:s{i}"), FOAF.age, Literal(str(i))))
+    counts = [row.c.toPython() for row in g.query(text, initNs={"foaf": FOAF})]
+
+    def count():
+        for _ in range(3):
+            counts.extend(
+                row.c.toPython() for row in g.query(text, initNs={"foaf": FOAF})
+            )
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counts == [3000] * 13
@@ -0,0 +1,94 @@
+from test.utils.sparql_checker import parse_tree_structure
+
+import pytest
+from pyparsing import ParseException
+
+import rdflib.plugins.sparql
+from rdflib import Graph, Literal, Namespace
+from rdflib.plugins.sparql import parser, rdparser
+from rdflib.plugins.sparql.processor import query_cache
+
+EX = Namespace("http://example.org/")
+
+QUERIES = [
+    "SELECT * { ?s ?p ?o }",
+    "PREFIX : <http://example.org/> BASE <http://example.org/> "
+    "SELECT DISTINCT ?s (COUNT(DISTINCT *) AS ?n) FROM <g> FROM NAMED :g "
+    "WHERE { ?s :p 1, +1, -1, 1.5, 2e3 ; a [ :q ( 1 ?x [] ) ] . } "
+    "GROUP BY ?s HAVING (?n > -1) ORDER BY DESC(?n) ?s LIMIT 5 OFFSET 1",
+    "SELECT ?x { ?x :p \"a\"@en, \"b\"^^:t, '''c''', true . "
+    "FILTER (?x NOT IN (1, 2) && !BOUND(?y) || ?x - 1 * 2 / 3 + 4 >= 5) }",
+    "SELECT ?x { ?x (:p/^:q|!(a|^:r))* ?y ; :s+ ?z ; ?v ?w "
+    "OPTIONAL { ?x :t ?u } MINUS { ?x :u ?v } { ?a ?b ?c } UNION { } "
+    "GRAPH ?g { } BIND (CONCAT(?x, 'a') AS ?c) VALUES (?x ?y) { (1 UNDEF) () } "
+    "FILTER NOT EXISTS { ?x :p ?x } FILTER (:f(DISTINCT ?x, ?y)) "
+    "{ SELECT * { } } } VALUES ?x { :a }",
+    "SELECT (GROUP_CONCAT(?x ; SEPARATOR='-') AS ?g) (SUBSTR(?x, 1) AS ?s) "
+    "(REGEX(?x, 'a', 'i') AS ?r) (BNODE() AS ?b) (RAND() AS ?n) { # comment\n }",
+    "CONSTRUCT { ?s :p [ :q ?o ] } WHERE { ?s :p ?o }",
+    "CONSTRUCT WHERE { ?s :p ?o . }",
+    "DESCRIBE ?x <x> WHERE { }",
+    "DESCRIBE *",
+    "ASK FROM <g> { }",
+    "SELECT * { SERVICE SILENT <http://example.org/sparql> { ?s ?p ?o } }",
+]
+
+UPDATES = [
+    "",
+    "PREFIX : <http://example.org/> INSERT DATA { :a :b :c . GRAPH :g { :a :b :c } } ;",
+    "LOAD SILENT <a> INTO GRAPH <g> ; CLEAR DEFAULT ; DROP GRAPH <g> ; CREATE GRAPH <g>",
+    "ADD DEFAULT TO GRAPH <g> ; MOVE SILENT <a> TO DEFAULT ; COPY <a> TO <b>",
+    "WITH <g> DELETE { ?s ?p ?o } INSERT { ?s ?p 1 } USING <g> USING NAMED <h> "
+    "WHERE { ?s ?p ?o } ; DELETE WHERE { ?s ?p ?o } ; DELETE DATA { <a> <b> <c> }",
+]
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_same_query_trees(text: str) -> None:
+    text = "PREFIX : <http://example.org/> " + text
+    assert parse_tree_structure(rdparser.parseQuery(text)) == parse_tree_structure(
+        parser.Query.parseString(text, parseAll=True)
+    )
+
+
+@pytest.mark.parametrize("text", UPDATES)
+def test_same_update_trees(text: str) -> None:
+    assert parse_tree_structure(rdparser.parseUpdate(text)) == parse_tree_structure(
+        parser.UpdateUnit.parseString(text, parseAll=True)[0]
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "SELECT * { ?s ?p ?o . . }",
+        "SELECT * { ?s :p?o }",
+        'SELECT * { ?s ?p "a" @en }',
+        "SELECT * { ?s ?p ?o } LIMIT",
+        "SELECT ?x { } LIMIT 1 LIMIT 2",
+        "SELECT * { } }",
+    ],
+)
+def test_syntax_errors(text: str) -> None:
+    with pytest.raises(ParseException):
+        parser.parseQuery(text)
+    with pytest.raises(ParseException):
+        rdparser.parseQuery(text)
+
+
+def test_setting(monkeypatch) -> None:
+    graph = Graph()
+    graph.add((EX.a, EX.p, Literal(1)))
+    query = "SELECT ?o { ?s <http://example.org/p> ?o }"
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_PARSER", "rdparser")
+    calls = []
+    parse = rdparser.parseQuery
+
+    def parseQuery(q):
+        calls.append(q)
+        return parse(q)
+
+    monkeypatch.setattr(rdparser, "parseQuery", parseQuery)
+    query_cache.clear()
+    assert list(graph.query(query)) == [(Literal(1),)]
+    assert calls == [query]
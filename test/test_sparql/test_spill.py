@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+import rdflib.plugins.sparql
+from rdflib import Graph, Literal, Namespace
+from rdflib.plugins.sparql import spill
+from rdflib.plugins.sparql.processor import query_cache
+
+EX = Namespace("http://example.org/")
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    rng = random.Random(7)
+    graph = Graph()
+    for i in range(400):
+        graph.add((EX[f"s{i}"], EX.a, Literal(rng.randint(0, 60))))
+        graph.add((EX[f"s{i}"], EX.b, Literal(f"v{rng.randint(0, 9)}")))
+    return graph
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT ?a ?b { ?s :a ?a ; :b ?b } ORDER BY DESC(?a) ?b",
+        "SELECT ?a { ?s :a ?a } ORDER BY ?a",
+        "SELECT DISTINCT ?a ?b { ?s :a ?a ; :b ?b }",
+        "SELECT DISTINCT ?b { ?s :b ?b } LIMIT 3",
+        "SELECT ?a (COUNT(*) AS ?n) (GROUP_CONCAT(?b) AS ?c) "
+        "{ ?s :a ?a ; :b ?b } GROUP BY ?a",
+        "SELECT ?b (MAX(?a) AS ?n) { ?s :a ?a ; :b ?b } GROUP BY ?b ORDER BY ?n",
+        "SELECT (COUNT(*) AS ?n) { ?s :a ?a ; :c ?c } GROUP BY ?a",
+    ],
+)
+@pytest.mark.parametrize("budget", [2, 25, 10_000])
+def test_same_results(graph: Graph, query: str, budget: int, monkeypatch) -> None:
+    query = "PREFIX : <http://example.org/> " + query
+    query_cache.clear()
+    expected = list(graph.query(query))
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_MEMORY_BUDGET", budget)
+    monkeypatch.setattr(spill, "MERGE_WIDTH", 3)
+    assert list(graph.query(query)) == expected
+
+
+def test_spills_over_budget(graph: Graph, monkeypatch) -> None:
+    files = []
+    spill_file = spill.SpillFile
+
+    def SpillFile(ctx):
+        files.append(spill_file(ctx))
+        return files[-1]
+
+    monkeypatch.setattr(spill, "SpillFile", SpillFile)
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_MEMORY_BUDGET", 100)
+    result = graph.query("SELECT DISTINCT ?s { ?s ?p ?o } ORDER BY ?s")
+    assert len(result) == 400 and files
+    assert all(spill.file.closed for spill in files)
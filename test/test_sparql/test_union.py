@@ -0,0 +1,146 @@
+import threading
+from typing import List
+
+import pytest
+
+import rdflib.plugins.sparql
+from rdflib import Graph, Literal, Namespace
+from rdflib.plugins.sparql import evaluate, parallel, prepareQuery
+from rdflib.plugins.sparql.operators import (
+    register_custom_function,
+    unregister_custom_function,
+)
+
+EX = Namespace("http://example.org/")
+
+PREFIX = "PREFIX : <http://example.org/> "
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    graph = Graph()
+    for i in range(50):
+        graph.add((EX[f"s{i}"], EX.p, Literal(i)))
+        graph.add((EX[f"s{i}"], EX.q, Literal(-i)))
+    return graph
+
+
+@pytest.fixture
+def function():
+    """registers :f, which calls the function of the test"""
+    calls: List[Literal] = []
+    behaviour = {"f": lambda x: Literal(True)}
+
+    def f(x):
+        calls.append(x)
+        return behaviour["f"](x)
+
+    register_custom_function(EX.f, f)
+    yield calls, behaviour
+    unregister_custom_function(EX.f)
+
+
+def test_streams(graph: Graph, function) -> None:
+    calls, _ = function
+    query = "SELECT ?o { { ?s :p ?o } UNION { ?s :q ?o FILTER (:f(?o)) } } LIMIT 10"
+    assert len(list(graph.query(PREFIX + query))) == 10
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT ?o { { ?s :p ?o } UNION { ?s :q ?o } }",
+        "SELECT ?o { { ?s :p ?o } UNION { ?s :q ?o } UNION { ?s :p ?o } } LIMIT 70",
+        "SELECT ?o { { ?s :p ?o } UNION { ?s :q ?o } FILTER (?o > 5) }",
+        "SELECT ?s { { ?s :p 1 } UNION { ?s :q ?o FILTER NOT EXISTS { ?s :p 2 } } }",
+    ],
+)
+def test_same_with_threads(graph: Graph, query: str, monkeypatch) -> None:
+    expected = list(graph.query(PREFIX + query))
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_THREADS", 2)
+    assert list(graph.query(PREFIX + query)) == expected
+
+
+def test_concurrent(graph: Graph, function, monkeypatch) -> None:
+    _, behaviour = function
+    # only passes if both branches wait for each other at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait(x):
+        if x == Literal(0):
+            barrier.wait()
+        return Literal(True)
+
+    behaviour["f"] = wait
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_THREADS", 2)
+    query = (
+        "SELECT ?o { { ?s :p ?o FILTER (:f(?o)) } UNION { ?s :q ?o FILTER (:f(?o)) } }"
+    )
+    assert len(list(graph.query(PREFIX + query))) == 100
+
+
+def test_errors(graph: Graph, function, monkeypatch) -> None:
+    _, behaviour = function
+
+    def fail(x):
+        raise ValueError("failed")
+
+    behaviour["f"] = fail
+    monkeypatch.setattr(rdflib.plugins.sparql, "SPARQL_THREADS", 2)
+    query = "SELECT ?o { { ?s :p ?o } UNION { ?s :q ?o FILTER (:f(?o)) } }"
+    with pytest.raises(ValueError, match="failed"):
+        list(graph.query(PREFIX + query))
+
+
+def test_independent() -> None:
+    def union(query: str):
+        part = prepareQuery(PREFIX + query).algebra
+        while part.name != "Union":
+            part = part.p
+        return part
+
+    assert evaluate._independent_branches(
+        union("SELECT * { { ?s :p ?o } UNION { ?s :q ?o } FILTER (?o > 1) }")
+    )
+    assert not evaluate._independent_branches(
+        union("SELECT * { { ?s :p ?o } UNION { ?s :q ?o } FILTER (:f(?o)) }")
+    )
+    assert not evaluate._independent_branches(
+        union("SELECT * { { BIND (BNODE('a') AS ?b) } UNION { ?s :q ?o } }")
+    )
+
+
+def test_in_worker() -> None:
+    seen: List[bool] = []
+    started = threading.Event()
+
+    def first():
+        assert started.wait(5)
+        yield 1
+
+    def second():
+        seen.append(parallel.in_worker())
+        started.set()
+        yield 2
+
+    assert list(parallel.chain([first, second], 1)) == [1, 2]
+    assert seen == [True]
+    assert not parallel.in_worker()
+
+
+def test_close_cancels() -> None:
+    produced: List[int] = []
+    started = threading.Event()
+
+    def part():
+        started.set()
+        for i in range(parallel.BUFFER_SIZE * 10):
+            produced.append(i)
+            yield i
+
+    solutions = parallel.chain([lambda: iter([0]), part], 1)
+    assert next(solutions) == 0
+    assert started.wait(5)
+    solutions.close()
+    assert len(produced) <= parallel.BUFFER_SIZE + 2
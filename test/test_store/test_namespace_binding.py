@@ -47,6 +47,7 @@ def make_store_info_dict(*result_format: StoreInfo) -> Dict[str, StoreInfo]:
 store_info_dict = make_store_info_dict(
     StoreInfo("Memory"),
     StoreInfo("SimpleMemory"),
+    StoreInfo("CompactMemory"),
     StoreInfo("SPARQLStore"),
     StoreInfo("SPARQLUpdateStore"),
     *((StoreInfo("BerkeleyDB", {StoreTrait.DISK_BACKED}),) if has_bsddb else ()),
@@ -0,0 +1,69 @@
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import List
+
+import pytest
+
+from rdflib import Graph, Literal, plugin
+from rdflib.events import Event
+from rdflib.store import Store, TripleAddedEvent
+
+
+@pytest.fixture(scope="function", params=["SimpleMemory", "Memory", "CompactMemory"])
+def store_name(request) -> str:
+    return request.param
+
+
+def make_quads(store: Store):
+    g1 = Graph(store, identifier=context1)
+    g2 = Graph(store, identifier=context2)
+    return [
+        (michel, likes, pizza, g1),
+        (michel, likes, cheese, g1),
+        (michel, hates, Literal("broccoli"), g1),
+        (bob, likes, cheese, g2),
+        (bob, hates, pizza, g2),
+        (michel, likes, pizza, g2),
+        (michel, likes, pizza, g2),
+    ]
+
+
+def test_addn_same_as_add(store_name: str) -> None:
+    added = plugin.get(store_name, Store)()
+    for s, p, o, c in make_quads(added):
+        added.add((s, p, o), c)
+    batched = plugin.get(store_name, Store)()
+    batched.addN(make_quads(batched))
+
+    contexts = [None, *batched.contexts()] if batched.context_aware else [None]
+    for context in contexts:
+        assert {t for t, _ in batched.triples((None, None, None), context)} == {
+            t for t, _ in added.triples((None, None, None), context)
+        }
+        assert batched.__len__(context) == added.__len__(context)
+    if batched.context_aware:
+        assert {c.identifier for c in batched.contexts()} == {context1, context2}
+        assert {c.identifier for c in batched.contexts((michel, likes, pizza))} == {
+            context1,
+            context2,
+        }
+
+
+def test_addn_dispatches_events_to_subscribers(store_name: str) -> None:
+    store = plugin.get(store_name, Store)()
+    events: List[Event] = []
+    store.dispatcher.subscribe(TripleAddedEvent, events.append)
+    quads = make_quads(store)
+    store.addN(quads)
+    if store_name == "SimpleMemory":
+        # SimpleMemory never dispatches events
+        assert events == []
+    else:
+        assert [(e.triple, e.context) for e in events] == [
+            ((s, p, o), c) for s, p, o, c in quads
+        ]
+
+
+def test_graph_addn(store_name: str) -> None:
+    graph = Graph(store=store_name)
+    graph.addN((michel, likes, o, graph) for o in (pizza, cheese))
+    assert set(graph) == {(michel, likes, pizza), (michel, likes, cheese)}
@@ -145,3 +145,21 @@ def test_open_shut(get_graph):
     assert (
         len(g) == 3
     ), "After close and reopen, we should still have the 3 originally added triples"
+
+
+def test_statistics(get_graph):
+    path, g = get_graph
+    assert g.cardinality((None, None, None)) == 3
+    assert g.cardinality((None, URIRef("https://example.org/e"), None)) == 1
+    assert g.distinct_cardinality(0, (None, None, None)) == 2
+    assert g.distinct_cardinality(1, (None, None, None)) == 3
+    g.remove((URIRef("https://example.org/d"), None, None))
+    assert g.cardinality((None, None, None)) == 1
+    assert g.cardinality((None, URIRef("https://example.org/e"), None)) == 0
+    g.close()
+
+    # the statistics are kept on disk
+    g = ConjunctiveGraph("BerkeleyDB")
+    g.open(path, create=False)
+    assert g.cardinality((None, None, None)) == 1
+    assert g.distinct_cardinality(2, (None, None, None)) == 1
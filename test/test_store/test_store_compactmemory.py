@@ -0,0 +1,129 @@
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import Set, Tuple
+
+import pytest
+
+from rdflib import Graph, Literal
+from rdflib.graph import ConjunctiveGraph, QuotedGraph
+from rdflib.plugins.stores.compactmemory import CompactMemory
+from rdflib.plugins.stores.memory import Memory
+from rdflib.store import Store
+
+
+def store_state(store: Store) -> Set[Tuple]:
+    """
+    All triples in the store together with the contexts they are in, for
+    comparing stores with each other.
+    """
+    state = set()
+    for context in [None, *store.contexts()]:
+        for triple, contexts in store.triples((None, None, None), context):
+            state.add(
+                (
+                    None if context is None else context.identifier,
+                    triple,
+                    frozenset(c.identifier for c in contexts),
+                )
+            )
+    return state
+
+
+def apply_operations(store: Store) -> None:
+    g1 = Graph(store, identifier=context1)
+    g2 = Graph(store, identifier=context2)
+    quoted = QuotedGraph(store, identifier=context2)
+    store.add((michel, likes, pizza), g1)
+    store.add((michel, likes, cheese), g1)
+    store.add((michel, likes, cheese), g2)
+    store.add((bob, likes, cheese), g2)
+    store.add((bob, hates, pizza), g2)
+    store.add((bob, hates, michel), quoted, quoted=True)
+    store.add((bob, hates, pizza), quoted, quoted=True)
+    store.remove((michel, likes, cheese), g1)
+    store.remove((bob, None, None), g2)
+    store.add((bob, hates, Literal("broccoli")), g1)
+
+
+def test_same_state_as_memory() -> None:
+    compact = CompactMemory()
+    memory = Memory()
+    apply_operations(compact)
+    apply_operations(memory)
+    assert store_state(compact) == store_state(memory)
+    for context in [None, *memory.contexts()]:
+        assert len(compact) == len(memory)
+        assert compact.__len__(context) == memory.__len__(context)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        (None, None, None),
+        (michel, None, None),
+        (michel, likes, None),
+        (michel, likes, pizza),
+        (michel, None, pizza),
+        (None, likes, None),
+        (None, likes, cheese),
+        (None, None, cheese),
+        (None, hates, None),
+        (Literal("unknown"), None, None),
+    ],
+)
+def test_patterns_match_memory(pattern) -> None:
+    compact = CompactMemory()
+    memory = Memory()
+    apply_operations(compact)
+    apply_operations(memory)
+    for context in [None, *memory.contexts()]:
+        assert {t for t, _ in compact.triples(pattern, context)} == {
+            t for t, _ in memory.triples(pattern, context)
+        }
+
+
+def test_unused_terms_are_released() -> None:
+    graph = Graph(store="CompactMemory")
+    graph.add((michel, likes, pizza))
+    graph.add((bob, likes, cheese))
+    graph.remove((michel, None, None))
+    store = graph.store
+    term_ids = store._CompactMemory__term_ids  # type: ignore[attr-defined]
+    assert michel not in term_ids
+    assert pizza not in term_ids
+    assert likes in term_ids
+    free_id = store._CompactMemory__free_ids[-1]  # type: ignore[attr-defined]
+    graph.add((michel, hates, cheese))
+    assert free_id in term_ids.values()
+    assert set(graph) == {(bob, likes, cheese), (michel, hates, cheese)}
+
+
+def test_quoted_flag_is_replaced() -> None:
+    store = CompactMemory()
+    graph = Graph(store, identifier=context1)
+    store.add((bob, likes, pizza), graph, quoted=True)
+    assert len(store) == 0
+    store.add((bob, likes, pizza), graph)
+    assert len(store) == 1
+    assert list(store.contexts((bob, likes, pizza))) == [graph]
+
+
+def test_conjunctive_graph() -> None:
+    cg = ConjunctiveGraph(store="CompactMemory")
+    g1 = cg.get_context(context1)
+    g2 = cg.get_context(context2)
+    g1.add((michel, likes, pizza))
+    g2.add((michel, likes, pizza))
+    g2.add((bob, likes, cheese))
+    assert len(cg) == 2
+    assert len(g1) == 1
+    assert len(g2) == 2
+    assert {c.identifier for c in cg.contexts((michel, likes, pizza))} == {
+        context1,
+        context2,
+    }
+    g1.remove((michel, likes, pizza))
+    assert len(cg) == 2
+    assert len(g1) == 0
+    cg.remove((None, None, None))
+    assert len(cg) == 0
+    assert len(g2) == 0
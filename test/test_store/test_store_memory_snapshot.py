@@ -0,0 +1,175 @@
+import gc
+import pickle
+import threading
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+
+import pytest
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.graph import ConjunctiveGraph, Dataset
+from rdflib.plugins.stores.memory import Memory, MemorySnapshot
+
+
+@pytest.fixture(scope="function")
+def graph() -> ConjunctiveGraph:
+    graph = ConjunctiveGraph(store="Memory")
+    graph.add((michel, likes, pizza, context1))
+    graph.add((michel, likes, cheese, context1))
+    graph.add((bob, likes, cheese, context2))
+    graph.add((bob, hates, pizza, context2))
+    return graph
+
+
+def test_snapshot_is_isolated(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    before = set(graph.quads())
+    snapshot = store.snapshot()
+    assert isinstance(snapshot, MemorySnapshot)
+
+    graph.add((bob, likes, pizza, context1))
+    graph.add((michel, hates, Literal("broccoli"), context2))
+    graph.remove((michel, likes, cheese, context1))
+    graph.remove_context(graph.get_context(context2))
+
+    after = set(graph.quads())
+    assert after != before
+    assert {
+        (s, p, o, c.identifier) for s, p, o, c in ConjunctiveGraph(snapshot).quads()
+    } == {(s, p, o, c.identifier) for s, p, o, c in before}
+    assert len(snapshot) == 4
+    assert snapshot.cardinality((None, likes, None)) == 3
+    assert snapshot.distinct_cardinality(0, (None, None, None)) == 2
+    assert set(graph.quads()) == after
+
+
+def test_snapshots_taken_at_different_times(graph: ConjunctiveGraph) -> None:
+    first = graph.store.snapshot()
+    graph.add((bob, likes, pizza, context1))
+    second = graph.store.snapshot()
+    graph.remove((None, likes, None))
+
+    assert len(first) == 4
+    assert len(second) == 5
+    assert len(graph) == 1
+    assert (bob, likes, pizza) not in ConjunctiveGraph(first)
+    assert (bob, likes, pizza) in ConjunctiveGraph(second)
+
+
+def test_snapshot_is_read_only(graph: ConjunctiveGraph) -> None:
+    snapshot = graph.store.snapshot()
+    with pytest.raises(TypeError):
+        snapshot.add((bob, likes, pizza), graph.get_context(context1))
+    with pytest.raises(TypeError):
+        snapshot.addN([(bob, likes, pizza, graph.get_context(context1))])
+    with pytest.raises(TypeError):
+        snapshot.remove((None, None, None))
+    with pytest.raises(TypeError):
+        snapshot.add_graph(graph.get_context(URIRef("urn:example:context-3")))
+    with pytest.raises(TypeError):
+        snapshot.remove_graph(graph.get_context(context1))
+    snapshot.add_graph(graph.get_context(context1))
+    assert snapshot.snapshot() is snapshot
+
+
+def test_snapshot_namespaces(graph: ConjunctiveGraph) -> None:
+    graph.bind("ex", "urn:example:")
+    snapshot = graph.store.snapshot()
+    snapshot.bind("other", URIRef("urn:other:"))
+    graph.bind("more", "urn:more:")
+    assert snapshot.namespace("ex") == URIRef("urn:example:")
+    assert snapshot.namespace("more") is None
+    assert graph.store.namespace("other") is None
+
+
+def test_snapshot_contexts_are_bound_to_snapshot(graph: ConjunctiveGraph) -> None:
+    snapshot = graph.store.snapshot()
+    graph.remove((None, None, None, context1))
+    for context in snapshot.contexts():
+        assert context.store is snapshot
+    assert len(ConjunctiveGraph(snapshot).get_context(context1)) == 2
+    for context in graph.contexts():
+        assert context.store is graph.store
+
+
+def test_released_snapshot_stops_copying(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    snapshot = store.snapshot()
+    graph.addN([(bob, likes, pizza, graph.get_context(context1))])
+    assert len(snapshot) == 4
+    del snapshot
+    gc.collect()
+    assert store._Memory__owned is None
+    graph.addN([(michel, hates, bob, graph.get_context(context1))])
+    assert len(graph) == 6
+
+
+@pytest.mark.parametrize("graph_class", [Graph, ConjunctiveGraph, Dataset])
+def test_query_snapshot(graph_class) -> None:
+    graph = graph_class(store="Memory")
+    graph.add((michel, likes, pizza))
+    graph.add((bob, likes, cheese))
+    result = graph.query(
+        "SELECT ?s ?o WHERE { ?s <urn:example:likes> ?o }", snapshot=True
+    )
+    # the result is evaluated lazily, from the snapshot
+    graph.remove((None, None, None))
+    graph.add((bob, hates, pizza))
+    assert {tuple(row) for row in result} == {(michel, pizza), (bob, cheese)}
+    assert len(graph) == 1
+
+
+def test_query_snapshot_graph_keyword() -> None:
+    dataset = Dataset(store="Memory")
+    dataset.graph(context1).add((michel, likes, pizza))
+    dataset.graph(context2).add((bob, likes, cheese))
+    result = dataset.query(
+        "SELECT ?g ?s WHERE { GRAPH ?g { ?s ?p ?o } }", snapshot=True
+    )
+    dataset.remove_graph(context1)
+    assert {tuple(row) for row in result} == {(context1, michel), (context2, bob)}
+
+
+def test_reads_during_writes(graph: ConjunctiveGraph) -> None:
+    subjects = [URIRef(f"urn:example:s{index}") for index in range(200)]
+    context = graph.get_context(context1)
+    errors = []
+    done = threading.Event()
+
+    def write() -> None:
+        for _ in range(20):
+            for subject in subjects:
+                graph.add((subject, likes, pizza, context))
+            graph.remove((None, likes, pizza, context))
+        done.set()
+
+    def read() -> None:
+        try:
+            while not done.is_set():
+                snapshot = graph.store.snapshot()
+                expected = len(snapshot)
+                assert len(list(snapshot.triples((None, None, None)))) == expected
+                assert sum(1 for _ in snapshot.triples((None, likes, None))) == (
+                    snapshot.cardinality((None, likes, None))
+                )
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    writer = threading.Thread(target=write)
+    for thread in readers + [writer]:
+        thread.start()
+    for thread in readers + [writer]:
+        thread.join()
+    assert errors == []
+    assert len(graph) == 3
+
+
+def test_pickle_with_snapshot(graph: ConjunctiveGraph) -> None:
+    snapshot = graph.store.snapshot()
+    graph.add((bob, likes, pizza, context1))
+    store = pickle.loads(pickle.dumps(graph.store))
+    assert isinstance(store, Memory)
+    assert len(store) == 5
+    store.add((michel, hates, bob), graph.get_context(context2))
+    assert len(store) == 6
+    assert len(pickle.loads(pickle.dumps(snapshot))) == 4
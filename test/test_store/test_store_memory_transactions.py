@@ -0,0 +1,213 @@
+import gc
+import threading
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import Set, Tuple
+
+import pytest
+
+from rdflib import Literal, URIRef
+from rdflib.graph import ConjunctiveGraph, Dataset, Graph
+from rdflib.plugins.sparql.operators import (
+    register_custom_function,
+    unregister_custom_function,
+)
+
+_QuadSet = Set[Tuple[URIRef, URIRef, URIRef, URIRef]]
+
+
+@pytest.fixture(scope="function")
+def graph() -> ConjunctiveGraph:
+    graph = ConjunctiveGraph(store="Memory")
+    graph.add((michel, likes, pizza, context1))
+    graph.add((michel, likes, cheese, context1))
+    graph.add((bob, likes, cheese, context2))
+    graph.add((bob, hates, pizza, context2))
+    return graph
+
+
+def quads(graph: ConjunctiveGraph) -> _QuadSet:
+    return {(s, p, o, c.identifier) for s, p, o, c in graph.quads()}
+
+
+def change(graph: ConjunctiveGraph) -> None:
+    graph.add((bob, likes, pizza, context1))
+    graph.add((michel, likes, cheese, context2))
+    graph.add((michel, hates, Literal("broccoli"), URIRef("urn:example:context-3")))
+    graph.addN([(bob, hates, michel, graph.get_context(context1))])
+    graph.remove((michel, likes, None, context1))
+    graph.remove_context(graph.get_context(context2))
+    graph.add((bob, likes, cheese, context2))
+
+
+def test_rollback(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    before = quads(graph)
+    contexts = {context.identifier for context in graph.contexts()}
+    stats = store.cardinality((None, likes, None)), store.distinct_cardinality(
+        0, (None, None, None)
+    )
+
+    store.begin()
+    assert store.in_transaction
+    change(graph)
+    assert quads(graph) != before
+    graph.rollback()
+
+    assert not store.in_transaction
+    assert quads(graph) == before
+    assert len(graph) == 4
+    assert {context.identifier for context in graph.contexts()} == contexts
+    assert (
+        store.cardinality((None, likes, None)),
+        store.distinct_cardinality(0, (None, None, None)),
+    ) == stats
+
+
+def test_commit(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    store.begin()
+    change(graph)
+    after = quads(graph)
+    graph.commit()
+    assert not store.in_transaction
+    graph.rollback()
+    assert quads(graph) == after
+
+
+def test_rollback_quoted_and_default_context() -> None:
+    graph = ConjunctiveGraph(store="Memory")
+    store = graph.store
+    graph.add((michel, likes, pizza, context1))
+    store.add((michel, likes, pizza), None)
+    before = {triple for triple, _ in store.triples((None, None, None))}
+    store.begin()
+    store.remove((michel, likes, pizza), None)
+    assert len(store) == 0
+    graph.rollback()
+    assert {triple for triple, _ in store.triples((None, None, None))} == before
+    assert len(graph.get_context(context1)) == 1
+
+
+@pytest.mark.parametrize("quoted", [True, False])
+def test_rollback_quoted(quoted: bool) -> None:
+    graph = ConjunctiveGraph(store="Memory")
+    store = graph.store
+    triple = (michel, likes, pizza)
+
+    def state():
+        triples = [t for t, _ in store.triples(triple, None)]
+        return len(store), triples, list(store.contexts(triple))
+
+    store.add(triple, graph.get_context(context1), quoted=quoted)
+    before = state()
+    store.begin()
+    store.add(triple, graph.get_context(context1), quoted=not quoted)
+    assert state() != before
+    graph.rollback()
+    assert state() == before
+
+
+def test_begin_twice(graph: ConjunctiveGraph) -> None:
+    graph.store.begin()
+    with pytest.raises(ValueError):
+        graph.store.begin()
+    graph.store.commit()
+
+
+def test_rollback_with_snapshot(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    snapshot = store.snapshot()
+    store.begin()
+    change(graph)
+    changed = quads(graph)
+    in_transaction = store.snapshot()
+    assert not in_transaction.in_transaction
+    graph.rollback()
+    assert quads(ConjunctiveGraph(snapshot)) == quads(graph)
+    assert quads(ConjunctiveGraph(in_transaction)) == changed
+    del snapshot, in_transaction
+    gc.collect()
+    assert len(graph) == 4
+
+
+def test_dataset_rollback() -> None:
+    dataset = Dataset(store="Memory")
+    dataset.graph(context1).add((michel, likes, pizza))
+    graphs = {graph.identifier for graph in dataset.graphs()}
+    dataset.store.begin()
+    dataset.graph(context2).add((bob, likes, cheese))
+    dataset.remove_graph(context1)
+    dataset.rollback()
+    assert {graph.identifier for graph in dataset.graphs()} == graphs
+    assert len(dataset.graph(context1)) == 1
+
+
+@pytest.mark.parametrize("graph_class", [Graph, ConjunctiveGraph])
+def test_update_is_atomic(graph_class) -> None:
+    function = URIRef("urn:example:fail-second")
+    calls = []
+
+    def fail_second(value):
+        calls.append(value)
+        if len(calls) > 1:
+            raise RuntimeError("failed")
+        return value
+
+    graph = graph_class(store="Memory")
+    graph.add((michel, likes, pizza))
+    graph.add((bob, likes, cheese))
+    before = set(graph)
+    register_custom_function(function, fail_second)
+    try:
+        with pytest.raises(RuntimeError):
+            graph.update(
+                "DELETE { ?s <urn:example:likes> ?o } "
+                "INSERT { ?s <urn:example:hates> ?x } "
+                "WHERE { ?s <urn:example:likes> ?o "
+                f"BIND(<{function}>(?o) AS ?x) }}"
+            )
+    finally:
+        unregister_custom_function(function, fail_second)
+    assert set(graph) == before
+    assert not graph.store.in_transaction
+
+
+def test_update_in_transaction(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    store.begin()
+    graph.update(
+        "DELETE { GRAPH ?g { ?s <urn:example:likes> ?o } } "
+        "WHERE { GRAPH ?g { ?s <urn:example:likes> ?o } }"
+    )
+    assert store.in_transaction
+    assert len(graph) == 1
+    graph.rollback()
+    assert len(graph) == 4
+
+
+def test_transaction_of_thread(graph: ConjunctiveGraph) -> None:
+    store = graph.store
+    store.begin()
+    graph.add((bob, likes, pizza, context1))
+
+    # another thread does not take part in the transaction, and its update
+    # waits for the transaction to end
+    in_transaction = []
+
+    def update() -> None:
+        in_transaction.append(store.in_transaction)
+        graph.update(f"INSERT DATA {{ <{bob}> <{hates}> 1 }}")
+        # does not end the transaction of the other thread
+        store.rollback()
+
+    updater = threading.Thread(target=update)
+    updater.start()
+    updater.join(0.2)
+    assert updater.is_alive()
+    assert in_transaction == [False] and len(graph) == 5
+
+    graph.rollback()
+    updater.join()
+    assert not store.in_transaction
+    assert (bob, likes, pizza) not in graph
+    assert (bob, hates, Literal(1)) in graph and len(graph) == 5
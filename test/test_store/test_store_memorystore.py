@@ -3,7 +3,7 @@ import pytest
 import rdflib
 
 
-@pytest.fixture(scope="function", params=["SimpleMemory", "Memory"])
+@pytest.fixture(scope="function", params=["SimpleMemory", "Memory", "CompactMemory"])
 def get_graph(request):
     g = rdflib.Graph(request.param)
     yield g
@@ -29,3 +29,47 @@ def test_memory_store(get_graph):
     g.remove(triple1)
     assert len(g) == 1
     assert len(g.serialize()) > 0
+
+
+@pytest.fixture(scope="function", params=["Memory", "CompactMemory"])
+def conjunctive_graph(request):
+    yield rdflib.ConjunctiveGraph(request.param)
+
+
+def test_memory_store_contexts(conjunctive_graph):
+    g = conjunctive_graph
+    ex = rdflib.Namespace("http://example.org/")
+    triple = (ex.s, ex.p, ex.o)
+    g.add(triple + (ex.g1,))
+    g.add((ex.s, ex.p, ex.o2, ex.g1))
+    assert {c.identifier for c in g.contexts(triple)} == {ex.g1}
+
+    # a triple in several graphs
+    g.add(triple + (ex.g2,))
+    assert {c.identifier for c in g.contexts(triple)} == {ex.g1, ex.g2}
+    assert len(g) == 2
+    assert len(g.get_context(ex.g2)) == 1
+
+    # and in a quoted graph
+    formula = rdflib.graph.QuotedGraph(g.store, ex.f)
+    formula.add(triple)
+    assert {c.identifier for c in g.contexts(triple)} == {ex.g1, ex.g2}
+    assert len(formula) == 1
+
+    g.remove(triple + (ex.g1,))
+    assert {c.identifier for c in g.contexts(triple)} == {ex.g2}
+    assert len(g.get_context(ex.g1)) == 1
+    assert len(g) == 2
+
+    g.remove(triple + (ex.g2,))
+    assert list(g.contexts(triple)) == []
+    assert triple not in g
+    assert len(g) == 1
+    assert len(formula) == 1
+
+    formula.remove(triple)
+    assert len(formula) == 0
+    assert list(g.store.triples(triple)) == []
+    g.remove((None, None, None))
+    assert len(g) == 0
+    assert len(g.get_context(ex.g1)) == 0
@@ -0,0 +1,191 @@
+import multiprocessing
+from pathlib import Path
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import Set, Tuple
+
+import pytest
+
+from rdflib import RDF, XSD, BNode, Literal, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID, ConjunctiveGraph, Dataset, Graph
+from rdflib.plugins.stores.mmapstore import MMapStore, write_mmap_store
+from rdflib.store import CORRUPTED_STORE, NO_STORE, VALID_STORE
+
+_QuadSet = Set[Tuple[URIRef, URIRef, URIRef, URIRef]]
+
+terms = [
+    Literal("broccoli"),
+    Literal("brocoli", lang="fr"),
+    Literal("42", datatype=XSD.integer),
+    Literal("1.5", datatype=XSD.decimal),
+    Literal("ünïcödé"),
+    BNode("b0"),
+]
+
+
+@pytest.fixture(scope="function")
+def source() -> Dataset:
+    dataset = Dataset()
+    dataset.bind("ex", "urn:example:")
+    dataset.add((michel, likes, pizza))
+    dataset.graph(context1).add((michel, likes, pizza))
+    dataset.graph(context1).add((michel, likes, cheese))
+    dataset.graph(context2).add((bob, likes, cheese))
+    dataset.graph(context2).add((bob, hates, pizza))
+    for term in terms:
+        dataset.graph(context2).add((bob, RDF.value, term))
+    return dataset
+
+
+@pytest.fixture(scope="function")
+def path(source: Dataset, tmp_path: Path) -> str:
+    path = str(tmp_path / "data.rdfmm")
+    write_mmap_store(source, path)
+    return path
+
+
+@pytest.fixture(scope="function")
+def dataset(path: str) -> Dataset:
+    dataset = Dataset(store="MMap")
+    assert dataset.open(path) == VALID_STORE
+    yield dataset
+    dataset.close()
+
+
+def quads(graph: ConjunctiveGraph) -> _QuadSet:
+    return set(Dataset(graph.store).quads((None, None, None, None)))
+
+
+def test_round_trip(source: Dataset, dataset: Dataset) -> None:
+    assert quads(dataset) == quads(source)
+    assert {graph.identifier for graph in dataset.graphs()} == {
+        graph.identifier for graph in source.graphs()
+    }
+    assert len(dataset.graph(context2)) == 2 + len(terms)
+    assert set(dataset.graph(context2).objects(bob, RDF.value)) == set(terms)
+    assert dataset.store.namespace("ex") == URIRef("urn:example:")
+
+
+def test_plain_graph(tmp_path: Path) -> None:
+    path = str(tmp_path / "graph.rdfmm")
+    source = Graph(identifier=context1)
+    source.add((michel, likes, pizza))
+    source.add((bob, likes, Literal("cheese")))
+    write_mmap_store(source, path)
+
+    graph = Graph(store=MMapStore(path), identifier=context1)
+    assert set(graph) == set(source)
+    assert len(graph) == 2
+    assert len(Graph(store=graph.store)) == 0
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        (None, None, None),
+        (michel, None, None),
+        (michel, likes, None),
+        (michel, likes, pizza),
+        (michel, None, pizza),
+        (None, likes, None),
+        (None, likes, cheese),
+        (None, None, pizza),
+        (None, RDF.value, Literal("42", datatype=XSD.integer)),
+        (None, None, Literal("missing")),
+    ],
+)
+def test_patterns(source: Dataset, dataset: Dataset, pattern) -> None:
+    union = ConjunctiveGraph(dataset.store)
+    expected = ConjunctiveGraph(source.store)
+    assert set(union.triples(pattern)) == set(expected.triples(pattern))
+    assert set(union.quads(pattern)) == {
+        (s, p, o, union.get_context(c.identifier))
+        for s, p, o, c in expected.quads(pattern)
+    }
+    for context in (context1, context2, DATASET_DEFAULT_GRAPH_ID):
+        assert set(dataset.graph(context).triples(pattern)) == set(
+            source.graph(context).triples(pattern)
+        )
+
+
+def test_contexts_of_triple(dataset: Dataset) -> None:
+    union = ConjunctiveGraph(dataset.store)
+    assert {
+        context.identifier for context in union.contexts((michel, likes, pizza))
+    } == {DATASET_DEFAULT_GRAPH_ID, context1}
+    assert list(union.contexts((michel, hates, pizza))) == []
+
+
+def test_statistics(dataset: Dataset) -> None:
+    store = dataset.store
+    graph = dataset.graph(context2)
+    # (michel, likes, pizza) is in two graphs, so only graphs can be counted
+    assert store.cardinality((None, likes, None)) is None
+    assert store.cardinality((bob, likes, None), graph) == 1
+    assert store.cardinality((bob, None, None), graph) == 2 + len(terms)
+    assert store.cardinality((bob, hates, michel), graph) == 0
+    assert store.distinct_cardinality(0, (None, None, None)) == 2
+    assert store.distinct_cardinality(1, (None, None, None)) == 3
+    assert len(store) == 4 + len(terms)
+
+
+def test_query(dataset: Dataset) -> None:
+    result = dataset.query(
+        "SELECT ?g ?s WHERE { GRAPH ?g { ?s <urn:example:hates> ?o } }"
+    )
+    assert {tuple(row) for row in result} == {(context2, bob)}
+
+
+def test_read_only(dataset: Dataset) -> None:
+    with pytest.raises(TypeError):
+        dataset.add((bob, likes, pizza))
+    with pytest.raises(TypeError):
+        dataset.addN([(bob, likes, pizza, dataset.graph(context1))])
+    with pytest.raises(TypeError):
+        dataset.remove((None, None, None))
+    with pytest.raises(TypeError):
+        dataset.graph(URIRef("urn:example:context-3"))
+    with pytest.raises(TypeError):
+        dataset.remove_graph(context1)
+    with pytest.raises(TypeError):
+        dataset.update("INSERT DATA { <urn:example:a> <urn:example:b> 1 }")
+    assert dataset.store.snapshot() is dataset.store
+
+
+def test_open(tmp_path: Path) -> None:
+    store = MMapStore()
+    assert store.open(str(tmp_path / "missing.rdfmm")) == NO_STORE
+    corrupted = tmp_path / "corrupted.rdfmm"
+    corrupted.write_bytes(b"not a store" * 20)
+    assert store.open(str(corrupted)) == CORRUPTED_STORE
+    with pytest.raises(TypeError):
+        store.open(str(corrupted), create=True)
+    assert len(store) == 0
+    assert list(store.triples((None, None, None))) == []
+
+
+def test_empty(tmp_path: Path) -> None:
+    path = str(tmp_path / "empty.rdfmm")
+    write_mmap_store(Dataset(), path)
+    store = MMapStore(path)
+    assert len(store) == 0
+    assert list(store.triples((None, None, None))) == []
+    assert list(store.contexts()) == []
+    store.close()
+
+
+def test_write_replaces_file(source: Dataset, path: str) -> None:
+    store = MMapStore(path)
+    source.remove((None, likes, None, None))
+    write_mmap_store(source, path)
+    assert len(MMapStore(path)) == len(terms) + 1
+    assert len(store) == 4 + len(terms)
+    store.close()
+
+
+def _count(path: str) -> int:
+    return len(ConjunctiveGraph(MMapStore(path)))
+
+
+def test_worker_processes(path: str) -> None:
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        assert pool.map(_count, [path, path]) == [4 + len(terms)] * 2
@@ -0,0 +1,147 @@
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import Optional
+
+import pytest
+
+from rdflib import RDF, Graph, Literal, URIRef
+from rdflib.graph import ConjunctiveGraph, Dataset, QuotedGraph
+from rdflib.namespace import FOAF
+
+PATTERNS = [
+    (None, None, None),
+    (michel, None, None),
+    (michel, likes, None),
+    (michel, likes, pizza),
+    (michel, None, pizza),
+    (None, likes, None),
+    (None, likes, cheese),
+    (None, None, cheese),
+    (None, RDF.type, FOAF.Person),
+    (URIRef("urn:example:unknown"), None, None),
+    (None, URIRef("urn:example:unknown"), None),
+]
+
+
+@pytest.fixture(scope="function", params=["Memory", "CompactMemory"])
+def graph(request) -> Graph:
+    graph = Graph(store=request.param)
+    graph.add((michel, RDF.type, FOAF.Person))
+    graph.add((bob, RDF.type, FOAF.Person))
+    graph.add((michel, likes, pizza))
+    graph.add((michel, likes, cheese))
+    graph.add((bob, likes, cheese))
+    graph.add((bob, hates, pizza))
+    graph.add((bob, hates, michel))
+    graph.add((michel, hates, Literal("broccoli")))
+    graph.remove((bob, hates, None))
+    return graph
+
+
+def distinct(graph: Graph, position: int, predicate: Optional[URIRef]) -> int:
+    return len({t[position] for t in graph.triples((None, predicate, None))})
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_cardinality_counts_matches(graph: Graph, pattern) -> None:
+    assert graph.cardinality(pattern) == len(list(graph.triples(pattern)))
+
+
+@pytest.mark.parametrize("predicate", [None, RDF.type, likes, hates, bob])
+def test_distinct_cardinality(graph: Graph, predicate) -> None:
+    for position in range(3):
+        assert graph.distinct_cardinality(
+            position, (None, predicate, None)
+        ) == distinct(graph, position, predicate)
+
+
+def test_statistics_follow_removals(graph: Graph) -> None:
+    graph.remove((michel, None, None))
+    for pattern in PATTERNS:
+        assert graph.cardinality(pattern) == len(list(graph.triples(pattern)))
+    assert graph.distinct_cardinality(2, (None, None, None)) == 2
+    graph.remove((None, None, None))
+    assert graph.cardinality((None, None, None)) == 0
+    assert graph.distinct_cardinality(0, (None, likes, None)) == 0
+
+
+@pytest.mark.parametrize("store", ["Memory", "CompactMemory"])
+def test_only_exact_statistics_are_reported(store: str) -> None:
+    cg = ConjunctiveGraph(store=store)
+    g1 = cg.get_context(context1)
+    g2 = cg.get_context(context2)
+    g1.add((michel, likes, pizza))
+    assert g1.cardinality((None, likes, None)) == 1
+    g2.add((bob, likes, pizza))
+    # the statistics cover both contexts
+    assert g1.cardinality((None, likes, None)) is None
+    assert cg.cardinality((None, likes, None)) == 2
+    quoted = QuotedGraph(cg.store, identifier=context2)
+    cg.store.add((bob, likes, cheese), quoted, quoted=True)
+    assert cg.cardinality((None, likes, None)) is None
+
+
+@pytest.mark.parametrize("store", ["Memory", "CompactMemory"])
+def test_dataset_union(store: str) -> None:
+    ds = Dataset(store=store, default_union=True)
+    ds.graph(context1).add((michel, likes, pizza))
+    ds.graph(context2).add((bob, likes, pizza))
+    assert ds.cardinality((None, likes, pizza)) == 2
+    assert ds.distinct_cardinality(0, (None, likes, None)) == 2
+
+
+def test_path_is_not_counted() -> None:
+    graph = Graph(store="Memory")
+    graph.add((michel, likes, pizza))
+    assert graph.cardinality((None, likes / likes, None)) is None
+    assert graph.cardinality((None, likes, None)) == 1
+
+
+def test_stores_without_statistics() -> None:
+    graph = Graph(store="SimpleMemory")
+    graph.add((michel, likes, pizza))
+    assert graph.cardinality((None, likes, None)) is None
+    assert graph.distinct_cardinality(0, (None, None, None)) is None
+
+
+@pytest.fixture(scope="function", params=["Memory", "CompactMemory", "BerkeleyDB"])
+def conjunctive_graph(request, tmp_path) -> ConjunctiveGraph:
+    if request.param == "BerkeleyDB":
+        pytest.importorskip("berkeleydb")
+    cg = ConjunctiveGraph(store=request.param)
+    if request.param == "BerkeleyDB":
+        cg.open(str(tmp_path / "db"), create=True)
+    cg.add((michel, RDF.type, FOAF.Person, context1))
+    cg.add((michel, likes, pizza, context1))
+    cg.add((michel, likes, cheese, context1))
+    cg.add((bob, likes, cheese, context2))
+    cg.add((bob, hates, pizza, context2))
+    cg.add((michel, likes, pizza, context2))
+    quoted = QuotedGraph(cg.store, identifier=URIRef("urn:example:quoted"))
+    cg.store.add((bob, likes, pizza), quoted, quoted=True)
+    yield cg
+    cg.close()
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_count_counts_matches(conjunctive_graph: ConjunctiveGraph, pattern) -> None:
+    cg = conjunctive_graph
+    assert cg.count(pattern) == len(list(cg.triples(pattern)))
+    for context in (context1, context2, URIRef("urn:example:unknown")):
+        graph = cg.get_context(context)
+        assert graph.count(pattern) == len(list(graph.triples(pattern)))
+
+
+def test_count_follows_removals(conjunctive_graph: ConjunctiveGraph) -> None:
+    cg = conjunctive_graph
+    cg.remove((michel, likes, pizza, context1))
+    graph = cg.get_context(context1)
+    assert graph.count((None, likes, None)) == 1
+    assert cg.count((None, likes, None)) == 3
+    assert cg.get_context(context2).count((michel, None, None)) == 1
+
+
+def test_count_path() -> None:
+    graph = Graph(store="Memory")
+    graph.add((michel, likes, bob))
+    graph.add((bob, likes, pizza))
+    assert graph.count((None, likes / likes, None)) == 1
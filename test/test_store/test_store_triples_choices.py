@@ -0,0 +1,95 @@
+from test.data import bob, cheese, context1, context2, hates, likes, michel, pizza
+from typing import Any, List, Set, Tuple
+
+import pytest
+
+from rdflib import RDF, Literal, URIRef
+from rdflib.graph import ConjunctiveGraph, Graph
+from rdflib.namespace import FOAF
+from rdflib.store import Store
+
+tarek = URIRef("urn:example:tarek")
+unknown = URIRef("urn:example:unknown")
+
+CHOICES = [
+    ([michel, bob, unknown], None, None),
+    ([michel, bob, michel], likes, None),
+    ([michel, bob], likes, cheese),
+    ([michel, bob], None, pizza),
+    ([], likes, None),
+    (michel, [likes, hates, unknown], None),
+    (michel, [likes, hates], pizza),
+    (None, [likes, RDF.type], None),
+    (None, [likes, hates], pizza),
+    (unknown, [likes], None),
+    (michel, likes, [pizza, cheese, unknown]),
+    (michel, None, [pizza, Literal("broccoli")]),
+    (None, likes, [pizza, cheese]),
+    (None, None, [pizza, FOAF.Person]),
+    (michel, hates, []),
+]
+
+
+@pytest.fixture(scope="function", params=["Memory", "BerkeleyDB"])
+def graph(request, tmp_path) -> ConjunctiveGraph:
+    if request.param == "BerkeleyDB":
+        pytest.importorskip("berkeleydb")
+    graph = ConjunctiveGraph(store=request.param)
+    if request.param == "BerkeleyDB":
+        graph.open(str(tmp_path / "db"), create=True)
+    graph.add((michel, RDF.type, FOAF.Person, context1))
+    graph.add((michel, likes, pizza, context1))
+    graph.add((michel, likes, cheese, context1))
+    graph.add((michel, hates, Literal("broccoli"), context2))
+    graph.add((bob, likes, cheese, context2))
+    graph.add((bob, hates, pizza, context2))
+    graph.add((bob, likes, cheese, context1))
+    yield graph
+    graph.close()
+
+
+def fallback(store: Store, triple: Any, context: Any = None) -> List[Tuple]:
+    """The result of the default implementation, for distinct choices."""
+    triple = tuple(
+        list(dict.fromkeys(term)) if isinstance(term, list) else term for term in triple
+    )
+    return [
+        (t, {c.identifier for c in cg})
+        for t, cg in Store.triples_choices(store, triple, context)
+    ]
+
+
+def results(store: Store, triple: Any, context: Any = None) -> Set[Tuple]:
+    result = [
+        (t, frozenset(c.identifier for c in cg))
+        for t, cg in store.triples_choices(triple, context)
+    ]
+    assert len(result) == len(set(result))
+    return set(result)
+
+
+@pytest.mark.parametrize("triple", CHOICES)
+def test_triples_choices(graph: ConjunctiveGraph, triple) -> None:
+    store = graph.store
+    assert results(store, triple) == {
+        (t, frozenset(c)) for t, c in fallback(store, triple)
+    }
+    for identifier in (context1, context2, unknown):
+        context = Graph(store, identifier)
+        assert results(store, triple, context) == {
+            (t, frozenset(c)) for t, c in fallback(store, triple, context)
+        }
+
+
+def test_graph_triples_choices(graph: ConjunctiveGraph) -> None:
+    assert set(graph.triples_choices(([michel, bob], likes, None))) == {
+        (michel, likes, pizza),
+        (michel, likes, cheese),
+        (bob, likes, cheese),
+    }
+    assert set(
+        graph.get_context(context2).triples_choices((bob, [likes, hates], None))
+    ) == {
+        (bob, likes, cheese),
+        (bob, hates, pizza),
+    }
@@ -27,6 +27,7 @@ from typing import (
 from urllib.parse import urljoin
 
 import pytest
+from pyparsing import ParseResults
 from pytest import MonkeyPatch
 
 import rdflib
@@ -35,6 +36,7 @@ from rdflib.namespace import RDFS
 from rdflib.plugins import sparql as rdflib_sparql_module
 from rdflib.plugins.sparql.algebra import translateQuery, translateUpdate
 from rdflib.plugins.sparql.parser import parseQuery, parseUpdate
+from rdflib.plugins.sparql.parserutils import CompValue
 from rdflib.plugins.sparql.results.rdfresults import RDFResultParser
 from rdflib.plugins.sparql.sparql import QueryContext
 from rdflib.query import Result
@@ -293,23 +295,58 @@ def ctx_configure_rdflib() -> Generator[None, None, None]:
     rdflib.DAWG_LITERAL_COLLATION = False
 
 
+def parse_tree_structure(tree: Any, bnodes: Optional[Dict[BNode, int]] = None) -> Any:
+    """
+    Returns nested tuples that are equal for equal parse trees, with blank
+    nodes numbered in the order in which they appear.
+    """
+    if bnodes is None:
+        bnodes = {}
+    if isinstance(tree, CompValue):
+        evalfn = getattr(tree, "_evalfn", None)
+        return (
+            type(tree).__name__,
+            tree.name,
+            evalfn and evalfn.__func__,
+            tuple(
+                (key, parse_tree_structure(dict.__getitem__(tree, key), bnodes))
+                for key in tree
+            ),
+        )
+    if isinstance(tree, (list, ParseResults)):
+        return (
+            type(tree).__name__,
+            tuple(parse_tree_structure(item, bnodes) for item in tree),
+        )
+    if isinstance(tree, BNode):
+        return ("BNode", bnodes.setdefault(tree, len(bnodes)))
+    return (type(tree).__name__, repr(tree))
+
+
 def check_syntax(monkeypatch: MonkeyPatch, entry: SPARQLEntry) -> None:
     assert entry.query is not None
     assert entry.type_info.query_type is not None
     query_text = entry.query_text()
-    catcher: Optional[pytest.ExceptionInfo[Exception]] = None
-    with ExitStack() as xstack:
-        if entry.type_info.negative:
-            catcher = xstack.enter_context(pytest.raises(Exception))
-        if entry.type_info.query_type is QueryType.UPDATE:
-            tree = parseUpdate(query_text)
-            translateUpdate(tree)
-        elif entry.type_info.query_type is QueryType.QUERY:
-            tree = parseQuery(query_text)
-            translateQuery(tree)
-    if catcher is not None:
-        assert catcher.value is not None
-        logging.info("catcher.value = %s", catcher.value)
+    structures = []
+    for parser in ("pyparsing", "rdparser"):
+        monkeypatch.setattr(rdflib_sparql_module, "SPARQL_PARSER", parser)
+        catcher: Optional[pytest.ExceptionInfo[Exception]] = None
+        with ExitStack() as xstack:
+            if entry.type_info.negative:
+                catcher = xstack.enter_context(pytest.raises(Exception))
+            if entry.type_info.query_type is QueryType.UPDATE:
+                tree = parseUpdate(query_text)
+                structures.append(parse_tree_structure(tree))
+                translateUpdate(tree)
+            elif entry.type_info.query_type is QueryType.QUERY:
+                tree = parseQuery(query_text)
+                structures.append(parse_tree_structure(tree))
+                translateQuery(tree)
+        if catcher is not None:
+            assert catcher.value is not None
+            logging.info("%s: catcher.value = %s", parser, catcher.value)
+    if not entry.type_info.negative:
+        assert structures[0] == structures[1]
 
 
 def check_update(monkeypatch: MonkeyPatch, entry: SPARQLEntry) -> None: